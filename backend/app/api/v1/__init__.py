@@ -11,6 +11,7 @@ from app.api.v1 import (
     secret_keys,
     cep,
     profile,
+    recurring_rules,
 )
 from app.routes import system_config
 
@@ -28,3 +29,4 @@ router.include_router(secret_keys.router)
 router.include_router(cep.router, prefix="/cep", tags=["cep"])
 router.include_router(profile.router, prefix="/profile", tags=["profile"])
 router.include_router(system_config.router)
+router.include_router(recurring_rules.router)
@@ -20,14 +20,22 @@ from app.schemas.user_schema import (
     UserRoleChange,
 )
 from app.services.audit_service import AuditService, AuditActions
+from app.services.cache_invalidation_service import CacheInvalidationService
 from app.services.hierarchy_service import HierarchyService
-from app.services import email_service
+from app.services.login_throttle_service import USERS_TOPIC
+from app.services.email_service import email_service
 from app.core.security import get_password_hash
 from app.core.master_protection import can_delete_user, can_disable_user, can_block_user
 
 router = APIRouter(prefix="/admin/users", tags=["admin"])
 
 
+def _publish_user_change(db: Session, user: UserModel) -> None:
+    """Zera, em todos os workers, as falhas de login do usuário (por email e username)."""
+    for login in {user.email, user.username} - {None}:
+        CacheInvalidationService.publish(db, USERS_TOPIC, login)
+
+
 @router.get("/", response_model=List[User])
 async def list_users(
     db: Session = Depends(get_db),
@@ -206,6 +214,7 @@ async def change_status(
 
     old_status = user.is_active
     user.is_active = bool(payload.is_active)  # type: ignore[assignment]
+    _publish_user_change(db, user)
     db.commit()
     db.refresh(user)
 
@@ -444,27 +453,17 @@ async def reset_user_password(
     user.password_reset_by = current_user.id  # type: ignore[assignment]
     user.updated_at = datetime.now(UTC)  # type: ignore[assignment]
 
-    db.commit()
-
-    # Enviar email com senha temporária
-    email_sent = email_service.send_temporary_password_email(
-        to_email=user.email, user_name=user.name, temp_password=temp_password
+    # Enfileirar os emails na mesma transação da nova senha: ou ambos são
+    # gravados, ou nenhum. O envio acontece em segundo plano.
+    email_service.queue_temporary_password_email(
+        db, to_email=user.email, user_name=user.name, temp_password=temp_password
     )
-
-    if not email_sent:
-        # Reverter alterações se email falhou
-        user.temp_password_hash = None  # type: ignore[assignment]
-        user.temp_password_expires = None  # type: ignore[assignment]
-        user.password_reset_by = None  # type: ignore[assignment]
-        db.commit()
-        raise HTTPException(
-            status_code=500, detail="Falha ao enviar email com senha temporária"
-        )
-
-    # Enviar notificação de reset
-    email_service.send_password_reset_notification(
-        to_email=user.email, user_name=user.name, admin_name=current_user.name
+    email_service.queue_password_reset_notification(
+        db, to_email=user.email, user_name=user.name, admin_name=current_user.name
     )
+    _publish_user_change(db, user)
+
+    db.commit()
 
     # Registrar log de auditoria
     AuditService.log_user_action(
@@ -473,13 +472,13 @@ async def reset_user_password(
         target_user=user,
         performed_by=current_user,
         description=f"Senha do usuário {user.name} foi resetada",
-        details={"expires_at": expires_at.isoformat(), "email_sent": True},
+        details={"expires_at": expires_at.isoformat(), "email_queued": True},
         request=request,
     )
 
     return {
         "message": "Senha resetada com sucesso",
-        "email_sent": True,
+        "email_queued": True,
         "expires_at": expires_at.isoformat(),
     }
 
@@ -563,6 +562,7 @@ async def unblock_user(
     user.blocked_by = None  # type: ignore[assignment]
     user.is_active = True  # type: ignore[assignment]
     user.updated_at = unblocked_at  # type: ignore[assignment]
+    _publish_user_change(db, user)
 
     db.commit()
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime, date
 
 from app.core.database import get_db
@@ -9,9 +9,33 @@ from app.models.audit_log import AuditLog
 from app.schemas.audit_log_schema import AuditLogResponse
 from app.dependencies import get_current_admin, get_current_master
 from app.models.user import User
+from app.core.config import settings
+from app.services.audit_facet_service import AuditFacetService
+from app.services.audit_retention_service import AuditRetentionService
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 
+MatchMode = Literal["exact", "prefix", "contains"]
+
+
+def _text_filter(column, value: str, mode: str):
+    """
+    Monta o filtro textual conforme o modo de busca.
+
+    - exact: igualdade, usa o índice b-tree da coluna
+    - prefix: faixa [valor, próximo valor), usa o índice b-tree em qualquer dialeto
+    - contains: ILIKE '%valor%' (no PostgreSQL atendido pelo índice trigram)
+    """
+    if mode == "exact":
+        return column == value
+    if mode == "prefix":
+        # 'abc' -> 'abd': limite superior exclusivo para a faixa do prefixo
+        if ord(value[-1]) >= 0x10FFFF:
+            return column >= value
+        upper = value[:-1] + chr(ord(value[-1]) + 1)
+        return (column >= value) & (column < upper)
+    return column.ilike(f"%{value}%")
+
 
 @router.get("/", response_model=List[AuditLogResponse])
 def get_audit_logs(
@@ -22,24 +46,29 @@ def get_audit_logs(
     performed_by: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    match: MatchMode = "contains",
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin),
 ):
     """
     Lista logs de auditoria com filtros opcionais.
+    O parâmetro ``match`` define como action/performed_by são comparados
+    (exact e prefix usam índice; contains faz busca por substring).
     Apenas ADMINs e MASTERs podem acessar.
     """
     query = db.query(AuditLog)
 
     # Aplicar filtros
     if action:
-        query = query.filter(AuditLog.action.ilike(f"%{action}%"))
+        query = query.filter(_text_filter(AuditLog.action, action, match))
 
     if resource_type:
         query = query.filter(AuditLog.resource_type == resource_type)
 
     if performed_by:
-        query = query.filter(AuditLog.performed_by.ilike(f"%{performed_by}%"))
+        query = query.filter(
+            _text_filter(AuditLog.performed_by, performed_by, match)
+        )
 
     if start_date:
         query = query.filter(AuditLog.created_at >= start_date)
@@ -65,9 +94,10 @@ def get_available_actions(
 ):
     """
     Retorna lista de ações disponíveis para filtro.
+
+    Lida do dicionário mantido pelo gravador de auditoria, sem varrer os logs.
     """
-    actions = db.query(AuditLog.action).distinct().all()
-    return [action[0] for action in actions if action[0]]
+    return AuditFacetService.list_values(db, AuditFacetService.ACTION)
 
 
 @router.get("/resource-types", response_model=List[str])
@@ -77,9 +107,10 @@ def get_available_resource_types(
 ):
     """
     Retorna lista de tipos de recursos disponíveis para filtro.
+
+    Lida do dicionário mantido pelo gravador de auditoria, sem varrer os logs.
     """
-    resource_types = db.query(AuditLog.resource_type).distinct().all()
-    return [rt[0] for rt in resource_types if rt[0]]
+    return AuditFacetService.list_values(db, AuditFacetService.RESOURCE_TYPE)
 
 
 @router.get("/stats")
@@ -144,11 +175,13 @@ def get_audit_stats(
 @router.delete("/cleanup")
 def cleanup_old_logs(
     days_to_keep: int = 90,
+    chunk_size: int = settings.AUDIT_RETENTION_CHUNK_SIZE,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_master),  # Apenas MASTER
 ):
     """
     Remove logs de auditoria mais antigos que N dias.
+    A remoção é feita em lotes (com arquivamento se AUDIT_ARCHIVE_DIR estiver definido).
     Apenas MASTERs podem executar esta operação.
     """
     from datetime import timedelta
@@ -159,14 +192,22 @@ def cleanup_old_logs(
             detail="Não é possível manter menos de 30 dias de logs",
         )
 
+    if chunk_size < 1 or chunk_size > 10000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="chunk_size deve estar entre 1 e 10000",
+        )
+
     cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
-    # Remover logs antigos
-    deleted_count = (
-        db.query(AuditLog).filter(AuditLog.created_at < cutoff_date).delete()
+    # Remover logs antigos em lotes
+    report = AuditRetentionService.purge(
+        db,
+        cutoff_date,
+        chunk_size=chunk_size,
+        archive_dir=settings.AUDIT_ARCHIVE_DIR,
     )
-
-    db.commit()
+    deleted_count = report["deleted_count"]
 
     # Registrar a operação de limpeza
     cleanup_log = AuditLog(
@@ -178,6 +219,8 @@ def cleanup_old_logs(
             "days_to_keep": days_to_keep,
             "cutoff_date": cutoff_date.isoformat(),
             "deleted_count": deleted_count,
+            "archived_count": report["archived_count"],
+            "chunks": report["chunks"],
         },
     )
     db.add(cleanup_log)
@@ -186,5 +229,9 @@ def cleanup_old_logs(
     return {
         "message": f"Limpeza concluída: {deleted_count} logs removidos",
         "deleted_count": deleted_count,
+        "archived_count": report["archived_count"],
+        "chunks": report["chunks"],
+        "elapsed_seconds": report["elapsed_seconds"],
+        "rows_per_second": report["rows_per_second"],
         "cutoff_date": cutoff_date.isoformat(),
     }
@@ -29,6 +29,7 @@ from app.core.security_questions import (
 )
 from app.services.google_auth import verify_google_token
 from app.services.audit_service import AuditService, AuditActions
+from app.services.login_throttle_service import LoginThrottleService
 from app.core.security import get_password_hash
 from datetime import datetime, UTC, timedelta
 
@@ -78,6 +79,35 @@ async def login_for_access_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # Limitar tentativas antes de buscar o usuário ou verificar o hash
+        client_ip = LoginThrottleService.client_ip(request)
+        try:
+            retry_after = LoginThrottleService.retry_after(
+                db, form_data.username, client_ip
+            )
+        except Exception as e:
+            logger.error(f"Erro ao consultar limite de tentativas: {str(e)}")
+            retry_after = None
+        if retry_after:
+            logger.warning(
+                f"Login bloqueado por excesso de tentativas: "
+                f"{form_data.username} ({client_ip})"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=(
+                    f"Muitas tentativas de login. Tente novamente em "
+                    f"{(retry_after + 59) // 60} minuto(s)"
+                ),
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        def record_failure():
+            try:
+                LoginThrottleService.record_failure(db, form_data.username, client_ip)
+            except Exception as e:
+                logger.error(f"Erro ao registrar tentativa de login: {str(e)}")
+
         # Tentar buscar por email primeiro, depois por username (para Master)
         user = None
         try:
@@ -105,6 +135,7 @@ async def login_for_access_token(
 
         if not user:
             logger.warning(f"Usuário não encontrado: {form_data.username}")
+            record_failure()
             # Registrar tentativa de login com credenciais inexistentes
             try:
                 AuditService.log_auth_action(
@@ -163,6 +194,7 @@ async def login_for_access_token(
                     logger.warning(
                         f"Usuário {user.email} não possui senha " f"configurada"
                     )
+                    record_failure()
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="Email ou senha incorretos",
@@ -191,6 +223,7 @@ async def login_for_access_token(
             )
 
         if not password_verified:
+            record_failure()
             # Registrar tentativa de login com senha incorreta
             try:
                 AuditService.log_auth_action(
@@ -215,7 +248,12 @@ async def login_for_access_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Login bem-sucedido - criar token de acesso
+        # Login bem-sucedido - zerar falhas do usuário e criar token de acesso
+        try:
+            LoginThrottleService.record_success(form_data.username)
+        except Exception as e:
+            logger.error(f"Erro ao zerar tentativas de login: {str(e)}")
+
         try:
             access_token = create_access_token(
                 data={"sub": user.email, "user_id": user.id, "role": user.role}
@@ -6,6 +6,9 @@ from app.dependencies import get_current_user
 from app.core.database import get_db
 from app.models.category import Category
 from app.models.user import User
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.category_cache_service import CategoryCacheService, CATEGORIES_TOPIC
+from app.services.subcategory_service import SubcategoryService
 from app.schemas.category_schema import (
     Category as CategorySchema,
     CategoryCreate,
@@ -47,6 +50,7 @@ async def create_category(
         is_default=False,
     )
     db.add(db_category)
+    CacheInvalidationService.publish(db, CATEGORIES_TOPIC)
     db.commit()
     db.refresh(db_category)
     return db_category
@@ -62,16 +66,21 @@ async def read_categories(
     Retorna todas as categorias disponíveis para o usuário
     (categorias padrão do sistema + categorias personalizadas do usuário)
     """
-    # Buscar categorias padrão do sistema e categorias personalizadas do usuário
+    # Categorias padrão vêm do cache em processo; apenas as do usuário vão ao banco
+    default_categories = CategoryCacheService.get_default_categories(
+        db, category_type
+    )
+
     query = db.query(Category).filter(
-        (Category.is_default == True) | (Category.user_id == current_user.id)
+        Category.user_id == current_user.id,
+        Category.is_default.isnot(True),
     )
 
     # Filtrar por tipo de categoria se fornecido
     if category_type:
         query = query.filter(Category.type == category_type)
 
-    return query.all()
+    return [*default_categories, *query.all()]
 
 
 @router.get("/{category_id}", response_model=CategorySchema)
@@ -83,6 +92,10 @@ async def read_category(
     """
     Retorna uma categoria específica
     """
+    cached_category = CategoryCacheService.get_default_category(db, category_id)
+    if cached_category is not None:
+        return cached_category
+
     db_category = (
         db.query(Category)
         .filter(
@@ -107,19 +120,19 @@ async def get_category_subcategories(
     """
     Retorna a lista de subcategorias de uma categoria específica
     """
-    db_category = (
-        db.query(Category)
-        .filter(
-            Category.id == category_id,
-            (Category.is_default == True) | (Category.user_id == current_user.id),
-        )
-        .first()
+    cached_category = CategoryCacheService.get_default_category(db, category_id)
+    if cached_category is not None:
+        return cached_category.subcategories or []
+
+    # Itens expandidos no próprio banco (json_each / JSONB), sem decodificar a lista
+    subcategories = SubcategoryService.list_subcategories(
+        db, category_id, current_user.id
     )
 
-    if db_category is None:
+    if subcategories is None:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
 
-    return db_category.subcategories or []
+    return subcategories
 
 
 @router.put("/{category_id}", response_model=CategorySchema)
@@ -155,6 +168,7 @@ async def update_category(
     for key, value in update_data.items():
         setattr(db_category, key, value)
 
+    CacheInvalidationService.publish(db, CATEGORIES_TOPIC)
     db.commit()
     db.refresh(db_category)
 
@@ -194,6 +208,7 @@ async def patch_category(
     for key, value in update_data.items():
         setattr(db_category, key, value)
 
+    CacheInvalidationService.publish(db, CATEGORIES_TOPIC)
     db.commit()
     db.refresh(db_category)
 
@@ -226,6 +241,7 @@ async def delete_category(
         )
 
     db.delete(db_category)
+    CacheInvalidationService.publish(db, CATEGORIES_TOPIC)
     db.commit()
 
     return {"message": "Categoria removida com sucesso"}
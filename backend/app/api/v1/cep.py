@@ -1,9 +1,12 @@
 """Endpoints para consulta de CEP e autocompletar endereço."""
 
-from fastapi import APIRouter, HTTPException, Depends
+from collections import Counter
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
 from typing import Dict, Any
+from app.services.cep_backfill_service import CEPBackfillService
 from app.services.cep_service import CEPService
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_admin
+from app.schemas.cep_schema import CEPBatchRequest, CEPBatchResponse
 from app.schemas.user_schema import UserInDB
 import logging
 
@@ -96,3 +99,60 @@ async def validate_cep(
         raise HTTPException(
             status_code=500, detail="Erro interno do servidor ao validar CEP"
         )
+
+
+@router.post("/batch", response_model=CEPBatchResponse)
+async def resolve_ceps_batch(
+    payload: CEPBatchRequest, current_user: UserInDB = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """Consulta vários CEPs de uma vez (limpeza de dados e importação em massa).
+
+    CEPs repetidos são consultados uma única vez, acertos de cache voltam na
+    hora e as demais consultas rodam em paralelo com concorrência limitada.
+
+    Args:
+        payload: Lista de CEPs (até CEP_BATCH_MAX_SIZE)
+        current_user: Administrador autenticado
+
+    Returns:
+        Um resultado por CEP, na ordem enviada, com status individual
+    """
+    logger.info(
+        f"Usuário {current_user.username} consultando {len(payload.ceps)} CEPs em lote"
+    )
+    results = await CEPService.resolve_many(payload.ceps)
+    summary = dict(Counter(item["status"] for item in results))
+
+    return {
+        "success": True,
+        "data": results,
+        "summary": summary,
+        "message": f"{summary.get('found', 0)} de {len(results)} CEPs encontrados",
+    }
+
+
+@router.post("/backfill-users", status_code=status.HTTP_202_ACCEPTED)
+async def backfill_user_addresses(
+    background_tasks: BackgroundTasks,
+    current_user: UserInDB = Depends(get_current_admin),
+) -> Dict[str, Any]:
+    """Agenda o preenchimento de endereços incompletos a partir do CEP.
+
+    Completa logradouro, bairro, cidade e UF vazios de usuários que já têm
+    CEP cadastrado. Roda em segundo plano; o resultado vai para o log.
+
+    Args:
+        background_tasks: Tarefas executadas após a resposta
+        current_user: Administrador autenticado
+
+    Returns:
+        Confirmação do agendamento
+    """
+    logger.info(f"Usuário {current_user.username} agendou backfill de endereços")
+    background_tasks.add_task(CEPBackfillService.backfill_user_addresses)
+
+    return {
+        "success": True,
+        "data": None,
+        "message": "Preenchimento de endereços agendado",
+    }
@@ -1,31 +1,156 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
 from app.dependencies import get_current_user
 from app.core.database import get_db
 from app.models.entry import Entry, EntryType
 from app.models.user import User
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.driver_analytics_service import DriverAnalyticsService, ENTRIES_TOPIC
+from app.services.earnings_sketch_service import EarningsSketchService
+from app.services.entry_bulk_service import EntryBulkService
+from app.services.entry_update_service import EntryUpdateService
+from app.services.idempotency_service import IdempotencyKeyMismatch, IdempotencyService
+from app.services.profitability_service import ProfitabilityService
+from app.services.subcategory_service import SubcategoryService
 from app.schemas.entry_schema import (
     EntryInDB as EntrySchema, EntryCreate, EntryUpdate,
-    EntrySummary, CategoryDistribution, CategoryDistributionList
+    EntrySummary, CategoryDistribution, CategoryDistributionList,
+    EntryFilters, EntryBulkDelete, EntryBulkUpdate, EntryBulkResult,
 )
 
 router = APIRouter(prefix="/entries", tags=["lançamentos financeiros"])
 
 
+# Filtros de data como intervalos sobre a coluna (sem date()), para que os
+# índices (user_id, date) e (user_id, type, date) cubram o período
+def _date_from(start_date: date):
+    return Entry.date >= datetime.combine(start_date, time.min)
+
+
+def _date_until(end_date: date):
+    return Entry.date < datetime.combine(end_date + timedelta(days=1), time.min)
+
+
+def _entry_filters(filters: EntryFilters) -> list:
+    """Condições dos filtros opcionais de GET /entries (também usadas nas operações em massa)."""
+    conditions = []
+    if filters.start_date:
+        conditions.append(_date_from(filters.start_date))
+    if filters.end_date:
+        conditions.append(_date_until(filters.end_date))
+    if filters.type:
+        conditions.append(Entry.type == filters.type)
+    if filters.category:
+        conditions.append(Entry.category == filters.category)
+    if filters.search:
+        conditions.append(
+            or_(
+                Entry.description.ilike(f"%{filters.search}%"),
+                Entry.category.ilike(f"%{filters.search}%"),
+                Entry.subcategory.ilike(f"%{filters.search}%"),
+            )
+        )
+    if filters.platform:
+        conditions.append(Entry.platform == filters.platform)
+    if filters.shift_tag:
+        conditions.append(Entry.shift_tag == filters.shift_tag)
+    if filters.city:
+        conditions.append(Entry.city == filters.city)
+    return conditions
+
+
+def _ensure_valid_subcategory(
+    db: Session,
+    user_id: str,
+    category: Optional[str],
+    subcategory: Optional[str],
+    entry_type: Optional[str],
+):
+    """Rejeita subcategorias que não pertencem à categoria (verificação feita em SQL)."""
+    if not category or not subcategory:
+        return
+    if not SubcategoryService.is_valid_subcategory(
+        db, user_id, category, subcategory, entry_type
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Subcategoria inválida para a categoria informada",
+        )
+
+
+def _apply_entry_update(
+    db: Session, current_user: User, entry_id: str, entry_update: EntryUpdate
+) -> dict:
+    """Caminho comum de PUT e PATCH: um UPDATE ... RETURNING e o commit."""
+    update_data = entry_update.model_dump(exclude_unset=True)
+    entry = EntryUpdateService.update(db, current_user.id, entry_id, update_data)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Lançamento não encontrado")
+
+    if {'category', 'subcategory', 'type'}.intersection(update_data.keys()):
+        # Validada sobre a linha retornada (valores novos ou atuais); inválida desfaz a edição
+        try:
+            _ensure_valid_subcategory(
+                db, current_user.id, entry['category'], entry['subcategory'], entry['type']
+            )
+        except HTTPException:
+            db.rollback()
+            raise
+
+    CacheInvalidationService.publish(db, ENTRIES_TOPIC, current_user.id)
+    db.commit()
+    return entry
+
+
+def _replayed_response(
+    db: Session, user_id: str, idempotency_key: str, request_hash: str
+) -> Optional[JSONResponse]:
+    """Resposta guardada para a Idempotency-Key (None se a chave é nova)."""
+    try:
+        stored = IdempotencyService.lookup(db, user_id, idempotency_key, request_hash)
+    except IdempotencyKeyMismatch:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key já utilizada com outro conteúdo",
+        )
+    if stored is None:
+        return None
+    status_code, body = stored
+    return JSONResponse(
+        status_code=status_code, content=body, headers={"Idempotent-Replayed": "true"}
+    )
+
+
 @router.post("/", response_model=EntrySchema, status_code=status.HTTP_201_CREATED)
 async def create_entry(
     entry: EntryCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
 ):
     """
     Cria um novo lançamento financeiro
+
+    Com o cabeçalho Idempotency-Key, repetições da mesma requisição devolvem a
+    resposta da primeira criação sem inserir outro lançamento.
     """
+    request_hash = None
+    if idempotency_key:
+        request_hash = IdempotencyService.request_hash(entry.model_dump(mode="json"))
+        replayed = _replayed_response(db, current_user.id, idempotency_key, request_hash)
+        if replayed is not None:
+            return replayed
+
     data = entry.model_dump()
+    _ensure_valid_subcategory(
+        db, current_user.id, data.get('category'), data.get('subcategory'), data.get('type')
+    )
     # Se for uma corrida (INCOME com gross_amount) e net_amount não enviado, calcular
     if data.get('type') == 'INCOME':
         gross = data.get('gross_amount')
@@ -41,9 +166,81 @@ async def create_entry(
         user_id=current_user.id,
     )
     db.add(db_entry)
-    db.commit()
+    CacheInvalidationService.publish(db, ENTRIES_TOPIC, current_user.id)
+    if not idempotency_key:
+        db.commit()
+        db.refresh(db_entry)
+        return db_entry
+
+    # A resposta é gravada com a chave na mesma transação do lançamento
+    db.flush()
     db.refresh(db_entry)
-    return db_entry
+    body = EntrySchema.model_validate(db_entry).model_dump(mode="json")
+    IdempotencyService.store(
+        db, current_user.id, idempotency_key, request_hash, status.HTTP_201_CREATED, body
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # Tentativa concorrente com a mesma chave gravou primeiro: desfaz esta
+        db.rollback()
+        replayed = _replayed_response(db, current_user.id, idempotency_key, request_hash)
+        if replayed is None:
+            raise
+        return replayed
+    return body
+
+
+@router.post("/bulk-delete", response_model=EntryBulkResult)
+async def bulk_delete_entries(
+    request: EntryBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Marca como excluídos (soft delete) os lançamentos informados por ids ou filtros
+    """
+    report = EntryBulkService.soft_delete(
+        db,
+        current_user.id,
+        ids=request.ids,
+        criteria=_entry_filters(request.filters) if request.filters else None,
+    )
+    if report["affected_count"]:
+        CacheInvalidationService.publish(db, ENTRIES_TOPIC, current_user.id)
+    db.commit()
+    return report
+
+
+@router.post("/bulk-update", response_model=EntryBulkResult)
+async def bulk_update_entries(
+    request: EntryBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Altera campos de classificação dos lançamentos informados por ids ou filtros
+    """
+    changes = request.changes.model_dump(exclude_unset=True)
+    if "category" in changes:
+        _ensure_valid_subcategory(
+            db,
+            current_user.id,
+            changes["category"],
+            changes["subcategory"],
+            request.filters.type if request.filters else None,
+        )
+    report = EntryBulkService.update(
+        db,
+        current_user.id,
+        changes,
+        ids=request.ids,
+        criteria=_entry_filters(request.filters) if request.filters else None,
+    )
+    if report["affected_count"]:
+        CacheInvalidationService.publish(db, ENTRIES_TOPIC, current_user.id)
+    db.commit()
+    return report
 
 
 @router.get("/", response_model=List[EntrySchema])
@@ -67,36 +264,19 @@ async def read_entries(
     query = db.query(Entry).filter(
         Entry.user_id == current_user.id,
         Entry.is_deleted.is_(False),
-    )
-
-    # Aplicar filtros se fornecidos
-    if start_date:
-        query = query.filter(func.date(Entry.date) >= start_date)
-
-    if end_date:
-        query = query.filter(func.date(Entry.date) <= end_date)
-
-    if type:
-        query = query.filter(Entry.type == type)  # Alterado de entry_type para type
-
-    if category:
-        query = query.filter(Entry.category == category)
-
-    if search:
-        query = query.filter(
-            or_(
-                Entry.description.ilike(f"%{search}%"),
-                Entry.category.ilike(f"%{search}%"),
-                Entry.subcategory.ilike(f"%{search}%"),
+        *_entry_filters(
+            EntryFilters(
+                start_date=start_date,
+                end_date=end_date,
+                type=type,
+                category=category,
+                search=search,
+                platform=platform,
+                shift_tag=shift_tag,
+                city=city,
             )
-        )
-
-    if platform:
-        query = query.filter(Entry.platform == platform)
-    if shift_tag:
-        query = query.filter(Entry.shift_tag == shift_tag)
-    if city:
-        query = query.filter(Entry.city == city)
+        ),
+    )
 
     # Ordenar por data (mais recente primeiro)
     query = query.order_by(Entry.date.desc())
@@ -120,10 +300,10 @@ async def get_entries_summary(
     ]
 
     if start_date:
-        query_filters.append(func.date(Entry.date) >= start_date)
+        query_filters.append(_date_from(start_date))
 
     if end_date:
-        query_filters.append(func.date(Entry.date) <= end_date)
+        query_filters.append(_date_until(end_date))
 
     # Calcular total de receitas
     income_total = db.query(func.sum(Entry.amount)).filter(
@@ -183,8 +363,8 @@ async def get_monthly_summary(
     query_filters = [
         Entry.user_id == current_user.id,
         Entry.is_deleted.is_(False),
-        func.date(Entry.date) >= start_date,
-        func.date(Entry.date) <= end_date
+        _date_from(start_date),
+        _date_until(end_date),
     ]
 
     # Calcular total de receitas
@@ -235,9 +415,9 @@ async def get_category_distribution(
         Entry.is_deleted.is_(False),
     ]
     if start_date:
-        query_filters.append(func.date(Entry.date) >= start_date)
+        query_filters.append(_date_from(start_date))
     if end_date:
-        query_filters.append(func.date(Entry.date) <= end_date)
+        query_filters.append(_date_until(end_date))
     if type:
         query_filters.append(Entry.type == type)
 
@@ -283,9 +463,9 @@ async def get_daily_metrics(
     """Métricas agregadas por dia (ganho bruto, taxa, líquido, km, horas)."""
     filters = [Entry.user_id == current_user.id, Entry.is_deleted.is_(False), Entry.type == EntryType.INCOME]
     if start_date:
-        filters.append(func.date(Entry.date) >= start_date)
+        filters.append(_date_from(start_date))
     if end_date:
-        filters.append(func.date(Entry.date) <= end_date)
+        filters.append(_date_until(end_date))
     if platform:
         filters.append(Entry.platform == platform)
 
@@ -375,6 +555,77 @@ async def get_monthly_metrics(
     return {'year': year, 'items': result, 'count': len(result)}
 
 
+@router.get("/metrics/heatmap")
+async def get_heatmap_metrics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    platform: Optional[str] = None,
+):
+    """Heatmap dia da semana × hora do dia (ganho por hora e por km)."""
+    return DriverAnalyticsService.heatmap(
+        db, current_user.id, start_date, end_date, platform
+    )
+
+
+@router.get("/metrics/platforms")
+async def get_platform_metrics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Comparação entre plataformas e divisão por turno e cidade."""
+    return DriverAnalyticsService.platforms(db, current_user.id, start_date, end_date)
+
+
+@router.get("/metrics/percentiles")
+async def get_earnings_percentiles(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    q: List[float] = Query([0.5, 0.9]),
+):
+    """Percentis (padrão: mediana e p90) do ganho por corrida, por km e por hora."""
+    if not q or any(not 0 <= value <= 1 for value in q):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Os quantis devem estar entre 0 e 1",
+        )
+    return EarningsSketchService.percentiles(
+        db, current_user.id, start_month, end_month, q
+    )
+
+
+@router.get("/profitability")
+async def get_profitability(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    granularity: str = Query("month", pattern="^(day|month)$"),
+    only_trip_expenses: bool = False,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Lucro real por período e por corrida: líquido menos despesas vinculadas
+    (linked_entry_id) e rateio por km das despesas não vinculadas do período
+    """
+    return ProfitabilityService.report(
+        db,
+        current_user.id,
+        start_date,
+        end_date,
+        granularity,
+        only_trip_expenses,
+        limit,
+        offset,
+    )
+
+
 @router.get("/{entry_id}", response_model=EntrySchema)
 async def read_entry(
     entry_id: str,
@@ -406,34 +657,7 @@ async def update_entry(
     """
     Atualiza um lançamento financeiro
     """
-    db_entry = db.query(Entry).filter(
-        Entry.id == entry_id,
-        Entry.user_id == current_user.id,
-        Entry.is_deleted.is_(False),
-    ).first()
-
-    if db_entry is None:
-        raise HTTPException(status_code=404, detail="Lançamento não encontrado")
-
-    update_data = entry_update.model_dump(exclude_unset=True)
-    # Recalcular net_amount se campos relevantes alterados
-    fields_trigger = {'gross_amount', 'platform_fee', 'tips_amount'}
-    if fields_trigger.intersection(update_data.keys()) and db_entry.type == EntryType.INCOME:
-        gross = update_data.get('gross_amount', getattr(db_entry, 'gross_amount', None))
-        fee = update_data.get('platform_fee', getattr(db_entry, 'platform_fee', 0)) or 0
-        tips = update_data.get('tips_amount', getattr(db_entry, 'tips_amount', 0)) or 0
-        if gross is not None:
-            update_data['net_amount'] = (gross + tips) - fee
-            # Ajustar amount se parecer ser antigo bruto
-            if 'amount' not in update_data and getattr(db_entry, 'amount', None) in (gross, None):
-                update_data['amount'] = update_data['net_amount']
-    for key, value in update_data.items():
-        setattr(db_entry, key, value)
-
-    db.commit()
-    db.refresh(db_entry)
-
-    return db_entry
+    return _apply_entry_update(db, current_user, entry_id, entry_update)
 
 
 @router.patch("/{entry_id}", response_model=EntrySchema)
@@ -446,32 +670,7 @@ async def update_entry_patch(
     """
     Atualiza parcialmente um lançamento financeiro
     """
-    db_entry = db.query(Entry).filter(
-        Entry.id == entry_id,
-        Entry.user_id == current_user.id,
-        Entry.is_deleted.is_(False),
-    ).first()
-
-    if db_entry is None:
-        raise HTTPException(status_code=404, detail="Lançamento não encontrado")
-
-    update_data = entry_update.model_dump(exclude_unset=True)
-    fields_trigger = {'gross_amount', 'platform_fee', 'tips_amount'}
-    if fields_trigger.intersection(update_data.keys()) and db_entry.type == EntryType.INCOME:
-        gross = update_data.get('gross_amount', getattr(db_entry, 'gross_amount', None))
-        fee = update_data.get('platform_fee', getattr(db_entry, 'platform_fee', 0)) or 0
-        tips = update_data.get('tips_amount', getattr(db_entry, 'tips_amount', 0)) or 0
-        if gross is not None:
-            update_data['net_amount'] = (gross + tips) - fee
-            if 'amount' not in update_data and getattr(db_entry, 'amount', None) in (gross, None):
-                update_data['amount'] = update_data['net_amount']
-    for key, value in update_data.items():
-        setattr(db_entry, key, value)
-
-    db.commit()
-    db.refresh(db_entry)
-
-    return db_entry
+    return _apply_entry_update(db, current_user, entry_id, entry_update)
 
 
 @router.delete("/{entry_id}", status_code=status.HTTP_200_OK)
@@ -494,6 +693,7 @@ async def delete_entry(
 
     # Soft delete
     db_entry.is_deleted = True  # type: ignore
+    CacheInvalidationService.publish(db, ENTRIES_TOPIC, current_user.id)
     db.commit()
 
     return {"message": "Lançamento removido com sucesso"}
@@ -0,0 +1,153 @@
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_current_user
+from app.core.database import get_db
+from app.models.recurring_rule import RecurringRule
+from app.models.user import User
+from app.services.recurring_entry_service import first_occurrence_on_or_after
+from app.services.subcategory_service import SubcategoryService
+from app.schemas.recurring_rule_schema import (
+    RecurringRule as RecurringRuleSchema,
+    RecurringRuleCreate,
+    RecurringRuleUpdate,
+)
+
+router = APIRouter(prefix="/recurring-rules", tags=["recorrências"])
+
+# Campos que mudam a agenda e exigem recalcular a marca d'água
+SCHEDULE_FIELDS = {"frequency", "interval", "start_date", "end_date"}
+
+
+def _get_rule(db: Session, rule_id: str, user_id: str) -> RecurringRule:
+    rule = (
+        db.query(RecurringRule)
+        .filter(RecurringRule.id == rule_id, RecurringRule.user_id == user_id)
+        .first()
+    )
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Regra recorrente não encontrada",
+        )
+    return rule
+
+
+def _ensure_valid_subcategory(db: Session, user_id: str, rule: RecurringRule):
+    """Mesma regra dos lançamentos: a subcategoria precisa pertencer à categoria."""
+    if not rule.category or not rule.subcategory:
+        return
+    if not SubcategoryService.is_valid_subcategory(
+        db, user_id, rule.category, rule.subcategory, rule.type
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Subcategoria inválida para a categoria informada",
+        )
+
+
+@router.post("/", response_model=RecurringRuleSchema, status_code=status.HTTP_201_CREATED)
+async def create_recurring_rule(
+    rule: RecurringRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Cria uma regra recorrente; as ocorrências são geradas pelo agendador
+    a partir de start_date (inclusive as já vencidas)
+    """
+    db_rule = RecurringRule(
+        **rule.model_dump(),
+        user_id=current_user.id,
+        next_run_date=rule.start_date,
+    )
+    _ensure_valid_subcategory(db, current_user.id, db_rule)
+    db.add(db_rule)
+    db.commit()
+    db.refresh(db_rule)
+    return db_rule
+
+
+@router.get("/", response_model=List[RecurringRuleSchema])
+async def read_recurring_rules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retorna as regras recorrentes do usuário
+    """
+    return (
+        db.query(RecurringRule)
+        .filter(RecurringRule.user_id == current_user.id)
+        .order_by(RecurringRule.created_at)
+        .all()
+    )
+
+
+@router.get("/{rule_id}", response_model=RecurringRuleSchema)
+async def read_recurring_rule(
+    rule_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retorna uma regra recorrente do usuário
+    """
+    return _get_rule(db, rule_id, current_user.id)
+
+
+@router.put("/{rule_id}", response_model=RecurringRuleSchema)
+async def update_recurring_rule(
+    rule_id: str,
+    rule_update: RecurringRuleUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Atualiza uma regra recorrente. Lançamentos já gerados não são alterados;
+    mudanças na agenda valem para as ocorrências a partir de hoje, assim como
+    a reativação (o período pausado não é gerado retroativamente)
+    """
+    db_rule = _get_rule(db, rule_id, current_user.id)
+    changes = rule_update.model_dump(exclude_unset=True)
+    reactivated = changes.get("is_active") is True and not db_rule.is_active
+    for field, value in changes.items():
+        setattr(db_rule, field, value)
+
+    if db_rule.end_date is not None and db_rule.end_date < db_rule.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date deve ser posterior a start_date",
+        )
+    if {"category", "subcategory"} & changes.keys():
+        _ensure_valid_subcategory(db, current_user.id, db_rule)
+    if SCHEDULE_FIELDS & changes.keys() or reactivated:
+        db_rule.next_run_date = first_occurrence_on_or_after(
+            db_rule.start_date,
+            db_rule.frequency,
+            db_rule.interval,
+            max(db_rule.start_date, date.today()),
+            db_rule.end_date,
+        )
+
+    db.commit()
+    db.refresh(db_rule)
+    return db_rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_rule(
+    rule_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Remove a regra; os lançamentos já gerados são mantidos
+    """
+    db_rule = _get_rule(db, rule_id, current_user.id)
+    db.delete(db_rule)
+    db.commit()
+    return None
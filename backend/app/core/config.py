@@ -24,7 +24,25 @@ class Settings(BaseModel):
     SMTP_USERNAME: str = os.getenv("SMTP_USERNAME", "")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
     FROM_EMAIL: str = os.getenv("FROM_EMAIL", "noreply@autonomocontrol.com")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", "2"))
+    # Fila de emails (tabela email_outbox) enviada em segundo plano
+    EMAIL_QUEUE_ENABLED: bool = os.getenv("EMAIL_QUEUE_ENABLED", "true").lower() == "true"
+    EMAIL_QUEUE_POLL_SECONDS: float = float(os.getenv("EMAIL_QUEUE_POLL_SECONDS", "2"))
+    EMAIL_QUEUE_BATCH_SIZE: int = int(os.getenv("EMAIL_QUEUE_BATCH_SIZE", "50"))
+    EMAIL_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "6"))
+    EMAIL_QUEUE_BACKOFF_SECONDS: float = float(os.getenv("EMAIL_QUEUE_BACKOFF_SECONDS", "30"))
+    # Mensagens não enviadas neste prazo são descartadas (mesma validade da senha temporária)
+    EMAIL_QUEUE_MESSAGE_TTL_HOURS: float = float(os.getenv("EMAIL_QUEUE_MESSAGE_TTL_HOURS", "24"))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Limite de tentativas de login (max_login_attempts/lockout_duration_minutes do
+    # SystemConfig). Backend "memory" (por processo) ou "database" (compartilhado)
+    LOGIN_THROTTLE_ENABLED: bool = os.getenv("LOGIN_THROTTLE_ENABLED", "true").lower() == "true"
+    LOGIN_THROTTLE_BACKEND: str = os.getenv("LOGIN_THROTTLE_BACKEND", "memory")
+    # Limite por IP = max_login_attempts * fator (vários usuários atrás de um NAT)
+    LOGIN_THROTTLE_IP_FACTOR: int = int(os.getenv("LOGIN_THROTTLE_IP_FACTOR", "4"))
+    # Usar X-Forwarded-For como IP do cliente (somente atrás de proxy confiável)
+    LOGIN_THROTTLE_TRUST_PROXY: bool = os.getenv("LOGIN_THROTTLE_TRUST_PROXY", "false").lower() == "true"
 
     # Configuração Google OAuth2 (será implementada posteriormente)
     GOOGLE_CLIENT_ID: Optional[str] = os.getenv("GOOGLE_CLIENT_ID")
@@ -32,11 +50,67 @@ class Settings(BaseModel):
     GOOGLE_REDIRECT_URI: Optional[str] = os.getenv(
         "GOOGLE_REDIRECT_URI", "http://localhost:8000/api/v1/auth/google/callback"
     )
+    # Certificados de assinatura dos ID tokens (mantidos em cache conforme o max-age)
+    GOOGLE_CERTS_URL: str = os.getenv(
+        "GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"
+    )
 
     # Admin / Master control
     MASTER_EMAIL: Optional[str] = os.getenv("MASTER_EMAIL")
     MASTER_PASSWORD: Optional[str] = os.getenv("MASTER_PASSWORD")
 
+    # Retenção de logs de auditoria (prazo definido por log_retention_days no SystemConfig).
+    # Desligada por padrão: remove logs de forma irreversível
+    AUDIT_RETENTION_ENABLED: bool = os.getenv("AUDIT_RETENTION_ENABLED", "false").lower() == "true"
+    AUDIT_RETENTION_INTERVAL_HOURS: float = float(os.getenv("AUDIT_RETENTION_INTERVAL_HOURS", "24"))
+    AUDIT_RETENTION_CHUNK_SIZE: int = int(os.getenv("AUDIT_RETENTION_CHUNK_SIZE", "1000"))
+    AUDIT_ARCHIVE_DIR: Optional[str] = os.getenv("AUDIT_ARCHIVE_DIR") or None
+
+    # Remoção definitiva dos lançamentos excluídos (soft delete) após a carência.
+    # Desligada por padrão: apaga dados de forma irreversível
+    ENTRY_PURGE_ENABLED: bool = os.getenv("ENTRY_PURGE_ENABLED", "false").lower() == "true"
+    ENTRY_PURGE_GRACE_DAYS: int = int(os.getenv("ENTRY_PURGE_GRACE_DAYS", "30"))
+    ENTRY_PURGE_INTERVAL_HOURS: float = float(os.getenv("ENTRY_PURGE_INTERVAL_HOURS", "24"))
+    ENTRY_PURGE_CHUNK_SIZE: int = int(os.getenv("ENTRY_PURGE_CHUNK_SIZE", "1000"))
+    # Se definido, as linhas são arquivadas (NDJSON comprimido) antes da remoção
+    ENTRY_ARCHIVE_DIR: Optional[str] = os.getenv("ENTRY_ARCHIVE_DIR") or None
+
+    # Materialização das regras de lançamentos recorrentes (tabela recurring_rules)
+    RECURRING_ENTRIES_ENABLED: bool = os.getenv("RECURRING_ENTRIES_ENABLED", "true").lower() == "true"
+    RECURRING_ENTRIES_INTERVAL_MINUTES: float = float(os.getenv("RECURRING_ENTRIES_INTERVAL_MINUTES", "60"))
+    RECURRING_ENTRIES_BATCH_SIZE: int = int(os.getenv("RECURRING_ENTRIES_BATCH_SIZE", "1000"))
+
+    # Invalidação de caches em memória entre workers (tabela cache_invalidations)
+    CACHE_INVALIDATION_ENABLED: bool = os.getenv("CACHE_INVALIDATION_ENABLED", "true").lower() == "true"
+    # Defasagem máxima dos caches de outros workers
+    CACHE_INVALIDATION_POLL_SECONDS: float = float(os.getenv("CACHE_INVALIDATION_POLL_SECONDS", "1"))
+    CACHE_INVALIDATION_RETENTION_MINUTES: float = float(os.getenv("CACHE_INVALIDATION_RETENTION_MINUTES", "10"))
+    # Diretório dos sockets Unix de aviso entre workers do mesmo host (opcional)
+    CACHE_INVALIDATION_SOCKET_DIR: Optional[str] = os.getenv("CACHE_INVALIDATION_SOCKET_DIR") or None
+
+    # Cabeçalho Idempotency-Key em POST /entries/ (tabela idempotency_keys)
+    IDEMPOTENCY_KEY_TTL_HOURS: float = float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    IDEMPOTENCY_SWEEP_ENABLED: bool = os.getenv("IDEMPOTENCY_SWEEP_ENABLED", "true").lower() == "true"
+    IDEMPOTENCY_SWEEP_INTERVAL_MINUTES: float = float(os.getenv("IDEMPOTENCY_SWEEP_INTERVAL_MINUTES", "60"))
+    IDEMPOTENCY_SWEEP_CHUNK_SIZE: int = int(os.getenv("IDEMPOTENCY_SWEEP_CHUNK_SIZE", "1000"))
+
+    # Consulta de CEP (ViaCEP) e cache em dois níveis (memória + tabela cep_cache)
+    VIACEP_BASE_URL: str = os.getenv("VIACEP_BASE_URL", "https://viacep.com.br/ws")
+    CEP_CACHE_TTL_DAYS: int = int(os.getenv("CEP_CACHE_TTL_DAYS", "30"))
+    CEP_NEGATIVE_CACHE_TTL_HOURS: int = int(os.getenv("CEP_NEGATIVE_CACHE_TTL_HOURS", "24"))
+    CEP_MEMORY_CACHE_SIZE: int = int(os.getenv("CEP_MEMORY_CACHE_SIZE", "10000"))
+    # Base offline gerada por scripts/utils/build_cep_index.py (opcional)
+    CEP_OFFLINE_DATASET: Optional[str] = os.getenv("CEP_OFFLINE_DATASET") or None
+    # Consulta em lote (POST /cep/batch e backfill de endereços)
+    CEP_BATCH_MAX_SIZE: int = int(os.getenv("CEP_BATCH_MAX_SIZE", "100"))
+    CEP_BATCH_CONCURRENCY: int = int(os.getenv("CEP_BATCH_CONCURRENCY", "8"))
+
+    # Métricas no formato Prometheus em GET /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # /metrics só é servido com um token, enviado em "Authorization: Bearer <token>";
+    # sem ele a coleta continua, mas a rota responde 404
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN") or None
+
 
 # Instância global de configurações
 settings = Settings()
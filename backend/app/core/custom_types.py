@@ -1,21 +1,28 @@
-from sqlalchemy import types
+from sqlalchemy import types, func, case
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.schema import Column
 import json
 
 
-class SQLiteListType(types.TypeDecorator):
+class JSONListType(types.TypeDecorator):
     """
-    Tipo personalizado que salva listas como texto delimitado em SQLite
-    mas mantém o comportamento normal de ARRAY no PostgreSQL
+    Tipo personalizado para listas armazenadas como JSON, ciente do dialeto:
+    texto JSON no SQLite (consultável com json_each) e JSONB no PostgreSQL
+    (indexável com GIN)
     """
 
     impl = types.Text
     cache_ok = True
 
     def __init__(self, item_type=None):
-        super(SQLiteListType, self).__init__()
+        super(JSONListType, self).__init__()
         self.item_type = item_type
 
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(types.Text())
+
     def process_bind_param(self, value, dialect):
         """
         Converte o valor para uma representação que pode ser armazenada no banco
@@ -27,7 +34,7 @@ class SQLiteListType(types.TypeDecorator):
         if dialect.name == "sqlite":
             return json.dumps(value)
 
-        # Para PostgreSQL, retorna o valor normalmente (será tratado como ARRAY)
+        # Para PostgreSQL, retorna a lista (serializada pelo próprio JSONB)
         return value
 
     def process_result_value(self, value, dialect):
@@ -40,9 +47,32 @@ class SQLiteListType(types.TypeDecorator):
         # Para SQLite, converte a string JSON de volta para lista
         if dialect.name == "sqlite":
             try:
-                return json.loads(value)
+                value = json.loads(value)
             except (ValueError, TypeError):
                 return []
+            return value if isinstance(value, list) else []
 
         # Para PostgreSQL, retorna o valor normalmente (já vem como lista)
         return value
+
+
+# Nome mantido por compatibilidade com migrações e código legado
+SQLiteListType = JSONListType
+
+
+def list_elements(column, dialect_name: str):
+    """
+    Expande uma coluna JSONListType em linhas (value, key) dentro do banco.
+
+    Usa json_each no SQLite e jsonb_array_elements_text no PostgreSQL, de modo
+    que filtros e listagens sobre os itens não precisem decodificar a lista
+    inteira em Python. ``key`` preserva a ordem original dos itens.
+    """
+    if dialect_name == "postgresql":
+        return func.jsonb_array_elements_text(column).table_valued(
+            "value", with_ordinality="key"
+        )
+    # Valores legados inválidos viram NULL para não quebrar o json_each
+    return func.json_each(case((func.json_valid(column) == 1, column))).table_valued(
+        "value", "key"
+    )
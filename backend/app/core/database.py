@@ -18,10 +18,13 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./autonomo_control.db")
 
 # Criar engine com configurações otimizadas (Solução A1)
 if DATABASE_URL.startswith("sqlite"):
+    # StaticPool compartilha uma única conexão entre todas as threads: só faz
+    # sentido para banco em memória. Com arquivo, cada requisição concorrente
+    # precisa da sua conexão (senão o commit falha com comandos em andamento).
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        poolclass=StaticPool if ":memory:" in DATABASE_URL else None,
         echo=False,  # Desabilitado para reduzir logs em produção
         pool_pre_ping=True,  # Verificar conexões antes de usar
         pool_recycle=3600,  # Reciclar conexões a cada hora
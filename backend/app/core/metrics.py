@@ -0,0 +1,408 @@
+"""Métricas da aplicação no formato texto do Prometheus.
+
+Implementação própria e sem dependências: contadores, gauges e histogramas
+com rótulos, guardados em dicionários protegidos por lock. O custo por
+requisição é algumas observações em memória, o que permite manter a coleta
+ligada em produção; a renderização só acontece quando ``/metrics`` é lido.
+
+Fontes instrumentadas:
+- ``MetricsMiddleware``: latência, status e requisições em andamento por rota
+  (o rótulo é o template da rota, ex. ``/api/v1/entries/{entry_id}``)
+- ``instrument_engine``: consultas SQL por rota e espera no pool de conexões
+- ``record_cache``: acertos e faltas dos caches em processo
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LabelValues = Tuple[str, ...]
+
+# Buckets de latência em segundos (mesmos padrões do cliente oficial)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+KNOWN_METHODS = frozenset(
+    ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Linhas no formato texto, com o cabeçalho HELP/TYPE."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Descarta os valores coletados."""
+
+
+class Counter(_Metric):
+    """Valor acumulado que só cresce."""
+
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def items(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    """Valor instantâneo; pode ser calculado na leitura via ``collect``."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        collect: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.collect = collect
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def values(self) -> Dict[LabelValues, float]:
+        if self.collect is not None:
+            return self.collect()
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self.values().items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Distribuição em buckets fixos, com soma e contagem."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # rótulos -> [contagens por bucket (não acumuladas) + overflow, soma, total]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self, labels: LabelValues = ()) -> Optional[Tuple[List[int], float, int]]:
+        """Retorna (contagens acumuladas por bucket, soma, total)."""
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                return None
+            counts, total_sum, count = list(entry[0]), entry[1], entry[2]
+        cumulative, running = [], 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total_sum, count
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            keys = sorted(self._values)
+        bucket_names = self.labelnames + ("le",)
+        for labels in keys:
+            cumulative, total_sum, count = self.snapshot(labels)
+            for bound, value in zip(self.buckets + (float("inf"),), cumulative):
+                label_str = _format_labels(bucket_names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{label_str} {value}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total_sum)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Conjunto de métricas renderizadas juntas em ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Zera os valores acumulados (usado em testes e benchmarks)."""
+        for metric in self._metrics:
+            metric.clear()
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+
+class _RequestState:
+    """Estado de uma requisição em andamento, compartilhado com as threads do endpoint."""
+
+    __slots__ = ("scope", "method", "queries")
+
+    def __init__(self, scope, method: str):
+        self.scope = scope
+        self.method = method
+        self.queries = 0
+
+
+_current_request: ContextVar[Optional[_RequestState]] = ContextVar(
+    "metrics_current_request", default=None
+)
+_active_requests: Dict[int, _RequestState] = {}
+
+
+def route_label(scope) -> str:
+    """Template da rota resolvida; ``unmatched`` para caminhos sem rota."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "unmatched"
+
+
+def _collect_in_progress() -> Dict[LabelValues, float]:
+    counts: Dict[LabelValues, float] = {}
+    for state in list(_active_requests.values()):
+        key = (state.method, route_label(state.scope))
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Requisições HTTP por rota e status", ("method", "route", "status")
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP", ("method", "route")
+)
+HTTP_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    ("method", "route"),
+    collect=_collect_in_progress,
+)
+DB_QUERIES = registry.counter(
+    "db_queries_total", "Consultas SQL executadas por rota", ("route",)
+)
+DB_QUERY_LATENCY = registry.histogram(
+    "db_query_duration_seconds", "Duração das consultas SQL por rota", ("route",), QUERY_BUCKETS
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request", "Consultas SQL por requisição", ("route",), COUNT_BUCKETS
+)
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Espera para obter conexão do pool", (), QUERY_BUCKETS
+)
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total", "Consultas aos caches em processo", ("cache", "result")
+)
+
+
+def _collect_cache_ratio() -> Dict[LabelValues, float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_REQUESTS.items():
+        entry = totals.setdefault(cache, [0.0, 0.0])
+        entry[0 if result == "hit" else 1] += value
+    return {(cache,): hits / (hits + misses) for cache, (hits, misses) in totals.items()}
+
+
+CACHE_HIT_RATIO = registry.gauge(
+    "cache_hit_ratio", "Fração de acertos por cache", ("cache",), collect=_collect_cache_ratio
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Registra um acerto ou uma falta de cache."""
+    CACHE_REQUESTS.inc((cache, "hit" if hit else "miss"))
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede latência, status e concorrência por rota."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        if method not in KNOWN_METHODS:
+            method = "OTHER"
+        state = _RequestState(scope, method)
+        token = _current_request.set(state)
+        _active_requests[id(state)] = state
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _active_requests.pop(id(state), None)
+            _current_request.reset(token)
+            route = route_label(scope)
+            HTTP_REQUESTS.inc((method, route, status))
+            HTTP_LATENCY.observe(elapsed, (method, route))
+            DB_QUERIES_PER_REQUEST.observe(state.queries, (route,))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # O contexto de execução é descartado ao fim da consulta; mais barato que conn.info
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    state = _current_request.get()
+    route = route_label(state.scope) if state is not None else "background"
+    if state is not None:
+        state.queries += 1
+    DB_QUERIES.inc((route,))
+    DB_QUERY_LATENCY.observe(elapsed, (route,))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Mede consultas e espera no pool da engine (idempotente)."""
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    # O pool não tem evento anterior ao checkout; a espera é medida em volta
+    # de raw_connection, que sobrevive a engine.dispose() (o pool é recriado)
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+    engine._metrics_instrumented = True
+
+    def _collect_pool() -> Dict[LabelValues, float]:
+        pool = engine.pool
+        checked_out = getattr(pool, "checkedout", None)
+        size = getattr(pool, "size", None)
+        values: Dict[LabelValues, float] = {}
+        if callable(checked_out):
+            values[("checked_out",)] = checked_out()
+        if callable(size):
+            values[("size",)] = size()
+        return values
+
+    registry.gauge(
+        "db_pool_connections", "Conexões do pool por estado", ("state",), collect=_collect_pool
+    )
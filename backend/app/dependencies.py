@@ -8,6 +8,7 @@ from app.core.database import get_db
 from app.models.user import User
 from app.schemas.user_schema import TokenData
 from app.core.config import settings
+from app.services.query_profiler_service import QueryProfilerService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 
@@ -44,15 +45,7 @@ async def get_current_user(
             detail="Usuário bloqueado pelo administrador",
         )
 
-    # Backfill defensivo: alguns registros legados podem ter role NULL
-    if getattr(user, "role", None) is None:  # type: ignore[attr-defined]
-        user.role = "USER"  # type: ignore[assignment]
-        try:
-            db.commit()
-            db.refresh(user)
-        except Exception:
-            db.rollback()
-
+    QueryProfilerService.note_user(user)
     return user
 
 
@@ -1,15 +1,29 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, engine
+from app.core import metrics
 from app.core.security import get_password_hash
 from app.core.config import settings
 from app.models.user import User
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import hmac
 import logging
 
 from app.api.v1 import router as api_router
+from app.services.audit_facet_service import AuditFacetService
+from app.services.cep_service import CEPService
+from app.services.data_migration_service import DataMigrationService
+from app.services.query_profiler_service import QueryProfilerMiddleware
+from app.services.audit_retention_service import audit_retention_loop
+from app.services.entry_retention_service import entry_purge_loop
+from app.services.email_queue_service import email_sender_loop
+from app.services.recurring_entry_service import recurring_entries_loop
+from app.services.cache_invalidation_service import cache_invalidation_loop
+from app.services.idempotency_service import idempotency_sweep_loop
+from app.services.google_certs_cache import GoogleCertsCache, google_certs_refresh_loop
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -61,12 +75,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiler de consultas: ligado/desligado em tempo de execução pelo SystemConfig
+app.add_middleware(QueryProfilerMiddleware)
+
+if settings.METRICS_ENABLED:
+    # Adicionado por último: envolve todos os outros middlewares na medição
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine)
+
 
 @app.get("/")
 async def root():
     return {"message": "Bem-vindo à API do Autônomo Control"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Métricas no formato texto do Prometheus (exige METRICS_TOKEN)."""
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    provided = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(provided, f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Token de métricas inválido")
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # Registro das rotas da API
 app.include_router(api_router)
 
@@ -103,22 +136,93 @@ def bootstrap_master():
             )
             db.add(new_user)
             db.commit()
+    finally:
+        db.close()
 
-        # Backfill global: garantir que nenhum usuário permaneça com role NULL
-        null_role_users = db.query(User).filter((User.role == None)).all()  # noqa: E711
-        updated = 0
-        for u in null_role_users:
-            u.role = "USER"  # type: ignore[assignment]
-            updated += 1
-        if updated:
-            db.commit()
+
+def run_data_migrations():
+    """Aplica as migrações de dados pendentes (cada versão roda uma única vez)."""
+    db: Session = SessionLocal()
+    try:
+        DataMigrationService.run_pending(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro ao aplicar migrações de dados: {str(e)}")
+    finally:
+        db.close()
+
+
+def seed_audit_facets():
+    """Popula o dicionário de ações/tipos de recurso na primeira execução."""
+    db: Session = SessionLocal()
+    try:
+        inserted = AuditFacetService.ensure_seeded(db)
+        if inserted:
+            logger.info(f"Dicionário de auditoria populado com {inserted} valores")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erro ao popular dicionário de auditoria: {str(e)}")
     finally:
         db.close()
 
 
+_background_tasks: list = []
+
+
 @app.on_event("startup")
-def _on_startup():
+async def _on_startup():
     bootstrap_master()
+    run_data_migrations()
+    seed_audit_facets()
+    await CEPService.startup()
+    if settings.AUDIT_RETENTION_ENABLED:
+        _background_tasks.append(
+            asyncio.create_task(
+                audit_retention_loop(settings.AUDIT_RETENTION_INTERVAL_HOURS)
+            )
+        )
+    if settings.ENTRY_PURGE_ENABLED:
+        _background_tasks.append(
+            asyncio.create_task(entry_purge_loop(settings.ENTRY_PURGE_INTERVAL_HOURS))
+        )
+    if settings.EMAIL_QUEUE_ENABLED:
+        _background_tasks.append(
+            asyncio.create_task(email_sender_loop(settings.EMAIL_QUEUE_POLL_SECONDS))
+        )
+    if settings.CACHE_INVALIDATION_ENABLED:
+        _background_tasks.append(
+            asyncio.create_task(
+                cache_invalidation_loop(
+                    settings.CACHE_INVALIDATION_POLL_SECONDS,
+                    socket_dir=settings.CACHE_INVALIDATION_SOCKET_DIR,
+                    retention_minutes=settings.CACHE_INVALIDATION_RETENTION_MINUTES,
+                )
+            )
+        )
+    if settings.IDEMPOTENCY_SWEEP_ENABLED:
+        _background_tasks.append(
+            asyncio.create_task(
+                idempotency_sweep_loop(settings.IDEMPOTENCY_SWEEP_INTERVAL_MINUTES)
+            )
+        )
+    if settings.RECURRING_ENTRIES_ENABLED:
+        _background_tasks.append(
+            asyncio.create_task(
+                recurring_entries_loop(settings.RECURRING_ENTRIES_INTERVAL_MINUTES)
+            )
+        )
+    if settings.GOOGLE_CLIENT_ID:
+        # Mantém os certificados aquecidos: o login Google não faz chamadas externas
+        _background_tasks.append(asyncio.create_task(google_certs_refresh_loop()))
+
+
+@app.on_event("shutdown")
+async def _on_shutdown():
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    await CEPService.shutdown()
+    GoogleCertsCache.clear()
 
 
 if __name__ == "__main__":
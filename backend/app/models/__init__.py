@@ -2,6 +2,31 @@ from .user import User
 from .entry import Entry, EntryType
 from .category import Category
 from .audit_log import AuditLog
+from .audit_log_facet import AuditLogFacet
 from .system_config import SystemConfig
+from .cep_cache import CepCache
+from .outbound_email import OutboundEmail
+from .login_attempt import LoginAttempt
+from .data_migration import DataMigration
+from .earnings_sketch import EarningsSketch
+from .recurring_rule import RecurringRule
+from .cache_invalidation import CacheInvalidation
+from .idempotency_key import IdempotencyKey
 
-__all__ = ["User", "Entry", "EntryType", "Category", "AuditLog", "SystemConfig"]
+__all__ = [
+    "User",
+    "Entry",
+    "EntryType",
+    "Category",
+    "AuditLog",
+    "AuditLogFacet",
+    "SystemConfig",
+    "CepCache",
+    "OutboundEmail",
+    "LoginAttempt",
+    "DataMigration",
+    "EarningsSketch",
+    "RecurringRule",
+    "CacheInvalidation",
+    "IdempotencyKey",
+]
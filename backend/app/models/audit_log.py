@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, JSON, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from uuid import uuid4
@@ -44,3 +44,30 @@ class AuditLog(Base):
 
     # Relacionamentos SQLAlchemy
     user = relationship("User", back_populates="audit_logs_performed")
+
+    __table_args__ = (
+        # Atende a visão "eventos recentes do tipo X" sem ordenar em memória
+        Index("ix_audit_logs_resource_type_created_at", "resource_type", "created_at"),
+        # Ações têm baixa cardinalidade: o filtro exato também precisa vir ordenado
+        Index("ix_audit_logs_action_created_at", "action", "created_at"),
+        # Busca por substring (ILIKE '%x%') indexada; só existe no PostgreSQL
+        Index(
+            "ix_audit_logs_action_trgm",
+            "action",
+            postgresql_using="gin",
+            postgresql_ops={"action": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_audit_logs_performed_by_trgm",
+            "performed_by",
+            postgresql_using="gin",
+            postgresql_ops={"performed_by": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+event.listen(
+    AuditLog.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
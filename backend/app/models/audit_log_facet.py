@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AuditLogFacet(Base):
+    """Dicionário de valores distintos de ação e tipo de recurso dos logs de auditoria."""
+
+    __tablename__ = "audit_log_facets"
+
+    # 'action' ou 'resource_type'
+    kind = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+
+    # Primeira vez em que o valor apareceu
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
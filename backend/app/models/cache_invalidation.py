@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, Integer
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class CacheInvalidation(Base):
+    """Invalidação de cache publicada por um worker para os demais."""
+
+    __tablename__ = "cache_invalidations"
+    # Sem AUTOINCREMENT o SQLite reaproveita ids depois que a limpeza esvazia a
+    # tabela, e os cursores dos workers (no id antigo) pulariam as linhas novas
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    # Crescente: cada worker lê as linhas com id acima do último visto
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Cache afetado ('categories', 'entries', 'system_config', 'users')
+    topic = Column(String(64), nullable=False)
+
+    # Escopo opcional dentro do tópico (ex.: ID do usuário); NULL = tudo
+    key = Column(String, nullable=True)
+
+    # Worker que publicou (ele já invalidou o próprio cache no commit)
+    origin = Column(String(32), nullable=False)
+
+    # Data em UTC; linhas antigas são removidas pelo laço de polling
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -1,10 +1,10 @@
-from sqlalchemy import Boolean, Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy import Boolean, Column, String, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from uuid import uuid4
 
 from app.core.database import Base
-from app.core.custom_types import SQLiteListType
+from app.core.custom_types import JSONListType
 
 
 class Category(Base):
@@ -15,7 +15,7 @@ class Category(Base):
     type = Column(String, nullable=False, index=True)  # INCOME ou EXPENSE
     icon = Column(String, nullable=True)  # Ícone opcional para a categoria
     color = Column(String, nullable=True)  # Cor opcional para visualização
-    subcategories = Column(SQLiteListType(), nullable=True)  # type: ignore  # Lista de subcategorias como array
+    subcategories = Column(JSONListType(), nullable=True)  # type: ignore  # Lista de subcategorias (JSON/JSONB)
 
     # Relação com usuário (categorias podem ser personalizadas por usuário)
     user_id = Column(
@@ -29,3 +29,12 @@ class Category(Base):
 
     # Relacionamentos SQLAlchemy
     user = relationship("User", back_populates="categories")
+
+    __table_args__ = (
+        # GIN só faz sentido no PostgreSQL (JSONB); no SQLite usamos json_each
+        Index(
+            "ix_categories_subcategories_gin",
+            "subcategories",
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
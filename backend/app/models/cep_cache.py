@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, JSON
+
+from app.core.database import Base
+
+
+class CepCache(Base):
+    """Cache persistente das consultas de CEP feitas ao ViaCEP."""
+
+    __tablename__ = "cep_cache"
+
+    # CEP apenas com números (8 dígitos)
+    cep = Column(String(8), primary_key=True)
+
+    # Endereço normalizado; NULL indica CEP inexistente (cache negativo).
+    # none_as_null grava None como NULL do SQL, e não como o JSON 'null'
+    data = Column(JSON(none_as_null=True), nullable=True)
+
+    # Datas em UTC
+    fetched_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime
+
+from app.core.database import Base
+
+
+class DataMigration(Base):
+    """Migração de dados já aplicada (executada uma única vez na inicialização)."""
+
+    __tablename__ = "data_migrations"
+
+    # Identificador versionado, ex.: "20261019_01_backfill_user_roles"
+    version = Column(String(128), primary_key=True)
+
+    # Data em UTC
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
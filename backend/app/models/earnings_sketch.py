@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, DateTime, Integer, JSON
+
+from app.core.database import Base
+
+
+class EarningsSketch(Base):
+    """Sketches de quantis dos ganhos das corridas de um usuário em um mês."""
+
+    __tablename__ = "earnings_sketches"
+
+    # Sem FK: é um agregado derivado dos lançamentos e some junto com eles
+    user_id = Column(String, primary_key=True)
+
+    # Mês da corrida no formato 'AAAA-MM'
+    month = Column(String(7), primary_key=True)
+
+    # Métrica ('per_ride', 'per_km', 'per_hour') -> QuantileSketch.to_dict()
+    sketches = Column(JSON, nullable=False)
+
+    # Corridas consideradas no mês
+    rides = Column(Integer, nullable=False, default=0)
+
+    # Data em UTC
+    updated_at = Column(DateTime, nullable=False)
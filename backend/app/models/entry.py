@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, DateTime, Integer, Float, ForeignKey
+from sqlalchemy import Boolean, Column, String, DateTime, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -35,19 +35,63 @@ class Entry(Base):
     shift_tag = Column(String, nullable=True, index=True)             # MANHA / TARDE / NOITE / MADRUGADA
     city = Column(String, nullable=True)
     is_trip_expense = Column(Boolean, default=False)                  # Se despesa atrelada a corrida
-    linked_entry_id = Column(String, ForeignKey("entries.id"), nullable=True)  # Possível referência cruzada
+    linked_entry_id = Column(String, ForeignKey("entries.id"), nullable=True, index=True)  # Despesa -> corrida
 
     # Relação com usuário
     user_id = Column(String, ForeignKey("users.id"))
 
-    # Dados de recorrência (para implementação futura)
+    # Dados de recorrência
     is_recurring = Column(Boolean, default=False)
+    recurring_rule_id = Column(
+        String, ForeignKey("recurring_rules.id", ondelete="SET NULL"), nullable=True
+    )  # Regra que gerou o lançamento
 
     # Campos de controle
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_deleted = Column(Boolean, default=False)  # Soft delete
+
+    __table_args__ = (
+        # Uma ocorrência por regra e data: a materialização pode ser repetida sem duplicar
+        Index("uq_entries_recurring_rule_date", "recurring_rule_id", "date", unique=True),
+        # Índices parciais só com lançamentos ativos para os caminhos quentes
+        # (listagens e relatórios filtram por usuário, tipo e período). O predicado
+        # é o mesmo das consultas (is_deleted IS false) para o planejador usá-los
+        Index(
+            "ix_entries_active_user_date",
+            "user_id",
+            "date",
+            sqlite_where=is_deleted.is_(False),
+            postgresql_where=is_deleted.is_(False),
+        ),
+        Index(
+            "ix_entries_active_user_type_date",
+            "user_id",
+            "type",
+            "date",
+            sqlite_where=is_deleted.is_(False),
+            postgresql_where=is_deleted.is_(False),
+        ),
+        # Só os excluídos: a limpeza os percorre por id sem varrer a tabela
+        Index(
+            "ix_entries_deleted_id",
+            "id",
+            sqlite_where=is_deleted.is_(True),
+            postgresql_where=is_deleted.is_(True),
+        ),
+    )
     
     # Relacionamentos SQLAlchemy
     user = relationship("User", back_populates="entries")
     linked_entry = relationship("Entry", remote_side=[id], backref="linked_entries")
+
+
+# Atributos que definem a contribuição de uma corrida nos sketches de ganhos. Com
+# active_history o valor antigo é carregado mesmo quando o atributo estava expirado
+# (ex.: após um commit); precisa valer antes da configuração do mapper
+EARNINGS_ATTRIBUTES = (
+    "user_id", "date", "type", "is_deleted", "net_amount", "amount", "distance_km", "duration_min",
+)
+
+for _name in EARNINGS_ATTRIBUTES:
+    Entry.__mapper__.get_property(_name).active_history = True
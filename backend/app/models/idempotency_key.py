@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, DateTime, Integer, JSON
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Resposta guardada de uma criação feita com o cabeçalho Idempotency-Key."""
+
+    __tablename__ = "idempotency_keys"
+
+    # Chave primária composta = índice único: a chave vale por usuário
+    user_id = Column(String, primary_key=True)
+    key = Column(String(255), primary_key=True)
+
+    # SHA-256 do corpo da requisição; a mesma chave com outro corpo é rejeitada
+    request_hash = Column(String(64), nullable=False)
+
+    # Resposta devolvida nas repetições, sem nova inserção
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+
+    # Datas em UTC; linhas expiradas são removidas pelo laço de limpeza
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
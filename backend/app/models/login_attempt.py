@@ -0,0 +1,24 @@
+from uuid import uuid4
+
+from sqlalchemy import Column, String, DateTime, Index
+
+from app.core.database import Base
+
+
+class LoginAttempt(Base):
+    """Falha de login registrada pelo limitador de tentativas (backend em banco)."""
+
+    __tablename__ = "login_attempts"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid4()))
+
+    # "user:<username>" ou "ip:<endereço>"
+    key = Column(String(320), nullable=False)
+
+    # Data em UTC
+    attempted_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_login_attempts_key_attempted_at", "key", "attempted_at"),
+        Index("ix_login_attempts_attempted_at", "attempted_at"),
+    )
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index
+from sqlalchemy.sql import func
+from datetime import datetime
+from uuid import uuid4
+
+from app.core.database import Base
+
+
+class OutboundEmail(Base):
+    """Fila persistente de emails a enviar."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
+
+    # Mensagem
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=True)  # Removido ao enviar ou descartar (pode conter senhas)
+
+    # Estado: PENDING, SENDING, SENT ou DEAD (esgotou as tentativas)
+    status = Column(String, nullable=False, default="PENDING")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # UTC
+    # Prazo para o envio (UTC); vencido, a mensagem é descartada sem envio
+    expires_at = Column(DateTime, nullable=False)
+
+    # Reserva por um worker (mensagens SENDING com reserva antiga são retomadas)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+
+    # Último erro de envio
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Busca dos próximos envios: WHERE status = ? AND next_attempt_at <= ?
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,45 @@
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+from uuid import uuid4
+
+from app.core.database import Base
+
+
+class RecurrenceFrequency:
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+
+
+class RecurringRule(Base):
+    """Regra de lançamento recorrente (ex.: seguro mensal, aluguel semanal do carro)."""
+
+    __tablename__ = "recurring_rules"
+    __table_args__ = (
+        # Busca das regras vencidas pelo agendador
+        Index("ix_recurring_rules_due", "is_active", "next_run_date"),
+    )
+
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+
+    # Modelo do lançamento gerado
+    description = Column(String)
+    amount = Column(Float, nullable=False)
+    type = Column(String, nullable=False)  # INCOME / EXPENSE
+    category = Column(String)
+    subcategory = Column(String, nullable=True)
+    platform = Column(String, nullable=True)
+
+    # Agenda: a cada ``interval`` dias/semanas/meses a partir de start_date
+    frequency = Column(String, nullable=False)  # DAILY / WEEKLY / MONTHLY
+    interval = Column(Integer, nullable=False, default=1)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)  # Inclusive
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    # Marca d'água: próxima ocorrência ainda não materializada (NULL = encerrada)
+    next_run_date = Column(Date, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
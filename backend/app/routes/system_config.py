@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field
 from app.core.database import get_db
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.login_throttle_service import CONFIG_TOPIC
 from app.services.system_config_service import SystemConfigService
 
 router = APIRouter(prefix="/system-config", tags=["System Configuration"])
@@ -192,7 +194,8 @@ async def update_config(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=error_message
             )
 
-        # Atualizar configuração
+        # Atualizar configuração (a invalidação vai no commit do serviço)
+        CacheInvalidationService.publish(db, CONFIG_TOPIC)
         success = service.update_config(request.key, request.value, current_user.id)
 
         if not success:
@@ -237,8 +240,10 @@ async def update_multiple_configs(
                 detail=f"Erros de validação: {'; '.join(validation_errors)}",
             )
 
-        # Atualizar configurações
+        # Atualizar configurações (um commit por chave; a invalidação vai depois de todos)
         results = service.update_multiple_configs(request.configs, current_user.id)
+        CacheInvalidationService.publish(db, CONFIG_TOPIC)
+        db.commit()
 
         # Verificar se todas foram atualizadas com sucesso
         failed_updates = [key for key, success in results.items() if not success]
@@ -271,6 +276,7 @@ async def reset_to_defaults(
     """Reseta todas as configurações para os valores padrão."""
     try:
         service = SystemConfigService(db)
+        CacheInvalidationService.publish(db, CONFIG_TOPIC)
         success = service.reset_to_defaults(current_user.id)
 
         if not success:
@@ -299,6 +305,7 @@ async def initialize_default_configs(
     """Inicializa as configurações padrão no banco de dados."""
     try:
         service = SystemConfigService(db)
+        CacheInvalidationService.publish(db, CONFIG_TOPIC)
         success = service.initialize_default_configs(current_user.id)
 
         if not success:
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal
+
+from app.core.config import settings
+
+
+class CEPBatchRequest(BaseModel):
+    """Schema para consulta de CEPs em lote."""
+
+    ceps: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.CEP_BATCH_MAX_SIZE,
+        description="CEPs a consultar (com ou sem formatação)",
+    )
+
+
+class CEPBatchItem(BaseModel):
+    """Resultado da consulta de um CEP do lote."""
+
+    cep: str = Field(..., description="CEP como enviado")
+    status: Literal["found", "not_found", "invalid", "error"]
+    data: Optional[Dict[str, Any]] = Field(None, description="Endereço encontrado")
+    detail: Optional[str] = Field(None, description="Mensagem de erro")
+
+
+class CEPBatchResponse(BaseModel):
+    """Schema para resposta da consulta em lote."""
+
+    success: bool = True
+    data: List[CEPBatchItem]
+    summary: Dict[str, int]
+    message: str
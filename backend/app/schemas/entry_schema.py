@@ -1,11 +1,14 @@
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import BaseModel, field_validator, ConfigDict, Field, model_validator
 from typing import Optional, Literal, List
-from datetime import datetime
+from datetime import date, datetime
 
 
 PLATFORM_VALUES = ["UBER", "99", "INDRIVE", "OUTRA"]
 SHIFT_TAG_VALUES = ["MANHA", "TARDE", "NOITE", "MADRUGADA"]
 
+# Máximo de ids por requisição de operação em massa
+MAX_BULK_IDS = 10000
+
 
 class EntryBase(BaseModel):
     amount: float
@@ -98,6 +101,80 @@ class EntryUpdate(BaseModel):
         return v
 
 
+class EntryFilters(BaseModel):
+    """Mesmos filtros de GET /entries."""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    type: Optional[str] = None
+    category: Optional[str] = None
+    search: Optional[str] = None
+    platform: Optional[str] = None
+    shift_tag: Optional[str] = None
+    city: Optional[str] = None
+
+
+class EntryBulkDelete(BaseModel):
+    """Seleção de lançamentos por lista de ids ou por filtros (um dos dois)."""
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=MAX_BULK_IDS)
+    filters: Optional[EntryFilters] = None
+
+    @model_validator(mode="after")
+    def ids_or_filters(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Informe ids ou filters (apenas um)")
+        if self.filters is not None and not self.filters.model_dump(exclude_none=True):
+            raise ValueError("Informe ao menos um filtro")
+        return self
+
+
+class EntryBulkChanges(BaseModel):
+    """Campos de classificação alteráveis em massa (não afetam valores nem datas)."""
+    description: Optional[str] = None
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    platform: Optional[str] = None
+    shift_tag: Optional[str] = None
+    city: Optional[str] = None
+    vehicle_id: Optional[str] = None
+    is_trip_expense: Optional[bool] = None
+    is_recurring: Optional[bool] = None
+
+    @field_validator("platform")
+    @classmethod
+    def platform_valid(cls, v):
+        if v is not None and v not in PLATFORM_VALUES:
+            raise ValueError(f"platform deve estar em {PLATFORM_VALUES}")
+        return v
+
+    @field_validator("shift_tag")
+    @classmethod
+    def shift_valid(cls, v):
+        if v is not None and v not in SHIFT_TAG_VALUES:
+            raise ValueError(f"shift_tag deve estar em {SHIFT_TAG_VALUES}")
+        return v
+
+    @model_validator(mode="after")
+    def category_with_subcategory(self):
+        fields = self.model_fields_set
+        if not fields:
+            raise ValueError("Informe ao menos um campo para alterar")
+        # Categoria e subcategoria mudam juntas para não deixar pares inválidos
+        if ("category" in fields) != ("subcategory" in fields):
+            raise ValueError("category e subcategory devem ser alteradas juntas")
+        if "category" in fields and not self.category:
+            raise ValueError("category não pode ser vazia")
+        return self
+
+
+class EntryBulkUpdate(EntryBulkDelete):
+    changes: EntryBulkChanges
+
+
+class EntryBulkResult(BaseModel):
+    affected_count: int
+    batches: int
+
+
 class EntryInDB(EntryBase):
     id: str
     created_at: datetime
@@ -0,0 +1,88 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import Optional, Literal
+from datetime import date, datetime
+
+from app.schemas.entry_schema import PLATFORM_VALUES
+
+
+class RecurringRuleBase(BaseModel):
+    description: str
+    amount: float
+    type: Literal["INCOME", "EXPENSE"]
+    category: str
+    subcategory: Optional[str] = None
+    platform: Optional[str] = None
+    frequency: Literal["DAILY", "WEEKLY", "MONTHLY"]
+    interval: int = Field(1, ge=1, le=365)
+    start_date: date
+    end_date: Optional[date] = None
+    is_active: bool = True
+
+    @field_validator("platform")
+    @classmethod
+    def platform_valid(cls, v):
+        if v is not None and v not in PLATFORM_VALUES:
+            raise ValueError(f"platform deve estar em {PLATFORM_VALUES}")
+        return v
+
+
+class RecurringRuleCreate(RecurringRuleBase):
+    @field_validator("amount")
+    @classmethod
+    def amount_must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError("O valor deve ser maior que zero")
+        return v
+
+    @model_validator(mode="after")
+    def end_after_start(self):
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date deve ser posterior a start_date")
+        return self
+
+
+class RecurringRuleUpdate(BaseModel):
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    platform: Optional[str] = None
+    frequency: Optional[Literal["DAILY", "WEEKLY", "MONTHLY"]] = None
+    interval: Optional[int] = Field(None, ge=1, le=365)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_active: Optional[bool] = None
+
+    # Omitidos ficam como estão, mas não podem ser limpos (colunas obrigatórias)
+    @field_validator(
+        "description", "amount", "category", "frequency", "interval", "start_date", "is_active"
+    )
+    @classmethod
+    def not_null(cls, v, info):
+        if v is None:
+            raise ValueError(f"{info.field_name} não pode ser nulo")
+        return v
+
+    @field_validator("amount")
+    @classmethod
+    def amount_must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError("O valor deve ser maior que zero")
+        return v
+
+    @field_validator("platform")
+    @classmethod
+    def platform_valid(cls, v):
+        if v is not None and v not in PLATFORM_VALUES:
+            raise ValueError(f"platform deve estar em {PLATFORM_VALUES}")
+        return v
+
+
+class RecurringRule(RecurringRuleBase):
+    id: str
+    user_id: str
+    next_run_date: Optional[date] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
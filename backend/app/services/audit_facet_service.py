@@ -0,0 +1,167 @@
+"""Dicionário de ações e tipos de recurso vistos nos logs de auditoria.
+
+Os filtros da tela de auditoria precisam dos valores distintos de ``action`` e
+``resource_type``. Em vez de um ``SELECT DISTINCT`` sobre ``audit_logs`` a cada
+abertura, os valores ficam na tabela ``audit_log_facets``, atualizada na mesma
+transação em que o log é gravado. Um conjunto em memória evita tocar a tabela
+quando o valor já é conhecido, que é o caso de quase todas as gravações.
+"""
+
+import threading
+import weakref
+from typing import List, Set, Tuple
+
+from sqlalchemy import event, exists, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+from app.models.audit_log import AuditLog
+from app.models.audit_log_facet import AuditLogFacet
+
+Facet = Tuple[str, str]
+
+_PENDING_KEY = "audit_facets_pending"
+
+
+class AuditFacetService:
+    """Mantém e consulta o dicionário de valores distintos dos logs."""
+
+    ACTION = "action"
+    RESOURCE_TYPE = "resource_type"
+    KINDS = (ACTION, RESOURCE_TYPE)
+
+    # Valores já persistidos, por engine, para que bancos distintos não se misturem
+    _known: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def list_values(db: Session, kind: str) -> List[str]:
+        """
+        Retorna os valores conhecidos de um tipo de faceta, em ordem alfabética.
+
+        Args:
+            db: Sessão do banco de dados
+            kind: 'action' ou 'resource_type'
+
+        Returns:
+            Lista de valores distintos
+        """
+        return list(
+            db.execute(
+                select(AuditLogFacet.value)
+                .where(AuditLogFacet.kind == kind)
+                .order_by(AuditLogFacet.value)
+            ).scalars()
+        )
+
+    @classmethod
+    def backfill(cls, db: Session) -> int:
+        """
+        Popula o dicionário a partir dos logs existentes.
+
+        Executa o ``SELECT DISTINCT`` uma única vez; valores já presentes são
+        ignorados. Retorna a quantidade de valores inseridos.
+        """
+        inserted = 0
+        for kind in cls.KINDS:
+            column = getattr(AuditLog, kind)
+            existing = set(cls.list_values(db, kind))
+            values = db.execute(select(column).distinct()).scalars().all()
+            rows = [
+                {"kind": kind, "value": value}
+                for value in values
+                if value and value not in existing
+            ]
+            if rows:
+                db.execute(insert(AuditLogFacet), rows)
+                inserted += len(rows)
+        db.commit()
+        return inserted
+
+    @classmethod
+    def ensure_seeded(cls, db: Session) -> int:
+        """Faz o backfill apenas se o dicionário ainda estiver vazio."""
+        if db.execute(select(exists().select_from(AuditLogFacet))).scalar():
+            return 0
+        return cls.backfill(db)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Esquece os valores conhecidos em memória (usado em testes)."""
+        with cls._lock:
+            cls._known.clear()
+
+    @classmethod
+    def _known_for(cls, engine) -> Set[Facet]:
+        with cls._lock:
+            known = cls._known.get(engine)
+            if known is None:
+                known = cls._known[engine] = set()
+            return known
+
+    @classmethod
+    def _record(cls, connection: Connection, target: AuditLog) -> None:
+        """Registra os valores do log recém-inserido que ainda não são conhecidos."""
+        known = cls._known_for(connection.engine)
+        facets = [
+            (kind, value)
+            for kind, value in (
+                (cls.ACTION, target.action),
+                (cls.RESOURCE_TYPE, target.resource_type),
+            )
+            if value and (kind, value) not in known
+        ]
+        if not facets:
+            return
+
+        for kind, value in facets:
+            cls._insert_ignore(connection, kind, value)
+
+        # Só vira "conhecido" após o commit; num rollback a linha some junto
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).update(facets)
+
+    @staticmethod
+    def _insert_ignore(connection: Connection, kind: str, value: str) -> None:
+        dialect_name = connection.dialect.name
+        if dialect_name == "postgresql":
+            stmt = postgresql.insert(AuditLogFacet).on_conflict_do_nothing()
+        elif dialect_name == "sqlite":
+            stmt = sqlite.insert(AuditLogFacet).on_conflict_do_nothing()
+        else:
+            found = connection.execute(
+                select(exists().where(
+                    AuditLogFacet.kind == kind, AuditLogFacet.value == value
+                ))
+            ).scalar()
+            if found:
+                return
+            stmt = insert(AuditLogFacet)
+        connection.execute(stmt.values(kind=kind, value=value))
+
+    @classmethod
+    def _promote_pending(cls, session: Session) -> None:
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            cls._known_for(session.get_bind()).update(pending)
+
+    @staticmethod
+    def _discard_pending(session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(AuditLog, "after_insert")
+def _on_audit_log_insert(mapper, connection, target):
+    AuditFacetService._record(connection, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_session_commit(session):
+    AuditFacetService._promote_pending(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_session_rollback(session):
+    AuditFacetService._discard_pending(session)
@@ -0,0 +1,194 @@
+"""Retenção de logs de auditoria em lotes, com arquivamento opcional.
+
+A remoção é feita em lotes limitados e ordenados por id, com commit e pausa
+entre eles, para não segurar um lock de escrita longo (fatal no SQLite) nem
+inflar o log de transações. Antes de cada exclusão as linhas podem ser
+arquivadas em segmentos NDJSON comprimidos e particionados por data.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class AuditRetentionService:
+    """Motor de retenção e arquivamento de logs de auditoria."""
+
+    DEFAULT_CHUNK_SIZE = 1000
+    DEFAULT_PAUSE_SECONDS = 0.05
+
+    @classmethod
+    def purge(
+        cls,
+        db: Session,
+        cutoff_date: datetime,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+        archive_dir: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Remove logs anteriores a ``cutoff_date`` em lotes ordenados por id.
+
+        Args:
+            db: Sessão do banco de dados
+            cutoff_date: Logs criados antes desta data são removidos
+            chunk_size: Quantidade máxima de linhas por lote
+            pause_seconds: Pausa entre lotes para liberar o banco
+            archive_dir: Diretório para arquivar as linhas antes da exclusão
+            progress_callback: Chamado após cada lote com o progresso parcial
+
+        Returns:
+            Dict com totais removidos/arquivados, lotes e vazão
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser maior que zero")
+
+        started = time.perf_counter()
+        deleted_count = 0
+        archived_count = 0
+        chunks = 0
+        last_id: Optional[str] = None
+
+        while True:
+            query = select(AuditLog).where(AuditLog.created_at < cutoff_date)
+            if last_id is not None:
+                query = query.where(AuditLog.id > last_id)
+            rows = db.execute(query.order_by(AuditLog.id).limit(chunk_size)).scalars().all()
+            if not rows:
+                break
+
+            ids = [row.id for row in rows]
+            if archive_dir:
+                archived_count += cls._archive_rows(rows, Path(archive_dir))
+
+            result = db.execute(
+                delete(AuditLog)
+                .where(AuditLog.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            db.expunge_all()
+
+            deleted_count += result.rowcount or 0
+            chunks += 1
+            last_id = ids[-1]
+
+            progress = cls._progress(deleted_count, archived_count, chunks, started)
+            logger.info(
+                "Retenção de auditoria: lote %s, %s removidos (%.0f linhas/s)",
+                chunks,
+                deleted_count,
+                progress["rows_per_second"],
+            )
+            if progress_callback:
+                progress_callback(progress)
+
+            if len(rows) < chunk_size:
+                break
+            if pause_seconds > 0:
+                time.sleep(pause_seconds)
+
+        return {
+            **cls._progress(deleted_count, archived_count, chunks, started),
+            "cutoff_date": cutoff_date.isoformat(),
+        }
+
+    @staticmethod
+    def _progress(
+        deleted_count: int, archived_count: int, chunks: int, started: float
+    ) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        return {
+            "deleted_count": deleted_count,
+            "archived_count": archived_count,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(deleted_count / elapsed, 1) if elapsed else 0.0,
+        }
+
+    @classmethod
+    def _archive_rows(cls, rows: List[AuditLog], archive_dir: Path) -> int:
+        """Anexa as linhas aos segmentos ``AAAA/MM/audit_logs-AAAA-MM-DD.ndjson.gz``."""
+        partitions: Dict[str, List[str]] = {}
+        for row in rows:
+            day = row.created_at.date() if row.created_at else None
+            key = day.isoformat() if day else "sem-data"
+            partitions.setdefault(key, []).append(
+                json.dumps(cls._serialize(row), ensure_ascii=False)
+            )
+
+        for key, lines in partitions.items():
+            path = cls.segment_path(archive_dir, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Cada lote vira um novo membro gzip; leitores concatenam os membros
+            with gzip.open(path, "at", encoding="utf-8") as segment:
+                segment.write("\n".join(lines) + "\n")
+        return len(rows)
+
+    @staticmethod
+    def segment_path(archive_dir: Path, day_key: str) -> Path:
+        if day_key == "sem-data":
+            return archive_dir / "sem-data" / "audit_logs-sem-data.ndjson.gz"
+        year, month, _ = day_key.split("-")
+        return archive_dir / year / month / f"audit_logs-{day_key}.ndjson.gz"
+
+    @staticmethod
+    def _serialize(row: AuditLog) -> Dict[str, Any]:
+        data = {}
+        for column in AuditLog.__table__.columns:
+            value = getattr(row, column.name)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            data[column.name] = value
+        return data
+
+
+def run_scheduled_retention() -> Optional[Dict[str, Any]]:
+    """Executa uma rodada de retenção usando ``log_retention_days`` do SystemConfig."""
+    from app.services.system_config_service import SystemConfigService
+
+    db = SessionLocal()
+    try:
+        retention_days = SystemConfigService(db).get_config("log_retention_days")
+        if not retention_days or int(retention_days) <= 0:
+            return None
+        cutoff_date = datetime.now() - timedelta(days=int(retention_days))
+        return AuditRetentionService.purge(
+            db,
+            cutoff_date,
+            chunk_size=settings.AUDIT_RETENTION_CHUNK_SIZE,
+            archive_dir=settings.AUDIT_ARCHIVE_DIR,
+        )
+    finally:
+        db.close()
+
+
+async def audit_retention_loop(interval_hours: float) -> None:
+    """Laço em background que aplica a retenção periodicamente."""
+    while True:
+        try:
+            report = await asyncio.to_thread(run_scheduled_retention)
+            if report:
+                logger.info("Retenção de auditoria concluída: %s", report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro na retenção de logs de auditoria: {str(e)}")
+        await asyncio.sleep(interval_hours * 3600)
@@ -5,6 +5,9 @@ from fastapi import Request
 from app.models.audit_log import AuditLog
 from app.models.user import User
 
+# Registra o listener que mantém o dicionário de ações/tipos de recurso
+from app.services import audit_facet_service  # noqa: F401
+
 
 class AuditService:
     """Serviço para registrar logs de auditoria."""
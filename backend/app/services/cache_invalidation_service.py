@@ -0,0 +1,283 @@
+"""Barramento de invalidação de cache entre workers.
+
+Os caches em memória (categorias padrão, colunas de analytics, política de
+login) são por processo: com vários workers do uvicorn, uma escrita tratada
+pelo worker A não chega ao cache do worker B. As rotas de escrita publicam a
+invalidação com :meth:`CacheInvalidationService.publish`, que:
+
+1. grava uma linha em ``cache_invalidations`` na mesma transação da escrita
+   (se a escrita sofrer rollback, a invalidação some junto)
+2. após o commit, aplica a invalidação no próprio processo e, se
+   ``CACHE_INVALIDATION_SOCKET_DIR`` estiver definido, avisa os demais workers
+   do mesmo host por um datagrama Unix
+
+Cada worker roda :func:`cache_invalidation_loop`, que lê as linhas com ``id``
+acima do último visto a cada ``CACHE_INVALIDATION_POLL_SECONDS`` (ou assim que
+recebe o aviso) e chama os handlers inscritos no tópico. O banco é sempre a
+fonte da verdade: o aviso só antecipa a leitura, então um datagrama perdido
+atrasa a invalidação até o próximo polling, nunca a descarta. A defasagem
+máxima de um cache é, portanto, o intervalo de polling.
+
+No PostgreSQL, ids de transações concorrentes podem ficar visíveis fora de
+ordem; ids pulados ficam pendentes por ``GAP_GRACE_SECONDS`` antes de o cursor
+passar por eles (ids de transações desfeitas nunca aparecem).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+from uuid import uuid4
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.cache_invalidation import CacheInvalidation
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "cache_invalidation_pending"
+_SOCKET_SUFFIX = ".sock"
+
+Handler = Callable[[Optional[str]], None]
+
+
+class CacheInvalidationService:
+    """Publicação e aplicação de invalidações de cache por tópico."""
+
+    # Identifica as linhas publicadas por este processo
+    WORKER_ID = uuid4().hex
+
+    _handlers: Dict[str, List[Handler]] = {}
+    _sender: Optional[socket.socket] = None
+
+    @classmethod
+    def subscribe(cls, topic: str, handler: Handler) -> None:
+        """Registra um handler chamado com a chave de cada invalidação do tópico."""
+        cls._handlers.setdefault(topic, []).append(handler)
+
+    @classmethod
+    def publish(cls, db: Session, topic: str, key: Optional[str] = None) -> None:
+        """
+        Publica uma invalidação na transação da sessão.
+
+        Chamar antes do commit da escrita; a invalidação local e o aviso aos
+        demais workers acontecem no commit.
+        """
+        if settings.CACHE_INVALIDATION_ENABLED:
+            db.add(CacheInvalidation(topic=topic, key=key, origin=cls.WORKER_ID))
+        db.info.setdefault(_PENDING_KEY, []).append((topic, key))
+
+    @classmethod
+    def dispatch(cls, topic: str, key: Optional[str] = None) -> None:
+        """Aplica uma invalidação neste processo."""
+        for handler in cls._handlers.get(topic, ()):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Erro ao invalidar cache '{topic}': {str(e)}")
+
+    @classmethod
+    def purge(cls, db: Session, older_than: datetime) -> int:
+        """Remove invalidações antigas (já lidas por todos os workers)."""
+        result = db.execute(
+            delete(CacheInvalidation).where(CacheInvalidation.created_at < older_than)
+        )
+        db.commit()
+        return result.rowcount
+
+    @classmethod
+    def _on_commit(cls, session: Session) -> None:
+        pending = session.info.pop(_PENDING_KEY, None)
+        if not pending:
+            return
+        for topic, key in dict.fromkeys(pending):
+            cls.dispatch(topic, key)
+        if settings.CACHE_INVALIDATION_ENABLED and settings.CACHE_INVALIDATION_SOCKET_DIR:
+            cls.notify_peers(settings.CACHE_INVALIDATION_SOCKET_DIR)
+
+    @classmethod
+    def notify_peers(cls, directory: str) -> None:
+        """Avisa os workers do host que há invalidações novas (melhor esforço)."""
+        if cls._sender is None:
+            cls._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            cls._sender.setblocking(False)
+        own = cls.socket_path(directory)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            if not name.endswith(_SOCKET_SUFFIX) or path == own:
+                continue
+            try:
+                cls._sender.sendto(b"1", path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Socket de um worker que já terminou
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except OSError:
+                # Fila do destino cheia: ele já tem avisos pendentes
+                pass
+
+    @classmethod
+    def socket_path(cls, directory: str) -> str:
+        return os.path.join(directory, cls.WORKER_ID + _SOCKET_SUFFIX)
+
+    @classmethod
+    def listen(cls, directory: str) -> socket.socket:
+        """Abre o socket de avisos deste worker em ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        path = cls.socket_path(directory)
+        if os.path.exists(path):
+            os.unlink(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        sock.bind(path)
+        return sock
+
+
+class InvalidationPoller:
+    """Lê da tabela as invalidações publicadas por outros workers."""
+
+    # Tempo que um id pulado pode levar para aparecer (commit fora de ordem)
+    GAP_GRACE_SECONDS = 5.0
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 1000,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._cursor: Optional[int] = None
+        self._gaps: Dict[int, float] = {}
+        self._seen: Set[int] = set()
+
+    def poll(self) -> int:
+        """Aplica as invalidações novas; retorna quantas vieram de outros workers."""
+        with self.session_factory() as db:
+            if self._cursor is None:
+                # Worker novo começa com caches vazios: não há o que reaplicar
+                self._cursor = db.scalar(select(func.max(CacheInvalidation.id))) or 0
+                return 0
+            rows = self._fetch(db)
+            if not rows and self._cursor:
+                top = db.scalar(select(func.max(CacheInvalidation.id))) or 0
+                if top < self._cursor:
+                    # Ids reiniciados (tabela antiga sem AUTOINCREMENT esvaziada)
+                    self._cursor, self._gaps, self._seen = 0, {}, set()
+                    rows = self._fetch(db)
+
+        now = time.monotonic()
+        applied = 0
+        expected = self._cursor + 1
+        for row in rows:
+            for missing in range(expected, row.id):
+                self._gaps.setdefault(missing, now)
+            expected = row.id + 1
+            self._gaps.pop(row.id, None)
+            if row.id in self._seen:
+                continue
+            self._seen.add(row.id)
+            if row.origin != CacheInvalidationService.WORKER_ID:
+                CacheInvalidationService.dispatch(row.topic, row.key)
+                applied += 1
+
+        self._gaps = {
+            gap: since for gap, since in self._gaps.items()
+            if now - since < self.GAP_GRACE_SECONDS
+        }
+        top = rows[-1].id if rows else self._cursor
+        # O cursor só passa de um id pulado quando ele aparece ou expira
+        self._cursor = min(self._gaps) - 1 if self._gaps else top
+        self._seen = {seen for seen in self._seen if seen > self._cursor}
+        return applied
+
+    def _fetch(self, db: Session) -> list:
+        return db.execute(
+            select(
+                CacheInvalidation.id,
+                CacheInvalidation.topic,
+                CacheInvalidation.key,
+                CacheInvalidation.origin,
+            )
+            .where(CacheInvalidation.id > self._cursor)
+            .order_by(CacheInvalidation.id)
+            .limit(self.batch_size)
+        ).all()
+
+
+@event.listens_for(Session, "after_commit")
+def _on_session_commit(session):
+    CacheInvalidationService._on_commit(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_session_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _drain(sock: socket.socket, wakeup: asyncio.Event) -> None:
+    try:
+        while sock.recv(64):
+            pass
+    except (BlockingIOError, InterruptedError):
+        pass
+    wakeup.set()
+
+
+def _purge_old(session_factory: Callable[[], Session], retention_minutes: float) -> int:
+    with session_factory() as db:
+        return CacheInvalidationService.purge(
+            db, datetime.utcnow() - timedelta(minutes=retention_minutes)
+        )
+
+
+async def cache_invalidation_loop(
+    poll_seconds: float,
+    session_factory: Callable[[], Session] = SessionLocal,
+    socket_dir: Optional[str] = None,
+    retention_minutes: float = 10,
+) -> None:
+    """Laço em background que aplica as invalidações dos outros workers."""
+    poller = InvalidationPoller(session_factory)
+    wakeup = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    sock = None
+    if socket_dir:
+        sock = CacheInvalidationService.listen(socket_dir)
+        loop.add_reader(sock.fileno(), _drain, sock, wakeup)
+    next_purge = 0.0
+    try:
+        while True:
+            wakeup.clear()
+            try:
+                await asyncio.to_thread(poller.poll)
+                if time.monotonic() >= next_purge:
+                    next_purge = time.monotonic() + retention_minutes * 60 / 2
+                    await asyncio.to_thread(_purge_old, session_factory, retention_minutes)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro ao aplicar invalidações de cache: {str(e)}")
+            try:
+                await asyncio.wait_for(wakeup.wait(), poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if sock is not None:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+            try:
+                os.unlink(CacheInvalidationService.socket_path(socket_dir))
+            except OSError:
+                pass
@@ -0,0 +1,94 @@
+"""Cache em processo das categorias padrão do sistema.
+
+As categorias padrão são globais e praticamente imutáveis, então são lidas do
+banco uma única vez, com as subcategorias já decodificadas, e reaproveitadas
+por todas as requisições até que alguma escrita de categoria invalide o cache.
+"""
+
+import threading
+import weakref
+from typing import Optional, Tuple
+
+from pydantic import ConfigDict
+from sqlalchemy.orm import Session
+
+from app.core.metrics import record_cache
+from app.models.category import Category
+from app.schemas.category_schema import Category as CategorySchema
+from app.services.cache_invalidation_service import CacheInvalidationService
+
+# Tópico publicado pelas escritas de categorias
+CATEGORIES_TOPIC = "categories"
+
+
+class CachedCategory(CategorySchema):
+    """Snapshot imutável de uma categoria padrão."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class CategoryCacheService:
+    """Mantém as categorias padrão em memória, uma cópia por engine."""
+
+    # Chaveado pela engine para que bancos distintos (ex.: testes) não se misturem
+    _snapshots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    _generation = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_default_categories(
+        cls, db: Session, category_type: Optional[str] = None
+    ) -> Tuple[CachedCategory, ...]:
+        """Retorna as categorias padrão, carregando do banco apenas na primeira vez.
+
+        Args:
+            db: Sessão do banco de dados
+            category_type: Filtra por tipo (INCOME/EXPENSE) se informado
+
+        Returns:
+            Tupla imutável de categorias padrão
+        """
+        snapshot = cls._get_snapshot(db)
+        if category_type:
+            return tuple(c for c in snapshot if c.type == category_type)
+        return snapshot
+
+    @classmethod
+    def get_default_category(
+        cls, db: Session, category_id: str
+    ) -> Optional[CachedCategory]:
+        """Busca uma categoria padrão pelo ID sem consultar o banco."""
+        for category in cls._get_snapshot(db):
+            if category.id == category_id:
+                return category
+        return None
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Descarta os snapshots; a próxima leitura recarrega do banco."""
+        with cls._lock:
+            cls._generation += 1
+            cls._snapshots.clear()
+
+    @classmethod
+    def _get_snapshot(cls, db: Session) -> Tuple[CachedCategory, ...]:
+        bind = db.get_bind()
+        snapshot = cls._snapshots.get(bind)
+        record_cache("default_categories", snapshot is not None)
+        if snapshot is not None:
+            return snapshot
+
+        generation = cls._generation
+        rows = db.query(Category).filter(Category.is_default.is_(True)).all()
+        snapshot = tuple(CachedCategory.model_validate(row) for row in rows)
+
+        with cls._lock:
+            # Não publicar um snapshot carregado antes de uma invalidação concorrente
+            if generation == cls._generation:
+                cls._snapshots[bind] = snapshot
+        return snapshot
+
+
+CacheInvalidationService.subscribe(
+    CATEGORIES_TOPIC, lambda key: CategoryCacheService.invalidate()
+)
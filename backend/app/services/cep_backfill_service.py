@@ -0,0 +1,144 @@
+"""Preenchimento de endereços incompletos de usuários a partir do CEP."""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.cep_service import CEPService
+
+logger = logging.getLogger(__name__)
+
+# Campo do usuário -> chave do endereço retornado pelo CEPService
+ADDRESS_FIELDS = {
+    "street": "street",
+    "neighborhood": "neighborhood",
+    "city": "city",
+    "state": "state",
+}
+
+
+class CEPBackfillService:
+    """Completa logradouro, bairro, cidade e UF de usuários que têm CEP."""
+
+    DEFAULT_BATCH_SIZE = 200
+
+    @classmethod
+    async def backfill_user_addresses(
+        cls,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Percorre os usuários com CEP e endereço incompleto, em lotes por id.
+
+        Apenas campos vazios são preenchidos; dados informados pelo usuário
+        nunca são sobrescritos.
+
+        Args:
+            session_factory: Fábrica de sessões do banco
+            batch_size: Usuários por lote
+            concurrency: Máximo de consultas simultâneas de CEP
+
+        Returns:
+            Dict com usuários analisados, atualizados e CEPs não resolvidos
+        """
+        report = {
+            "scanned": 0,
+            "updated": 0,
+            "not_found": 0,
+            "invalid": 0,
+            "errors": 0,
+        }
+        last_id: Optional[str] = None
+
+        while True:
+            users = await asyncio.to_thread(
+                cls._next_batch, session_factory, last_id, batch_size
+            )
+            if not users:
+                break
+            last_id = users[-1]["id"]
+            report["scanned"] += len(users)
+
+            results = await CEPService.resolve_many(
+                [u["cep"] for u in users], concurrency=concurrency
+            )
+            updates = []
+            for user, result in zip(users, results):
+                status = result["status"]
+                if status == "found":
+                    changes = {
+                        field: result["data"][key]
+                        for field, key in ADDRESS_FIELDS.items()
+                        if not user[field] and result["data"].get(key)
+                    }
+                    if changes:
+                        updates.append((user["id"], changes))
+                elif status == "error":
+                    report["errors"] += 1
+                else:
+                    report[status] += 1
+
+            report["updated"] += await asyncio.to_thread(
+                cls._apply_updates, session_factory, updates
+            )
+            if len(users) < batch_size:
+                break
+
+        logger.info(f"Backfill de endereços concluído: {report}")
+        return report
+
+    @staticmethod
+    def _next_batch(
+        session_factory: Callable[[], Session], last_id: Optional[str], batch_size: int
+    ) -> List[Dict[str, Any]]:
+        incomplete = or_(
+            *(
+                or_(getattr(User, field).is_(None), getattr(User, field) == "")
+                for field in ADDRESS_FIELDS
+            )
+        )
+        query = select(
+            User.id, User.cep, *(getattr(User, f) for f in ADDRESS_FIELDS)
+        ).where(User.cep.isnot(None), User.cep != "", incomplete)
+        if last_id is not None:
+            query = query.where(User.id > last_id)
+
+        db = session_factory()
+        try:
+            rows = db.execute(query.order_by(User.id).limit(batch_size))
+            return [dict(row) for row in rows.mappings()]
+        finally:
+            db.close()
+
+    @staticmethod
+    def _apply_updates(session_factory: Callable[[], Session], updates: list) -> int:
+        if not updates:
+            return 0
+        db = session_factory()
+        updated = 0
+        try:
+            for user_id, changes in updates:
+                user = db.get(User, user_id)
+                if user is None:
+                    continue
+                # Revalida: o usuário pode ter editado o perfil durante a consulta
+                written = False
+                for field, value in changes.items():
+                    if not getattr(user, field):
+                        setattr(user, field, value)
+                        written = True
+                updated += written
+            db.commit()
+            return updated
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
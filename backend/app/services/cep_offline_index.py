@@ -0,0 +1,239 @@
+"""Base de CEPs offline em arquivo binário ordenado e mapeado em memória.
+
+O arquivo é gerado a partir de um dump CSV (ex.: DNE/ViaCEP) e tem o formato:
+
+    cabeçalho   <8sIQQ>  magic, quantidade, offset e tamanho das localidades
+    ceps        uint32[n]      CEPs ordenados (little-endian)
+    offsets     uint32[n + 1]  início de cada registro no bloco de registros
+    registros   <H localidade> + "logradouro\\x1fcomplemento\\x1fbairro" (UTF-8)
+    localidades JSON [[cidade, uf, ibge, ddd], ...]
+
+Cidade/UF/IBGE/DDD se repetem em milhares de CEPs, por isso ficam numa tabela
+de localidades referenciada por índice. A busca é um ``bisect`` direto sobre o
+vetor de CEPs mapeado, sem carregar o arquivo na memória do processo.
+"""
+
+import bisect
+import csv
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+MAGIC = b"CEPIDX01"
+HEADER = struct.Struct("<8sIQQ")
+LOCALITY = struct.Struct("<H")
+SEPARATOR = "\x1f"
+
+# Cabeçalhos aceitos no CSV, por campo
+COLUMN_ALIASES = {
+    "cep": ("cep",),
+    "street": ("logradouro", "street", "rua"),
+    "complement": ("complemento", "complement"),
+    "neighborhood": ("bairro", "neighborhood"),
+    "city": ("localidade", "cidade", "city", "municipio"),
+    "state": ("uf", "estado", "state"),
+    "ibge_code": ("ibge", "ibge_code", "codigo_ibge"),
+    "ddd": ("ddd",),
+}
+
+PathLike = Union[str, Path]
+
+
+def _resolve_columns(header: List[str]) -> Dict[str, int]:
+    normalized = [h.strip().lower() for h in header]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[field] = normalized.index(alias)
+                break
+    missing = {"cep", "city", "state"} - set(columns)
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes no CSV: {sorted(missing)}")
+    return columns
+
+
+def _read_csv(csv_path: PathLike, encoding: str) -> Iterable[Dict[str, str]]:
+    with open(csv_path, newline="", encoding=encoding) as fh:
+        sample = fh.read(4096)
+        fh.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;|\t")
+        reader = csv.reader(fh, dialect)
+        columns = _resolve_columns(next(reader))
+        for row in reader:
+            if not row:
+                continue
+            yield {
+                field: (row[i].strip() if i < len(row) else "")
+                for field, i in columns.items()
+            }
+
+
+def build_cep_index(
+    csv_path: PathLike, output_path: PathLike, encoding: str = "utf-8"
+) -> int:
+    """
+    Gera o arquivo binário de CEPs a partir de um dump CSV.
+
+    Linhas com CEP inválido são ignoradas; CEPs repetidos mantêm a última
+    ocorrência.
+
+    Args:
+        csv_path: Caminho do CSV de origem
+        output_path: Caminho do arquivo binário gerado
+        encoding: Codificação do CSV
+
+    Returns:
+        Quantidade de CEPs gravados
+    """
+    localities: Dict[Tuple[str, str, str, str], int] = {}
+    records: Dict[int, Tuple[int, str]] = {}
+
+    for row in _read_csv(csv_path, encoding):
+        cep = "".join(ch for ch in row["cep"] if ch.isdigit())
+        if len(cep) != 8:
+            continue
+        locality = (
+            row.get("city", ""),
+            row.get("state", "").upper(),
+            row.get("ibge_code", ""),
+            row.get("ddd", ""),
+        )
+        locality_id = localities.setdefault(locality, len(localities))
+        if locality_id > 0xFFFF:
+            raise ValueError("Quantidade de localidades excede o limite do formato")
+        text = SEPARATOR.join(
+            (
+                row.get("street", ""),
+                row.get("complement", ""),
+                row.get("neighborhood", ""),
+            )
+        )
+        records[int(cep)] = (locality_id, text)
+
+    ceps = array("I", sorted(records))
+    offsets = array("I", [0])
+    blob = bytearray()
+    for cep in ceps:
+        locality_id, text = records[cep]
+        blob += LOCALITY.pack(locality_id)
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+    if len(blob) > 0xFFFFFFFF:
+        raise ValueError("Bloco de registros excede o limite do formato")
+
+    if sys.byteorder != "little":
+        ceps.byteswap()
+        offsets.byteswap()
+
+    # dicts preservam a ordem de inserção, que é a ordem dos ids
+    locality_bytes = json.dumps(
+        [list(locality) for locality in localities], ensure_ascii=False
+    ).encode("utf-8")
+    locality_offset = HEADER.size + 4 * len(ceps) + 4 * len(offsets) + len(blob)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, len(ceps), locality_offset, len(locality_bytes)))
+        out.write(ceps.tobytes())
+        out.write(offsets.tobytes())
+        out.write(blob)
+        out.write(locality_bytes)
+    # Troca atômica: processos com o arquivo antigo mapeado não são afetados
+    tmp_path.replace(output_path)
+    return len(ceps)
+
+
+class CEPOfflineIndex:
+    """Consulta de CEPs sobre o arquivo binário mapeado em memória."""
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Arquivo de CEPs vazio: {self.path}")
+
+        try:
+            magic, count, locality_offset, locality_length = HEADER.unpack_from(
+                self._mm, 0
+            )
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Arquivo de CEPs inválido: {self.path}")
+
+        self.count = count
+        ceps_start = HEADER.size
+        offsets_start = ceps_start + 4 * count
+        self._records_start = offsets_start + 4 * (count + 1)
+
+        view = memoryview(self._mm)
+        if sys.byteorder == "little":
+            self._ceps = view[ceps_start:offsets_start].cast("I")
+            self._offsets = view[offsets_start:self._records_start].cast("I")
+        else:
+            # Em big-endian os vetores são convertidos uma vez para a memória
+            self._ceps = array("I")
+            self._ceps.frombytes(view[ceps_start:offsets_start])
+            self._offsets = array("I")
+            self._offsets.frombytes(view[offsets_start:self._records_start])
+            self._ceps.byteswap()
+            self._offsets.byteswap()
+        view.release()
+
+        localities = self._mm[locality_offset : locality_offset + locality_length]
+        self._localities = [
+            tuple(locality) for locality in json.loads(localities.decode("utf-8"))
+        ]
+
+    def lookup(self, clean_cep: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um CEP (apenas dígitos) no arquivo.
+
+        Returns:
+            Dict no mesmo formato do CEPService ou None se o CEP não constar
+        """
+        key = int(clean_cep)
+        i = bisect.bisect_left(self._ceps, key)
+        if i >= self.count or self._ceps[i] != key:
+            return None
+
+        start = self._records_start + self._offsets[i]
+        end = self._records_start + self._offsets[i + 1]
+        (locality_id,) = LOCALITY.unpack_from(self._mm, start)
+        street, complement, neighborhood = (
+            self._mm[start + LOCALITY.size:end].decode("utf-8").split(SEPARATOR)
+        )
+        city, state, ibge_code, ddd = self._localities[locality_id]
+        return {
+            "cep": f"{clean_cep[:5]}-{clean_cep[5:]}",
+            "street": street,
+            "complement": complement,
+            "neighborhood": neighborhood,
+            "city": city,
+            "state": state,
+            "ibge_code": ibge_code,
+            "ddd": ddd,
+        }
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        for name in ("_ceps", "_offsets"):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
@@ -1,10 +1,26 @@
 """Serviço para integração com API ViaCEP para autocompletar endereços."""
 
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 import logging
 
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import record_cache
+from app.models.cep_cache import CepCache
+from app.services.cep_offline_index import CEPOfflineIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,11 +41,86 @@ class AddressData(BaseModel):
 
 
 class CEPService:
-    """Serviço para consulta de CEP via API ViaCEP."""
+    """Serviço para consulta de CEP via API ViaCEP.
+
+    As consultas passam por um cache em dois níveis: um LRU em memória e a
+    tabela ``cep_cache`` (com TTL e cache negativo para CEPs inexistentes).
+    Consultas simultâneas do mesmo CEP compartilham uma única chamada ao
+    ViaCEP, feita por um cliente HTTP com pool de conexões reaproveitado.
 
-    BASE_URL = "https://viacep.com.br/ws"
+    Com ``CEP_OFFLINE_DATASET`` configurado, a base offline mapeada em memória
+    é consultada antes de tudo; o ViaCEP só é usado quando o CEP não consta nela.
+    """
+
+    BASE_URL = settings.VIACEP_BASE_URL
     TIMEOUT = 10.0
 
+    # Sessões para o cache persistente (substituível em testes)
+    session_factory: Callable[[], Session] = SessionLocal
+
+    _client: Optional[httpx.AsyncClient] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
+    _memory: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+    _inflight: Dict[str, "asyncio.Task"] = {}
+    # Acesso ao cache persistente roda em threads; só o SQLite em memória
+    # (StaticPool) compartilha uma conexão entre elas e precisa ser serializado
+    _persistent_lock = threading.Lock()
+    _offline: Optional[CEPOfflineIndex] = None
+    _offline_checked = False
+
+    @classmethod
+    async def startup(
+        cls, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        """Cria o cliente HTTP compartilhado (chamado no startup da aplicação)."""
+        await cls._close_client()
+        cls._client = cls._build_client(transport)
+        cls._client_loop = asyncio.get_running_loop()
+        cls._get_offline_index()
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Fecha o cliente HTTP compartilhado e a base offline."""
+        await cls._close_client()
+        cls.close_offline_dataset()
+
+    @classmethod
+    async def _close_client(cls) -> None:
+        client, cls._client = cls._client, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    @classmethod
+    def load_offline_dataset(cls, path: str) -> int:
+        """Abre a base offline de CEPs gerada por ``build_cep_index``.
+
+        Args:
+            path: Caminho do arquivo binário
+
+        Returns:
+            Quantidade de CEPs disponíveis offline
+        """
+        index = CEPOfflineIndex(path)
+        previous, cls._offline = cls._offline, index
+        cls._offline_checked = True
+        if previous is not None:
+            previous.close()
+        logger.info(f"Base offline de CEP carregada: {len(index)} CEPs ({path})")
+        return len(index)
+
+    @classmethod
+    def close_offline_dataset(cls) -> None:
+        """Fecha a base offline; será reaberta sob demanda se configurada."""
+        index, cls._offline = cls._offline, None
+        cls._offline_checked = False
+        if index is not None:
+            index.close()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Esvazia o cache em memória (o persistente expira pelo TTL)."""
+        cls._memory.clear()
+
     @classmethod
     async def get_address_by_cep(cls, cep: str) -> Optional[Dict[str, Any]]:
         """Busca dados de endereço pelo CEP.
@@ -43,53 +134,276 @@ class CEPService:
         Raises:
             Exception: Em caso de erro na consulta
         """
-        try:
-            # Remove formatação do CEP
-            clean_cep = cls._clean_cep(cep)
+        # Remove formatação do CEP
+        clean_cep = cls._clean_cep(cep)
+
+        if not cls._validate_cep_format(clean_cep):
+            logger.warning(f"CEP inválido fornecido: {cep}")
+            return None
+
+        found, address = cls._local_lookup(clean_cep)
+        if found:
+            return address
+
+        # Single-flight: consultas simultâneas aguardam a mesma tarefa
+        task = cls._inflight.get(clean_cep)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(cls._resolve(clean_cep))
+            cls._inflight[clean_cep] = task
+            task.add_done_callback(partial(cls._forget_inflight, clean_cep))
 
+        address = await asyncio.shield(task)
+        return dict(address) if address else None
+
+    @classmethod
+    async def resolve_many(
+        cls, ceps: List[str], concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Resolve vários CEPs de uma vez.
+
+        CEPs repetidos são consultados uma única vez; acertos da base offline
+        e do cache em memória são respondidos na hora e as demais consultas
+        rodam em paralelo, limitadas por um semáforo.
+
+        Args:
+            ceps: CEPs a consultar (com ou sem formatação)
+            concurrency: Máximo de consultas simultâneas ao cache/ViaCEP
+
+        Returns:
+            Um item por CEP de entrada, na mesma ordem, com ``status`` igual a
+            found, not_found, invalid ou error
+        """
+        resolved: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, None] = {}
+        for cep in ceps:
+            clean_cep = cls._clean_cep(cep)
+            if clean_cep in resolved or clean_cep in pending:
+                continue
             if not cls._validate_cep_format(clean_cep):
-                logger.warning(f"CEP inválido fornecido: {cep}")
-                return None
+                resolved[clean_cep] = {"status": "invalid", "data": None}
+                continue
+            found, address = cls._local_lookup(clean_cep)
+            if found:
+                resolved[clean_cep] = cls._batch_item(address)
+            else:
+                pending[clean_cep] = None
+
+        semaphore = asyncio.Semaphore(concurrency or settings.CEP_BATCH_CONCURRENCY)
+
+        async def resolve(clean_cep: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return cls._batch_item(await cls.get_address_by_cep(clean_cep))
+                except Exception as e:
+                    return {"status": "error", "data": None, "detail": str(e)}
+
+        for clean_cep, item in zip(
+            pending, await asyncio.gather(*(resolve(c) for c in pending))
+        ):
+            resolved[clean_cep] = item
+
+        return [{"cep": cep, **resolved[cls._clean_cep(cep)]} for cep in ceps]
+
+    @staticmethod
+    def _batch_item(address: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if address:
+            return {"status": "found", "data": address}
+        return {"status": "not_found", "data": None}
+
+    @classmethod
+    def _local_lookup(cls, clean_cep: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Consulta base offline e cache em memória, sem I/O."""
+        offline = cls._get_offline_index()
+        if offline is not None:
+            address = offline.lookup(clean_cep)
+            if address:
+                record_cache("cep_offline", True)
+                return True, address
+
+        found, address = cls._memory_get(clean_cep)
+        record_cache("cep_memory", found)
+        if found:
+            return True, dict(address) if address else None
+        return False, None
+
+    @classmethod
+    def _get_offline_index(cls) -> Optional[CEPOfflineIndex]:
+        if cls._offline is None and not cls._offline_checked:
+            cls._offline_checked = True
+            if settings.CEP_OFFLINE_DATASET:
+                try:
+                    cls.load_offline_dataset(settings.CEP_OFFLINE_DATASET)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Base offline de CEP indisponível: {str(e)}")
+        return cls._offline
+
+    @classmethod
+    def _forget_inflight(cls, clean_cep: str, task: "asyncio.Task") -> None:
+        if cls._inflight.get(clean_cep) is task:
+            del cls._inflight[clean_cep]
 
+    @classmethod
+    async def _resolve(cls, clean_cep: str) -> Optional[Dict[str, Any]]:
+        """Consulta o cache persistente e, se preciso, o ViaCEP."""
+        found, address = await asyncio.to_thread(cls._load_persistent, clean_cep)
+        record_cache("cep_persistent", found)
+        if not found:
+            address = await cls._fetch_remote(clean_cep)
+            await asyncio.to_thread(
+                cls._store_persistent, clean_cep, address, cls._ttl_for(address)
+            )
+        cls._memory_put(clean_cep, address, cls._ttl_for(address))
+        return address
+
+    @classmethod
+    async def _fetch_remote(cls, clean_cep: str) -> Optional[Dict[str, Any]]:
+        """Consulta o ViaCEP usando o cliente compartilhado."""
+        try:
             url = f"{cls.BASE_URL}/{clean_cep}/json/"
 
-            async with httpx.AsyncClient(timeout=cls.TIMEOUT) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            response = await cls._get_client().get(url)
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                # Verifica se a API retornou erro
-                if data.get("erro"):
-                    logger.info(f"CEP não encontrado: {cep}")
-                    return None
+            # Verifica se a API retornou erro
+            if data.get("erro"):
+                logger.info(f"CEP não encontrado: {clean_cep}")
+                return None
 
-                # Valida e processa os dados
-                address_data = AddressData(**data)
+            # Valida e processa os dados
+            address_data = AddressData(**data)
 
-                return {
-                    "cep": cls._format_cep(address_data.cep),
-                    "street": address_data.logradouro,
-                    "complement": address_data.complemento,
-                    "neighborhood": address_data.bairro,
-                    "city": address_data.localidade,
-                    "state": address_data.uf,
-                    "ibge_code": address_data.ibge,
-                    "ddd": address_data.ddd,
-                }
+            return {
+                "cep": cls._format_cep(address_data.cep),
+                "street": address_data.logradouro,
+                "complement": address_data.complemento,
+                "neighborhood": address_data.bairro,
+                "city": address_data.localidade,
+                "state": address_data.uf,
+                "ibge_code": address_data.ibge,
+                "ddd": address_data.ddd,
+            }
 
         except httpx.TimeoutException:
-            logger.error(f"Timeout ao consultar CEP: {cep}")
+            logger.error(f"Timeout ao consultar CEP: {clean_cep}")
             raise Exception("Timeout na consulta do CEP. Tente novamente.")
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro HTTP ao consultar CEP {cep}: {e.response.status_code}")
+            logger.error(
+                f"Erro HTTP ao consultar CEP {clean_cep}: {e.response.status_code}"
+            )
             raise Exception("Erro na consulta do CEP. Serviço indisponível.")
 
         except Exception as e:
-            logger.error(f"Erro inesperado ao consultar CEP {cep}: {str(e)}")
+            logger.error(f"Erro inesperado ao consultar CEP {clean_cep}: {str(e)}")
             raise Exception("Erro interno na consulta do CEP.")
 
+    @classmethod
+    def _build_client(
+        cls, transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=cls.TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=transport,
+        )
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Retorna o cliente compartilhado, criando-o se o startup não rodou."""
+        loop = asyncio.get_running_loop()
+        if cls._client is None or cls._client.is_closed or cls._client_loop is not loop:
+            # Conexões do pool pertencem ao event loop em que foram abertas
+            cls._client = cls._build_client()
+            cls._client_loop = loop
+        return cls._client
+
+    @staticmethod
+    def _ttl_for(address: Optional[Dict[str, Any]]) -> timedelta:
+        """TTL longo para endereços encontrados e curto para CEPs inexistentes."""
+        if address:
+            return timedelta(days=settings.CEP_CACHE_TTL_DAYS)
+        return timedelta(hours=settings.CEP_NEGATIVE_CACHE_TTL_HOURS)
+
+    @classmethod
+    def _memory_get(cls, clean_cep: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        entry = cls._memory.get(clean_cep)
+        if entry is None:
+            return False, None
+        expires_at, address = entry
+        if expires_at <= time.monotonic():
+            cls._memory.pop(clean_cep, None)
+            return False, None
+        cls._memory.move_to_end(clean_cep)
+        return True, address
+
+    @classmethod
+    def _memory_put(
+        cls, clean_cep: str, address: Optional[Dict[str, Any]], ttl: timedelta
+    ) -> None:
+        cls._memory[clean_cep] = (time.monotonic() + ttl.total_seconds(), address)
+        cls._memory.move_to_end(clean_cep)
+        while len(cls._memory) > settings.CEP_MEMORY_CACHE_SIZE:
+            cls._memory.popitem(last=False)
+
+    @classmethod
+    def _load_persistent(cls, clean_cep: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Lê o CEP de ``cep_cache``; falhas do cache não impedem a consulta."""
+        try:
+            return cls._read_cache_row(clean_cep)
+        except SQLAlchemyError as e:
+            logger.warning(f"Cache de CEP indisponível: {str(e)}")
+            return False, None
+
+    @classmethod
+    def _read_cache_row(cls, clean_cep: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        db = cls.session_factory()
+        with cls._serialized(db):
+            try:
+                row = db.get(CepCache, clean_cep)
+                if row is None or row.expires_at <= datetime.utcnow():
+                    return False, None
+                return True, row.data
+            finally:
+                db.close()
+
+    @classmethod
+    def _store_persistent(
+        cls, clean_cep: str, address: Optional[Dict[str, Any]], ttl: timedelta
+    ) -> None:
+        try:
+            cls._write_cache_row(clean_cep, address, ttl)
+        except SQLAlchemyError as e:
+            logger.warning(f"Falha ao gravar cache de CEP: {str(e)}")
+
+    @classmethod
+    def _write_cache_row(
+        cls, clean_cep: str, address: Optional[Dict[str, Any]], ttl: timedelta
+    ) -> None:
+        db = cls.session_factory()
+        with cls._serialized(db):
+            try:
+                now = datetime.utcnow()
+                db.merge(
+                    CepCache(
+                        cep=clean_cep, data=address, fetched_at=now, expires_at=now + ttl
+                    )
+                )
+                db.commit()
+            except SQLAlchemyError:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    @classmethod
+    def _serialized(cls, db: Session):
+        """Trava global só para a conexão única do StaticPool; nos demais bancos, nenhuma."""
+        if isinstance(db.get_bind().pool, StaticPool):
+            return cls._persistent_lock
+        return nullcontext()
+
     @classmethod
     def search_cep_by_address(cls, state: str, city: str, street: str) -> str:
         """Busca CEP por endereço (funcionalidade futura).
@@ -0,0 +1,80 @@
+"""Migrações de dados versionadas, executadas uma única vez na inicialização.
+
+Cada migração tem uma versão única registrada na tabela ``data_migrations``
+na mesma transação em que é aplicada. Nas inicializações seguintes o custo é
+uma única consulta às versões já aplicadas, independente do tamanho das
+tabelas de negócio.
+
+Quando vários workers sobem ao mesmo tempo, a chave primária da versão
+garante que só um deles aplique a migração; os demais recebem violação de
+unicidade, desfazem a transação e seguem.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.data_migration import DataMigration
+from app.models.user import User
+from app.services.earnings_sketch_service import EarningsSketchService
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_user_roles(db: Session) -> int:
+    """Atribui role USER a registros legados sem role, em um único UPDATE."""
+    result = db.execute(
+        update(User)
+        .where(User.role.is_(None))
+        .values(role="USER")
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+class DataMigrationService:
+    """Registro e execução das migrações de dados."""
+
+    # Em ordem de aplicação; versões nunca devem ser renomeadas ou removidas
+    MIGRATIONS: List[Tuple[str, Callable[[Session], int]]] = [
+        ("20261019_01_backfill_user_roles", backfill_user_roles),
+        ("20261019_02_build_earnings_sketches", EarningsSketchService.rebuild),
+    ]
+
+    @staticmethod
+    def applied_versions(db: Session) -> set:
+        return set(db.execute(select(DataMigration.version)).scalars())
+
+    @classmethod
+    def run_pending(cls, db: Session) -> Dict[str, int]:
+        """
+        Aplica as migrações ainda não registradas.
+
+        Returns:
+            Dicionário versão -> linhas afetadas, apenas das migrações aplicadas
+        """
+        applied = cls.applied_versions(db)
+        results: Dict[str, int] = {}
+        for version, migration in cls.MIGRATIONS:
+            if version in applied:
+                continue
+            try:
+                # Registrar a versão antes de aplicar serializa workers concorrentes
+                db.add(DataMigration(version=version, applied_at=datetime.utcnow()))
+                db.flush()
+                affected = migration(db)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                logger.info(f"Migração de dados {version} aplicada por outro processo")
+                continue
+            except Exception:
+                db.rollback()
+                raise
+            results[version] = affected
+            logger.info(f"Migração de dados {version} aplicada ({affected} linhas)")
+        return results
@@ -0,0 +1,280 @@
+"""Análises vetorizadas dos ganhos do motorista.
+
+As corridas (lançamentos INCOME) de um usuário são carregadas uma única vez em
+arrays NumPy por coluna (data, líquido, bruto, taxa, km, minutos, plataforma,
+turno, cidade) e mantidas em cache por usuário até a próxima escrita de
+lançamento. A partir delas, cada relatório é calculado em uma passada
+vetorizada com ``np.bincount``, sem GROUP BY por dimensão no banco:
+
+- heatmap hora do dia × dia da semana de ganho por hora e por km
+- comparação entre plataformas e divisão por turno e cidade
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.metrics import record_cache
+from app.models.entry import Entry, EntryType
+from app.services.cache_invalidation_service import CacheInvalidationService
+
+# Tópico publicado pelas escritas de lançamentos (chave: ID do usuário)
+ENTRIES_TOPIC = "entries"
+
+WEEKDAYS = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+
+
+class RideColumns:
+    """Corridas de um usuário em arrays paralelos (uma posição por corrida)."""
+
+    __slots__ = (
+        "day",
+        "weekday",
+        "hour",
+        "net",
+        "gross",
+        "fee",
+        "km",
+        "minutes",
+        "platform",
+        "platforms",
+        "shift",
+        "shifts",
+        "city",
+        "cities",
+    )
+
+    def __init__(self, rows):
+        rows = list(rows)
+        n = len(rows)
+        # Minutos desde o ordinal do calendário, sem fuso: hora e dia da semana
+        # seguem o horário gravado (uma passada em Python, o resto é vetorizado)
+        stamps = np.fromiter(
+            (r.date.toordinal() * 1440 + r.date.hour * 60 + r.date.minute for r in rows),
+            dtype=np.int64,
+            count=n,
+        )
+        self.day = stamps // 1440
+        # O ordinal 1 (01/01/0001) foi uma segunda-feira (0)
+        self.weekday = ((self.day + 6) % 7).astype(np.int8)
+        self.hour = ((stamps % 1440) // 60).astype(np.int8)
+        self.net = np.fromiter((r.net for r in rows), dtype=np.float64, count=n)
+        self.gross = np.fromiter((r.gross for r in rows), dtype=np.float64, count=n)
+        self.fee = np.fromiter((r.fee for r in rows), dtype=np.float64, count=n)
+        self.km = np.fromiter((r.km for r in rows), dtype=np.float64, count=n)
+        self.minutes = np.fromiter((r.minutes for r in rows), dtype=np.float64, count=n)
+        self.platforms, self.platform = _encode([r.platform for r in rows])
+        self.shifts, self.shift = _encode([r.shift_tag for r in rows])
+        self.cities, self.city = _encode([r.city for r in rows])
+
+    def __len__(self) -> int:
+        return len(self.net)
+
+    def mask(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        platform: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """Máscara booleana dos filtros informados (None = todas as corridas)."""
+        selected = None
+        if start_date:
+            selected = self.day >= start_date.toordinal()
+        if end_date:
+            upper = self.day <= end_date.toordinal()
+            selected = upper if selected is None else selected & upper
+        if platform:
+            code = self.platforms.index(platform) if platform in self.platforms else -1
+            match = self.platform == code
+            selected = match if selected is None else selected & match
+        return selected
+
+
+def _encode(values: List[Optional[str]]):
+    """Codifica uma coluna categórica em (rótulos, códigos int32)."""
+    labels: Dict[str, int] = {}
+    codes = np.fromiter(
+        (labels.setdefault(v or "", len(labels)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return list(labels), codes
+
+
+def _group_totals(cols: RideColumns, codes: np.ndarray, size: int, selected) -> Dict[str, np.ndarray]:
+    """Somatórios por grupo em uma passada (bincount por coluna)."""
+    if selected is not None:
+        codes = codes[selected]
+
+    def total(values):
+        if selected is not None:
+            values = values[selected]
+        return np.bincount(codes, weights=values, minlength=size)
+
+    return {
+        "rides": np.bincount(codes, minlength=size),
+        "net": total(cols.net),
+        "gross": total(cols.gross),
+        "fee": total(cols.fee),
+        "km": total(cols.km),
+        "hours": total(cols.minutes) / 60,
+    }
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(numerator, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return np.round(out, 2)
+
+
+def _breakdown(cols: RideColumns, codes, labels, selected, key: str) -> List[dict]:
+    totals = _group_totals(cols, codes, len(labels), selected)
+    earn_per_hour = _ratio(totals["net"], totals["hours"])
+    earn_per_km = _ratio(totals["net"], totals["km"])
+    fee_pct = _ratio(totals["fee"] * 100, totals["gross"])
+    avg_ticket = _ratio(totals["net"], totals["rides"].astype(np.float64))
+    items = []
+    for i in np.argsort(-totals["net"], kind="stable"):
+        if not totals["rides"][i]:
+            continue
+        items.append({
+            key: labels[i] or None,
+            "rides": int(totals["rides"][i]),
+            "net": round(float(totals["net"][i]), 2),
+            "gross": round(float(totals["gross"][i]), 2),
+            "fee": round(float(totals["fee"][i]), 2),
+            "fee_pct": float(fee_pct[i]),
+            "km": round(float(totals["km"][i]), 2),
+            "hours": round(float(totals["hours"][i]), 2),
+            "earn_per_hour": float(earn_per_hour[i]),
+            "earn_per_km": float(earn_per_km[i]),
+            "avg_ticket": float(avg_ticket[i]),
+        })
+    return items
+
+
+class DriverAnalyticsService:
+    """Cache de colunas por usuário e relatórios calculados sobre ele."""
+
+    # Usuários mantidos em memória por engine (os menos usados saem primeiro)
+    MAX_CACHED_USERS = 256
+
+    # Chaveado pela engine para que bancos distintos (ex.: testes) não se misturem
+    _columns: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    _generation = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_columns(cls, db: Session, user_id: str) -> RideColumns:
+        """Colunas das corridas do usuário, lidas do banco apenas em cache miss."""
+        bind = db.get_bind()
+        with cls._lock:
+            per_user = cls._columns.get(bind)
+            cols = per_user.get(user_id) if per_user is not None else None
+            if cols is not None:
+                per_user.move_to_end(user_id)
+        record_cache("driver_analytics", cols is not None)
+        if cols is not None:
+            return cols
+
+        generation = cls._generation
+        cols = RideColumns(cls._load_rows(db, user_id))
+        with cls._lock:
+            # Não publicar colunas lidas antes de uma invalidação concorrente
+            if generation == cls._generation:
+                per_user = cls._columns.setdefault(bind, OrderedDict())
+                per_user[user_id] = cols
+                while len(per_user) > cls.MAX_CACHED_USERS:
+                    per_user.popitem(last=False)
+        return cols
+
+    @staticmethod
+    def _load_rows(db: Session, user_id: str):
+        return db.query(
+            Entry.date.label("date"),
+            func.coalesce(Entry.net_amount, Entry.amount, 0).label("net"),
+            func.coalesce(Entry.gross_amount, 0).label("gross"),
+            func.coalesce(Entry.platform_fee, 0).label("fee"),
+            func.coalesce(Entry.distance_km, 0).label("km"),
+            func.coalesce(Entry.duration_min, 0).label("minutes"),
+            Entry.platform,
+            Entry.shift_tag,
+            Entry.city,
+        ).filter(
+            Entry.user_id == user_id,
+            Entry.is_deleted.is_(False),
+            Entry.type == EntryType.INCOME,
+            Entry.date.isnot(None),
+        ).all()
+
+    @classmethod
+    def invalidate(cls, user_id: Optional[str] = None) -> None:
+        """Descarta as colunas do usuário (ou de todos); chamar após escrever lançamentos."""
+        with cls._lock:
+            cls._generation += 1
+            if user_id is None:
+                cls._columns.clear()
+                return
+            for per_user in cls._columns.values():
+                per_user.pop(user_id, None)
+
+    @classmethod
+    def heatmap(
+        cls,
+        db: Session,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        platform: Optional[str] = None,
+    ) -> dict:
+        """Matrizes 7 × 24 (dia da semana × hora) de ganho, tempo e km.
+
+        Returns:
+            Dict com ``weekdays``, ``hours`` e as matrizes ``net``, ``rides``,
+            ``hours_worked``, ``km``, ``earn_per_hour`` e ``earn_per_km``
+        """
+        cols = cls.get_columns(db, user_id)
+        selected = cols.mask(start_date, end_date, platform)
+        cell = cols.weekday.astype(np.int32) * 24 + cols.hour
+        totals = _group_totals(cols, cell, 7 * 24, selected)
+
+        def grid(values: np.ndarray) -> List[List[float]]:
+            return np.round(values, 2).reshape(7, 24).tolist()
+
+        return {
+            "weekdays": WEEKDAYS,
+            "hours": list(range(24)),
+            "rides": totals["rides"].reshape(7, 24).tolist(),
+            "net": grid(totals["net"]),
+            "hours_worked": grid(totals["hours"]),
+            "km": grid(totals["km"]),
+            "earn_per_hour": grid(_ratio(totals["net"], totals["hours"])),
+            "earn_per_km": grid(_ratio(totals["net"], totals["km"])),
+            "total_rides": int(totals["rides"].sum()),
+        }
+
+    @classmethod
+    def platforms(
+        cls,
+        db: Session,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> dict:
+        """Comparação entre plataformas e divisão por turno e cidade."""
+        cols = cls.get_columns(db, user_id)
+        selected = cols.mask(start_date, end_date)
+        return {
+            "platforms": _breakdown(cols, cols.platform, cols.platforms, selected, "platform"),
+            "shifts": _breakdown(cols, cols.shift, cols.shifts, selected, "shift_tag"),
+            "cities": _breakdown(cols, cols.city, cols.cities, selected, "city"),
+        }
+
+
+CacheInvalidationService.subscribe(ENTRIES_TOPIC, DriverAnalyticsService.invalidate)
@@ -0,0 +1,364 @@
+"""Percentis dos ganhos por corrida, por km e por hora sem ler as corridas.
+
+Para cada usuário e mês, a tabela ``earnings_sketches`` guarda um
+:class:`QuantileSketch` por métrica. Os sketches são atualizados
+incrementalmente nos eventos de inserção, edição e exclusão de ``Entry``, na
+mesma transação do lançamento: edições removem a contribuição antiga e
+adicionam a nova, sem reprocessar o mês.
+
+Uma consulta de percentis sobre um intervalo de meses lê uma linha por mês e
+mescla os sketches em memória (dezenas de microssegundos por métrica e mês).
+O valor retornado difere do percentil exato em no máximo ``RELATIVE_ACCURACY``
+(1%) relativo; veja ``quantile_sketch``.
+
+Atualizações em massa (``query.update``/``delete``) não disparam os eventos do
+ORM; depois delas use :meth:`EarningsSketchService.rebuild`.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, event, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.earnings_sketch import EarningsSketch
+from app.models.entry import EARNINGS_ATTRIBUTES, Entry, EntryType
+from app.services.quantile_sketch import QuantileSketch
+
+RELATIVE_ACCURACY = 0.01
+METRICS = ("per_ride", "per_km", "per_hour")
+
+# Meses por SELECT/INSERT/UPDATE em apply() (2 parâmetros por mês no IN)
+APPLY_CHUNK = 400
+
+# (usuário, mês, {métrica: valor}) de uma corrida
+Contribution = Tuple[str, str, Dict[str, float]]
+
+_table = EarningsSketch.__table__
+
+
+def ride_contribution(
+    user_id: Optional[str],
+    when: Optional[datetime],
+    entry_type: Optional[str],
+    is_deleted: Optional[bool],
+    net: Optional[float],
+    km: Optional[float],
+    minutes: Optional[float],
+) -> Optional[Contribution]:
+    """Valores que uma corrida soma aos sketches do seu mês (None se não conta)."""
+    if is_deleted or entry_type != EntryType.INCOME or when is None or user_id is None or net is None:
+        return None
+    values = {"per_ride": float(net)}
+    if km:
+        values["per_km"] = float(net) / float(km)
+    if minutes:
+        values["per_hour"] = float(net) / (float(minutes) / 60)
+    return user_id, when.strftime("%Y-%m"), values
+
+
+def row_contribution(row: Mapping[str, Any]) -> Optional[Contribution]:
+    """Contribuição de uma linha de ``entries`` lida pelo Core (ex.: RETURNING)."""
+    net = row["net_amount"]
+    if net is None:
+        net = row["amount"]
+    return ride_contribution(
+        row["user_id"],
+        row["date"],
+        row["type"],
+        row["is_deleted"],
+        net,
+        row["distance_km"],
+        row["duration_min"],
+    )
+
+
+def _entry_contribution(entry: Entry, previous: bool = False) -> Optional[Contribution]:
+    """Contribuição atual do lançamento ou, com ``previous``, a de antes da edição."""
+    state = inspect(entry)
+
+    def value(attr: str):
+        if previous:
+            history = state.attrs[attr].history
+            if history.deleted:
+                return history.deleted[0]
+        return getattr(entry, attr)
+
+    net = value("net_amount")
+    if net is None:
+        net = value("amount")
+    return ride_contribution(
+        value("user_id"),
+        value("date"),
+        value("type"),
+        value("is_deleted"),
+        net,
+        value("distance_km"),
+        value("duration_min"),
+    )
+
+
+def _label(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+class EarningsSketchService:
+    """Manutenção e consulta dos sketches mensais de ganhos."""
+
+    @staticmethod
+    def empty_sketches() -> Dict[str, QuantileSketch]:
+        return {metric: QuantileSketch(RELATIVE_ACCURACY) for metric in METRICS}
+
+    @classmethod
+    def apply(
+        cls,
+        connection: Connection,
+        removed: Iterable[Contribution] = (),
+        added: Iterable[Contribution] = (),
+    ) -> None:
+        """
+        Aplica contribuições removidas/adicionadas.
+
+        Os meses afetados são lidos, criados e gravados em lote (um SELECT, um
+        INSERT e um UPDATE por bloco de ``APPLY_CHUNK`` meses), em ordem de chave
+        para que escritores concorrentes travem as linhas na mesma ordem.
+        """
+        changes: Dict[Tuple[str, str], List[Tuple[Dict[str, float], int]]] = defaultdict(list)
+        for user_id, month, values in removed:
+            changes[(user_id, month)].append((values, -1))
+        for user_id, month, values in added:
+            changes[(user_id, month)].append((values, 1))
+
+        keys = sorted(changes)
+        for offset in range(0, len(keys), APPLY_CHUNK):
+            chunk = keys[offset:offset + APPLY_CHUNK]
+            rows = cls._locked_rows(connection, chunk)
+            missing = [key for key in chunk if key not in rows]
+            if missing:
+                cls._insert_ignore(connection, missing)
+                rows.update(cls._locked_rows(connection, missing))
+
+            now = datetime.utcnow()
+            updates, deletes = [], []
+            for key in chunk:
+                sketches = {
+                    metric: QuantileSketch.from_dict(rows[key].get(metric))
+                    for metric in METRICS
+                }
+                for values, count in changes[key]:
+                    for metric, metric_value in values.items():
+                        sketches[metric].add(metric_value, count)
+                rides = sketches["per_ride"].count
+                if rides == 0:
+                    deletes.append(key)
+                    continue
+                updates.append({
+                    "key_user_id": key[0],
+                    "key_month": key[1],
+                    "sketches": {m: s.to_dict() for m, s in sketches.items()},
+                    "rides": rides,
+                    "updated_at": now,
+                })
+            if deletes:
+                connection.execute(
+                    delete(_table).where(tuple_(_table.c.user_id, _table.c.month).in_(deletes))
+                )
+            if updates:
+                connection.execute(
+                    update(_table)
+                    .where(
+                        _table.c.user_id == bindparam("key_user_id"),
+                        _table.c.month == bindparam("key_month"),
+                    )
+                    .values(
+                        sketches=bindparam("sketches"),
+                        rides=bindparam("rides"),
+                        updated_at=bindparam("updated_at"),
+                    ),
+                    updates,
+                )
+
+    @staticmethod
+    def _locked_rows(connection: Connection, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], dict]:
+        # FOR UPDATE serializa escritas concorrentes no mesmo mês (ignorado no SQLite,
+        # onde a transação já detém o lock de escrita ao chegar aqui)
+        result = connection.execute(
+            select(_table.c.user_id, _table.c.month, _table.c.sketches)
+            .where(tuple_(_table.c.user_id, _table.c.month).in_(keys))
+            .with_for_update()
+        )
+        return {(row.user_id, row.month): row.sketches for row in result}
+
+    @staticmethod
+    def _insert_ignore(connection: Connection, keys: List[Tuple[str, str]]) -> None:
+        now = datetime.utcnow()
+        values = [
+            dict(user_id=user_id, month=month, sketches={}, rides=0, updated_at=now)
+            for user_id, month in keys
+        ]
+        dialect_name = connection.dialect.name
+        if dialect_name == "postgresql":
+            stmt = postgresql.insert(_table).on_conflict_do_nothing()
+        elif dialect_name == "sqlite":
+            stmt = sqlite.insert(_table).on_conflict_do_nothing()
+        else:
+            stmt = insert(_table)
+        connection.execute(stmt, values)
+
+    @classmethod
+    def percentiles(
+        cls,
+        db: Session,
+        user_id: str,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        quantiles: Sequence[float] = (0.5, 0.9),
+    ) -> dict:
+        """
+        Percentis dos ganhos por corrida, por km e por hora em um intervalo de meses.
+
+        Args:
+            db: Sessão do banco de dados
+            user_id: ID do usuário
+            start_month: Primeiro mês ('AAAA-MM'), inclusive; None = sem limite
+            end_month: Último mês ('AAAA-MM'), inclusive; None = sem limite
+            quantiles: Quantis desejados, entre 0 e 1
+
+        Returns:
+            Dicionário com a contagem e os percentis (ex.: 'p50', 'p90') por métrica
+        """
+        query = select(EarningsSketch.sketches).where(EarningsSketch.user_id == user_id)
+        if start_month:
+            query = query.where(EarningsSketch.month >= start_month)
+        if end_month:
+            query = query.where(EarningsSketch.month <= end_month)
+        rows = db.execute(query).scalars().all()
+
+        merged = cls.empty_sketches()
+        for data in rows:
+            for metric in METRICS:
+                merged[metric].merge_dict(data.get(metric))
+
+        metrics = {}
+        for metric, sketch in merged.items():
+            values = sketch.quantiles(quantiles)
+            metrics[metric] = {"count": sketch.count}
+            for q, value in zip(quantiles, values):
+                metrics[metric][_label(q)] = round(value, 2) if value is not None else None
+        return {
+            "start_month": start_month,
+            "end_month": end_month,
+            "months": len(rows),
+            "relative_accuracy": RELATIVE_ACCURACY,
+            "metrics": metrics,
+        }
+
+    @classmethod
+    def rebuild(cls, db: Session, user_id: Optional[str] = None) -> int:
+        """
+        Recalcula os sketches a partir dos lançamentos (de um usuário ou de todos).
+
+        Lê as corridas em lotes, ordenadas por usuário, e grava os meses de cada
+        usuário assim que ele termina. Não faz commit. Retorna as linhas gravadas.
+        """
+        delete_stmt = delete(EarningsSketch)
+        query = select(
+            Entry.user_id,
+            Entry.date,
+            Entry.type,
+            Entry.is_deleted,
+            Entry.net_amount,
+            Entry.amount,
+            Entry.distance_km,
+            Entry.duration_min,
+        ).where(
+            Entry.type == EntryType.INCOME,
+            Entry.is_deleted.is_(False),
+            Entry.date.isnot(None),
+        )
+        if user_id is not None:
+            delete_stmt = delete_stmt.where(EarningsSketch.user_id == user_id)
+            query = query.where(Entry.user_id == user_id)
+        db.execute(delete_stmt)
+
+        written = 0
+        current_user = None
+        months: Dict[str, Dict[str, QuantileSketch]] = {}
+        result = db.execute(query.order_by(Entry.user_id).execution_options(yield_per=10_000))
+        for row in result:
+            contribution = ride_contribution(
+                row.user_id,
+                row.date,
+                row.type,
+                row.is_deleted,
+                row.net_amount if row.net_amount is not None else row.amount,
+                row.distance_km,
+                row.duration_min,
+            )
+            if contribution is None:
+                continue
+            row_user, month, values = contribution
+            if row_user != current_user:
+                written += cls._write_months(db, current_user, months)
+                current_user, months = row_user, {}
+            sketches = months.get(month)
+            if sketches is None:
+                sketches = months[month] = cls.empty_sketches()
+            for metric, metric_value in values.items():
+                sketches[metric].add(metric_value)
+        written += cls._write_months(db, current_user, months)
+        return written
+
+    @staticmethod
+    def _write_months(db: Session, user_id: Optional[str], months: Dict[str, Dict[str, QuantileSketch]]) -> int:
+        if not months:
+            return 0
+        now = datetime.utcnow()
+        db.execute(
+            insert(EarningsSketch),
+            [
+                {
+                    "user_id": user_id,
+                    "month": month,
+                    "sketches": {m: s.to_dict() for m, s in sketches.items()},
+                    "rides": sketches["per_ride"].count,
+                    "updated_at": now,
+                }
+                for month, sketches in months.items()
+            ],
+        )
+        return len(months)
+
+
+# Atributos que definem a contribuição de uma corrida (com active_history no modelo)
+TRACKED_ATTRIBUTES = EARNINGS_ATTRIBUTES
+
+
+@event.listens_for(Entry, "after_insert")
+def _on_entry_insert(mapper, connection, target):
+    added = _entry_contribution(target)
+    if added:
+        EarningsSketchService.apply(connection, added=[added])
+
+
+@event.listens_for(Entry, "after_update")
+def _on_entry_update(mapper, connection, target):
+    removed = _entry_contribution(target, previous=True)
+    added = _entry_contribution(target)
+    if removed == added:
+        return
+    EarningsSketchService.apply(
+        connection,
+        removed=[removed] if removed else [],
+        added=[added] if added else [],
+    )
+
+
+@event.listens_for(Entry, "after_delete")
+def _on_entry_delete(mapper, connection, target):
+    removed = _entry_contribution(target, previous=True)
+    if removed:
+        EarningsSketchService.apply(connection, removed=[removed])
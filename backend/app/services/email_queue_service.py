@@ -0,0 +1,450 @@
+"""Fila persistente de emails com envio em segundo plano.
+
+As rotas apenas gravam a mensagem na tabela ``email_outbox``, na mesma
+transação da alteração que a originou, e retornam. Um laço em background
+reserva lotes de mensagens pendentes e as envia por um pool de conexões SMTP
+já autenticadas, evitando o custo de conexão + STARTTLS + login por email.
+Falhas temporárias são reagendadas com backoff exponencial; erros permanentes,
+o esgotamento das tentativas ou o fim do prazo (``EMAIL_QUEUE_MESSAGE_TTL_HOURS``)
+movem a mensagem para ``DEAD``. O corpo, que pode conter a senha temporária, é
+apagado tanto no envio quanto no descarte.
+"""
+
+import asyncio
+import logging
+import random
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import Message
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.outbound_email import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+_NOTIFY_KEY = "email_outbox_notify"
+
+
+class SMTPConnectionPool:
+    """Pool de conexões SMTP autenticadas, seguro para uso entre threads."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        starttls: bool = True,
+        size: int = 2,
+        timeout: float = 30.0,
+        max_idle_seconds: float = 60.0,
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        if size <= 0:
+            raise ValueError("size deve ser maior que zero")
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.timeout = timeout
+        self.max_idle_seconds = max_idle_seconds
+        self.tls_context = tls_context
+        self.connections_opened = 0
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls) -> "SMTPConnectionPool":
+        return cls(
+            settings.SMTP_SERVER,
+            settings.SMTP_PORT,
+            settings.SMTP_USERNAME,
+            settings.SMTP_PASSWORD,
+            starttls=settings.SMTP_STARTTLS,
+            size=settings.SMTP_POOL_SIZE,
+        )
+
+    def send(self, msg: Message) -> None:
+        """Envia a mensagem por uma conexão do pool, abrindo uma se preciso."""
+        with self._slots:
+            conn, reused = self._checkout()
+            try:
+                self._send_on(conn, msg)
+            except smtplib.SMTPServerDisconnected:
+                if not reused:
+                    raise
+                # Conexão ociosa derrubada pelo servidor: uma nova tentativa
+                self._send_on(self._connect(), msg)
+
+    def close(self) -> None:
+        """Encerra as conexões ociosas; as em uso são encerradas ao retornar."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                conn.starttls(context=self.tls_context)
+            if self.username:
+                conn.login(self.username, self.password)
+        except BaseException:
+            conn.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _checkout(self) -> Tuple[smtplib.SMTP, bool]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if time.monotonic() - last_used <= self.max_idle_seconds:
+                return conn, True
+            # Ociosa há muito tempo: confirma que o servidor ainda a mantém
+            try:
+                if conn.noop()[0] == 250:
+                    return conn, True
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard(conn)
+        return self._connect(), False
+
+    def _send_on(self, conn: smtplib.SMTP, msg: Message) -> None:
+        try:
+            conn.send_message(msg)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+            # O smtplib já executou RSET; a sessão segue válida se não foi fechada
+            self._release(conn)
+            raise
+        except BaseException:
+            self._discard(conn)
+            raise
+        self._release(conn)
+
+    def _release(self, conn: smtplib.SMTP) -> None:
+        if conn.sock is None:
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._discard(conn)
+
+    @staticmethod
+    def _discard(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+
+class EmailQueueService:
+    """Enfileiramento, reserva e envio das mensagens da tabela email_outbox."""
+
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    DEAD = "DEAD"
+
+    MAX_BACKOFF_SECONDS = 3600
+    EXPIRED_ERROR = "Prazo de envio esgotado"
+    # Reservas mais antigas que isto (worker interrompido) voltam para a fila
+    LOCK_TIMEOUT_SECONDS = 300
+
+    _wakeup: Optional[asyncio.Event] = None
+    _wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def enqueue(
+        cls, db: Session, to_email: str, subject: str, body: str
+    ) -> OutboundEmail:
+        """
+        Adiciona uma mensagem à fila na transação corrente.
+
+        Não faz commit: a mensagem só fica visível para o worker junto com as
+        demais alterações de quem chamou, e some se a transação for desfeita.
+        """
+        now = datetime.utcnow()
+        message = OutboundEmail(
+            to_email=to_email,
+            subject=subject,
+            body=body,
+            status=cls.PENDING,
+            attempts=0,
+            next_attempt_at=now,
+            expires_at=now + timedelta(hours=settings.EMAIL_QUEUE_MESSAGE_TTL_HOURS),
+        )
+        db.add(message)
+        db.info[_NOTIFY_KEY] = True
+        return message
+
+    @classmethod
+    def expire_overdue(cls, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Descarta (``DEAD``, sem corpo) as mensagens que passaram do prazo sem envio.
+
+        Inclui as reservas abandonadas; as reservas em andamento seguem com o
+        worker que as detém.
+
+        Returns:
+            Quantidade de mensagens descartadas
+        """
+        now = now or datetime.utcnow()
+        stale = now - timedelta(seconds=cls.LOCK_TIMEOUT_SECONDS)
+        result = db.execute(
+            update(OutboundEmail)
+            .where(
+                OutboundEmail.expires_at <= now,
+                or_(
+                    OutboundEmail.status == cls.PENDING,
+                    and_(
+                        OutboundEmail.status == cls.SENDING,
+                        OutboundEmail.locked_at < stale,
+                    ),
+                ),
+            )
+            .values(
+                status=cls.DEAD,
+                body=None,
+                last_error=cls.EXPIRED_ERROR,
+                locked_by=None,
+                locked_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount or 0
+
+    @classmethod
+    def claim_batch(
+        cls, db: Session, batch_size: int, worker_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Reserva até ``batch_size`` mensagens vencidas para este worker.
+
+        Returns:
+            Lista de dicts com os dados de cada mensagem reservada
+        """
+        token = worker_id or uuid4().hex
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=cls.LOCK_TIMEOUT_SECONDS)
+        candidates = (
+            select(OutboundEmail.id)
+            .where(
+                or_(
+                    and_(
+                        OutboundEmail.status == cls.PENDING,
+                        OutboundEmail.next_attempt_at <= now,
+                    ),
+                    and_(
+                        OutboundEmail.status == cls.SENDING,
+                        OutboundEmail.locked_at < stale,
+                    ),
+                )
+            )
+            .order_by(OutboundEmail.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        db.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.id.in_(candidates))
+            .values(status=cls.SENDING, locked_by=token, locked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(
+            select(
+                OutboundEmail.id,
+                OutboundEmail.to_email,
+                OutboundEmail.subject,
+                OutboundEmail.body,
+                OutboundEmail.attempts,
+            ).where(
+                OutboundEmail.locked_by == token,
+                OutboundEmail.status == cls.SENDING,
+            )
+        ).all()
+        db.commit()
+        return [dict(row._mapping, locked_by=token) for row in rows]
+
+    @classmethod
+    def process_batch(
+        cls,
+        pool: SMTPConnectionPool,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Reserva um lote, envia as mensagens em paralelo e registra o resultado.
+
+        Returns:
+            Dict com quantidades reservadas, enviadas, reagendadas, descartadas
+            e expiradas
+        """
+        from app.services.email_service import email_service
+
+        batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+        max_attempts = max_attempts or settings.EMAIL_QUEUE_MAX_ATTEMPTS
+        report = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0, "expired": 0}
+
+        with session_factory() as db:
+            report["expired"] = cls.expire_overdue(db)
+            messages = cls.claim_batch(db, batch_size)
+        report["claimed"] = len(messages)
+        if not messages:
+            return report
+
+        def _send(message: Dict[str, Any]) -> Optional[Exception]:
+            try:
+                pool.send(
+                    email_service.build_message(
+                        message["to_email"], message["subject"], message["body"] or ""
+                    )
+                )
+            except Exception as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(pool.size, len(messages))) as executor:
+            errors = list(executor.map(_send, messages))
+
+        now = datetime.utcnow()
+        with session_factory() as db:
+            for message, error in zip(messages, errors):
+                owned = update(OutboundEmail).where(
+                    OutboundEmail.id == message["id"],
+                    OutboundEmail.locked_by == message["locked_by"],
+                )
+                if error is None:
+                    values = {
+                        "status": cls.SENT,
+                        "sent_at": now,
+                        # O corpo pode conter senha temporária; não fica guardado
+                        "body": None,
+                        "last_error": None,
+                    }
+                    report["sent"] += 1
+                else:
+                    attempts = message["attempts"] + 1
+                    values = {"attempts": attempts, "last_error": str(error)[:1000]}
+                    if cls._is_permanent(error) or attempts >= max_attempts:
+                        values["status"] = cls.DEAD
+                        values["body"] = None
+                        report["dead"] += 1
+                        logger.error(
+                            "Email %s descartado após %s tentativa(s): %s",
+                            message["id"],
+                            attempts,
+                            error,
+                        )
+                    else:
+                        values["status"] = cls.PENDING
+                        values["next_attempt_at"] = now + timedelta(
+                            seconds=cls._backoff_seconds(attempts)
+                        )
+                        report["retried"] += 1
+                values.update(locked_by=None, locked_at=None)
+                db.execute(owned.values(**values).execution_options(synchronize_session=False))
+            db.commit()
+        return report
+
+    @classmethod
+    def notify(cls) -> None:
+        """Acorda o laço de envio (pode ser chamado de qualquer thread)."""
+        loop, wakeup = cls._wakeup_loop, cls._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass
+
+    @staticmethod
+    def _backoff_seconds(attempts: int) -> float:
+        delay = min(
+            settings.EMAIL_QUEUE_BACKOFF_SECONDS * 2 ** (attempts - 1),
+            EmailQueueService.MAX_BACKOFF_SECONDS,
+        )
+        # Jitter para que falhas simultâneas não voltem todas no mesmo instante
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return True
+        if isinstance(
+            error, (smtplib.SMTPAuthenticationError, smtplib.SMTPSenderRefused)
+        ):
+            # Problema de configuração do remetente, não da mensagem
+            return False
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 500 <= error.smtp_code < 600
+        return False
+
+
+@event.listens_for(Session, "after_commit")
+def _on_session_commit(session):
+    if session.info.pop(_NOTIFY_KEY, False):
+        EmailQueueService.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_session_rollback(session):
+    session.info.pop(_NOTIFY_KEY, None)
+
+
+async def email_sender_loop(
+    poll_seconds: float,
+    pool: Optional[SMTPConnectionPool] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """Laço em background que esvazia a fila de emails."""
+    pool = pool or SMTPConnectionPool.from_settings()
+    EmailQueueService._wakeup = asyncio.Event()
+    EmailQueueService._wakeup_loop = asyncio.get_running_loop()
+    try:
+        while True:
+            EmailQueueService._wakeup.clear()
+            full_batch = False
+            try:
+                report = await asyncio.to_thread(
+                    EmailQueueService.process_batch, pool, session_factory
+                )
+                if report["claimed"] or report["expired"]:
+                    logger.info("Fila de emails processada: %s", report)
+                full_batch = report["claimed"] >= settings.EMAIL_QUEUE_BATCH_SIZE
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro no envio da fila de emails: {str(e)}")
+            if full_batch:
+                continue
+            try:
+                await asyncio.wait_for(EmailQueueService._wakeup.wait(), poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        EmailQueueService._wakeup = None
+        EmailQueueService._wakeup_loop = None
+        await asyncio.to_thread(pool.close)
@@ -4,7 +4,13 @@ import string
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.models.outbound_email import OutboundEmail
+from app.services.email_queue_service import EmailQueueService
+
+TEMPORARY_PASSWORD_SUBJECT = "Nova Senha Temporária - Autônomo Control"
+PASSWORD_RESET_SUBJECT = "Senha Resetada - Autônomo Control"
 
 
 class EmailService:
@@ -22,36 +28,63 @@ class EmailService:
         characters = string.ascii_letters + string.digits + "!@#$%&*"
         return "".join(secrets.choice(characters) for _ in range(length))
 
-    def send_temporary_password_email(
-        self, to_email: str, user_name: str, temp_password: str
-    ) -> bool:
-        """Envia email com senha temporária para o usuário."""
-        try:
-            # Criar mensagem
-            msg = MIMEMultipart()
-            msg["From"] = self.from_email
-            msg["To"] = to_email
-            msg["Subject"] = "Nova Senha Temporária - Autônomo Control"
-
-            # Corpo do email
-            body = f"""
+    def build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
+        """Monta a mensagem MIME em texto puro."""
+        msg = MIMEMultipart()
+        msg["From"] = self.from_email
+        msg["To"] = to_email
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain", "utf-8"))
+        return msg
+
+    @staticmethod
+    def temporary_password_body(user_name: str, temp_password: str) -> str:
+        """Corpo do email com senha temporária."""
+        return f"""
             Olá {user_name},
-            
+
             Uma nova senha temporária foi gerada para sua conta no Autônomo Control.
-            
+
             Senha temporária: {temp_password}
-            
+
             Por favor, faça login com esta senha e altere-a imediatamente por uma de sua escolha.
-            
+
             Esta senha é válida por 24 horas.
-            
+
+            Se você não solicitou esta alteração, entre em contato conosco imediatamente.
+
+            Atenciosamente,
+            Equipe Autônomo Control
+            """
+
+    @staticmethod
+    def password_reset_body(user_name: str, admin_name: str) -> str:
+        """Corpo da notificação de senha resetada por um administrador."""
+        return f"""
+            Olá {user_name},
+
+            Sua senha foi resetada pelo administrador {admin_name}.
+
+            Uma nova senha temporária foi enviada para este email.
+
+            Por favor, faça login com a nova senha e altere-a imediatamente.
+
             Se você não solicitou esta alteração, entre em contato conosco imediatamente.
-            
+
             Atenciosamente,
             Equipe Autônomo Control
             """
 
-            msg.attach(MIMEText(body, "plain", "utf-8"))
+    def send_temporary_password_email(
+        self, to_email: str, user_name: str, temp_password: str
+    ) -> bool:
+        """Envia email com senha temporária para o usuário."""
+        try:
+            msg = self.build_message(
+                to_email,
+                TEMPORARY_PASSWORD_SUBJECT,
+                self.temporary_password_body(user_name, temp_password),
+            )
 
             # Enviar email
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
@@ -70,27 +103,11 @@ class EmailService:
     ) -> bool:
         """Envia notificação de que a senha foi resetada por um administrador."""
         try:
-            msg = MIMEMultipart()
-            msg["From"] = self.from_email
-            msg["To"] = to_email
-            msg["Subject"] = "Senha Resetada - Autônomo Control"
-
-            body = f"""
-            Olá {user_name},
-            
-            Sua senha foi resetada pelo administrador {admin_name}.
-            
-            Uma nova senha temporária foi enviada para este email.
-            
-            Por favor, faça login com a nova senha e altere-a imediatamente.
-            
-            Se você não solicitou esta alteração, entre em contato conosco imediatamente.
-            
-            Atenciosamente,
-            Equipe Autônomo Control
-            """
-
-            msg.attach(MIMEText(body, "plain", "utf-8"))
+            msg = self.build_message(
+                to_email,
+                PASSWORD_RESET_SUBJECT,
+                self.password_reset_body(user_name, admin_name),
+            )
 
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 server.starttls()
@@ -103,6 +120,32 @@ class EmailService:
             print(f"Erro ao enviar notificação: {e}")
             return False
 
+    def queue_temporary_password_email(
+        self, db: Session, to_email: str, user_name: str, temp_password: str
+    ) -> OutboundEmail:
+        """Enfileira o email com senha temporária (enviado em segundo plano).
+
+        A mensagem entra na transação corrente; o envio só acontece após o
+        commit de quem chamou.
+        """
+        return EmailQueueService.enqueue(
+            db,
+            to_email,
+            TEMPORARY_PASSWORD_SUBJECT,
+            self.temporary_password_body(user_name, temp_password),
+        )
+
+    def queue_password_reset_notification(
+        self, db: Session, to_email: str, user_name: str, admin_name: str
+    ) -> OutboundEmail:
+        """Enfileira a notificação de senha resetada (enviada em segundo plano)."""
+        return EmailQueueService.enqueue(
+            db,
+            to_email,
+            PASSWORD_RESET_SUBJECT,
+            self.password_reset_body(user_name, admin_name),
+        )
+
 
 # Instância global do serviço de email
 email_service = EmailService()
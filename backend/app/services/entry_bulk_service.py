@@ -0,0 +1,161 @@
+"""Exclusão (soft delete) e edição em massa de lançamentos.
+
+As rotas ``/entries/bulk-delete`` e ``/entries/bulk-update`` selecionam os
+lançamentos por lista de ids ou pelos mesmos filtros de GET /entries. Em vez
+de um UPDATE por lançamento, cada lote é uma única instrução:
+
+- ids: ``UPDATE ... WHERE user_id AND NOT is_deleted AND id IN (...)`` com até
+  ``batch_size`` ids
+- filtros: ``UPDATE ... WHERE id IN (SELECT id ... ORDER BY id LIMIT n)``,
+  avançando pelo maior id do lote anterior (keyset), então linhas que
+  continuam casando com o filtro depois da edição não são reprocessadas
+
+O RETURNING traz só o necessário para os sketches de ganhos (eventos do ORM não
+disparam em UPDATE do Core); sem suporte a RETURNING, cada lote é emulado com
+SELECT e UPDATE. Todos os lotes ficam na mesma transação e o commit fica com
+quem chama, então a operação é aplicada inteira ou não é aplicada.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry
+from app.services.earnings_sketch_service import (
+    TRACKED_ATTRIBUTES,
+    EarningsSketchService,
+    row_contribution,
+)
+
+_entries = Entry.__table__
+
+
+class EntryBulkService:
+    """Operações em massa sobre os lançamentos ativos de um usuário."""
+
+    DEFAULT_BATCH_SIZE = 500
+
+    @classmethod
+    def soft_delete(
+        cls,
+        db: Session,
+        user_id: str,
+        ids: Optional[Sequence[str]] = None,
+        criteria: Optional[Sequence[Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Marca como excluídos os lançamentos selecionados, sem commit.
+
+        Args:
+            db: Sessão do banco de dados
+            user_id: Dono dos lançamentos
+            ids: IDs dos lançamentos (alternativa a ``criteria``)
+            criteria: Condições SQL sobre ``Entry`` (alternativa a ``ids``)
+            batch_size: Lançamentos por instrução
+
+        Returns:
+            Dicionário com ``affected_count`` e ``batches``
+        """
+        columns = [_entries.c[name] for name in TRACKED_ATTRIBUTES]
+        report = {"affected_count": 0, "batches": 0}
+        for rows in cls._batches(db, user_id, {"is_deleted": True}, ids, criteria, batch_size, columns):
+            removed = [
+                contribution
+                for contribution in (
+                    row_contribution({**row._mapping, "is_deleted": False}) for row in rows
+                )
+                if contribution
+            ]
+            if removed:
+                EarningsSketchService.apply(db.connection(), removed=removed)
+            report["affected_count"] += len(rows)
+            report["batches"] += 1
+        return report
+
+    @classmethod
+    def update(
+        cls,
+        db: Session,
+        user_id: str,
+        changes: Dict[str, Any],
+        ids: Optional[Sequence[str]] = None,
+        criteria: Optional[Sequence[Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Aplica ``changes`` aos lançamentos selecionados, sem commit.
+
+        Só aceita campos que não entram nos sketches de ganhos (classificação,
+        descrição etc.); valores e datas continuam sendo editados um a um.
+
+        Returns:
+            Dicionário com ``affected_count`` e ``batches``
+        """
+        tracked = set(TRACKED_ATTRIBUTES).intersection(changes)
+        if tracked:
+            raise ValueError(f"Campos não editáveis em massa: {sorted(tracked)}")
+        if not changes:
+            raise ValueError("Nenhum campo para alterar")
+        report = {"affected_count": 0, "batches": 0}
+        for rows in cls._batches(db, user_id, changes, ids, criteria, batch_size, []):
+            report["affected_count"] += len(rows)
+            report["batches"] += 1
+        return report
+
+    @classmethod
+    def _batches(
+        cls,
+        db: Session,
+        user_id: str,
+        values: Dict[str, Any],
+        ids: Optional[Sequence[str]],
+        criteria: Optional[Sequence[Any]],
+        batch_size: int,
+        columns: List[Any],
+    ) -> Iterator[list]:
+        """Executa um UPDATE por lote; produz as linhas afetadas de cada lote."""
+        if batch_size <= 0:
+            raise ValueError("batch_size deve ser maior que zero")
+        if (ids is None) == (criteria is None):
+            raise ValueError("Informe ids ou criteria (apenas um)")
+        owned = [_entries.c.user_id == user_id, _entries.c.is_deleted.is_(False)]
+        returning = [_entries.c.id, *columns]
+
+        if ids is not None:
+            unique = sorted(set(ids))
+            for start in range(0, len(unique), batch_size):
+                chunk = unique[start:start + batch_size]
+                rows = cls._execute(db, values, [*owned, _entries.c.id.in_(chunk)], returning)
+                if rows:
+                    yield rows
+            return
+
+        last_id: Optional[str] = None
+        while True:
+            selected = select(_entries.c.id).where(*owned, *criteria)
+            if last_id is not None:
+                selected = selected.where(_entries.c.id > last_id)
+            selected = selected.order_by(_entries.c.id).limit(batch_size)
+            rows = cls._execute(db, values, [_entries.c.id.in_(selected)], returning)
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = max(row.id for row in rows)
+
+    @staticmethod
+    def _execute(db: Session, values: Dict[str, Any], where: List[Any], returning: List[Any]) -> list:
+        if db.get_bind().dialect.update_returning:
+            return db.execute(update(_entries).where(*where).values(values).returning(*returning)).all()
+        # Emulação: as linhas são lidas (e travadas) antes do UPDATE pelos ids
+        rows = db.execute(select(*returning).where(*where).with_for_update()).all()
+        if rows:
+            db.execute(
+                update(_entries)
+                .where(_entries.c.id.in_([row.id for row in rows]))
+                .values(values)
+            )
+        return rows
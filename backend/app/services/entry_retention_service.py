@@ -0,0 +1,237 @@
+"""Limpeza em lotes dos lançamentos excluídos (soft delete), com arquivamento opcional.
+
+``delete_entry`` apenas marca ``is_deleted``; as linhas continuam na tabela e
+nos índices. Esta rotina remove de vez as excluídas há mais de um período de
+carência (``updated_at``, gravado na exclusão; ``created_at`` se ausente):
+
+- os ids são percorridos pelo índice parcial ``ix_entries_deleted_id``, que
+  contém só as linhas excluídas, em lotes ordenados com commit e pausa entre
+  eles (mesma estratégia de ``audit_retention_service``)
+- despesas ainda vinculadas a uma corrida removida perdem o vínculo
+  (``linked_entry_id``) no mesmo lote
+- antes da exclusão as linhas podem ser arquivadas em segmentos NDJSON
+  comprimidos e particionados pela data do lançamento
+
+O relatório traz o tamanho dos índices de ``entries`` antes e depois.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.entry import Entry
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+_entries = Entry.__table__
+
+
+class EntryRetentionService:
+    """Remoção definitiva dos lançamentos excluídos há mais que a carência."""
+
+    DEFAULT_CHUNK_SIZE = 1000
+    DEFAULT_PAUSE_SECONDS = 0.05
+
+    @classmethod
+    def purge(
+        cls,
+        db: Session,
+        cutoff_date: datetime,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+        archive_dir: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Remove lançamentos excluídos antes de ``cutoff_date`` em lotes ordenados por id.
+
+        Args:
+            db: Sessão do banco de dados
+            cutoff_date: Lançamentos excluídos antes desta data são removidos
+            chunk_size: Quantidade máxima de linhas por lote
+            pause_seconds: Pausa entre lotes para liberar o banco
+            archive_dir: Diretório para arquivar as linhas antes da exclusão
+            progress_callback: Chamado após cada lote com o progresso parcial
+
+        Returns:
+            Dict com totais removidos/arquivados, lotes, vazão e tamanho dos índices
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser maior que zero")
+
+        index_bytes_before = cls.index_sizes(db)
+        started = time.perf_counter()
+        deleted_count = 0
+        archived_count = 0
+        unlinked_count = 0
+        chunks = 0
+        last_id: Optional[str] = None
+
+        while True:
+            query = select(_entries).where(
+                _entries.c.is_deleted.is_(True),
+                func.coalesce(_entries.c.updated_at, _entries.c.created_at) < cutoff_date,
+            )
+            if last_id is not None:
+                query = query.where(_entries.c.id > last_id)
+            rows = db.execute(query.order_by(_entries.c.id).limit(chunk_size)).all()
+            if not rows:
+                break
+
+            ids = [row.id for row in rows]
+            if archive_dir:
+                archived_count += cls._archive_rows(rows, Path(archive_dir))
+
+            unlinked = db.execute(
+                update(_entries)
+                .where(_entries.c.linked_entry_id.in_(ids))
+                .values(linked_entry_id=None)
+            )
+            result = db.execute(delete(_entries).where(_entries.c.id.in_(ids)))
+            db.commit()
+
+            unlinked_count += unlinked.rowcount or 0
+            deleted_count += result.rowcount or 0
+            chunks += 1
+            last_id = ids[-1]
+
+            progress = cls._progress(deleted_count, archived_count, chunks, started)
+            logger.info(
+                "Limpeza de lançamentos excluídos: lote %s, %s removidos (%.0f linhas/s)",
+                chunks,
+                deleted_count,
+                progress["rows_per_second"],
+            )
+            if progress_callback:
+                progress_callback(progress)
+
+            if len(rows) < chunk_size:
+                break
+            if pause_seconds > 0:
+                time.sleep(pause_seconds)
+
+        return {
+            **cls._progress(deleted_count, archived_count, chunks, started),
+            "unlinked_count": unlinked_count,
+            "cutoff_date": cutoff_date.isoformat(),
+            "index_bytes_before": index_bytes_before,
+            "index_bytes_after": cls.index_sizes(db),
+        }
+
+    @staticmethod
+    def index_sizes(db: Session, table: str = "entries") -> Dict[str, int]:
+        """
+        Tamanho em bytes de cada índice da tabela.
+
+        Usa ``dbstat`` no SQLite e ``pg_relation_size`` no PostgreSQL; retorna
+        vazio em outros bancos ou se a extensão não estiver disponível.
+        """
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "sqlite":
+            query = text(
+                "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table) "
+                "GROUP BY name"
+            )
+        elif dialect_name == "postgresql":
+            query = text(
+                "SELECT indexrelname, pg_relation_size(indexrelid) "
+                "FROM pg_stat_user_indexes WHERE relname = :table"
+            )
+        else:
+            return {}
+        try:
+            rows = db.execute(query, {"table": table}).all()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Tamanho dos índices indisponível: {str(e)}")
+            return {}
+        return {name: int(size or 0) for name, size in sorted(rows)}
+
+    @staticmethod
+    def _progress(
+        deleted_count: int, archived_count: int, chunks: int, started: float
+    ) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        return {
+            "deleted_count": deleted_count,
+            "archived_count": archived_count,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(deleted_count / elapsed, 1) if elapsed else 0.0,
+        }
+
+    @classmethod
+    def _archive_rows(cls, rows: List[Any], archive_dir: Path) -> int:
+        """Anexa as linhas aos segmentos ``AAAA/MM/entries-AAAA-MM-DD.ndjson.gz``."""
+        partitions: Dict[str, List[str]] = {}
+        for row in rows:
+            key = row.date.date().isoformat() if row.date else "sem-data"
+            partitions.setdefault(key, []).append(
+                json.dumps(cls._serialize(row), ensure_ascii=False)
+            )
+
+        for key, lines in partitions.items():
+            path = cls.segment_path(archive_dir, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Cada lote vira um novo membro gzip; leitores concatenam os membros
+            with gzip.open(path, "at", encoding="utf-8") as segment:
+                segment.write("\n".join(lines) + "\n")
+        return len(rows)
+
+    @staticmethod
+    def segment_path(archive_dir: Path, day_key: str) -> Path:
+        if day_key == "sem-data":
+            return archive_dir / "sem-data" / "entries-sem-data.ndjson.gz"
+        year, month, _ = day_key.split("-")
+        return archive_dir / year / month / f"entries-{day_key}.ndjson.gz"
+
+    @staticmethod
+    def _serialize(row: Any) -> Dict[str, Any]:
+        data = {}
+        for column, value in row._mapping.items():
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            data[column] = value
+        return data
+
+
+def run_scheduled_entry_purge() -> Dict[str, Any]:
+    """Executa uma rodada de limpeza usando ``ENTRY_PURGE_GRACE_DAYS``."""
+    db = SessionLocal()
+    try:
+        cutoff_date = datetime.utcnow() - timedelta(days=settings.ENTRY_PURGE_GRACE_DAYS)
+        return EntryRetentionService.purge(
+            db,
+            cutoff_date,
+            chunk_size=settings.ENTRY_PURGE_CHUNK_SIZE,
+            archive_dir=settings.ENTRY_ARCHIVE_DIR,
+        )
+    finally:
+        db.close()
+
+
+async def entry_purge_loop(interval_hours: float) -> None:
+    """Laço em background que remove os lançamentos excluídos periodicamente."""
+    while True:
+        try:
+            report = await asyncio.to_thread(run_scheduled_entry_purge)
+            if report["deleted_count"]:
+                logger.info("Limpeza de lançamentos excluídos concluída: %s", report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro na limpeza de lançamentos excluídos: {str(e)}")
+        await asyncio.sleep(interval_hours * 3600)
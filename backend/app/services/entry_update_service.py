@@ -0,0 +1,154 @@
+"""Edição de lançamentos em uma única instrução.
+
+PUT e PATCH de ``/entries/{id}`` usavam SELECT, ``setattr``, commit e
+``refresh``: três idas ao banco por edição. Aqui a edição vira um
+``UPDATE ... WHERE id AND user_id AND NOT is_deleted RETURNING``:
+
+- ``net_amount`` e ``amount`` são recalculados no próprio UPDATE, com
+  expressões sobre os valores atuais da linha (mesma regra das rotas)
+- no PostgreSQL a linha anterior vem de uma subconsulta ``FOR UPDATE`` no
+  ``FROM`` e é devolvida junto no RETURNING (uma ida ao banco)
+- no SQLite o RETURNING não enxerga as tabelas do ``FROM``; a linha anterior é
+  lida antes só quando a edição mexe em campos dos sketches de ganhos
+- sem suporte a ``UPDATE ... RETURNING`` a edição é emulada com SELECT,
+  UPDATE e SELECT
+
+Como o UPDATE é feito pelo Core, os eventos do ORM não disparam: a diferença
+entre a contribuição antiga e a nova é aplicada aqui aos sketches de ganhos.
+O commit fica com quem chama.
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Float, and_, case, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry, EntryType
+from app.services.earnings_sketch_service import (
+    TRACKED_ATTRIBUTES,
+    EarningsSketchService,
+    row_contribution,
+)
+
+# Campos que disparam o recálculo de net_amount (e de amount, se for o bruto)
+NET_TRIGGERS = frozenset({"gross_amount", "platform_fee", "tips_amount"})
+
+_entries = Entry.__table__
+_PREVIOUS = "previous_"
+
+
+class EntryUpdateService:
+    """Atualização de um lançamento com UPDATE ... RETURNING."""
+
+    @classmethod
+    def update(
+        cls,
+        db: Session,
+        user_id: str,
+        entry_id: str,
+        changes: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Aplica ``changes`` ao lançamento ativo do usuário, sem commit.
+
+        Args:
+            db: Sessão do banco de dados
+            user_id: Dono do lançamento
+            entry_id: ID do lançamento
+            changes: Campos enviados na requisição (``exclude_unset``)
+
+        Returns:
+            Colunas do lançamento já atualizado ou None se não encontrado
+        """
+        owned = (
+            _entries.c.id == entry_id,
+            _entries.c.user_id == user_id,
+            _entries.c.is_deleted.is_(False),
+        )
+        if not changes:
+            row = db.execute(select(_entries).where(*owned)).first()
+            return dict(row._mapping) if row else None
+
+        values = {**changes, **cls.recomputed_amounts(changes)}
+        tracked = [_entries.c[name] for name in TRACKED_ATTRIBUTES]
+        touches_sketches = bool(values.keys() & set(TRACKED_ATTRIBUTES))
+        dialect = db.get_bind().dialect
+        stmt = update(_entries).values(values)
+
+        if dialect.name == "postgresql":
+            previous_row = (
+                select(_entries.c.id, *tracked).where(*owned).with_for_update().subquery("previous")
+            )
+            row = db.execute(
+                stmt.where(_entries.c.id == previous_row.c.id).returning(
+                    *_entries.c,
+                    *(previous_row.c[name].label(_PREVIOUS + name) for name in TRACKED_ATTRIBUTES),
+                )
+            ).first()
+            if row is None:
+                return None
+            previous = {name: row._mapping[_PREVIOUS + name] for name in TRACKED_ATTRIBUTES}
+            entry = {column.name: row._mapping[column] for column in _entries.c}
+        else:
+            previous = None
+            if touches_sketches:
+                found = db.execute(select(*tracked).where(*owned).with_for_update()).first()
+                if found is None:
+                    return None
+                previous = dict(found._mapping)
+            if dialect.update_returning:
+                row = db.execute(stmt.where(*owned).returning(*_entries.c)).first()
+            elif db.execute(stmt.where(*owned)).rowcount:
+                row = db.execute(select(_entries).where(_entries.c.id == entry_id)).first()
+            else:
+                row = None
+            if row is None:
+                return None
+            entry = dict(row._mapping)
+
+        if touches_sketches:
+            cls._apply_sketches(db, previous, entry)
+        return entry
+
+    @staticmethod
+    def recomputed_amounts(changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Expressões de ``net_amount``/``amount`` para o UPDATE.
+
+        Para receitas com bruto conhecido: líquido = (bruto + gorjetas) − taxa,
+        e ``amount`` acompanha o líquido se estava vazio ou igual ao bruto. Os
+        campos não enviados usam o valor atual da coluna.
+        """
+        if not NET_TRIGGERS & changes.keys():
+            return {}
+
+        def value(name: str):
+            if name in changes:
+                return literal(changes[name], Float)
+            return _entries.c[name]
+
+        gross = value("gross_amount")
+        net = (gross + func.coalesce(value("tips_amount"), 0)) - func.coalesce(
+            value("platform_fee"), 0
+        )
+        recalculates = and_(_entries.c.type == EntryType.INCOME, gross.isnot(None))
+        amounts = {"net_amount": case((recalculates, net), else_=value("net_amount"))}
+        if "amount" not in changes:
+            amount = _entries.c.amount
+            amounts["amount"] = case(
+                (and_(recalculates, or_(amount.is_(None), amount == gross)), net),
+                else_=amount,
+            )
+        return amounts
+
+    @staticmethod
+    def _apply_sketches(db: Session, previous: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        removed = row_contribution(previous)
+        added = row_contribution(entry)
+        if removed == added:
+            return
+        EarningsSketchService.apply(
+            db.connection(),
+            removed=[removed] if removed else [],
+            added=[added] if added else [],
+        )
@@ -5,9 +5,12 @@ Este módulo implementa a integração com a autenticação Google OAuth2.
 from typing import Dict, Optional
 import httpx
 from google.oauth2 import id_token
-from google.auth.transport import requests
 
 from app.core.config import settings
+from app.services.google_certs_cache import CachedCertsRequest, GoogleCertsCache
+
+# Transporte sem estado: os certificados vêm do GoogleCertsCache
+_certs_request = CachedCertsRequest()
 
 
 class GoogleAuthService:
@@ -87,9 +90,10 @@ def verify_google_token(token: str) -> Optional[Dict]:
     Verifica a validade de um token ID do Google
     """
     try:
-        # Verificar o token ID
+        # Verificar o token ID localmente, com os certificados em cache
+        GoogleCertsCache.ensure_key(token)
         idinfo = id_token.verify_oauth2_token(
-            token, requests.Request(), settings.GOOGLE_CLIENT_ID
+            token, _certs_request, settings.GOOGLE_CLIENT_ID
         )
 
         # Verificar o emissor do token
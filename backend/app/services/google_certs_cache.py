@@ -0,0 +1,202 @@
+"""Cache em processo dos certificados de assinatura dos ID tokens do Google.
+
+O ``google.oauth2.id_token`` busca os certificados a cada verificação. Aqui o
+documento é guardado em memória pelo prazo do ``Cache-Control: max-age`` da
+resposta e servido ao google-auth por um transporte próprio, de modo que a
+verificação da assinatura é sempre local. Um laço em background renova o
+documento pouco antes de expirar; um ``kid`` desconhecido (rotação de chaves)
+força uma renovação, limitada a uma a cada ``FORCED_REFRESH_INTERVAL``.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+from google.auth import transport
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class _CachedResponse(transport.Response):
+    def __init__(self, data: bytes):
+        self._data = data
+
+    @property
+    def status(self) -> int:
+        return 200
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return {"content-type": "application/json"}
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+
+class CachedCertsRequest(transport.Request):
+    """Transporte do google-auth que responde a URL de certificados do cache.
+
+    O google-auth sempre pede a URL pública do Google; o conteúdo vem de
+    ``GOOGLE_CERTS_URL``, que pode apontar para um espelho.
+    """
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method == "GET" and url in (
+            GoogleCertsCache.GOOGLE_CERTS_URL,
+            GoogleCertsCache.certs_url(),
+        ):
+            return _CachedResponse(GoogleCertsCache.get())
+        raise google_exceptions.TransportError(f"URL não suportada: {url}")
+
+
+class GoogleCertsCache:
+    """Documento de certificados do Google, compartilhado pelo processo."""
+
+    GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+    DEFAULT_TTL_SECONDS = 3600
+    # Renova quando faltar esta fração do max-age (limitada a MAX_REFRESH_MARGIN)
+    REFRESH_MARGIN_RATIO = 0.1
+    MAX_REFRESH_MARGIN = 300
+    RETRY_SECONDS = 30
+    FORCED_REFRESH_INTERVAL = 60
+
+    _body: Optional[bytes] = None
+    _key_ids: frozenset = frozenset()
+    _ttl: float = 0.0
+    _expires_at: float = 0.0
+    _last_forced: float = float("-inf")
+    _lock = threading.Lock()
+    _client: Optional[httpx.Client] = None
+
+    fetch_count = 0
+
+    @staticmethod
+    def certs_url() -> str:
+        return settings.GOOGLE_CERTS_URL
+
+    @classmethod
+    def get(cls) -> bytes:
+        """Retorna o documento de certificados, buscando-o só se expirado."""
+        body = cls._body
+        if body is not None and time.monotonic() < cls._expires_at:
+            record_cache("google_certs", True)
+            return body
+        record_cache("google_certs", False)
+        with cls._lock:
+            # Outra thread pode ter renovado enquanto esperávamos o lock
+            if cls._body is not None and time.monotonic() < cls._expires_at:
+                return cls._body
+            try:
+                return cls._fetch()
+            except Exception as e:
+                if cls._body is None:
+                    raise google_exceptions.TransportError(
+                        f"Falha ao obter certificados do Google: {e}"
+                    ) from e
+                # Chaves antigas continuam válidas durante a rotação
+                logger.warning(f"Usando certificados do Google expirados: {str(e)}")
+                return cls._body
+
+    @classmethod
+    def refresh(cls) -> None:
+        """Busca o documento imediatamente, independente do prazo."""
+        with cls._lock:
+            cls._fetch()
+
+    @classmethod
+    def ensure_key(cls, token: str) -> None:
+        """Renova o cache se o token foi assinado por uma chave ainda desconhecida."""
+        if cls._body is None:
+            return
+        try:
+            kid = google_jwt.decode_header(token).get("kid")
+        except Exception:
+            return
+        if not kid or kid in cls._key_ids:
+            return
+        now = time.monotonic()
+        if now - cls._last_forced < cls.FORCED_REFRESH_INTERVAL:
+            return
+        cls._last_forced = now
+        try:
+            cls.refresh()
+        except Exception as e:
+            logger.warning(f"Falha ao renovar certificados do Google: {str(e)}")
+
+    @classmethod
+    def seconds_until_refresh(cls) -> float:
+        """Tempo até a próxima renovação em background (0 se ainda não há cache)."""
+        if cls._body is None:
+            return 0.0
+        margin = min(cls._ttl * cls.REFRESH_MARGIN_RATIO, cls.MAX_REFRESH_MARGIN)
+        # Piso de 1s para que um max-age=0 não vire um laço de requisições
+        return max(cls._expires_at - margin - time.monotonic(), 1.0)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._body = None
+            cls._key_ids = frozenset()
+            cls._ttl = 0.0
+            cls._expires_at = 0.0
+            cls._last_forced = float("-inf")
+            if cls._client is not None:
+                cls._client.close()
+                cls._client = None
+
+    @classmethod
+    def _fetch(cls) -> bytes:
+        # Chamado com cls._lock adquirido
+        if cls._client is None:
+            cls._client = httpx.Client(timeout=10.0)
+        response = cls._client.get(cls.certs_url())
+        response.raise_for_status()
+        body = response.content
+        certs: Dict[str, Any] = json.loads(body)
+        ttl = cls._ttl_from_headers(response.headers)
+
+        cls.fetch_count += 1
+        cls._body = body
+        cls._key_ids = frozenset(
+            [k.get("kid") for k in certs["keys"]] if "keys" in certs else certs
+        )
+        cls._ttl = ttl
+        cls._expires_at = time.monotonic() + ttl
+        return body
+
+    @classmethod
+    def _ttl_from_headers(cls, headers: Mapping[str, str]) -> float:
+        match = _MAX_AGE.search(headers.get("cache-control", ""))
+        if not match:
+            return float(cls.DEFAULT_TTL_SECONDS)
+        try:
+            age = int(headers.get("age", "0"))
+        except ValueError:
+            age = 0
+        return float(max(int(match.group(1)) - age, 0))
+
+
+async def google_certs_refresh_loop() -> None:
+    """Laço em background que mantém os certificados do Google sempre válidos."""
+    while True:
+        await asyncio.sleep(GoogleCertsCache.seconds_until_refresh())
+        try:
+            await asyncio.to_thread(GoogleCertsCache.refresh)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Falha ao renovar certificados do Google: {str(e)}")
+            await asyncio.sleep(GoogleCertsCache.RETRY_SECONDS)
@@ -0,0 +1,162 @@
+"""Chaves de idempotência para criações repetidas por conexões instáveis.
+
+Um app que reenvia ``POST /entries/`` com o mesmo cabeçalho ``Idempotency-Key``
+recebe a resposta da primeira criação, sem um segundo lançamento:
+
+1. a chave é procurada pela chave primária ``(user_id, key)`` — a única
+   consulta a mais da requisição; encontrada e válida, a resposta guardada é
+   devolvida (a mesma chave com outro corpo é rejeitada)
+2. nova (ou expirada), a linha com a resposta é gravada na mesma transação do
+   lançamento; se duas tentativas correrem juntas, a segunda esbarra no índice
+   único no commit, é desfeita inteira (lançamento incluído) e devolve a
+   resposta da primeira
+
+As chaves valem ``IDEMPOTENCY_KEY_TTL_HOURS``; :func:`idempotency_sweep_loop`
+remove as expiradas em lotes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyMismatch(Exception):
+    """A chave já foi usada com outro corpo de requisição."""
+
+
+class IdempotencyService:
+    """Consulta, gravação e limpeza das chaves de idempotência."""
+
+    @staticmethod
+    def request_hash(payload: Dict[str, Any]) -> str:
+        """SHA-256 do corpo da requisição em JSON canônico."""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def lookup(
+        db: Session,
+        user_id: str,
+        key: str,
+        request_hash: str,
+        now: Optional[datetime] = None,
+    ) -> Optional[Tuple[int, Any]]:
+        """
+        Resposta guardada para a chave do usuário.
+
+        Returns:
+            ``(status_code, response_body)`` ou None se a chave é nova ou expirou
+
+        Raises:
+            IdempotencyKeyMismatch: Chave válida usada com outro corpo
+        """
+        now = now or datetime.utcnow()
+        row = db.execute(
+            select(
+                IdempotencyKey.request_hash,
+                IdempotencyKey.status_code,
+                IdempotencyKey.response_body,
+                IdempotencyKey.expires_at,
+            ).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        ).first()
+        if row is None:
+            return None
+        if row.expires_at <= now:
+            # Ainda não varrida: libera a chave na transação da nova criação
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+                )
+            )
+            return None
+        if row.request_hash != request_hash:
+            raise IdempotencyKeyMismatch(key)
+        return row.status_code, row.response_body
+
+    @staticmethod
+    def store(
+        db: Session,
+        user_id: str,
+        key: str,
+        request_hash: str,
+        status_code: int,
+        response_body: Any,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Grava a resposta na transação da criação (sem commit)."""
+        now = now or datetime.utcnow()
+        db.add(
+            IdempotencyKey(
+                user_id=user_id,
+                key=key,
+                request_hash=request_hash,
+                status_code=status_code,
+                response_body=response_body,
+                created_at=now,
+                expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+            )
+        )
+
+    @staticmethod
+    def purge_expired(
+        db: Session,
+        now: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Remove as chaves expiradas em lotes pelo índice de ``expires_at``."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser maior que zero")
+        now = now or datetime.utcnow()
+        removed = 0
+        while True:
+            expired = (
+                select(IdempotencyKey.user_id, IdempotencyKey.key)
+                .where(IdempotencyKey.expires_at <= now)
+                .limit(chunk_size)
+            )
+            result = db.execute(
+                delete(IdempotencyKey).where(
+                    tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+                )
+            )
+            db.commit()
+            removed += result.rowcount or 0
+            if (result.rowcount or 0) < chunk_size:
+                return removed
+
+
+def run_scheduled_idempotency_sweep() -> int:
+    """Executa uma rodada de limpeza das chaves expiradas com uma sessão própria."""
+    db = SessionLocal()
+    try:
+        return IdempotencyService.purge_expired(
+            db, chunk_size=settings.IDEMPOTENCY_SWEEP_CHUNK_SIZE
+        )
+    finally:
+        db.close()
+
+
+async def idempotency_sweep_loop(interval_minutes: float) -> None:
+    """Laço em background que remove as chaves de idempotência expiradas."""
+    while True:
+        try:
+            removed = await asyncio.to_thread(run_scheduled_idempotency_sweep)
+            if removed:
+                logger.info("Chaves de idempotência expiradas removidas: %s", removed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro na limpeza das chaves de idempotência: {str(e)}")
+        await asyncio.sleep(interval_minutes * 60)
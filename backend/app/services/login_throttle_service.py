@@ -0,0 +1,240 @@
+"""Limitador de tentativas de login em janela deslizante.
+
+Aplica ``max_login_attempts`` e ``lockout_duration_minutes`` do SystemConfig
+antes de qualquer busca de usuário ou verificação bcrypt: um ataque de força
+bruta ou de credential stuffing passa a custar uma consulta barata por
+tentativa, em vez de um hash e uma gravação de auditoria.
+
+As falhas são contadas por usuário e por IP de origem (com limite maior, pois
+vários usuários podem compartilhar um IP). O backend em memória atende um
+processo; o backend em banco (tabela ``login_attempts``) é compartilhado entre
+workers.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.login_attempt import LoginAttempt
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.system_config_service import SystemConfigService
+
+# Tópicos de invalidação: política (SystemConfig) e falhas de um usuário
+# desbloqueado por um admin (chave: email)
+CONFIG_TOPIC = "system_config"
+USERS_TOPIC = "users"
+
+
+class MemoryThrottleBackend:
+    """Falhas recentes por chave, em memória do processo."""
+
+    # A cada tantas gravações, remove chaves sem falhas dentro da janela
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._failures: Dict[str, Deque[datetime]] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def recent_failures(self, key: str, since: datetime, limit: int) -> List[datetime]:
+        with self._lock:
+            failures = self._failures.get(key)
+            if not failures:
+                return []
+            while failures and failures[0] <= since:
+                failures.popleft()
+            return list(failures)[-limit:][::-1]
+
+    def record_failure(self, keys: List[str], when: datetime, since: datetime) -> None:
+        with self._lock:
+            for key in keys:
+                self._failures.setdefault(key, deque()).append(when)
+            self._writes += 1
+            if self._writes % self.SWEEP_EVERY == 0:
+                self._failures = {
+                    k: v for k, v in self._failures.items() if v and v[-1] > since
+                }
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._writes = 0
+
+
+class DatabaseThrottleBackend:
+    """Falhas recentes na tabela login_attempts, compartilhadas entre workers."""
+
+    # A cada tantas gravações (por processo), remove linhas fora da janela
+    PURGE_EVERY = 500
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._writes = 0
+
+    def recent_failures(self, key: str, since: datetime, limit: int) -> List[datetime]:
+        with self.session_factory() as db:
+            return list(
+                db.execute(
+                    select(LoginAttempt.attempted_at)
+                    .where(LoginAttempt.key == key, LoginAttempt.attempted_at > since)
+                    .order_by(LoginAttempt.attempted_at.desc())
+                    .limit(limit)
+                ).scalars()
+            )
+
+    def record_failure(self, keys: List[str], when: datetime, since: datetime) -> None:
+        self._writes += 1
+        with self.session_factory() as db:
+            db.add_all([LoginAttempt(key=key, attempted_at=when) for key in keys])
+            if self._writes % self.PURGE_EVERY == 0:
+                db.execute(delete(LoginAttempt).where(LoginAttempt.attempted_at <= since))
+            db.commit()
+
+    def reset(self, key: str) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(LoginAttempt).where(LoginAttempt.key == key))
+            db.commit()
+
+    def clear(self) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(LoginAttempt))
+            db.commit()
+
+
+class LoginThrottleService:
+    """Política de bloqueio de login sobre o backend configurado."""
+
+    # Os valores do SystemConfig são relidos no máximo uma vez por intervalo
+    POLICY_TTL_SECONDS = 60
+
+    _backend = None
+    _policy: Optional[Tuple[int, int]] = None
+    _policy_expires_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_backend(cls):
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    if settings.LOGIN_THROTTLE_BACKEND == "database":
+                        cls._backend = DatabaseThrottleBackend()
+                    else:
+                        cls._backend = MemoryThrottleBackend()
+        return cls._backend
+
+    @classmethod
+    def set_backend(cls, backend) -> None:
+        cls._backend = backend
+
+    @classmethod
+    def reset(cls) -> None:
+        """Descarta falhas registradas e a política em cache."""
+        if cls._backend is not None:
+            cls._backend.clear()
+        cls._policy = None
+        cls._policy_expires_at = 0.0
+
+    @classmethod
+    def invalidate_policy(cls) -> None:
+        """Força reler a política do SystemConfig na próxima verificação."""
+        cls._policy = None
+        cls._policy_expires_at = 0.0
+
+    @classmethod
+    def reset_user(cls, username: Optional[str]) -> None:
+        """Zera as falhas registradas para o usuário (ex.: após desbloqueio)."""
+        if username:
+            cls.get_backend().reset(f"user:{username.strip().lower()}")
+
+    @classmethod
+    def policy(cls, db: Session) -> Tuple[int, int]:
+        """Retorna (max_login_attempts, lockout_duration_minutes)."""
+        now = time.monotonic()
+        if cls._policy is None or now >= cls._policy_expires_at:
+            service = SystemConfigService(db)
+            cls._policy = (
+                int(service.get_config("max_login_attempts") or 5),
+                int(service.get_config("lockout_duration_minutes") or 30),
+            )
+            cls._policy_expires_at = now + cls.POLICY_TTL_SECONDS
+        return cls._policy
+
+    @staticmethod
+    def client_ip(request: Optional[Request]) -> Optional[str]:
+        if request is None:
+            return None
+        if settings.LOGIN_THROTTLE_TRUST_PROXY:
+            forwarded = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+            if forwarded:
+                return forwarded
+        client = getattr(request, "client", None)
+        return client.host if client else None
+
+    @classmethod
+    def _keys(cls, username: str, ip: Optional[str], max_attempts: int):
+        keys = [(f"user:{username.strip().lower()}", max_attempts)]
+        if ip:
+            keys.append((f"ip:{ip}", max_attempts * settings.LOGIN_THROTTLE_IP_FACTOR))
+        return keys
+
+    @classmethod
+    def retry_after(cls, db: Session, username: str, ip: Optional[str]) -> Optional[int]:
+        """
+        Verifica se o login está bloqueado para o usuário ou para o IP.
+
+        Returns:
+            Segundos até a próxima tentativa permitida, ou None se liberado
+        """
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return None
+        max_attempts, lockout_minutes = cls.policy(db)
+        window = timedelta(minutes=lockout_minutes)
+        now = datetime.utcnow()
+        backend = cls.get_backend()
+
+        wait = 0.0
+        for key, limit in cls._keys(username, ip, max_attempts):
+            failures = backend.recent_failures(key, now - window, limit)
+            if len(failures) >= limit:
+                # Liberado quando a limit-ésima falha mais recente sair da janela
+                wait = max(wait, (failures[limit - 1] + window - now).total_seconds())
+        return max(math.ceil(wait), 1) if wait > 0 else None
+
+    @classmethod
+    def record_failure(cls, db: Session, username: str, ip: Optional[str]) -> None:
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return
+        max_attempts, lockout_minutes = cls.policy(db)
+        now = datetime.utcnow()
+        cls.get_backend().record_failure(
+            [key for key, _ in cls._keys(username, ip, max_attempts)],
+            now,
+            now - timedelta(minutes=lockout_minutes),
+        )
+
+    @classmethod
+    def record_success(cls, username: str) -> None:
+        """Zera as falhas do usuário; as do IP continuam contando."""
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return
+        cls.get_backend().reset(f"user:{username.strip().lower()}")
+
+
+CacheInvalidationService.subscribe(
+    CONFIG_TOPIC, lambda key: LoginThrottleService.invalidate_policy()
+)
+CacheInvalidationService.subscribe(USERS_TOPIC, LoginThrottleService.reset_user)
@@ -0,0 +1,239 @@
+"""Rentabilidade real por corrida e por período.
+
+Lucro de uma corrida = ganho líquido − despesas vinculadas a ela
+(``linked_entry_id``, ex.: pedágio) − rateio por km das despesas não
+vinculadas do mesmo período (ex.: abastecimento, lavagem).
+
+Tudo é calculado no banco, sem carregar ``linked_entries`` corrida a corrida:
+
+1. as despesas vinculadas são agregadas uma única vez por corrida
+   (``GROUP BY linked_entry_id``) e unidas às corridas com LEFT JOIN, já
+   somadas por período
+2. as despesas não vinculadas são somadas por período; o custo por km do
+   período é esse total dividido pelos km rodados nele
+3. a página de corridas busca o custo vinculado de cada corrida da página pelo
+   índice de ``linked_entry_id`` (só as linhas do LIMIT são avaliadas) e aplica
+   o custo por km do período de cada corrida
+
+São três consultas por chamada, independente do número de corridas. Os filtros
+de data são intervalos sobre a coluna (sem ``date()``) para poderem usar índice.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.entry import Entry, EntryType
+
+GRANULARITIES = ("day", "month")
+
+
+def _period(column, granularity: str, dialect_name: str):
+    """Expressão do período ('AAAA-MM-DD' ou 'AAAA-MM') para o dialeto."""
+    if granularity == "day":
+        return func.date(column)
+    if dialect_name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def _summary(rides: int, km: float, net: float, linked: float, apportioned: float) -> dict:
+    profit = net - linked - apportioned
+    return {
+        "rides": rides,
+        "km": round(km, 2),
+        "net": round(net, 2),
+        "linked_costs": round(linked, 2),
+        "apportioned_costs": round(apportioned, 2),
+        "profit": round(profit, 2),
+        "profit_per_km": round(profit / km, 2) if km else 0,
+        "margin_pct": round(profit / net * 100, 2) if net else 0,
+    }
+
+
+class ProfitabilityService:
+    """Lucro por corrida e por período a partir de joins agregados."""
+
+    @staticmethod
+    def report(
+        db: Session,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        granularity: str = "month",
+        only_trip_expenses: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> dict:
+        """
+        Calcula a rentabilidade do usuário por período e a página de corridas.
+
+        Args:
+            db: Sessão do banco de dados
+            user_id: ID do usuário
+            start_date: Data inicial (inclusive) das corridas e despesas
+            end_date: Data final (inclusive) das corridas e despesas
+            granularity: 'day' ou 'month'
+            only_trip_expenses: Ratear apenas despesas não vinculadas marcadas
+                como ``is_trip_expense`` (padrão: todas as não vinculadas)
+            limit: Corridas por página (mais recentes primeiro)
+            offset: Deslocamento da página de corridas
+
+        Returns:
+            Dicionário com ``periods``, ``totals`` e ``trips``
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularidade inválida: {granularity}")
+        dialect_name = db.get_bind().dialect.name
+        expense = aliased(Entry)
+
+        def date_filters(column):
+            filters = []
+            if start_date:
+                filters.append(column >= datetime.combine(start_date, time.min))
+            if end_date:
+                filters.append(column < datetime.combine(end_date + timedelta(days=1), time.min))
+            return filters
+
+        expense_filters = [
+            expense.user_id == user_id,
+            expense.is_deleted.is_(False),
+            expense.type == EntryType.EXPENSE,
+        ]
+        linked = (
+            select(
+                expense.linked_entry_id.label("ride_id"),
+                func.sum(expense.amount).label("cost"),
+            )
+            .where(*expense_filters, expense.linked_entry_id.isnot(None))
+            .group_by(expense.linked_entry_id)
+            .subquery()
+        )
+        ride_filters = [
+            Entry.user_id == user_id,
+            Entry.is_deleted.is_(False),
+            Entry.type == EntryType.INCOME,
+            *date_filters(Entry.date),
+        ]
+        net = func.coalesce(Entry.net_amount, Entry.amount, 0)
+        km = func.coalesce(Entry.distance_km, 0)
+        linked_cost = func.coalesce(linked.c.cost, 0)
+        ride_period = _period(Entry.date, granularity, dialect_name)
+
+        ride_rows = db.execute(
+            select(
+                ride_period.label("period"),
+                func.count(Entry.id).label("rides"),
+                func.sum(km).label("km"),
+                func.sum(net).label("net"),
+                func.sum(linked_cost).label("linked"),
+            )
+            .select_from(Entry)
+            .outerjoin(linked, linked.c.ride_id == Entry.id)
+            .where(*ride_filters)
+            .group_by(ride_period)
+        ).all()
+
+        unlinked_filters = [
+            *expense_filters,
+            expense.linked_entry_id.is_(None),
+            *date_filters(expense.date),
+        ]
+        if only_trip_expenses:
+            unlinked_filters.append(expense.is_trip_expense.is_(True))
+        expense_period = _period(expense.date, granularity, dialect_name)
+        unlinked: Dict[str, float] = {
+            str(period): float(cost or 0)
+            for period, cost in db.execute(
+                select(expense_period, func.sum(expense.amount))
+                .where(*unlinked_filters)
+                .group_by(expense_period)
+            )
+        }
+
+        periods = []
+        rates: Dict[str, float] = {}
+        totals = {"rides": 0, "km": 0.0, "net": 0.0, "linked": 0.0, "apportioned": 0.0}
+        for row in sorted(ride_rows, key=lambda r: str(r.period)):
+            period = str(row.period)
+            period_km = float(row.km or 0)
+            unlinked_cost = unlinked.get(period, 0.0)
+            # Sem km rodados no período não há base para o rateio
+            apportioned = unlinked_cost if period_km else 0.0
+            rates[period] = unlinked_cost / period_km if period_km else 0.0
+            item = _summary(int(row.rides), period_km, float(row.net or 0), float(row.linked or 0), apportioned)
+            item["period"] = period
+            item["unlinked_costs"] = round(unlinked_cost, 2)
+            item["cost_per_km"] = round(rates[period], 4)
+            periods.append(item)
+            totals["rides"] += item["rides"]
+            totals["km"] += period_km
+            totals["net"] += float(row.net or 0)
+            totals["linked"] += float(row.linked or 0)
+            totals["apportioned"] += apportioned
+
+        total_summary = _summary(
+            totals["rides"], totals["km"], totals["net"], totals["linked"], totals["apportioned"]
+        )
+        total_summary["unapportioned_costs"] = round(
+            sum(unlinked.values()) - totals["apportioned"], 2
+        )
+
+        # Subconsulta correlacionada: só filtra pelo índice de linked_entry_id;
+        # usuário e tipo entram no CASE para o planejador não trocar de índice
+        page_linked_cost = (
+            select(
+                func.sum(
+                    case(
+                        (
+                            (expense.user_id == user_id) & (expense.type == EntryType.EXPENSE),
+                            expense.amount,
+                        ),
+                        else_=0,
+                    )
+                )
+            )
+            .where(expense.linked_entry_id == Entry.id, expense.is_deleted.is_(False))
+            .correlate(Entry)
+            .scalar_subquery()
+        )
+        trip_rows = db.execute(
+            select(
+                Entry.id,
+                Entry.date,
+                Entry.platform,
+                ride_period.label("period"),
+                net.label("net"),
+                km.label("km"),
+                func.coalesce(page_linked_cost, 0).label("linked"),
+            )
+            .where(*ride_filters)
+            .order_by(Entry.date.desc(), Entry.id)
+            .limit(limit)
+            .offset(offset)
+        ).all()
+        trips = []
+        for row in trip_rows:
+            apportioned = float(row.km) * rates.get(str(row.period), 0.0)
+            profit = float(row.net) - float(row.linked) - apportioned
+            trips.append({
+                "id": row.id,
+                "date": row.date.isoformat() if row.date else None,
+                "platform": row.platform,
+                "net": round(float(row.net), 2),
+                "km": round(float(row.km), 2),
+                "linked_costs": round(float(row.linked), 2),
+                "apportioned_costs": round(apportioned, 2),
+                "profit": round(profit, 2),
+            })
+
+        return {
+            "granularity": granularity,
+            "periods": periods,
+            "totals": total_summary,
+            "trips": trips,
+            "limit": limit,
+            "offset": offset,
+        }
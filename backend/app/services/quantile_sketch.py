@@ -0,0 +1,164 @@
+"""Sketch de quantis mesclável com erro relativo garantido (DDSketch).
+
+Cada valor ``x > 0`` cai no bucket ``k = ceil(log_γ(x))``, com
+``γ = (1 + α) / (1 - α)``; o bucket cobre ``(γ^(k-1), γ^k]`` e é representado
+por ``2γ^k / (γ + 1)``. Assim, para qualquer quantil ``q``, o valor estimado
+difere do valor exato da mesma posição (``floor(q · (n - 1))`` na lista
+ordenada) em no máximo ``α`` relativo, independente da distribuição e do
+volume de dados. Valores negativos usam um conjunto espelhado de buckets e
+valores (quase) nulos um contador próprio.
+
+Como o estado é só uma contagem por bucket:
+
+- dois sketches com o mesmo ``α`` se mesclam somando as contagens (o resultado
+  é idêntico ao sketch de todos os valores juntos)
+- um valor pode ser removido decrementando o seu bucket, o que permite refletir
+  edições e exclusões sem reprocessar o histórico
+- o tamanho é proporcional ao log da razão entre o maior e o menor valor
+  (com α = 1%, valores entre R$ 0,01 e R$ 10.000 ocupam no máximo ~700 buckets)
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Abaixo disso o valor conta como zero (evita milhares de buckets perto de 0)
+MIN_INDEXABLE_VALUE = 1e-6
+
+
+class QuantileSketch:
+    """DDSketch com buckets esparsos em dicionário."""
+
+    __slots__ = ("relative_accuracy", "gamma", "_log_gamma", "positive", "negative", "zero", "count")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy deve estar entre 0 e 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Adiciona ``count`` ocorrências do valor (negativo para remover)."""
+        if value > MIN_INDEXABLE_VALUE:
+            applied = _bump(self.positive, self._key(value), count)
+        elif value < -MIN_INDEXABLE_VALUE:
+            applied = _bump(self.negative, self._key(-value), count)
+        else:
+            applied = max(self.zero + count, 0) - self.zero
+            self.zero += applied
+        self.count += applied
+
+    def remove(self, value: float) -> None:
+        """Remove uma ocorrência do valor adicionada anteriormente."""
+        self.add(value, -1)
+
+    def update(self, values: Iterable[float]) -> "QuantileSketch":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Soma as contagens de outro sketch (mesma precisão) neste."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Só é possível mesclar sketches com a mesma precisão")
+        for key, count in other.positive.items():
+            _bump(self.positive, key, count)
+        for key, count in other.negative.items():
+            _bump(self.negative, key, count)
+        self.zero += other.zero
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Valor aproximado do quantil ``q`` (0 a 1); None se o sketch estiver vazio."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Vários quantis em uma única varredura ordenada dos buckets."""
+        if any(not 0 <= q <= 1 for q in qs):
+            raise ValueError("O quantil deve estar entre 0 e 1")
+        if self.count == 0 or not qs:
+            return [None] * len(qs)
+        # Do negativo de maior módulo ao positivo de maior módulo
+        buckets = [(-self._value(k), self.negative[k]) for k in sorted(self.negative, reverse=True)]
+        if self.zero:
+            buckets.append((0.0, self.zero))
+        buckets.extend((self._value(k), self.positive[k]) for k in sorted(self.positive))
+
+        ranks = sorted((math.floor(q * (self.count - 1)), i) for i, q in enumerate(qs))
+        results: List[Optional[float]] = [None] * len(qs)
+        seen = 0
+        pending = iter(ranks)
+        rank, index = next(pending)
+        for value, count in buckets:
+            seen += count
+            while seen > rank:
+                results[index] = value
+                next_rank = next(pending, None)
+                if next_rank is None:
+                    return results
+                rank, index = next_rank
+        return results
+
+    def to_dict(self) -> dict:
+        """Representação serializável em JSON (buckets densos: [menor chave, contagens])."""
+        return {
+            "a": self.relative_accuracy,
+            "p": _dense(self.positive),
+            "n": _dense(self.negative),
+            "z": self.zero,
+        }
+
+    def merge_dict(self, data: Optional[dict]) -> "QuantileSketch":
+        """Mescla um sketch serializado sem instanciá-lo (caminho das consultas)."""
+        if not data:
+            return self
+        if data.get("a", DEFAULT_RELATIVE_ACCURACY) != self.relative_accuracy:
+            raise ValueError("Só é possível mesclar sketches com a mesma precisão")
+        for bins, dense in ((self.positive, data.get("p")), (self.negative, data.get("n"))):
+            if not dense:
+                continue
+            offset, counts = dense
+            get = bins.get
+            for key, count in zip(range(offset, offset + len(counts)), counts):
+                if count:
+                    bins[key] = get(key, 0) + count
+                    self.count += count
+        zero = data.get("z", 0)
+        self.zero += zero
+        self.count += zero
+        return self
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "QuantileSketch":
+        return cls((data or {}).get("a", DEFAULT_RELATIVE_ACCURACY)).merge_dict(data)
+
+
+def _dense(bins: Dict[int, int]) -> Optional[list]:
+    if not bins:
+        return None
+    offset = min(bins)
+    return [offset, [bins.get(key, 0) for key in range(offset, max(bins) + 1)]]
+
+
+def _bump(bins: Dict[int, int], key: int, count: int) -> int:
+    """Aplica a contagem ao bucket sem deixá-lo negativo; retorna a variação efetiva."""
+    current = bins.get(key, 0)
+    total = max(current + count, 0)
+    if total:
+        bins[key] = total
+    else:
+        bins.pop(key, None)
+    return total - current
@@ -0,0 +1,242 @@
+"""Profiler de consultas SQL por requisição.
+
+Ligado em tempo de execução pelo SystemConfig (``query_profiler_enabled``),
+registra cada comando executado durante a requisição nos eventos
+``before_cursor_execute``/``after_cursor_execute`` da engine e, ao final:
+
+- sinaliza comandos idênticos repetidos (padrão N+1, ex. uma busca de usuário
+  por item de uma listagem) a partir de ``query_profiler_repeat_threshold``
+- registra no log as consultas acima de ``query_profiler_slow_ms`` com o
+  plano de execução (EXPLAIN)
+- devolve ``X-DB-Queries`` e ``X-DB-Time`` (ms) quando o usuário autenticado
+  é MASTER
+
+Os listeners só são instalados na engine quando o profiler é ligado pela
+primeira vez; desligado, o custo é uma leitura da configuração em cache por
+requisição.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.database import SessionLocal, engine as default_engine
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.login_throttle_service import CONFIG_TOPIC
+from app.services.system_config_service import SystemConfigService
+
+logger = logging.getLogger(__name__)
+
+
+class QueryProfile:
+    """Comandos executados durante uma requisição."""
+
+    # Limite de comandos guardados; contagens e tempo total seguem acumulando
+    MAX_STATEMENTS = 500
+
+    __slots__ = (
+        "path",
+        "slow_ms",
+        "statements",
+        "counts",
+        "total_queries",
+        "total_seconds",
+        "is_master",
+    )
+
+    def __init__(self, path: str, slow_ms: int):
+        self.path = path
+        self.slow_ms = slow_ms
+        self.statements: List[Tuple[str, float]] = []
+        self.counts: Dict[str, int] = {}
+        self.total_queries = 0
+        self.total_seconds = 0.0
+        self.is_master = False
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.total_queries += 1
+        self.total_seconds += seconds
+        self.counts[statement] = self.counts.get(statement, 0) + 1
+        if len(self.statements) < self.MAX_STATEMENTS:
+            self.statements.append((statement, seconds))
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Comandos executados ``threshold`` vezes ou mais, do mais repetido ao menos."""
+        return sorted(
+            ((s, n) for s, n in self.counts.items() if n >= threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+class QueryProfilerService:
+    """Configuração, instrumentação da engine e relatório do profiler."""
+
+    # Os valores do SystemConfig são relidos no máximo uma vez por intervalo;
+    # alterações pelas rotas de configuração descartam o cache na hora
+    CONFIG_TTL_SECONDS = 30
+
+    _config: Optional[Tuple[bool, int, int]] = None
+    _config_expires_at = 0.0
+    _instrumented: "weakref.WeakSet" = weakref.WeakSet()
+    _lock = threading.Lock()
+
+    @classmethod
+    def config(cls) -> Tuple[bool, int, int]:
+        """Retorna (habilitado, limite de consulta lenta em ms, limite de repetições)."""
+        now = time.monotonic()
+        if cls._config is None or now >= cls._config_expires_at:
+            with cls._lock:
+                if cls._config is None or now >= cls._config_expires_at:
+                    cls._config = cls._load_config()
+                    cls._config_expires_at = now + cls.CONFIG_TTL_SECONDS
+        return cls._config
+
+    @classmethod
+    def _load_config(cls) -> Tuple[bool, int, int]:
+        db = SessionLocal()
+        try:
+            service = SystemConfigService(db)
+            return (
+                bool(service.get_config("query_profiler_enabled")),
+                int(service.get_config("query_profiler_slow_ms") or 200),
+                int(service.get_config("query_profiler_repeat_threshold") or 5),
+            )
+        except Exception as e:
+            logger.warning(f"Configuração do profiler indisponível: {str(e)}")
+            return False, 200, 5
+        finally:
+            db.close()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Descarta a configuração em cache."""
+        cls._config = None
+        cls._config_expires_at = 0.0
+
+    @classmethod
+    def instrument(cls, engine: Engine) -> None:
+        """Instala os listeners na engine (uma única vez)."""
+        if engine in cls._instrumented:
+            return
+        with cls._lock:
+            if engine in cls._instrumented:
+                return
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            cls._instrumented.add(engine)
+
+    @staticmethod
+    def current() -> Optional[QueryProfile]:
+        return _current_profile.get()
+
+    @staticmethod
+    def note_user(user) -> None:
+        """Informa o usuário autenticado da requisição (habilita os headers para MASTER)."""
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.is_master = getattr(user, "role", None) == "MASTER"
+
+    @staticmethod
+    def summary_headers(profile: QueryProfile) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"x-db-queries", str(profile.total_queries).encode()),
+            (b"x-db-time", f"{profile.total_seconds * 1000:.2f}".encode()),
+        ]
+
+    @staticmethod
+    def report(profile: QueryProfile, repeat_threshold: int) -> None:
+        """Registra no log os padrões N+1 encontrados na requisição."""
+        for statement, count in profile.repeated(repeat_threshold):
+            logger.warning(
+                f"Possível N+1 em {profile.path}: comando executado {count}x: {statement}"
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            for statement, seconds in profile.statements:
+                logger.debug(f"[{profile.path}] {seconds * 1000:.2f} ms: {statement}")
+
+
+def explain(cursor, statement: str, parameters, dialect_name: str) -> Optional[List[str]]:
+    """Plano de execução de uma consulta de leitura, na mesma conexão DBAPI."""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(prefix + statement, parameters)
+        return [" ".join(str(col) for col in row) for row in explain_cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN indisponível: {e}"]
+    finally:
+        explain_cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        context._profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profiler_started", None)
+    if profile is None or started is None:
+        return
+    seconds = time.perf_counter() - started
+    profile.record(statement, seconds)
+    if seconds * 1000 >= profile.slow_ms and not executemany:
+        plan = explain(cursor, statement, parameters, conn.dialect.name)
+        plan_text = "\n    ".join(plan) if plan else "(sem plano)"
+        logger.warning(
+            f"Consulta lenta em {profile.path} ({seconds * 1000:.1f} ms): {statement}"
+            f"\n    {plan_text}"
+        )
+
+
+class QueryProfilerMiddleware:
+    """Middleware ASGI que abre um QueryProfile por requisição quando ligado."""
+
+    def __init__(self, app, engine: Engine = default_engine):
+        self.app = app
+        self.engine = engine
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        enabled, slow_ms, repeat_threshold = QueryProfilerService.config()
+        if not enabled:
+            await self.app(scope, receive, send)
+            return
+
+        QueryProfilerService.instrument(self.engine)
+        profile = QueryProfile(f"{scope.get('method')} {scope.get('path')}", slow_ms)
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and profile.is_master:
+                message["headers"] = list(message.get("headers", [])) + (
+                    QueryProfilerService.summary_headers(profile)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            QueryProfilerService.report(profile, repeat_threshold)
+
+
+CacheInvalidationService.subscribe(
+    CONFIG_TOPIC, lambda key: QueryProfilerService.reset()
+)
@@ -0,0 +1,241 @@
+"""Materialização dos lançamentos recorrentes.
+
+Cada :class:`RecurringRule` guarda em ``next_run_date`` a próxima ocorrência
+ainda não gerada (marca d'água). O agendador:
+
+1. busca em lotes as regras ativas com ``next_run_date <= hoje`` pelo índice
+   ``(is_active, next_run_date)``, com ``FOR UPDATE SKIP LOCKED`` no PostgreSQL
+   para vários workers dividirem o trabalho
+2. calcula em memória as ocorrências devidas de cada regra do lote
+3. insere todos os lançamentos do lote em um único INSERT de várias linhas,
+   ignorando os que já existem (índice único ``(recurring_rule_id, date)``)
+4. avança as marcas d'água do lote em um único UPDATE executemany e faz commit
+
+Nenhuma etapa lê a tabela de lançamentos, e repetir uma rodada interrompida não
+duplica ocorrências. Ocorrências mensais são ancoradas no dia de
+``start_date`` (dia 31 vira o último dia dos meses mais curtos).
+
+Como o INSERT é feito pelo Core, os eventos do ORM não disparam: os sketches de
+ganhos e o cache de analytics (de todos os workers) são atualizados aqui para
+as receitas inseridas.
+"""
+
+import asyncio
+import calendar
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.entry import Entry, EntryType
+from app.models.recurring_rule import RecurrenceFrequency, RecurringRule
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.driver_analytics_service import ENTRIES_TOPIC
+from app.services.earnings_sketch_service import EarningsSketchService, ride_contribution
+
+logger = logging.getLogger(__name__)
+
+FREQUENCIES = (RecurrenceFrequency.DAILY, RecurrenceFrequency.WEEKLY, RecurrenceFrequency.MONTHLY)
+
+# Ocorrências geradas por regra em uma rodada; o restante do atraso fica para
+# os próximos lotes (a marca d'água continua vencida)
+MAX_CATCH_UP = 366
+
+_rules = RecurringRule.__table__
+_entries = Entry.__table__
+
+
+def occurrence(start: date, frequency: str, interval: int, index: int) -> date:
+    """Data da ocorrência de número ``index`` (0 = ``start``)."""
+    if frequency == RecurrenceFrequency.DAILY:
+        return start + timedelta(days=index * interval)
+    if frequency == RecurrenceFrequency.WEEKLY:
+        return start + timedelta(weeks=index * interval)
+    months = start.month - 1 + index * interval
+    year, month = start.year + months // 12, months % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def first_occurrence_on_or_after(
+    start: date, frequency: str, interval: int, when: date, end: Optional[date] = None
+) -> Optional[date]:
+    """Primeira ocorrência em ``when`` ou depois (None se passar de ``end``)."""
+    if when <= start:
+        index = 0
+    elif frequency == RecurrenceFrequency.MONTHLY:
+        index = ((when.year - start.year) * 12 + when.month - start.month) // interval
+    else:
+        step = interval * (7 if frequency == RecurrenceFrequency.WEEKLY else 1)
+        index = (when - start).days // step
+    current = occurrence(start, frequency, interval, index)
+    while current < when:
+        index += 1
+        current = occurrence(start, frequency, interval, index)
+    if end is not None and current > end:
+        return None
+    return current
+
+
+def due_dates(rule, today: date, limit: int = MAX_CATCH_UP) -> Tuple[List[date], Optional[date]]:
+    """Ocorrências devidas da regra até hoje e a nova marca d'água."""
+    until = min(today, rule.end_date) if rule.end_date else today
+    dates: List[date] = []
+    current = rule.next_run_date
+    while current is not None and current <= until and len(dates) < limit:
+        dates.append(current)
+        current = first_occurrence_on_or_after(
+            rule.start_date, rule.frequency, rule.interval, current + timedelta(days=1), rule.end_date
+        )
+    return dates, current
+
+
+class RecurringEntryService:
+    """Geração em lote das ocorrências vencidas das regras recorrentes."""
+
+    @classmethod
+    def materialize_due(
+        cls,
+        db: Session,
+        today: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> Dict[str, int]:
+        """
+        Materializa as ocorrências vencidas de todas as regras ativas.
+
+        Args:
+            db: Sessão do banco de dados
+            today: Data de referência (padrão: hoje)
+            batch_size: Regras por lote (um INSERT e um UPDATE por lote)
+
+        Returns:
+            Dicionário com regras processadas, lançamentos inseridos e lotes
+        """
+        today = today or date.today()
+        report = {"rules": 0, "entries": 0, "batches": 0}
+        while True:
+            rules = db.execute(
+                select(_rules)
+                .where(
+                    _rules.c.is_active.is_(True),
+                    _rules.c.next_run_date.isnot(None),
+                    _rules.c.next_run_date <= today,
+                )
+                .order_by(_rules.c.next_run_date, _rules.c.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rules:
+                break
+
+            rows: List[Dict[str, Any]] = []
+            watermarks: List[Dict[str, Any]] = []
+            for rule in rules:
+                dates, next_run = due_dates(rule, today)
+                rows.extend(cls._entry_row(rule, when) for when in dates)
+                watermarks.append({"rule_id": rule.id, "next_run": next_run})
+
+            count, inserted = cls._insert_entries(db, rows)
+            db.execute(
+                update(_rules)
+                .where(_rules.c.id == bindparam("rule_id"))
+                .values(next_run_date=bindparam("next_run")),
+                watermarks,
+            )
+            for user_id in cls._apply_sketches(db, inserted):
+                CacheInvalidationService.publish(db, ENTRIES_TOPIC, user_id)
+            db.commit()
+
+            report["rules"] += len(rules)
+            report["entries"] += count
+            report["batches"] += 1
+        return report
+
+    @staticmethod
+    def _entry_row(rule, when: date) -> Dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "user_id": rule.user_id,
+            "recurring_rule_id": rule.id,
+            "date": datetime.combine(when, time.min),
+            "amount": rule.amount,
+            "description": rule.description,
+            "type": rule.type,
+            "category": rule.category,
+            "subcategory": rule.subcategory,
+            "platform": rule.platform,
+            "is_recurring": True,
+            "is_trip_expense": False,
+            "is_deleted": False,
+        }
+
+    @staticmethod
+    def _insert_entries(db: Session, rows: List[Dict[str, Any]]) -> Tuple[int, list]:
+        """
+        INSERT em lote ignorando ocorrências já geradas.
+
+        Só as receitas usam RETURNING (para os sketches); as despesas vão em um
+        executemany simples. Retorna o total de linhas inseridas e as receitas
+        efetivamente inseridas.
+        """
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            stmt = postgresql.insert(_entries).on_conflict_do_nothing()
+        elif dialect_name == "sqlite":
+            stmt = sqlite.insert(_entries).on_conflict_do_nothing()
+        else:
+            stmt = insert(_entries)
+        expenses = [row for row in rows if row["type"] != EntryType.INCOME]
+        incomes = [row for row in rows if row["type"] == EntryType.INCOME]
+        count = 0
+        if expenses:
+            # rowcount de executemany conta só as linhas inseridas (-1 se o driver não informar)
+            count += max(db.execute(stmt, expenses).rowcount, 0)
+        inserted = []
+        if incomes:
+            inserted = db.execute(
+                stmt.returning(_entries.c.user_id, _entries.c.date, _entries.c.amount),
+                incomes,
+            ).all()
+        return count + len(inserted), inserted
+
+    @staticmethod
+    def _apply_sketches(db: Session, inserted: list) -> set:
+        """Soma as receitas inseridas aos sketches de ganhos; retorna os usuários afetados."""
+        contributions = [
+            ride_contribution(row.user_id, row.date, EntryType.INCOME, False, row.amount, None, None)
+            for row in inserted
+        ]
+        if contributions:
+            EarningsSketchService.apply(db.connection(), added=contributions)
+        return {c[0] for c in contributions}
+
+
+def run_scheduled_materialization() -> Dict[str, int]:
+    """Executa uma rodada de materialização com uma sessão própria."""
+    db = SessionLocal()
+    try:
+        return RecurringEntryService.materialize_due(
+            db, batch_size=settings.RECURRING_ENTRIES_BATCH_SIZE
+        )
+    finally:
+        db.close()
+
+
+async def recurring_entries_loop(interval_minutes: float) -> None:
+    """Laço em background que materializa as ocorrências vencidas periodicamente."""
+    while True:
+        try:
+            report = await asyncio.to_thread(run_scheduled_materialization)
+            if report["entries"]:
+                logger.info("Lançamentos recorrentes materializados: %s", report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro na materialização de lançamentos recorrentes: {str(e)}")
+        await asyncio.sleep(interval_minutes * 60)
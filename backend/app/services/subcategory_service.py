@@ -0,0 +1,105 @@
+"""Consultas de subcategorias resolvidas no banco (json_each / JSONB)."""
+
+from typing import List, Optional
+
+from sqlalchemy import exists, select, true, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.core.custom_types import list_elements
+from app.models.category import Category
+
+
+class SubcategoryService:
+    """Serviço para consultar subcategorias sem decodificar listas em Python."""
+
+    @staticmethod
+    def _visible_to(user_id: str):
+        return (Category.is_default == True) | (  # noqa: E712
+            Category.user_id == user_id
+        )
+
+    @classmethod
+    def list_subcategories(
+        cls, db: Session, category_id: str, user_id: str
+    ) -> Optional[List[str]]:
+        """
+        Retorna as subcategorias de uma categoria visível ao usuário.
+
+        Args:
+            db: Sessão do banco de dados
+            category_id: ID da categoria
+            user_id: ID do usuário atual
+
+        Returns:
+            Lista de subcategorias na ordem original ou None se a categoria
+            não existir para o usuário
+        """
+        visible = cls._visible_to(user_id)
+        elements = list_elements(Category.subcategories, db.get_bind().dialect.name)
+        rows = db.execute(
+            select(elements.c.value)
+            .select_from(Category)
+            .join(elements, true())
+            .where(Category.id == category_id, visible)
+            .order_by(elements.c.key)
+        ).scalars().all()
+        if rows:
+            return list(rows)
+
+        # Sem itens: distinguir categoria vazia de categoria inexistente
+        found = db.execute(
+            select(exists().where(Category.id == category_id, visible))
+        ).scalar()
+        return [] if found else None
+
+    @classmethod
+    def is_valid_subcategory(
+        cls,
+        db: Session,
+        user_id: str,
+        category_name: str,
+        subcategory: str,
+        entry_type: Optional[str] = None,
+    ) -> bool:
+        """
+        Verifica se a subcategoria é permitida para a categoria informada.
+
+        Categorias sem lista de subcategorias (ou que não existem no cadastro)
+        aceitam qualquer valor. Quando alguma categoria visível com esse nome
+        define subcategorias, o valor precisa constar em pelo menos uma delas.
+        A verificação é feita em uma única consulta; no PostgreSQL o teste de
+        pertencimento usa ``@>``, atendido pelo índice GIN da coluna.
+        """
+        dialect_name = db.get_bind().dialect.name
+        elements = list_elements(Category.subcategories, dialect_name)
+        filters = [Category.name == category_name, cls._visible_to(user_id)]
+        if entry_type:
+            filters.append(Category.type == entry_type)
+
+        restricted = (
+            select(elements.c.value)
+            .select_from(Category)
+            .join(elements, true())
+            .where(*filters)
+            .exists()
+        )
+        if dialect_name == "postgresql":
+            allowed = (
+                select(Category.id)
+                .where(
+                    *filters,
+                    type_coerce(Category.subcategories, JSONB).contains([subcategory]),
+                )
+                .exists()
+            )
+        else:
+            allowed = (
+                select(elements.c.value)
+                .select_from(Category)
+                .join(elements, true())
+                .where(*filters, elements.c.value == subcategory)
+                .exists()
+            )
+        row = db.execute(select(restricted, allowed)).one()
+        return (not row[0]) or bool(row[1])
@@ -191,6 +191,25 @@ class SystemConfigService:
                 "category": "security",
                 "public": False,
             },
+            # Profiler de consultas SQL (headers X-DB-* para o MASTER)
+            "query_profiler_enabled": {
+                "value": False,
+                "type": "boolean",
+                "category": "logging",
+                "public": False,
+            },
+            "query_profiler_slow_ms": {
+                "value": 200,
+                "type": "integer",
+                "category": "logging",
+                "public": False,
+            },
+            "query_profiler_repeat_threshold": {
+                "value": 5,
+                "type": "integer",
+                "category": "logging",
+                "public": False,
+            },
         }
 
     def get_all_configs(
@@ -446,6 +465,12 @@ class SystemConfigService:
             if key == "temp_password_expiry_hours" and value < 1:
                 return False, "Expiração de senha temporária deve ser pelo menos 1 hora"
 
+            if key == "query_profiler_slow_ms" and value < 1:
+                return False, "Limite de consulta lenta deve ser pelo menos 1 ms"
+
+            if key == "query_profiler_repeat_threshold" and value < 2:
+                return False, "Limite de repetições deve ser pelo menos 2"
+
             return True, ""
 
         except Exception as e:
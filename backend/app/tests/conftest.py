@@ -12,7 +12,34 @@ from app.core.security import create_access_token
 from app.models.user import User
 from app.models.entry import Entry
 from app.models.category import Category
+from app.models.cep_cache import CepCache
 from app.main import app
+from app.services.cep_service import CEPService
+from app.services.login_throttle_service import LoginThrottleService
+
+
+@pytest.fixture(autouse=True)
+def clear_cep_cache(monkeypatch):
+    """Evita que o cache de CEP (memória e tabela cep_cache) vaze entre testes."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine, tables=[CepCache.__table__])
+    monkeypatch.setattr(CEPService, "session_factory", sessionmaker(bind=engine))
+    CEPService.clear_cache()
+    yield
+    CEPService.clear_cache()
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    """Evita que falhas de login de um teste bloqueiem os seguintes."""
+    LoginThrottleService.reset()
+    yield
+    LoginThrottleService.reset()
 
 
 @pytest.fixture(scope="function")
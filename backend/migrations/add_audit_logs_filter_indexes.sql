@@ -0,0 +1,12 @@
+-- Migração para índices de filtragem dos logs de auditoria
+-- Data: 2026-10-19
+-- Descrição: Índices compostos (resource_type, created_at) e (action, created_at) para "eventos recentes do tipo X"
+-- Compatível com SQLite e PostgreSQL
+
+CREATE INDEX IF NOT EXISTS ix_audit_logs_resource_type_created_at ON audit_logs(resource_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_action_created_at ON audit_logs(action, created_at);
+
+-- Somente PostgreSQL: índices trigram para busca por substring (ILIKE '%valor%')
+-- CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- CREATE INDEX IF NOT EXISTS ix_audit_logs_action_trgm ON audit_logs USING gin (action gin_trgm_ops);
+-- CREATE INDEX IF NOT EXISTS ix_audit_logs_performed_by_trgm ON audit_logs USING gin (performed_by gin_trgm_ops);
@@ -0,0 +1,6 @@
+-- Migração para o índice de despesas vinculadas a corridas
+-- Data: 2026-10-19
+-- Descrição: Índice em entries.linked_entry_id para o join de rentabilidade por corrida
+-- Compatível com SQLite e PostgreSQL
+
+CREATE INDEX IF NOT EXISTS ix_entries_linked_entry_id ON entries(linked_entry_id);
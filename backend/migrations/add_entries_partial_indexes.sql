@@ -0,0 +1,16 @@
+-- Migração para os índices parciais de lançamentos ativos
+-- Data: 2026-10-19
+-- Descrição: Índices (user_id, date) e (user_id, type, date) só com lançamentos não
+--            excluídos, e índice dos excluídos usado pela limpeza em background
+-- Compatível com SQLite e PostgreSQL (o predicado precisa ser idêntico ao gerado
+-- pelas consultas: "IS 0"/"IS 1" no SQLite, "IS false"/"IS true" no PostgreSQL)
+
+-- SQLite
+CREATE INDEX IF NOT EXISTS ix_entries_active_user_date ON entries(user_id, date) WHERE is_deleted IS 0;
+CREATE INDEX IF NOT EXISTS ix_entries_active_user_type_date ON entries(user_id, type, date) WHERE is_deleted IS 0;
+CREATE INDEX IF NOT EXISTS ix_entries_deleted_id ON entries(id) WHERE is_deleted IS 1;
+
+-- PostgreSQL
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_active_user_date ON entries(user_id, date) WHERE is_deleted IS false;
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_active_user_type_date ON entries(user_id, type, date) WHERE is_deleted IS false;
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_entries_deleted_id ON entries(id) WHERE is_deleted IS true;
@@ -0,0 +1,16 @@
+-- Migração para armazenar subcategorias como JSONB no PostgreSQL
+-- Data: 2026-10-19
+-- Descrição: Converte categories.subcategories (TEXT) para JSONB e cria índice GIN
+-- Compatível apenas com PostgreSQL (no SQLite a coluna continua TEXT com JSON, consultada via json_each)
+
+-- Valores antigos podem estar como JSON ('["a","b"]') ou como literal de array ('{a,b}')
+ALTER TABLE categories
+    ALTER COLUMN subcategories TYPE JSONB
+    USING CASE
+        WHEN subcategories IS NULL THEN NULL
+        WHEN left(btrim(subcategories), 1) = '[' THEN subcategories::jsonb
+        ELSE to_jsonb(subcategories::text[])
+    END;
+
+-- Índice GIN para consultas de pertinência (@>, ?) sobre as subcategorias
+CREATE INDEX IF NOT EXISTS ix_categories_subcategories_gin ON categories USING gin (subcategories);
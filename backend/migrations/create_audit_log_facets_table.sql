@@ -0,0 +1,22 @@
+-- Migração para o dicionário de ações e tipos de recurso da auditoria
+-- Data: 2026-10-19
+-- Descrição: Tabela audit_log_facets com os valores distintos de action/resource_type, mantida pelo gravador de auditoria
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS audit_log_facets (
+    kind VARCHAR NOT NULL,
+    value VARCHAR NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (kind, value)
+);
+
+-- Backfill único a partir dos logs existentes
+INSERT INTO audit_log_facets (kind, value)
+SELECT DISTINCT 'action', action FROM audit_logs
+WHERE action IS NOT NULL AND action <> ''
+ON CONFLICT DO NOTHING;
+
+INSERT INTO audit_log_facets (kind, value)
+SELECT DISTINCT 'resource_type', resource_type FROM audit_logs
+WHERE resource_type IS NOT NULL AND resource_type <> ''
+ON CONFLICT DO NOTHING;
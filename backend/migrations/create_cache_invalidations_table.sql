@@ -0,0 +1,18 @@
+-- Migração para o barramento de invalidação de cache entre workers
+-- Data: 2026-10-19
+-- Descrição: Tabela cache_invalidations; cada worker lê as linhas com id acima do
+--            último visto e invalida os próprios caches em memória
+-- Compatível apenas com SQLite (PostgreSQL: create_cache_invalidations_table_postgresql.sql)
+-- AUTOINCREMENT é obrigatório: sem ele o SQLite reaproveita ids depois que a limpeza
+-- esvazia a tabela. As linhas são transitórias, então uma tabela criada sem ele pode
+-- ser recriada (DROP TABLE cache_invalidations) com os workers parados.
+
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic VARCHAR(64) NOT NULL,
+    key VARCHAR,
+    origin VARCHAR(32) NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_cache_invalidations_created_at ON cache_invalidations(created_at);
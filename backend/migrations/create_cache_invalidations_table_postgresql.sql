@@ -0,0 +1,16 @@
+-- Migração para o barramento de invalidação de cache entre workers
+-- Data: 2026-10-19
+-- Descrição: Tabela cache_invalidations; cada worker lê as linhas com id acima do
+--            último visto e invalida os próprios caches em memória
+-- Compatível apenas com PostgreSQL (SQLite: create_cache_invalidations_table.sql)
+-- A sequência da coluna identity nunca recua, mesmo com a tabela esvaziada pela limpeza
+
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    topic VARCHAR(64) NOT NULL,
+    key VARCHAR,
+    origin VARCHAR(32) NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_cache_invalidations_created_at ON cache_invalidations(created_at);
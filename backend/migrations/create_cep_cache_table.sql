@@ -0,0 +1,13 @@
+-- Migração para o cache persistente de consultas de CEP
+-- Data: 2026-10-19
+-- Descrição: Tabela cep_cache com TTL; data NULL representa CEP inexistente (cache negativo)
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS cep_cache (
+    cep VARCHAR(8) PRIMARY KEY,
+    data JSON,
+    fetched_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_cep_cache_expires_at ON cep_cache(expires_at);
@@ -0,0 +1,9 @@
+-- Migração para o registro de migrações de dados
+-- Data: 2026-10-19
+-- Descrição: Tabela data_migrations com as versões já aplicadas na inicialização
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS data_migrations (
+    version VARCHAR(128) PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL
+);
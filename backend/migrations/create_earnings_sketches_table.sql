@@ -0,0 +1,15 @@
+-- Migração para os sketches de quantis dos ganhos
+-- Data: 2026-10-19
+-- Descrição: Tabela earnings_sketches com um sketch por métrica (ganho por corrida,
+--            por km e por hora) para cada usuário e mês; preenchida na inicialização
+--            pela migração de dados 20261019_02_build_earnings_sketches
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS earnings_sketches (
+    user_id VARCHAR NOT NULL,
+    month VARCHAR(7) NOT NULL,
+    sketches JSON NOT NULL,
+    rides INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, month)
+);
@@ -0,0 +1,22 @@
+-- Migração para a fila persistente de emails
+-- Data: 2026-10-19
+-- Descrição: Tabela email_outbox consumida pelo envio em segundo plano (PENDING, SENDING, SENT, DEAD)
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id VARCHAR PRIMARY KEY,
+    to_email VARCHAR NOT NULL,
+    subject VARCHAR NOT NULL,
+    body TEXT,
+    status VARCHAR NOT NULL DEFAULT 'PENDING',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL,
+    locked_by VARCHAR,
+    locked_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_email_outbox_id ON email_outbox(id);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_status_next_attempt ON email_outbox(status, next_attempt_at);
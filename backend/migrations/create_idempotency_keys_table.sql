@@ -0,0 +1,18 @@
+-- Migração para as chaves de idempotência de POST /entries/
+-- Data: 2026-10-19
+-- Descrição: Tabela idempotency_keys; guarda a resposta de cada criação feita com o
+--            cabeçalho Idempotency-Key para devolvê-la nas repetições sem nova inserção
+-- Compatível com SQLite e PostgreSQL (no PostgreSQL, trocar JSON por JSONB se preferir)
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id VARCHAR NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER NOT NULL,
+    response_body JSON NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, key)
+);
+
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys(expires_at);
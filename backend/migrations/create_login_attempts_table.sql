@@ -0,0 +1,13 @@
+-- Migração para o limitador de tentativas de login (backend em banco)
+-- Data: 2026-10-19
+-- Descrição: Tabela login_attempts com as falhas recentes por usuário e por IP
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS login_attempts (
+    id VARCHAR PRIMARY KEY,
+    key VARCHAR(320) NOT NULL,
+    attempted_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_login_attempts_key_attempted_at ON login_attempts(key, attempted_at);
+CREATE INDEX IF NOT EXISTS ix_login_attempts_attempted_at ON login_attempts(attempted_at);
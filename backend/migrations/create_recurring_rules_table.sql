@@ -0,0 +1,32 @@
+-- Migração para as regras de lançamentos recorrentes
+-- Data: 2026-10-19
+-- Descrição: Cria a tabela recurring_rules e vincula os lançamentos gerados à regra
+--            (índice único por regra e data torna a materialização idempotente)
+-- Compatível com SQLite e PostgreSQL
+
+CREATE TABLE IF NOT EXISTS recurring_rules (
+    id VARCHAR PRIMARY KEY,
+    user_id VARCHAR NOT NULL REFERENCES users(id),
+    description VARCHAR,
+    amount FLOAT NOT NULL,
+    type VARCHAR NOT NULL,
+    category VARCHAR,
+    subcategory VARCHAR,
+    platform VARCHAR,
+    frequency VARCHAR NOT NULL,
+    interval INTEGER NOT NULL DEFAULT 1,
+    start_date DATE NOT NULL,
+    end_date DATE,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    next_run_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_recurring_rules_id ON recurring_rules(id);
+CREATE INDEX IF NOT EXISTS ix_recurring_rules_user_id ON recurring_rules(user_id);
+CREATE INDEX IF NOT EXISTS ix_recurring_rules_due ON recurring_rules(is_active, next_run_date);
+
+ALTER TABLE entries ADD COLUMN recurring_rule_id VARCHAR REFERENCES recurring_rules(id) ON DELETE SET NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_entries_recurring_rule_date ON entries(recurring_rule_id, date);
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos filtros de GET /api/v1/audit-logs/ em uma tabela grande.
+
+Gera N logs de auditoria sintéticos (padrão: 5 milhões) em um banco SQLite
+temporário e mede o tempo de cada modo de busca (contains / prefix / exact)
+para action e performed_by, além da visão "eventos recentes do tipo X" que
+usa o índice composto (resource_type, created_at). Também imprime o plano de
+execução de cada consulta.
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_audit_filters.py --rows 5000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.v1.audit_logs import _text_filter, get_audit_logs  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models.audit_log import AuditLog  # noqa: E402
+
+ACTIONS = [
+    f"{verb}_{noun}"
+    for verb in ("CREATE", "UPDATE", "DELETE", "BLOCK", "UNBLOCK", "RESET")
+    for noun in ("USER", "ENTRY", "CATEGORY", "CONFIG", "PASSWORD", "SECRET_KEY")
+] + ["LOGIN", "LOGOUT", "LOGIN_FAILED", "CLEANUP_LOGS"]
+RESOURCE_TYPES = ["user", "entry", "category", "auth", "audit_log", "system_config"]
+BATCH = 50_000
+
+
+def _populate(engine, rows: int, users: int, seed: int):
+    rng = random.Random(seed)
+    performers = [f"user{i:05d}@example.com" for i in range(users)]
+    start = datetime.now() - timedelta(days=730)
+    inserted = 0
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        while inserted < rows:
+            size = min(BATCH, rows - inserted)
+            conn.execute(
+                insert(AuditLog.__table__),
+                [
+                    {
+                        "id": f"{inserted + i:012d}",
+                        "action": rng.choice(ACTIONS),
+                        "resource_type": rng.choice(RESOURCE_TYPES),
+                        "performed_by": rng.choice(performers),
+                        "performed_by_role": "USER",
+                        "description": "bench",
+                        "created_at": start
+                        + timedelta(seconds=rng.randrange(730 * 86400)),
+                    }
+                    for i in range(size)
+                ],
+            )
+            inserted += size
+    print(f"{rows} linhas inseridas em {time.perf_counter() - started:.1f}s")
+
+
+def _time_call(session, repeat: int, **filters):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_audit_logs(db=session, current_user=None, limit=100, **filters)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def _plan(session, **filters):
+    """Reconstrói a consulta com os mesmos filtros e devolve o plano do SQLite."""
+    stmt = session.query(AuditLog)
+    if "action" in filters:
+        stmt = stmt.filter(
+            _text_filter(AuditLog.action, filters["action"], filters["match"])
+        )
+    if "performed_by" in filters:
+        stmt = stmt.filter(
+            _text_filter(AuditLog.performed_by, filters["performed_by"], filters["match"])
+        )
+    if "resource_type" in filters:
+        stmt = stmt.filter(AuditLog.resource_type == filters["resource_type"])
+    stmt = stmt.order_by(AuditLog.created_at.desc()).limit(100)
+    compiled = stmt.statement.compile(
+        session.get_bind(), compile_kwargs={"literal_binds": True}
+    )
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(engine)
+        _populate(engine, args.rows, args.users, args.seed)
+        session = sessionmaker(bind=engine)()
+
+        scenarios = [
+            ("action contains", {"action": "LOGIN_F", "match": "contains"}),
+            ("action prefix", {"action": "LOGIN_F", "match": "prefix"}),
+            ("action exact", {"action": "LOGIN_FAILED", "match": "exact"}),
+            ("performed_by contains", {"performed_by": "user00042@", "match": "contains"}),
+            ("performed_by prefix", {"performed_by": "user00042@", "match": "prefix"}),
+            (
+                "performed_by exact",
+                {"performed_by": "user00042@example.com", "match": "exact"},
+            ),
+            ("recentes por tipo", {"resource_type": "category", "match": "exact"}),
+        ]
+        for label, filters in scenarios:
+            elapsed = _time_call(session, args.repeat, **filters)
+            print(f"{label:<24} {elapsed:>10.2f} ms   plano: {_plan(session, **filters)}")
+        session.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
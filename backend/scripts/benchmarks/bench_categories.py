@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark do endpoint GET /api/v1/categories/ sob alta concorrência.
+
+Compara o caminho com o cache de categorias padrão aquecido contra o caminho
+"frio", em que o cache é invalidado antes de cada requisição (equivalente ao
+comportamento anterior, que consultava todas as categorias a cada chamada).
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_categories.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.database import Base, get_db  # noqa: E402
+from app.dependencies import get_current_user  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.category_cache_service import CategoryCacheService  # noqa: E402
+
+
+def _setup_database(path: str, defaults: int, per_user: int):
+    # Mesma configuração de pool usada pela aplicação para SQLite
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+    db = SessionLocal()
+    user = User(email="bench@example.com", username="bench", name="Bench")
+    db.add(user)
+    db.flush()
+    for i in range(defaults):
+        db.add(
+            Category(
+                name=f"Padrão {i}",
+                type="EXPENSE" if i % 2 else "INCOME",
+                is_default=True,
+                subcategories=[f"Sub {i}.{j}" for j in range(8)],
+            )
+        )
+    for i in range(per_user):
+        db.add(Category(name=f"Pessoal {i}", type="EXPENSE", user_id=user.id))
+    db.commit()
+    db.close()
+    return engine, SessionLocal, user
+
+
+async def _run(total: int, concurrency: int, cold: bool):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one():
+            async with semaphore:
+                if cold:
+                    CategoryCacheService.invalidate()
+                start = time.perf_counter()
+                response = await client.get("/api/v1/categories/")
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--defaults", type=int, default=40)
+    parser.add_argument("--per-user", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine, SessionLocal, user = _setup_database(path, args.defaults, args.per_user)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: user
+
+        for label, cold in (("sem cache (frio)", True), ("com cache", False)):
+            CategoryCacheService.invalidate()
+            result = asyncio.run(_run(args.requests, args.concurrency, cold))
+            print(
+                f"{label:<18} {result['rps']:>9.1f} req/s  "
+                f"p50={result['p50_ms']:.2f}ms  p95={result['p95_ms']:.2f}ms  "
+                f"p99={result['p99_ms']:.2f}ms"
+            )
+    finally:
+        app.dependency_overrides = {}
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark da base offline de CEPs (arquivo binário mapeado em memória).
+
+Gera um CSV sintético com N CEPs (padrão: 1 milhão, próximo do DNE), monta o
+arquivo com build_cep_index e mede:
+- tempo de geração e tamanho do arquivo (bytes por CEP)
+- memória residente do processo antes/depois de abrir a base e após as buscas
+- latência de CEPService.get_address_by_cep para CEPs presentes e ausentes
+  na base (ausentes caem no ViaCEP, aqui substituído por um transporte local)
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_cep_offline.py --ceps 1000000
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx  # noqa: E402
+
+from app.services.cep_offline_index import CEPOfflineIndex, build_cep_index  # noqa: E402
+from app.services.cep_service import CEPService  # noqa: E402
+
+STATES = ["SP", "RJ", "MG", "RS", "PR", "SC", "BA", "PE", "CE", "GO", "DF", "PA"]
+STREET_TYPES = ["Rua", "Avenida", "Travessa", "Alameda", "Praça"]
+NAMES = [
+    "das Flores", "Brasil", "São João", "Sete de Setembro", "XV de Novembro",
+    "Tiradentes", "Santos Dumont", "Dom Pedro II", "da Liberdade", "Paulista",
+]
+
+
+def rss_mib() -> float:
+    """Memória residente atual do processo em MiB."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def generate_csv(path: Path, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    ceps = sorted(rng.sample(range(1_000_000, 99_999_999), count))
+    cities = [
+        (f"Cidade {i}", STATES[i % len(STATES)], str(1_000_000 + i), str(11 + i % 89))
+        for i in range(5_570)
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(
+            ["cep", "logradouro", "complemento", "bairro", "localidade", "uf", "ibge", "ddd"]
+        )
+        for cep in ceps:
+            city, uf, ibge, ddd = cities[cep % len(cities)]
+            writer.writerow(
+                [
+                    f"{cep:08d}",
+                    f"{rng.choice(STREET_TYPES)} {rng.choice(NAMES)} {cep % 997}",
+                    "" if cep % 5 else f"até {cep % 1000}",
+                    f"Bairro {cep % 211}",
+                    city,
+                    uf,
+                    ibge,
+                    ddd,
+                ]
+            )
+    return ceps
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def measure(ceps: list, lookups: int, seed: int) -> None:
+    rng = random.Random(seed + 1)
+    present = set(ceps)
+    hits = [f"{rng.choice(ceps):08d}" for _ in range(lookups)]
+    misses = []
+    while len(misses) < min(lookups, 2_000):
+        candidate = rng.randrange(1_000_000, 99_999_999)
+        if candidate not in present:
+            misses.append(f"{candidate:08d}")
+
+    def viacep(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"erro": True})
+
+    await CEPService.startup(transport=httpx.MockTransport(viacep))
+    # O cache persistente fica fora da medição
+    CEPService._load_persistent = classmethod(lambda cls, cep: (False, None))
+    CEPService._store_persistent = classmethod(lambda cls, cep, address, ttl: None)
+
+    for label, sample in (("presentes (offline)", hits), ("ausentes (fallback)", misses)):
+        CEPService.clear_cache()
+        timings = []
+        for cep in sample:
+            started = time.perf_counter()
+            await CEPService.get_address_by_cep(cep)
+            timings.append((time.perf_counter() - started) * 1e6)
+        print(
+            f"CEPs {label:<22} n={len(sample):>7}  "
+            f"média {statistics.mean(timings):8.1f} µs  "
+            f"p50 {percentile(timings, 0.50):8.1f} µs  "
+            f"p99 {percentile(timings, 0.99):8.1f} µs"
+        )
+    await CEPService._close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da base offline de CEPs")
+    parser.add_argument("--ceps", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "ceps.csv"
+        index_path = Path(tmp) / "ceps.idx"
+
+        started = time.perf_counter()
+        ceps = generate_csv(csv_path, args.ceps, args.seed)
+        print(f"CSV sintético: {args.ceps} CEPs, {csv_path.stat().st_size / 1024 / 1024:.1f} MiB "
+              f"({time.perf_counter() - started:.1f}s)")
+
+        started = time.perf_counter()
+        build_cep_index(csv_path, index_path)
+        size = index_path.stat().st_size
+        print(f"Arquivo binário: {size / 1024 / 1024:.1f} MiB ({size / args.ceps:.1f} bytes/CEP), "
+              f"gerado em {time.perf_counter() - started:.1f}s")
+
+        before = rss_mib()
+        index = CEPOfflineIndex(index_path)
+        opened = rss_mib()
+        index.close()
+
+        CEPService.load_offline_dataset(str(index_path))
+        asyncio.run(measure(ceps, args.lookups, args.seed))
+        after = rss_mib()
+        CEPService.close_offline_dataset()
+
+        print(f"RSS antes de abrir: {before:.1f} MiB | após abrir: {opened:.1f} MiB "
+              f"| após as buscas: {after:.1f} MiB")
+        print("(páginas do mmap são do page cache e compartilhadas entre workers)")
+
+        # Referência: a mesma base carregada num dict Python em cada processo
+        before = rss_mib()
+        with open(csv_path, newline="", encoding="utf-8") as fh:
+            reader = csv.reader(fh, delimiter=";")
+            next(reader)
+            in_memory = {row[0]: tuple(row[1:]) for row in reader}
+        print(f"Referência dict em memória: +{rss_mib() - before:.1f} MiB "
+              f"({len(in_memory)} CEPs)")
+
+
+if __name__ == "__main__":
+    main()
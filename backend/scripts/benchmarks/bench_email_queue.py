@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark do envio de emails: conexão por mensagem x fila com pool SMTP.
+
+Sobe um servidor SMTP local (aiosmtpd) com STARTTLS (certificado autoassinado)
+e AUTH, e compara:
+- envio direto como no fluxo antigo: conexão + STARTTLS + login por mensagem,
+  em sequência, dentro da requisição
+- fila: custo de enfileirar na requisição (INSERT + commit) e vazão do envio
+  em segundo plano por EmailQueueService.process_batch com o pool de conexões
+
+``--rtt-ms`` adiciona um atraso por comando no servidor para simular a latência
+de rede até um provedor real (em loopback o handshake é quase gratuito).
+
+Requer requirements-dev.txt. Executar a partir de backend/:
+    python scripts/benchmarks/bench_email_queue.py --messages 500 --rtt-ms 20
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import logging
+import smtplib
+import socket
+import ssl
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.services.email_queue_service import (  # noqa: E402
+    EmailQueueService,
+    SMTPConnectionPool,
+)
+from app.services.email_service import email_service  # noqa: E402
+
+
+class CountingHandler:
+    """Aceita tudo, conta mensagens e simula latência por comando."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.delivered = 0
+
+    async def _delay(self):
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await self._delay()
+        session.host_name = hostname
+        return responses
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        await self._delay()
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        await self._delay()
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        await self._delay()
+        self.delivered += 1
+        return "250 Message accepted"
+
+
+def _self_signed(directory: Path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + dt.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_ctx.load_cert_chain(cert_path, key_path)
+    client_ctx = ssl.create_default_context()
+    client_ctx.check_hostname = False
+    client_ctx.verify_mode = ssl.CERT_NONE
+    return server_ctx, client_ctx
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _send_direct(port: int, client_ctx, messages: int) -> list:
+    latencies = []
+    for i in range(messages):
+        start = time.perf_counter()
+        with smtplib.SMTP("127.0.0.1", port) as server:
+            server.starttls(context=client_ctx)
+            server.login("bench", "bench")
+            server.send_message(
+                email_service.build_message(f"u{i}@example.com", "Bench", "corpo")
+            )
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da fila de emails")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        server_ctx, client_ctx = _self_signed(tmp_dir)
+        handler = CountingHandler(args.rtt_ms / 1000)
+        port = _free_port()
+        controller = Controller(
+            handler,
+            hostname="127.0.0.1",
+            port=port,
+            tls_context=server_ctx,
+            authenticator=lambda *a: AuthResult(success=True),
+        )
+        controller.start()
+        try:
+            print(f"Servidor SMTP local na porta {port} (STARTTLS + AUTH, "
+                  f"rtt simulado {args.rtt_ms:.0f} ms/comando)")
+
+            # 1) Conexão por mensagem, dentro da requisição
+            latencies = _send_direct(port, client_ctx, args.messages)
+            total = sum(latencies)
+            print(f"\nConexão por mensagem: {args.messages / total:.1f} msg/s | "
+                  f"latência na requisição p50 {statistics.median(latencies) * 1000:.1f} ms")
+
+            # 2) Fila + pool
+            engine = create_engine(f"sqlite:///{tmp_dir / 'bench.db'}")
+            Base.metadata.create_all(engine)
+            session_factory = sessionmaker(bind=engine)
+
+            enqueue = []
+            for i in range(args.messages):
+                start = time.perf_counter()
+                with session_factory() as db:
+                    EmailQueueService.enqueue(db, f"u{i}@example.com", "Bench", "corpo")
+                    db.commit()
+                enqueue.append(time.perf_counter() - start)
+
+            pool = SMTPConnectionPool(
+                "127.0.0.1",
+                port,
+                username="bench",
+                password="bench",
+                size=args.pool_size,
+                tls_context=client_ctx,
+            )
+            delivered_before = handler.delivered
+            start = time.perf_counter()
+            try:
+                while EmailQueueService.process_batch(
+                    pool, session_factory, batch_size=args.batch_size
+                )["claimed"]:
+                    pass
+            finally:
+                pool.close()
+            elapsed = time.perf_counter() - start
+            sent = handler.delivered - delivered_before
+            print(f"Fila + pool ({args.pool_size} conexões): {sent / elapsed:.1f} msg/s | "
+                  f"latência na requisição p50 {statistics.median(enqueue) * 1000:.2f} ms | "
+                  f"conexões abertas {pool.connections_opened}")
+            print(f"Ganho de vazão: {(sent / elapsed) / (args.messages / total):.1f}x")
+            engine.dispose()
+        finally:
+            controller.stop()
+
+
+if __name__ == "__main__":
+    logging.getLogger("mail.log").setLevel(logging.ERROR)
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark da edição de lançamentos (PUT/PATCH de /entries/{id}).
+
+Compara, sobre a mesma base, o caminho antigo (SELECT, ``setattr``, commit e
+``refresh``) com EntryUpdateService (UPDATE ... RETURNING), contando as
+instruções enviadas ao banco por edição, e mede a vazão do PATCH pela rota
+com o TestClient. Metade das edições muda a descrição e metade as gorjetas
+(recalcula ``net_amount`` e os sketches de ganhos); cada etapa edita
+lançamentos diferentes.
+
+Por padrão usa um SQLite temporário; com ``--database-url`` roda em outro banco
+(no PostgreSQL cada instrução a menos é uma ida à rede a menos).
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_entry_patch.py --edits 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.v1 import entries  # noqa: E402
+from app.core.database import Base, get_db  # noqa: E402
+from app.dependencies import get_current_user  # noqa: E402
+from app.models.entry import Entry, EntryType  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.earnings_sketch_service import EarningsSketchService  # noqa: E402
+from app.services.entry_update_service import EntryUpdateService  # noqa: E402
+
+USER_ID = "u000000"
+
+
+def _populate(engine, rows: int, seed: int) -> list:
+    rng = random.Random(seed)
+    ids = [f"e{i:09d}" for i in range(rows)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [{"id": USER_ID, "email": "u0@example.com", "username": "u0", "name": "U0", "role": "USER"}],
+        )
+        values = []
+        for entry_id in ids:
+            gross = round(rng.uniform(10, 80), 2)
+            fee = round(gross * 0.25, 2)
+            values.append({
+                "id": entry_id, "user_id": USER_ID, "type": "INCOME", "category": "Corrida",
+                "description": "Corrida", "amount": gross - fee, "gross_amount": gross,
+                "platform_fee": fee, "net_amount": gross - fee, "distance_km": rng.uniform(2, 30),
+                "duration_min": rng.randint(5, 60), "is_deleted": False,
+                "date": datetime(2026, 1, 1) + timedelta(minutes=rng.randrange(400_000)),
+            })
+        conn.execute(insert(Entry.__table__), values)
+    return ids
+
+
+def _changes(i: int) -> dict:
+    if i % 2:
+        return {"tips_amount": float(i % 7)}
+    return {"description": f"Corrida {i}"}
+
+
+def _legacy_update(db, entry_id: str, update_data: dict) -> Entry:
+    """Caminho anterior das rotas: SELECT, setattr, commit e refresh."""
+    db_entry = db.query(Entry).filter(
+        Entry.id == entry_id, Entry.user_id == USER_ID, Entry.is_deleted.is_(False)
+    ).first()
+    update_data = dict(update_data)
+    if {"gross_amount", "platform_fee", "tips_amount"}.intersection(update_data) and db_entry.type == EntryType.INCOME:
+        gross = update_data.get("gross_amount", db_entry.gross_amount)
+        fee = update_data.get("platform_fee", db_entry.platform_fee) or 0
+        tips = update_data.get("tips_amount", db_entry.tips_amount) or 0
+        if gross is not None:
+            update_data["net_amount"] = (gross + tips) - fee
+            if "amount" not in update_data and db_entry.amount in (gross, None):
+                update_data["amount"] = update_data["net_amount"]
+    for key, value in update_data.items():
+        setattr(db_entry, key, value)
+    db.commit()
+    db.refresh(db_entry)
+    return db_entry
+
+
+def _new_update(db, entry_id: str, update_data: dict) -> dict:
+    entry = EntryUpdateService.update(db, USER_ID, entry_id, update_data)
+    db.commit()
+    return entry
+
+
+def _run(label, engine, session_factory, ids, edits, func):
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with session_factory() as db:
+            started = time.perf_counter()
+            for i in range(edits):
+                func(db, ids[i], _changes(i))
+            elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    print(
+        f"  {label:<28} {edits / elapsed:>9.0f} edições/s   "
+        f"{statements[0] / edits:>5.2f} instruções/edição"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da edição de lançamentos")
+    parser.add_argument("--rows", type=int, default=20_000, help="Ao menos 3x --edits")
+    parser.add_argument("--edits", type=int, default=5000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    url = args.database_url
+    if url is None:
+        tmp_dir = tempfile.mkdtemp(prefix="bench_entry_patch_")
+        url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    if args.rows < 3 * args.edits:
+        parser.error("--rows deve ser ao menos 3x --edits")
+    ids = _populate(engine, args.rows, args.seed)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        EarningsSketchService.rebuild(db)
+        db.commit()
+    print(f"Base: {args.rows} corridas; {args.edits} edições por etapa ({engine.dialect.name})\n")
+
+    legacy_ids, new_ids, route_ids = (
+        ids[stage * args.edits:(stage + 1) * args.edits] for stage in range(3)
+    )
+    _run("antigo (SELECT+setattr)", engine, session_factory, legacy_ids, args.edits, _legacy_update)
+    _run("UPDATE ... RETURNING", engine, session_factory, new_ids, args.edits, _new_update)
+
+    app = FastAPI()
+    app.include_router(entries.router)
+
+    def override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+    with session_factory() as db:
+        user = db.get(User, USER_ID)
+        db.expunge(user)
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+    started = time.perf_counter()
+    for i in range(args.edits):
+        response = client.patch(f"/entries/{route_ids[i]}", json=_changes(i))
+        assert response.status_code == 200, response.text
+    elapsed = time.perf_counter() - started
+    print(f"  {'PATCH pela rota':<28} {args.edits / elapsed:>9.0f} edições/s")
+
+    engine.dispose()
+    if tmp_dir:
+        os.remove(os.path.join(tmp_dir, "bench.db"))
+        os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos índices parciais e da limpeza de lançamentos excluídos.
+
+Gera N lançamentos (padrão: 1 milhão) de vários usuários em um banco SQLite
+temporário, com uma fração excluída (soft delete) há mais que a carência, e
+mede os caminhos quentes de GET /entries e /entries/summary/monthly:
+
+1. sem os índices parciais (só os índices de coluna única)
+2. com ``ix_entries_active_user_date`` e ``ix_entries_active_user_type_date``
+3. depois de EntryRetentionService.purge
+
+Em cada etapa imprime o tamanho dos índices de ``entries``.
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_entry_purge.py --entries 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, func, insert, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.entry import Entry, EntryType  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.entry_retention_service import EntryRetentionService  # noqa: E402
+
+BATCH = 50_000
+NOW = datetime(2026, 10, 19)
+PARTIAL_INDEXES = ("ix_entries_active_user_date", "ix_entries_active_user_type_date")
+
+
+def _populate(engine, entries: int, users: int, deleted_ratio: float, seed: int) -> int:
+    rng = random.Random(seed)
+    start = NOW - timedelta(days=365)
+    deleted = 0
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"id": f"u{i:06d}", "email": f"u{i}@example.com", "username": f"u{i}", "name": f"U{i}", "role": "USER"}
+                for i in range(users)
+            ],
+        )
+        for offset in range(0, entries, BATCH):
+            rows = []
+            for i in range(offset, min(offset + BATCH, entries)):
+                is_deleted = rng.random() < deleted_ratio
+                deleted += is_deleted
+                income = rng.random() < 0.7
+                rows.append({
+                    "id": f"e{i:09d}", "user_id": f"u{rng.randrange(users):06d}",
+                    "type": "INCOME" if income else "EXPENSE",
+                    "category": "Corrida" if income else "Combustível",
+                    "date": start + timedelta(seconds=rng.randrange(365 * 86400)),
+                    "amount": round(rng.uniform(5, 80), 2), "is_deleted": is_deleted,
+                    "updated_at": NOW - timedelta(days=rng.randrange(31, 300)) if is_deleted else None,
+                })
+            conn.execute(insert(Entry.__table__), rows)
+    return deleted
+
+
+def _hot_paths(db, user_ids):
+    """Listagem (mais recentes) e resumo mensal, como nas rotas de entries."""
+    month_start, month_end = datetime(2026, 9, 1), datetime(2026, 10, 1)
+    for user_id in user_ids:
+        db.query(Entry).filter(
+            Entry.user_id == user_id, Entry.is_deleted.is_(False)
+        ).order_by(Entry.date.desc()).limit(100).all()
+        for entry_type in (EntryType.INCOME, EntryType.EXPENSE):
+            db.query(func.sum(Entry.amount), func.count(Entry.id)).filter(
+                Entry.user_id == user_id,
+                Entry.is_deleted.is_(False),
+                Entry.date >= month_start,
+                Entry.date < month_end,
+                Entry.type == entry_type,
+            ).one()
+
+
+def _measure(label, session_factory, user_ids):
+    with session_factory() as db:
+        _hot_paths(db, user_ids[:10])  # aquecimento do cache de páginas
+        started = time.perf_counter()
+        _hot_paths(db, user_ids)
+        elapsed = time.perf_counter() - started
+        sizes = EntryRetentionService.index_sizes(db)
+    total = sum(sizes.values())
+    print(
+        f"  {label:<34} {elapsed / len(user_ids) * 1000:>8.2f} ms/usuário   "
+        f"índices: {total / 2**20:>7.1f} MiB"
+    )
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos índices parciais e da limpeza de excluídos")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--deleted-ratio", type=float, default=0.2)
+    parser.add_argument("--sample", type=int, default=200, help="Usuários medidos por etapa")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_entry_purge_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for name in PARTIAL_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+
+    started = time.perf_counter()
+    deleted = _populate(engine, args.entries, args.users, args.deleted_ratio, args.seed)
+    print(
+        f"Base: {args.entries} lançamentos, {args.users} usuários, {deleted} excluídos "
+        f"({time.perf_counter() - started:.1f}s para popular)\n"
+    )
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    session_factory = sessionmaker(bind=engine)
+    user_ids = random.Random(args.seed).sample([f"u{i:06d}" for i in range(args.users)], args.sample)
+    before = _measure("sem índices parciais", session_factory, user_ids)
+
+    with engine.begin() as conn:
+        for index in Entry.__table__.indexes:
+            if index.name in PARTIAL_INDEXES:
+                index.create(conn)
+        conn.execute(text("ANALYZE"))
+    with_partial = _measure("com índices parciais", session_factory, user_ids)
+
+    with session_factory() as db:
+        report = EntryRetentionService.purge(
+            db, NOW - timedelta(days=30), chunk_size=args.chunk_size, pause_seconds=0
+        )
+    print(
+        f"\nLimpeza: {report['deleted_count']} removidos em {report['chunks']} lotes, "
+        f"{report['elapsed_seconds']:.1f}s ({report['rows_per_second']:.0f} linhas/s)\n"
+    )
+    after = _measure("depois da limpeza", session_factory, user_ids)
+
+    print(f"\n{'índice':<36} {'antes':>10} {'parciais':>10} {'limpeza':>10}   (KiB)")
+    for name in sorted(set(before) | set(with_partial) | set(after)):
+        print(
+            f"{name:<36} {before.get(name, 0) // 1024:>10} "
+            f"{with_partial.get(name, 0) // 1024:>10} {after.get(name, 0) // 1024:>10}"
+        )
+    engine.dispose()
+    os.remove(db_path)
+    os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark do limitador de tentativas de login sob credential stuffing.
+
+Cria usuários reais (hash bcrypt) em um banco SQLite temporário e dispara
+tentativas com pares usuário/senha vazados a partir de poucos IPs, chamando
+login_for_access_token diretamente. Compara o limitador desligado com os
+backends em memória e em banco, medindo:
+- tempo de CPU do processo e tempo total
+- quantidade de verificações bcrypt e de logs de auditoria gravados
+- respostas 401 x 429
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_login_throttle.py --attempts 300
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.api.v1.auth as auth_module  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.core.security import get_password_hash, verify_password  # noqa: E402
+from app.models.audit_log import AuditLog  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.login_throttle_service import (  # noqa: E402
+    DatabaseThrottleBackend,
+    LoginThrottleService,
+    MemoryThrottleBackend,
+)
+
+
+def _setup(path: Path, users: int):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    hashed = get_password_hash("senha-do-usuario")
+    with session_factory() as db:
+        db.add_all(
+            [
+                User(
+                    email=f"user{i}@example.com",
+                    username=f"user{i}",
+                    name=f"User {i}",
+                    hashed_password=hashed,
+                    role="USER",
+                )
+                for i in range(users)
+            ]
+        )
+        db.commit()
+    return engine, session_factory
+
+
+async def _attack(session_factory, attempts, users, ips, seed):
+    rng = random.Random(seed)
+    statuses = Counter()
+    with session_factory() as db:
+        for _ in range(attempts):
+            # Metade dos e-mails vazados existe na base; senhas sempre erradas
+            n = rng.randrange(users * 2)
+            form = SimpleNamespace(
+                username=f"user{n}@example.com", password=f"vazada{rng.random()}"
+            )
+            request = SimpleNamespace(
+                client=SimpleNamespace(host=f"203.0.113.{rng.randrange(ips)}"),
+                headers={},
+            )
+            try:
+                await auth_module.login_for_access_token(
+                    form_data=form, request=request, db=db
+                )
+                statuses[200] += 1
+            except HTTPException as e:
+                statuses[e.status_code] += 1
+    return statuses
+
+
+def _run(label, session_factory, backend, args):
+    with session_factory() as db:
+        db.query(AuditLog).delete()
+        db.commit()
+    settings.LOGIN_THROTTLE_ENABLED = backend is not None
+    LoginThrottleService.set_backend(backend)
+    LoginThrottleService.reset()
+
+    calls = Counter()
+
+    def counting_verify(plain, hashed):
+        calls["bcrypt"] += 1
+        return verify_password(plain, hashed)
+
+    with patch.object(auth_module, "verify_password", counting_verify):
+        cpu, wall = time.process_time(), time.perf_counter()
+        statuses = asyncio.run(
+            _attack(session_factory, args.attempts, args.users, args.ips, args.seed)
+        )
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    with session_factory() as db:
+        audits = db.scalar(select(func.count()).select_from(AuditLog))
+    print(
+        f"{label:<10} CPU {cpu:7.2f}s | total {wall:7.2f}s | bcrypt {calls['bcrypt']:5d} | "
+        f"auditoria {audits:5d} | 401 {statuses[401]:5d} | 429 {statuses[429]:5d}"
+    )
+    return cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do limitador de login")
+    parser.add_argument("--attempts", type=int, default=300)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--ips", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = _setup(Path(tmp) / "bench.db", args.users)
+        print(
+            f"{args.attempts} tentativas, {args.users * 2} e-mails vazados "
+            f"({args.users} existentes), {args.ips} IPs de origem\n"
+        )
+        baseline = _run("sem limite", session_factory, None, args)
+        memory = _run("memória", session_factory, MemoryThrottleBackend(), args)
+        database = _run(
+            "banco", session_factory, DatabaseThrottleBackend(session_factory), args
+        )
+        print(
+            f"\nCPU economizada: memória {100 * (1 - memory / baseline):.0f}% | "
+            f"banco {100 * (1 - database / baseline):.0f}%"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    # O endpoint registra cada tentativa; o volume distorceria a medição
+    logging.disable(logging.CRITICAL)
+    main()
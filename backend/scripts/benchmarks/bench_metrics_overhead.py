@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo da coleta de métricas (app/core/metrics.py).
+
+Monta duas aplicações FastAPI idênticas, uma sem e outra com
+MetricsMiddleware + instrument_engine, cada uma com sua engine SQLite em
+memória, e dispara requisições em processo (httpx + ASGITransport) contra uma
+rota que executa algumas consultas. As rodadas são intercaladas para reduzir
+ruído. Mede:
+- tempo por requisição (melhor rodada) em cada variante e o custo adicional
+- tempo de renderização de /metrics após a carga
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_metrics_overhead.py --requests 2000 --queries 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core import metrics  # noqa: E402
+
+
+def _build_app(instrumented: bool, queries: int) -> FastAPI:
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = sessionmaker(bind=engine)
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(metrics.MetricsMiddleware)
+        metrics.instrument_engine(engine)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with session_factory() as db:
+            for _ in range(queries):
+                db.execute(text("SELECT :id"), {"id": item_id})
+        return {"id": item_id}
+
+    return app
+
+
+async def _round(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        for i in range(requests):
+            await client.get(f"/items/{i}")
+        return (time.perf_counter() - started) / requests
+
+
+async def _main(args) -> None:
+    plain = _build_app(False, args.queries)
+    instrumented = _build_app(True, args.queries)
+
+    # Aquecimento
+    await _round(plain, 100)
+    await _round(instrumented, 100)
+
+    plain_times, instrumented_times = [], []
+    per_round = max(args.requests // args.rounds, 1)
+    for _ in range(args.rounds):
+        plain_times.append(await _round(plain, per_round))
+        instrumented_times.append(await _round(instrumented, per_round))
+
+    # Mínimo das rodadas: o ruído da máquina só soma tempo
+    base = min(plain_times) * 1e6
+    with_metrics = min(instrumented_times) * 1e6
+    print(
+        f"{per_round * args.rounds} requisições por variante, "
+        f"{args.queries} consultas por requisição\n"
+    )
+    print(f"sem métricas   {base:8.1f} µs/req")
+    print(f"com métricas   {with_metrics:8.1f} µs/req")
+    print(
+        f"custo          {with_metrics - base:8.1f} µs/req "
+        f"({100 * (with_metrics - base) / base:.1f}%)"
+    )
+
+    started = time.perf_counter()
+    body = metrics.registry.render()
+    print(
+        f"\n/metrics       {(time.perf_counter() - started) * 1000:8.2f} ms "
+        f"({len(body.splitlines())} linhas)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do custo das métricas")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark da rentabilidade por corrida (GET /api/v1/entries/profitability).
+
+Gera N corridas de um único usuário (padrão: 1 milhão) em um banco SQLite
+temporário, com pedágios vinculados a parte delas (``linked_entry_id``) e um
+abastecimento não vinculado por dia, e compara:
+
+- abordagem ingênua: carregar as corridas pelo ORM e acessar o backref
+  ``linked_entries`` de cada uma (uma consulta por corrida); medida em uma
+  amostra e extrapolada para o total
+- ProfitabilityService.report: joins agregados, três consultas por chamada
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_profitability.py --rides 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.entry import Entry  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.profitability_service import ProfitabilityService  # noqa: E402
+
+USER_ID = "bench-user"
+BATCH = 50_000
+
+
+def _populate(engine, rides: int, days: int, toll_ratio: float, seed: int) -> int:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    entries = Entry.__table__
+    expenses = 0
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [{"id": USER_ID, "email": "bench@example.com", "username": "bench", "name": "Bench", "role": "USER"}],
+        )
+        for offset in range(0, rides, BATCH):
+            ride_rows, toll_rows = [], []
+            for i in range(offset, min(offset + BATCH, rides)):
+                when = start + timedelta(seconds=rng.randrange(days * 86400))
+                net = round(rng.uniform(8, 60), 2)
+                ride_rows.append({
+                    "id": f"r{i:09d}", "user_id": USER_ID, "type": "INCOME", "category": "Corrida",
+                    "date": when, "amount": net, "net_amount": net,
+                    "distance_km": round(rng.uniform(1, 30), 2), "is_deleted": False,
+                })
+                if rng.random() < toll_ratio:
+                    toll_rows.append({
+                        "id": f"t{i:09d}", "user_id": USER_ID, "type": "EXPENSE", "category": "Pedágio",
+                        "date": when, "amount": round(rng.uniform(3, 15), 2),
+                        "linked_entry_id": f"r{i:09d}", "is_trip_expense": True, "is_deleted": False,
+                    })
+            conn.execute(insert(entries), ride_rows)
+            if toll_rows:
+                conn.execute(insert(entries), toll_rows)
+            expenses += len(toll_rows)
+        fuel_rows = [
+            {
+                "id": f"f{day:05d}", "user_id": USER_ID, "type": "EXPENSE", "category": "Combustível",
+                "date": start + timedelta(days=day, hours=7), "amount": round(rng.uniform(80, 250), 2),
+                "is_trip_expense": True, "is_deleted": False,
+            }
+            for day in range(days)
+        ]
+        conn.execute(insert(entries), fuel_rows)
+    return expenses + len(fuel_rows)
+
+
+def _naive(session_factory, sample: int) -> float:
+    """Corrida a corrida com o backref lazy; retorna segundos por corrida."""
+    with session_factory() as db:
+        started = time.perf_counter()
+        rides = (
+            db.query(Entry)
+            .filter(Entry.user_id == USER_ID, Entry.type == "INCOME", Entry.is_deleted.is_(False))
+            .limit(sample)
+            .all()
+        )
+        profit = 0.0
+        for ride in rides:
+            linked = sum(e.amount for e in ride.linked_entries if not e.is_deleted)
+            profit += (ride.net_amount or 0) - linked
+        return (time.perf_counter() - started) / max(len(rides), 1)
+
+
+def _timed(label: str, func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<44} {best * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da rentabilidade por corrida")
+    parser.add_argument("--rides", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--toll-ratio", type=float, default=0.2, help="Fração de corridas com pedágio vinculado")
+    parser.add_argument("--naive-sample", type=int, default=2000, help="Corridas medidas na abordagem ingênua")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_profitability_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+
+    started = time.perf_counter()
+    expenses = _populate(engine, args.rides, args.days, args.toll_ratio, args.seed)
+    print(
+        f"Base: {args.rides} corridas, {expenses} despesas "
+        f"({time.perf_counter() - started:.1f}s para popular)"
+    )
+
+    session_factory = sessionmaker(bind=engine)
+    per_ride = _naive(session_factory, args.naive_sample)
+    print(
+        f"\nIngênuo (lazy linked_entries): {per_ride * 1e6:.0f} µs/corrida em "
+        f"{args.naive_sample} corridas -> ~{per_ride * args.rides:.1f}s para {args.rides}"
+    )
+
+    print("\nProfitabilityService.report:")
+    with session_factory() as db:
+        report = _timed(
+            "mensal, ano inteiro (50 corridas/página)",
+            lambda: ProfitabilityService.report(db, USER_ID, granularity="month"),
+            args.repeat,
+        )
+        _timed(
+            "diário, ano inteiro",
+            lambda: ProfitabilityService.report(db, USER_ID, granularity="day"),
+            args.repeat,
+        )
+        first_month = report["periods"][0]["period"]
+        year, month = map(int, first_month.split("-"))
+        _timed(
+            f"mensal, só {first_month}",
+            lambda: ProfitabilityService.report(
+                db,
+                USER_ID,
+                start_date=datetime(year, month, 1).date(),
+                end_date=(datetime(year, month, 28) + timedelta(days=4)).replace(day=1).date() - timedelta(days=1),
+            ),
+            args.repeat,
+        )
+    totals = report["totals"]
+    print(
+        f"\nTotais: {totals['rides']} corridas, líquido {totals['net']:.2f}, "
+        f"vinculadas {totals['linked_costs']:.2f}, rateadas {totals['apportioned_costs']:.2f}, "
+        f"lucro {totals['profit']:.2f}"
+    )
+    engine.dispose()
+    os.remove(db_path)
+    os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark da materialização de lançamentos recorrentes.
+
+Cria N regras ativas (padrão: 100 mil, metade semanais e metade mensais, com
+algumas ocorrências vencidas cada) em um banco SQLite temporário com uma base
+de lançamentos existente, e mede:
+
+- uma rodada de RecurringEntryService.materialize_due (INSERT e UPDATE em lote)
+- uma segunda rodada no mesmo dia (nada vencido: só a busca pelo índice)
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_recurring_entries.py --rules 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.entry import Entry  # noqa: E402
+from app.models.recurring_rule import RecurringRule  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.recurring_entry_service import RecurringEntryService  # noqa: E402
+
+BATCH = 50_000
+TODAY = date(2026, 10, 19)
+
+
+def _populate(engine, rules: int, users: int, entries: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"id": f"u{i:06d}", "email": f"u{i}@example.com", "username": f"u{i}", "name": f"U{i}", "role": "USER"}
+                for i in range(users)
+            ],
+        )
+        for offset in range(0, entries, BATCH):
+            conn.execute(
+                insert(Entry.__table__),
+                [
+                    {
+                        "id": f"e{i:09d}", "user_id": f"u{rng.randrange(users):06d}", "type": "INCOME",
+                        "category": "Corrida", "amount": 20.0, "is_deleted": False,
+                        "date": datetime(2026, 1, 1) + timedelta(minutes=rng.randrange(400_000)),
+                    }
+                    for i in range(offset, min(offset + BATCH, entries))
+                ],
+            )
+        for offset in range(0, rules, BATCH):
+            rows = []
+            for i in range(offset, min(offset + BATCH, rules)):
+                monthly = i % 2 == 0
+                start = TODAY - timedelta(days=rng.randrange(1, 60))
+                rows.append({
+                    "id": f"r{i:09d}", "user_id": f"u{rng.randrange(users):06d}",
+                    "description": "Seguro" if monthly else "Aluguel do carro",
+                    "amount": round(rng.uniform(50, 500), 2),
+                    "type": "EXPENSE" if i % 10 else "INCOME",
+                    "category": "Seguro" if monthly else "Aluguel",
+                    "frequency": "MONTHLY" if monthly else "WEEKLY", "interval": 1,
+                    "start_date": start, "next_run_date": start, "is_active": True,
+                })
+            conn.execute(insert(RecurringRule.__table__), rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da materialização de lançamentos recorrentes")
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--entries", type=int, default=500_000, help="Lançamentos já existentes")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_recurring_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+
+    started = time.perf_counter()
+    _populate(engine, args.rules, args.users, args.entries, args.seed)
+    print(
+        f"Base: {args.rules} regras, {args.users} usuários, {args.entries} lançamentos "
+        f"({time.perf_counter() - started:.1f}s para popular)"
+    )
+
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        for label in ("primeira rodada", "segunda rodada (nada vencido)"):
+            started = time.perf_counter()
+            report = RecurringEntryService.materialize_due(db, today=TODAY, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - started
+            print(
+                f"  {label:<32} {elapsed * 1000:>10.1f} ms  "
+                f"{report['rules']} regras, {report['entries']} lançamentos, {report['batches']} lotes"
+            )
+        generated = db.scalar(select(func.count()).select_from(Entry).where(Entry.is_recurring.is_(True)))
+    print(f"\nLançamentos recorrentes na base: {generated}")
+    engine.dispose()
+    os.remove(db_path)
+    os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark da inicialização (bootstrap) com uma base grande de usuários.
+
+Cria um banco SQLite temporário com N usuários (padrão 100 mil, uma fração
+com role NULL) e compara:
+- backfill antigo: carrega os usuários com role NULL e corrige um a um
+- migração de dados versionada: primeira execução (UPDATE único) e
+  execuções seguintes (apenas a consulta às versões aplicadas)
+
+Executar a partir de backend/:
+    python scripts/benchmarks/bench_startup_bootstrap.py --users 100000
+"""
+
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import MetaData, create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.data_migration_service import DataMigrationService  # noqa: E402
+
+
+def _setup(path: Path, users: int, null_ratio: float):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "users"]
+    )
+    # role é NOT NULL no modelo; bases legadas ainda podem ter valores nulos
+    users_table = User.__table__.to_metadata(MetaData())
+    users_table.c.role.nullable = True
+    users_table.create(engine)
+
+    every = max(int(1 / null_ratio), 1) if null_ratio > 0 else 0
+    with engine.begin() as conn:
+        for start in range(0, users, 10_000):
+            conn.execute(
+                insert(User.__table__),
+                [
+                    {
+                        "id": f"user-{i}",
+                        "email": f"user{i}@example.com",
+                        "username": f"user{i}",
+                        "name": f"User {i}",
+                        "role": None if every and i % every == 0 else "USER",
+                        "is_active": True,
+                    }
+                    for i in range(start, min(start + 10_000, users))
+                ],
+            )
+    engine.dispose()
+
+
+def _legacy_backfill(db) -> int:
+    """Cópia do backfill executado em toda inicialização antes da migração."""
+    null_role_users = db.query(User).filter((User.role == None)).all()  # noqa: E711
+    updated = 0
+    for u in null_role_users:
+        u.role = "USER"  # type: ignore[assignment]
+        updated += 1
+    if updated:
+        db.commit()
+    return updated
+
+
+def _measure(path: Path, fn):
+    engine = create_engine(f"sqlite:///{path}")
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    session_factory = sessionmaker(bind=engine)
+    started = time.perf_counter()
+    with session_factory() as db:
+        result = fn(db)
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed, len(statements), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do bootstrap de inicialização")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--null-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / "template.db"
+        _setup(template, args.users, args.null_ratio)
+        print(f"{args.users} usuários, {args.null_ratio:.0%} com role NULL\n")
+
+        legacy_db = Path(tmp) / "legacy.db"
+        shutil.copy(template, legacy_db)
+        first = _measure(legacy_db, _legacy_backfill)
+        again = _measure(legacy_db, _legacy_backfill)
+        print(
+            f"backfill antigo   1ª {first[0] * 1000:8.1f} ms ({first[1]:6d} comandos) | "
+            f"seguintes {again[0] * 1000:7.1f} ms ({again[1]} comandos)"
+        )
+
+        migrated_db = Path(tmp) / "migrated.db"
+        shutil.copy(template, migrated_db)
+        first = _measure(migrated_db, DataMigrationService.run_pending)
+        again = _measure(migrated_db, DataMigrationService.run_pending)
+        print(
+            f"migração de dados 1ª {first[0] * 1000:8.1f} ms ({first[1]:6d} comandos) | "
+            f"seguintes {again[0] * 1000:7.1f} ms ({again[1]} comandos)"
+        )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Teste de carga HTTP com relatório de latência e orçamento (SLO) por endpoint.
+
+Sobe a aplicação com uvicorn em uma porta local, sobre uma base sintética
+gerada por scripts/utils/synthetic_data.py, e executa usuários virtuais
+concorrentes com httpx.AsyncClient:
+- motorista: login, painel (resumo, métricas diárias, distribuição por
+  categoria), listagem de lançamentos e registro de corridas
+- administrador: login, dashboard e relatórios, logs de auditoria e
+  listagem de usuários
+
+Ao final imprime vazão e p50/p95/p99 por endpoint (rótulo = template da rota)
+e compara com o orçamento de load_budgets.json; termina com código 1 se algum
+endpoint estourar o p95/p99 ou a taxa de erros permitida.
+
+Executar a partir de backend/:
+    python scripts/benchmarks/load_test.py --preset small --drivers 20 --admins 2 --duration 60
+Contra um servidor já em execução (sem subir uvicorn nem gerar base):
+    python scripts/benchmarks/load_test.py --base-url http://127.0.0.1:8000 --duration 60
+Requer numpy para gerar a base (pip install numpy).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx  # noqa: E402
+
+DEFAULT_BUDGETS = Path(__file__).parent / "load_budgets.json"
+LOAD_PASSWORD = "SenhaCarga123!"
+API = "/api/v1"
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    errors: int = 0
+
+    def percentile(self, p: float) -> float:
+        """Percentil pelo método do posto mais próximo, em ms."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(math.ceil(p / 100 * len(ordered)), 1)
+        return ordered[rank - 1] * 1000
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+
+class LoadRecorder:
+    """Acumula latências por endpoint; descarta amostras do aquecimento."""
+
+    def __init__(self):
+        self.stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.recording = False
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    def start(self) -> None:
+        self.recording = True
+        self.started_at = time.perf_counter()
+
+    def stop(self) -> None:
+        self.recording = False
+        self.finished_at = time.perf_counter()
+
+    def record(self, name: str, seconds: float, status: Optional[int]) -> None:
+        if not self.recording:
+            return
+        stats = self.stats[name]
+        stats.latencies.append(seconds)
+        if status is None or status >= 400:
+            stats.errors += 1
+        stats.statuses[status or 0] += 1
+
+    @property
+    def elapsed(self) -> float:
+        return max((self.finished_at or time.perf_counter()) - self.started_at, 1e-9)
+
+
+async def _call(client, recorder, name, method, url, **kwargs) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError:
+        recorder.record(name, time.perf_counter() - started, None)
+        return None
+    recorder.record(name, time.perf_counter() - started, response.status_code)
+    return response
+
+
+async def _login(client, recorder, username: str) -> Optional[Dict[str, str]]:
+    response = await _call(
+        client,
+        recorder,
+        "POST /auth/token",
+        "POST",
+        f"{API}/auth/token",
+        data={"username": username, "password": LOAD_PASSWORD},
+    )
+    if response is None or response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _ride_payload(rng: random.Random) -> dict:
+    gross = round(rng.uniform(8, 60), 2)
+    fee = round(gross * rng.uniform(0.1, 0.28), 2)
+    return {
+        "amount": gross,
+        "description": "Corrida (carga)",
+        "date": (datetime.utcnow() - timedelta(minutes=rng.randrange(600))).isoformat(),
+        "type": "INCOME",
+        "category": "Corrida",
+        "platform": rng.choice(["UBER", "99", "INDRIVE"]),
+        "distance_km": round(rng.uniform(1, 30), 2),
+        "duration_min": rng.randint(5, 60),
+        "gross_amount": gross,
+        "platform_fee": fee,
+        "tips_amount": 0.0,
+        "shift_tag": rng.choice(["MANHA", "TARDE", "NOITE", "MADRUGADA"]),
+        "city": "São Paulo",
+    }
+
+
+# (nome do endpoint, método, caminho, peso); o nome é o template da rota
+DRIVER_STEPS = [
+    ("GET /entries/summary", "GET", f"{API}/entries/summary", 4),
+    ("GET /entries/metrics/daily", "GET", f"{API}/entries/metrics/daily", 3),
+    ("GET /entries/category-distribution", "GET", f"{API}/entries/category-distribution", 2),
+    ("GET /entries/", "GET", f"{API}/entries/?limit=20", 3),
+    ("POST /entries/", "POST", f"{API}/entries/", 2),
+]
+ADMIN_STEPS = [
+    ("GET /system-reports/dashboard", "GET", f"{API}/system-reports/dashboard", 2),
+    ("GET /system-reports/users", "GET", f"{API}/system-reports/users", 1),
+    ("GET /audit-logs/", "GET", f"{API}/audit-logs/?limit=50", 3),
+    ("GET /admin/users/", "GET", f"{API}/admin/users/", 1),
+]
+
+
+async def _virtual_user(client, recorder, username, steps, deadline, think, seed):
+    rng = random.Random(seed)
+    headers = await _login(client, recorder, username)
+    if headers is None:
+        return
+    weights = [step[3] for step in steps]
+    while time.perf_counter() < deadline:
+        name, method, url, _ = rng.choices(steps, weights=weights)[0]
+        kwargs = {"headers": headers}
+        if method == "POST":
+            kwargs["json"] = _ride_payload(rng)
+        await _call(client, recorder, name, method, url, **kwargs)
+        if think:
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+
+
+def _driver_accounts(users: int, count: int, seed: int) -> List[str]:
+    # Contas USER da base sintética (a 0 é MASTER e as múltiplas de 100 são ADMIN)
+    candidates = [i for i in range(1, users) if i % 100 != 0]
+    rng = random.Random(seed)
+    return [f"user{rng.choice(candidates):06d}@example.com" for _ in range(count)]
+
+
+async def run_load(base_url: str, args, users: int) -> LoadRecorder:
+    recorder = LoadRecorder()
+    total = args.drivers + args.admins
+    limits = httpx.Limits(max_connections=total, max_keepalive_connections=total)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        deadline = time.perf_counter() + args.warmup + args.duration
+        tasks = [
+            _virtual_user(client, recorder, username, DRIVER_STEPS, deadline, args.think, args.seed + i)
+            for i, username in enumerate(_driver_accounts(users, args.drivers, args.seed))
+        ]
+        tasks += [
+            _virtual_user(
+                client, recorder, "user000000@example.com", ADMIN_STEPS, deadline, args.think, args.seed + 10_000 + i
+            )
+            for i in range(args.admins)
+        ]
+        # O login acontece durante o aquecimento; para medi-lo, use --warmup 0
+        if args.warmup:
+            asyncio.get_running_loop().call_later(args.warmup, recorder.start)
+        else:
+            recorder.start()
+        await asyncio.gather(*tasks)
+        recorder.stop()
+    return recorder
+
+
+def check_budgets(recorder: LoadRecorder, budgets: dict) -> List[str]:
+    """Retorna as violações de orçamento (vazio se tudo dentro do SLO)."""
+    default = budgets.get("default", {})
+    violations = []
+    for name, stats in sorted(recorder.stats.items()):
+        budget = {**default, **budgets.get("endpoints", {}).get(name, {})}
+        for key, p in (("p95_ms", 95), ("p99_ms", 99)):
+            if key in budget and stats.percentile(p) > budget[key]:
+                violations.append(
+                    f"{name}: p{p} {stats.percentile(p):.0f} ms > {budget[key]} ms"
+                )
+        max_error_rate = budget.get("max_error_rate")
+        if max_error_rate is not None and stats.error_rate > max_error_rate:
+            violations.append(
+                f"{name}: erros {100 * stats.error_rate:.1f}% > {100 * max_error_rate:.1f}%"
+            )
+    return violations
+
+
+def print_report(recorder: LoadRecorder) -> dict:
+    elapsed = recorder.elapsed
+    total = sum(s.count for s in recorder.stats.values())
+    print(f"\n{'endpoint':<38} {'req':>7} {'req/s':>8} {'erros':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    report = {"duration_s": elapsed, "requests": total, "rps": total / elapsed, "endpoints": {}}
+    for name, stats in sorted(recorder.stats.items()):
+        row = {
+            "count": stats.count,
+            "rps": stats.count / elapsed,
+            "errors": stats.errors,
+            "statuses": dict(stats.statuses),
+            "p50_ms": stats.percentile(50),
+            "p95_ms": stats.percentile(95),
+            "p99_ms": stats.percentile(99),
+        }
+        report["endpoints"][name] = row
+        print(
+            f"{name:<38} {row['count']:>7} {row['rps']:>8.1f} {row['errors']:>6} "
+            f"{row['p50_ms']:>6.1f}ms {row['p95_ms']:>6.1f}ms {row['p99_ms']:>6.1f}ms"
+        )
+    print(f"\nTotal: {total} requisições em {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _seed_database(database_url: str, args) -> int:
+    from sqlalchemy import create_engine
+
+    from app.core.security import get_password_hash
+    from scripts.utils.synthetic_data import PRESETS, generate_dataset
+
+    engine = create_engine(database_url)
+    started = time.perf_counter()
+    counts = generate_dataset(
+        engine, args.preset, seed=args.seed, password_hash=get_password_hash(LOAD_PASSWORD)
+    )
+    engine.dispose()
+    print(
+        f"Base {args.preset}: {counts['users']} usuários, {counts['entries']} lançamentos, "
+        f"{counts['audit_logs']} logs ({time.perf_counter() - started:.1f}s)"
+    )
+    return PRESETS[args.preset].users
+
+
+def _start_server(database_url: str, port: int, workers: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        # Tarefas de fundo e limite de login distorceriam a medição
+        "EMAIL_QUEUE_ENABLED": "false",
+        "AUDIT_RETENTION_ENABLED": "false",
+        "LOGIN_THROTTLE_ENABLED": "false",
+        "MASTER_EMAIL": "",
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(command, cwd=backend_dir, env=env)
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn terminou com código {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("uvicorn não respondeu a tempo")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga HTTP com orçamento de latência")
+    parser.add_argument("--preset", default="small", help="Preset da base sintética")
+    parser.add_argument("--database-url", help="Base já populada (senha das contas: LOAD_PASSWORD)")
+    parser.add_argument("--base-url", help="Servidor já em execução; não sobe uvicorn")
+    parser.add_argument("--users", type=int, help="Usuários na base (padrão: o do preset)")
+    parser.add_argument("--drivers", type=int, default=20, help="Motoristas virtuais")
+    parser.add_argument("--admins", type=int, default=2, help="Administradores virtuais")
+    parser.add_argument("--duration", type=float, default=60, help="Segundos medidos")
+    parser.add_argument("--warmup", type=float, default=5, help="Segundos descartados no início")
+    parser.add_argument("--think", type=float, default=0.0, help="Pausa média entre requisições (s)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS)
+    parser.add_argument("--output", type=Path, help="Grava o relatório em JSON")
+    args = parser.parse_args()
+
+    from scripts.utils.synthetic_data import PRESETS
+
+    users = args.users or PRESETS[args.preset].users
+    process = None
+    tmp = None
+    try:
+        if args.base_url:
+            base_url = args.base_url.rstrip("/")
+        else:
+            database_url = args.database_url
+            if not database_url:
+                tmp = tempfile.TemporaryDirectory()
+                database_url = f"sqlite:///{Path(tmp.name) / 'load.db'}"
+                users = _seed_database(database_url, args)
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = _start_server(database_url, port, args.workers)
+            _wait_ready(base_url, process)
+
+        print(
+            f"{args.drivers} motoristas + {args.admins} administradores por {args.duration:.0f}s "
+            f"(aquecimento {args.warmup:.0f}s) em {base_url}"
+        )
+        recorder = asyncio.run(run_load(base_url, args, users))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=15)
+        if tmp is not None:
+            tmp.cleanup()
+
+    report = print_report(recorder)
+    budgets = json.loads(args.budgets.read_text()) if args.budgets.exists() else {}
+    violations = check_budgets(recorder, budgets)
+    report["violations"] = violations
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if violations:
+        print("\nOrçamento de latência estourado:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("\nDentro do orçamento de latência.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
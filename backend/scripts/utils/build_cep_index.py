@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Gera a base offline de CEPs a partir de um dump CSV.
+
+O CSV precisa de cabeçalho com ao menos cep, cidade/localidade e uf; as
+colunas logradouro, complemento, bairro, ibge e ddd são opcionais. O
+delimitador (vírgula, ponto e vírgula, pipe ou tab) é detectado.
+
+Executar a partir de backend/:
+    python scripts/utils/build_cep_index.py ceps.csv data/ceps.idx
+Depois apontar CEP_OFFLINE_DATASET=data/ceps.idx no .env.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.cep_offline_index import build_cep_index  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("csv_path", help="CSV de origem")
+    parser.add_argument("output_path", help="Arquivo binário a ser gerado")
+    parser.add_argument("--encoding", default="utf-8", help="Codificação do CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = build_cep_index(args.csv_path, args.output_path, encoding=args.encoding)
+    elapsed = time.perf_counter() - started
+
+    size = os.path.getsize(args.output_path)
+    print(f"{count} CEPs gravados em {args.output_path}")
+    print(f"Tamanho: {size / 1024 / 1024:.1f} MiB ({size / max(count, 1):.1f} bytes/CEP)")
+    print(f"Tempo: {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Gerador de base sintética para testes de carga e benchmarks.
+
+Produz usuários, corridas, despesas (combustível, pedágio, alimentação...) e
+logs de auditoria com distribuições realistas, gerados em lote com NumPy e
+gravados com INSERTs em massa do SQLAlchemy Core, em blocos de tamanho fixo.
+A mesma semente e o mesmo preset geram sempre a mesma base.
+
+Distribuições:
+- atividade por motorista com cauda longa (poucos motoristas fazem muitas corridas)
+- horário com picos de manhã e no fim da tarde; turno derivado do horário
+- cidade de origem por motorista, com corridas ocasionais em outras cidades
+- distância lognormal, duração pela velocidade média do horário
+- tarifa por plataforma (base + km + minuto) com preço dinâmico nos picos
+- taxa da plataforma por distribuição Beta, gorjeta em ~12% das corridas
+- abastecimentos proporcionais às corridas, demais despesas em menor volume
+
+Presets (reutilizáveis em scripts/benchmarks e testes de carga):
+    small   200 usuários, 50 mil corridas, 10 mil logs
+    medium  2 mil usuários, 1 milhão de corridas, 200 mil logs
+    large   10 mil usuários, 5 milhões de corridas, 2 milhões de logs
+
+Uso como biblioteca (a partir de backend/):
+    from scripts.utils.synthetic_data import generate_dataset
+    counts = generate_dataset(engine, "small", seed=42)
+
+Executar a partir de backend/:
+    python scripts/utils/synthetic_data.py --preset medium --database-url sqlite:///bench.db
+Requer numpy (pip install numpy).
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+# Adicionar o diretório backend ao sys.path para permitir importação do módulo 'app'
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models.audit_log import AuditLog  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.entry import Entry  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@dataclass(frozen=True)
+class DatasetPreset:
+    users: int
+    rides: int
+    audit_logs: int
+    days: int
+
+
+PRESETS: Dict[str, DatasetPreset] = {
+    "small": DatasetPreset(users=200, rides=50_000, audit_logs=10_000, days=90),
+    "medium": DatasetPreset(users=2_000, rides=1_000_000, audit_logs=200_000, days=365),
+    "large": DatasetPreset(users=10_000, rides=5_000_000, audit_logs=2_000_000, days=730),
+}
+
+PLATFORMS = np.array(["UBER", "99", "INDRIVE"])
+PLATFORM_WEIGHTS = np.array([0.62, 0.28, 0.10])
+# Tarifa: base + R$/km + R$/min
+PLATFORM_BASE = np.array([5.00, 4.50, 4.00])
+PLATFORM_PER_KM = np.array([1.60, 1.45, 1.35])
+PLATFORM_PER_MIN = np.array([0.30, 0.26, 0.20])
+# Taxa da plataforma ~ Beta(a, b): médias de 25%, 20% e 10%
+PLATFORM_FEE_BETA = np.array([[25.0, 75.0], [20.0, 80.0], [10.0, 90.0]])
+
+CITIES = np.array(
+    [
+        "São Paulo",
+        "Rio de Janeiro",
+        "Belo Horizonte",
+        "Curitiba",
+        "Porto Alegre",
+        "Campinas",
+        "Salvador",
+        "Recife",
+        "Santos",
+    ]
+)
+CITY_STATES = np.array(["SP", "RJ", "MG", "PR", "RS", "SP", "BA", "PE", "SP"])
+CITY_WEIGHTS = np.array([0.35, 0.20, 0.10, 0.07, 0.06, 0.06, 0.06, 0.05, 0.05])
+# Fração das corridas fora da cidade de origem do motorista
+AWAY_RIDE_RATE = 0.08
+
+# Demanda relativa por hora do dia (picos às 7-9h e 17-20h)
+HOURLY_WEIGHTS = np.array(
+    [2, 1.5, 1, 0.8, 1, 2, 4, 7, 8, 5, 4, 4.5, 5, 4.5, 4, 4.5, 6, 8, 8.5, 7, 5.5, 4.5, 3.5, 2.5]
+)
+PEAK_HOURS = np.array([7, 8, 17, 18, 19])
+SURGE_RATE = 0.25
+# MADRUGADA 0-5h, MANHA 6-11h, TARDE 12-17h, NOITE 18-23h
+SHIFTS = np.array(["MADRUGADA", "MANHA", "TARDE", "NOITE"])
+
+TIP_RATE = 0.12
+
+# Despesas por corrida: abastecimento a cada ~12 corridas, demais mais raras
+EXPENSES_PER_RIDE = 0.12
+EXPENSE_CATEGORIES = np.array(
+    ["Combustível", "Alimentação", "Pedágio", "Lavagem", "Manutenção"]
+)
+EXPENSE_WEIGHTS = np.array([0.68, 0.14, 0.09, 0.05, 0.04])
+EXPENSE_DESCRIPTIONS = np.array(
+    ["Abastecimento", "Refeição", "Pedágio", "Lavagem do carro", "Manutenção do carro"]
+)
+TOLL_VALUES = np.array([5.90, 8.70, 12.40, 18.60])
+
+DEFAULT_CATEGORIES = [
+    ("Corrida", "INCOME"),
+    ("Combustível", "EXPENSE"),
+    ("Pedágio", "EXPENSE"),
+    ("Manutenção", "EXPENSE"),
+    ("Lavagem", "EXPENSE"),
+    ("Taxa Plataforma", "EXPENSE"),
+    ("Alimentação", "EXPENSE"),
+    ("Seguro", "EXPENSE"),
+    ("Depreciação", "EXPENSE"),
+]
+
+AUDIT_ACTIONS = np.array(
+    [
+        "LOGIN",
+        "LOGOUT",
+        "LOGIN_FAILED",
+        "CREATE_ENTRY",
+        "UPDATE_ENTRY",
+        "DELETE_ENTRY",
+        "UPDATE_PROFILE",
+        "CREATE_USER",
+        "BLOCK_USER",
+        "RESET_PASSWORD",
+        "UPDATE_CONFIG",
+    ]
+)
+AUDIT_RESOURCES = np.array(
+    ["auth", "auth", "auth", "entry", "entry", "entry", "user", "user", "user", "user", "system_config"]
+)
+AUDIT_WEIGHTS = np.array([0.40, 0.15, 0.08, 0.18, 0.08, 0.03, 0.04, 0.01, 0.01, 0.015, 0.005])
+# Ações administrativas são registradas por ADMIN/MASTER
+AUDIT_ADMIN_ONLY = np.isin(AUDIT_ACTIONS, ["CREATE_USER", "BLOCK_USER", "RESET_PASSWORD", "UPDATE_CONFIG"])
+
+FIRST_NAMES = np.array(
+    ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Felipe", "Gabriela", "Heitor", "Isabela", "João", "Larissa", "Marcos"]
+)
+LAST_NAMES = np.array(
+    ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Rodrigues", "Almeida", "Nascimento"]
+)
+
+# Um ADMIN a cada tantos usuários; o primeiro usuário é MASTER
+ADMIN_EVERY = 100
+
+
+@dataclass
+class _Users:
+    ids: np.ndarray
+    roles: np.ndarray
+    home_city: np.ndarray
+    activity: np.ndarray
+    admin_idx: np.ndarray
+
+
+def _uuids(rng: np.random.Generator, size: int) -> List[str]:
+    raw = rng.bytes(16 * size)
+    return [str(uuid.UUID(bytes=raw[i : i + 16], version=4)) for i in range(0, 16 * size, 16)]
+
+
+def _timestamps(rng, size: int, start: datetime, days: int, hours: np.ndarray) -> np.ndarray:
+    day = rng.integers(0, days, size=size)
+    seconds = day * 86400 + hours * 3600 + rng.integers(0, 3600, size=size)
+    return np.datetime64(start, "s") + seconds.astype("timedelta64[s]")
+
+
+def _shift_for(hours: np.ndarray) -> np.ndarray:
+    return SHIFTS[hours // 6]
+
+
+def build_users(rng: np.random.Generator, count: int, start: datetime, days: int):
+    """Gera as linhas de usuários e os atributos usados pelas demais tabelas."""
+    ids = np.array(_uuids(rng, count))
+    roles = np.full(count, "USER", dtype=object)
+    roles[::ADMIN_EVERY] = "ADMIN"
+    roles[0] = "MASTER"
+    home_city = rng.choice(len(CITIES), size=count, p=CITY_WEIGHTS)
+    # Cauda longa: atividade ~ lognormal, normalizada como probabilidade
+    activity = rng.lognormal(mean=0.0, sigma=1.0, size=count)
+    activity /= activity.sum()
+    first = rng.choice(FIRST_NAMES, size=count)
+    last = rng.choice(LAST_NAMES, size=count)
+    created_at = _timestamps(rng, count, start - timedelta(days=365), 365, rng.integers(8, 22, size=count))
+
+    columns = {
+        "id": ids,
+        "email": np.char.add(np.char.add("user", np.char.zfill(np.arange(count).astype(str), 6)), "@example.com"),
+        "username": np.char.add("user", np.char.zfill(np.arange(count).astype(str), 6)),
+        "name": np.char.add(np.char.add(first, " "), last),
+        "role": roles,
+        "is_active": np.ones(count, dtype=bool),
+        "can_view_admins": np.zeros(count, dtype=bool),
+        "requires_complete_profile": np.zeros(count, dtype=bool),
+        "city": CITIES[home_city],
+        "state": CITY_STATES[home_city],
+        "created_at": created_at,
+    }
+    users = _Users(
+        ids=ids,
+        roles=roles,
+        home_city=home_city,
+        activity=activity,
+        admin_idx=np.flatnonzero(roles != "USER"),
+    )
+    return columns, users
+
+
+def build_rides(rng: np.random.Generator, users: _Users, size: int, start: datetime, days: int):
+    """Gera ``size`` corridas (entries INCOME) como colunas NumPy."""
+    driver = rng.choice(len(users.ids), size=size, p=users.activity)
+    platform = rng.choice(len(PLATFORMS), size=size, p=PLATFORM_WEIGHTS)
+    hours = rng.choice(24, size=size, p=HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum())
+    when = _timestamps(rng, size, start, days, hours)
+
+    city = users.home_city[driver]
+    away = rng.random(size) < AWAY_RIDE_RATE
+    city[away] = rng.choice(len(CITIES), size=int(away.sum()), p=CITY_WEIGHTS)
+
+    peak = np.isin(hours, PEAK_HOURS)
+    distance = np.clip(rng.lognormal(mean=np.log(7.0), sigma=0.6, size=size), 1.0, 80.0)
+    speed = np.clip(rng.normal(28.0, 6.0, size=size) - 8.0 * peak, 8.0, 60.0)
+    duration = np.maximum(np.rint(distance / speed * 60 + rng.integers(2, 7, size=size)), 3).astype(int)
+
+    surge = np.where(peak & (rng.random(size) < SURGE_RATE), 1 + rng.exponential(0.3, size=size), 1.0)
+    gross = np.round(
+        (
+            PLATFORM_BASE[platform]
+            + PLATFORM_PER_KM[platform] * distance
+            + PLATFORM_PER_MIN[platform] * duration
+        )
+        * surge,
+        2,
+    )
+    fee_rate = rng.beta(PLATFORM_FEE_BETA[platform, 0], PLATFORM_FEE_BETA[platform, 1])
+    fee = np.round(gross * fee_rate, 2)
+    tips = np.where(rng.random(size) < TIP_RATE, np.round(rng.gamma(2.0, 2.5, size=size), 2), 0.0)
+    net = np.round(gross + tips - fee, 2)
+
+    return {
+        "id": np.array(_uuids(rng, size)),
+        "amount": net,
+        "description": np.char.add("Corrida ", PLATFORMS[platform]),
+        "date": when,
+        "type": np.full(size, "INCOME"),
+        "category": np.full(size, "Corrida"),
+        "user_id": users.ids[driver],
+        "platform": PLATFORMS[platform],
+        "distance_km": np.round(distance, 2),
+        "duration_min": duration,
+        "gross_amount": gross,
+        "platform_fee": fee,
+        "tips_amount": tips,
+        "net_amount": net,
+        "shift_tag": _shift_for(hours),
+        "city": CITIES[city],
+        "is_trip_expense": np.zeros(size, dtype=bool),
+        "is_recurring": np.zeros(size, dtype=bool),
+        "is_deleted": np.zeros(size, dtype=bool),
+        "created_at": when,
+    }
+
+
+def build_expenses(rng: np.random.Generator, users: _Users, size: int, start: datetime, days: int):
+    """Gera ``size`` despesas (entries EXPENSE), na mesma proporção de atividade das corridas."""
+    driver = rng.choice(len(users.ids), size=size, p=users.activity)
+    kind = rng.choice(len(EXPENSE_CATEGORIES), size=size, p=EXPENSE_WEIGHTS)
+    hours = rng.integers(6, 23, size=size)
+    when = _timestamps(rng, size, start, days, hours)
+
+    amount = np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3],
+        [
+            np.clip(rng.normal(170.0, 50.0, size=size), 40.0, 400.0),
+            rng.gamma(4.0, 7.0, size=size),
+            TOLL_VALUES[rng.integers(0, len(TOLL_VALUES), size=size)],
+            np.clip(rng.normal(40.0, 10.0, size=size), 15.0, 90.0),
+        ],
+        default=rng.lognormal(mean=np.log(300.0), sigma=0.7, size=size),
+    )
+    amount = np.round(amount, 2)
+
+    return {
+        "id": np.array(_uuids(rng, size)),
+        "amount": amount,
+        "description": EXPENSE_DESCRIPTIONS[kind],
+        "date": when,
+        "type": np.full(size, "EXPENSE"),
+        "category": EXPENSE_CATEGORIES[kind],
+        "user_id": users.ids[driver],
+        "shift_tag": _shift_for(hours),
+        "city": CITIES[users.home_city[driver]],
+        "is_trip_expense": kind == 0,
+        "is_recurring": np.zeros(size, dtype=bool),
+        "is_deleted": np.zeros(size, dtype=bool),
+        "created_at": when,
+    }
+
+
+def build_audit_logs(rng: np.random.Generator, users: _Users, size: int, start: datetime, days: int):
+    """Gera ``size`` logs de auditoria; ações administrativas saem de ADMIN/MASTER."""
+    action = rng.choice(len(AUDIT_ACTIONS), size=size, p=AUDIT_WEIGHTS)
+    performer = rng.choice(len(users.ids), size=size, p=users.activity)
+    admin_only = AUDIT_ADMIN_ONLY[action]
+    performer[admin_only] = users.admin_idx[
+        rng.integers(0, len(users.admin_idx), size=int(admin_only.sum()))
+    ]
+    hours = rng.choice(24, size=size, p=HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum())
+    when = _timestamps(rng, size, start, days, hours)
+    ip = np.char.add(
+        "10.", np.char.add(rng.integers(0, 256, size=size).astype(str), np.char.add(".0.", rng.integers(1, 255, size=size).astype(str)))
+    )
+
+    return {
+        "id": np.array(_uuids(rng, size)),
+        "action": AUDIT_ACTIONS[action],
+        "resource_type": AUDIT_RESOURCES[action],
+        "resource_id": users.ids[rng.integers(0, len(users.ids), size=size)],
+        "performed_by": users.ids[performer],
+        "performed_by_role": users.roles[performer],
+        "description": AUDIT_ACTIONS[action],
+        "ip_address": ip,
+        "user_agent": np.full(size, "synthetic-data/1.0"),
+        "created_at": when,
+    }
+
+
+def _to_python(values) -> list:
+    if isinstance(values, np.ndarray):
+        if np.issubdtype(values.dtype, np.datetime64):
+            return values.astype("datetime64[us]").tolist()
+        return values.tolist()
+    return list(values)
+
+
+def insert_columns(conn, table, columns: Dict[str, np.ndarray], extra: Optional[dict] = None) -> int:
+    """INSERT em massa (executemany) de colunas NumPy de mesmo tamanho."""
+    keys = list(columns)
+    if extra:
+        keys += list(extra)
+        values = [_to_python(v) for v in columns.values()]
+        size = len(values[0])
+        values += [[v] * size for v in extra.values()]
+    else:
+        values = [_to_python(v) for v in columns.values()]
+    rows = [dict(zip(keys, row)) for row in zip(*values)]
+    if rows:
+        conn.execute(insert(table), rows)
+    return len(rows)
+
+
+def _chunks(total: int, chunk_size: int):
+    while total > 0:
+        size = min(chunk_size, total)
+        yield size
+        total -= size
+
+
+def generate_dataset(
+    engine: Engine,
+    preset: Union[str, DatasetPreset] = "small",
+    seed: int = 42,
+    chunk_size: int = 50_000,
+    end: Optional[datetime] = None,
+    password_hash: Optional[str] = None,
+    create_schema: bool = True,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Popula o banco com a base sintética do preset.
+
+    Args:
+        engine: Engine de destino (tabelas criadas se ``create_schema``)
+        preset: Nome em PRESETS ou um DatasetPreset
+        seed: Semente; mesma semente e preset geram a mesma base
+        chunk_size: Linhas por bloco gerado e inserido
+        end: Fim do período coberto (padrão: agora, em UTC)
+        password_hash: Hash gravado em todos os usuários (permite login nos testes de carga)
+        progress: Chamado com (tabela, linhas inseridas até o momento)
+
+    Returns:
+        Quantidade de linhas inseridas por tabela
+    """
+    spec = PRESETS[preset] if isinstance(preset, str) else preset
+    rng = np.random.default_rng(seed)
+    end = (end or datetime.utcnow()).replace(microsecond=0)
+    start = end - timedelta(days=spec.days)
+    if create_schema:
+        Base.metadata.create_all(engine)
+
+    counts = {"users": 0, "categories": 0, "entries": 0, "audit_logs": 0}
+    report = progress or (lambda table, rows: None)
+
+    user_columns, users = build_users(rng, spec.users, start, spec.days)
+    with engine.begin() as conn:
+        counts["users"] = insert_columns(
+            conn, User.__table__, user_columns, {"hashed_password": password_hash}
+        )
+        conn.execute(
+            insert(Category.__table__),
+            [
+                {"id": str(uuid.UUID(int=i + 1)), "name": name, "type": ctype, "is_default": True}
+                for i, (name, ctype) in enumerate(DEFAULT_CATEGORIES)
+            ],
+        )
+        counts["categories"] = len(DEFAULT_CATEGORIES)
+    report("users", counts["users"])
+
+    for size in _chunks(spec.rides, chunk_size):
+        rides = build_rides(rng, users, size, start, spec.days)
+        with engine.begin() as conn:
+            counts["entries"] += insert_columns(conn, Entry.__table__, rides)
+        report("entries", counts["entries"])
+
+    for size in _chunks(int(spec.rides * EXPENSES_PER_RIDE), chunk_size):
+        expenses = build_expenses(rng, users, size, start, spec.days)
+        with engine.begin() as conn:
+            counts["entries"] += insert_columns(conn, Entry.__table__, expenses)
+        report("entries", counts["entries"])
+
+    for size in _chunks(spec.audit_logs, chunk_size):
+        logs = build_audit_logs(rng, users, size, start, spec.days)
+        with engine.begin() as conn:
+            counts["audit_logs"] += insert_columns(conn, AuditLog.__table__, logs)
+        report("audit_logs", counts["audit_logs"])
+
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera uma base sintética para carga e benchmarks")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--database-url", default="sqlite:///synthetic.db")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--password", help="Senha de todos os usuários (user000000@example.com ...)"
+    )
+    args = parser.parse_args()
+
+    password_hash = None
+    if args.password:
+        from app.core.security import get_password_hash
+
+        password_hash = get_password_hash(args.password)
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    last = {"table": None}
+
+    def progress(table: str, rows: int) -> None:
+        elapsed = time.perf_counter() - started
+        end = "\n" if table != last["table"] and last["table"] else ""
+        print(f"{end}\r{table:<11} {rows:>10,} linhas  ({elapsed:6.1f}s)", end="", flush=True)
+        last["table"] = table
+
+    counts = generate_dataset(
+        engine,
+        args.preset,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        password_hash=password_hash,
+        progress=progress,
+    )
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"\n\nPreset {args.preset} (semente {args.seed}) em {args.database_url}")
+    for table, rows in counts.items():
+        print(f"  {table:<11} {rows:>10,}")
+    print(f"Tempo: {elapsed:.1f}s ({total / elapsed:,.0f} linhas/s)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Fixtures compartilhadas dos testes unitários com banco SQLite em memória.
+
+``engine`` usa uma única conexão (StaticPool), então sessões abertas em
+threads diferentes (TestClient, ``asyncio.to_thread``) enxergam o mesmo banco.
+Os módulos que precisam de dados extras sobrescrevem ``db`` ou
+``session_factory`` pedindo a fixture original.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.user import User
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    """Sessão com o usuário ``u1`` já gravado."""
+    session = session_factory()
+    session.add(User(id="u1", email="u1@test.com", username="u1", name="U1", role="USER"))
+    session.commit()
+    yield session
+    session.close()
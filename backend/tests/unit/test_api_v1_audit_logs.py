@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime, date, timedelta
 
 from app.api.v1.audit_logs import (
+    _text_filter,
     router,
     get_audit_logs,
     get_available_actions,
@@ -16,6 +17,18 @@ from app.models.user import User
 from app.models.audit_log import AuditLog
 
 
+def _purge_report(deleted_count):
+    """Relatório no formato retornado por AuditRetentionService.purge."""
+    return {
+        "deleted_count": deleted_count,
+        "archived_count": 0,
+        "chunks": 1 if deleted_count else 0,
+        "elapsed_seconds": 0.01,
+        "rows_per_second": deleted_count * 100.0,
+        "cutoff_date": "2024-01-01T00:00:00",
+    }
+
+
 class TestAuditLogsAPI:
     """Testes para os endpoints de logs de auditoria."""
 
@@ -238,6 +251,76 @@ class TestGetAuditLogs:
         assert result == []
 
 
+class TestTextFilterModes:
+    """Testes para os modos de busca de action/performed_by."""
+
+    def _sql(self, expression):
+        return str(expression.compile(compile_kwargs={"literal_binds": True}))
+
+    def test_contains_uses_ilike(self):
+        sql = self._sql(_text_filter(AuditLog.action, "LOG", "contains"))
+
+        assert "LIKE" in sql.upper()
+        assert "'%LOG%'" in sql
+
+    def test_exact_uses_equality(self):
+        sql = self._sql(_text_filter(AuditLog.action, "LOGIN", "exact"))
+
+        assert sql == "audit_logs.action = 'LOGIN'"
+
+    def test_prefix_uses_index_friendly_range(self):
+        sql = self._sql(_text_filter(AuditLog.performed_by, "adm", "prefix"))
+
+        assert "LIKE" not in sql.upper()
+        assert "audit_logs.performed_by >= 'adm'" in sql
+        assert "audit_logs.performed_by < 'adn'" in sql
+
+    def test_prefix_matches_expected_rows(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.core.database import Base
+
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        for action in ("LOGIN", "LOGIN_FAILED", "LOGOUT", "LOGINX", "CREATE_USER"):
+            db.add(
+                AuditLog(
+                    action=action,
+                    resource_type="auth",
+                    performed_by="u1",
+                    performed_by_role="USER",
+                )
+            )
+        db.commit()
+
+        result = get_audit_logs(
+            action="LOGIN", match="prefix", db=db, current_user=None
+        )
+
+        assert sorted(log.action for log in result) == [
+            "LOGIN",
+            "LOGINX",
+            "LOGIN_FAILED",
+        ]
+        db.close()
+
+    def test_prefix_plan_uses_index(self):
+        from sqlalchemy import create_engine, select, text
+        from app.core.database import Base
+
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        stmt = select(AuditLog.id).where(
+            _text_filter(AuditLog.action, "LOGIN", "prefix")
+        )
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        with engine.connect() as conn:
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+
+        assert "ix_audit_logs_action" in " ".join(row[-1] for row in plan)
+
+
 class TestGetAvailableActions:
     """Testes para o endpoint de ações disponíveis."""
 
@@ -247,48 +330,42 @@ class TestGetAvailableActions:
         self.admin_user = User(
             id=1, username="admin", email="admin@test.com", role="ADMIN", is_active=True
         )
+        self.list_patcher = patch(
+            "app.api.v1.audit_logs.AuditFacetService.list_values"
+        )
+        self.list_values = self.list_patcher.start()
 
-        # Mock query chain
-        self.query_mock = Mock()
-        self.db_mock.query.return_value = self.query_mock
-        self.query_mock.distinct.return_value = self.query_mock
+    def teardown_method(self):
+        """Limpeza após cada teste."""
+        self.list_patcher.stop()
 
     def test_get_available_actions_success(self):
         """Testa obtenção bem-sucedida das ações."""
         # Arrange
-        mock_actions = [
-            ("LOGIN",),
-            ("CREATE_ENTRY",),
-            ("UPDATE_ENTRY",),
-            ("DELETE_ENTRY",),
-        ]
-        self.query_mock.all.return_value = mock_actions
+        self.list_values.return_value = ["CREATE_ENTRY", "DELETE_ENTRY", "LOGIN"]
 
         # Act
         result = get_available_actions(db=self.db_mock, current_user=self.admin_user)
 
         # Assert
-        expected = ["LOGIN", "CREATE_ENTRY", "UPDATE_ENTRY", "DELETE_ENTRY"]
-        assert result == expected
-        self.query_mock.distinct.assert_called_once()
+        assert result == ["CREATE_ENTRY", "DELETE_ENTRY", "LOGIN"]
+        self.list_values.assert_called_once_with(self.db_mock, "action")
 
-    def test_get_available_actions_with_nulls(self):
-        """Testa filtro de valores nulos."""
+    def test_get_available_actions_does_not_scan_logs(self):
+        """Testa que a lista vem do dicionário, sem consultar audit_logs."""
         # Arrange
-        mock_actions = [("LOGIN",), (None,), ("CREATE_ENTRY",), ("",)]
-        self.query_mock.all.return_value = mock_actions
+        self.list_values.return_value = ["LOGIN"]
 
         # Act
-        result = get_available_actions(db=self.db_mock, current_user=self.admin_user)
+        get_available_actions(db=self.db_mock, current_user=self.admin_user)
 
         # Assert
-        expected = ["LOGIN", "CREATE_ENTRY"]
-        assert result == expected
+        self.db_mock.query.assert_not_called()
 
     def test_get_available_actions_empty(self):
         """Testa resultado vazio."""
         # Arrange
-        self.query_mock.all.return_value = []
+        self.list_values.return_value = []
 
         # Act
         result = get_available_actions(db=self.db_mock, current_user=self.admin_user)
@@ -306,33 +383,19 @@ class TestGetAvailableResourceTypes:
         self.admin_user = User(
             id=1, username="admin", email="admin@test.com", role="ADMIN", is_active=True
         )
+        self.list_patcher = patch(
+            "app.api.v1.audit_logs.AuditFacetService.list_values"
+        )
+        self.list_values = self.list_patcher.start()
 
-        # Mock query chain
-        self.query_mock = Mock()
-        self.db_mock.query.return_value = self.query_mock
-        self.query_mock.distinct.return_value = self.query_mock
+    def teardown_method(self):
+        """Limpeza após cada teste."""
+        self.list_patcher.stop()
 
     def test_get_available_resource_types_success(self):
         """Testa obtenção bem-sucedida dos tipos de recursos."""
         # Arrange
-        mock_types = [("user",), ("financial_entry",), ("system_config",)]
-        self.query_mock.all.return_value = mock_types
-
-        # Act
-        result = get_available_resource_types(
-            db=self.db_mock, current_user=self.admin_user
-        )
-
-        # Assert
-        expected = ["user", "financial_entry", "system_config"]
-        assert result == expected
-        self.query_mock.distinct.assert_called_once()
-
-    def test_get_available_resource_types_with_nulls(self):
-        """Testa filtro de valores nulos."""
-        # Arrange
-        mock_types = [("user",), (None,), ("financial_entry",), ("",)]
-        self.query_mock.all.return_value = mock_types
+        self.list_values.return_value = ["financial_entry", "system_config", "user"]
 
         # Act
         result = get_available_resource_types(
@@ -340,8 +403,9 @@ class TestGetAvailableResourceTypes:
         )
 
         # Assert
-        expected = ["user", "financial_entry"]
-        assert result == expected
+        assert result == ["financial_entry", "system_config", "user"]
+        self.list_values.assert_called_once_with(self.db_mock, "resource_type")
+        self.db_mock.query.assert_not_called()
 
 
 class TestGetAuditStats:
@@ -449,6 +513,11 @@ class TestCleanupOldLogs:
 
     def setup_method(self):
         """Setup para cada teste."""
+        self.purge_patcher = patch(
+            "app.api.v1.audit_logs.AuditRetentionService.purge",
+            return_value=_purge_report(0),
+        )
+        self.purge_mock = self.purge_patcher.start()
         self.db_mock = Mock(spec=Session)
         self.master_user = User(
             id=1,
@@ -463,6 +532,10 @@ class TestCleanupOldLogs:
         self.db_mock.query.return_value = self.query_mock
         self.query_mock.filter.return_value = self.query_mock
 
+    def teardown_method(self):
+        """Limpeza após cada teste."""
+        self.purge_patcher.stop()
+
     @patch("app.api.v1.audit_logs.datetime")
     def test_cleanup_old_logs_success(self, mock_datetime):
         """Testa limpeza bem-sucedida de logs antigos."""
@@ -472,7 +545,7 @@ class TestCleanupOldLogs:
 
         # Mock count and delete operations
         self.query_mock.count.return_value = 50
-        self.query_mock.delete.return_value = 50
+        self.purge_mock.return_value = _purge_report(50)
 
         # Act
         result = cleanup_old_logs(
@@ -481,8 +554,7 @@ class TestCleanupOldLogs:
 
         # Assert
         assert "50 logs removidos" in result["message"]
-        self.query_mock.count.assert_called_once()
-        self.query_mock.delete.assert_called_once()
+        self.purge_mock.assert_called_once()
         self.db_mock.commit.assert_called()
         self.db_mock.add.assert_called_once()  # Log de auditoria da limpeza
 
@@ -504,7 +576,7 @@ class TestCleanupOldLogs:
             mock_datetime.now.return_value = mock_now
 
             self.query_mock.count.return_value = 10
-            self.query_mock.delete.return_value = 10
+            self.purge_mock.return_value = _purge_report(10)
 
             # Act
             result = cleanup_old_logs(
@@ -522,7 +594,7 @@ class TestCleanupOldLogs:
         mock_datetime.now.return_value = mock_now
 
         self.query_mock.count.return_value = 0
-        self.query_mock.delete.return_value = 0
+        self.purge_mock.return_value = _purge_report(0)
 
         # Act
         result = cleanup_old_logs(
@@ -541,7 +613,7 @@ class TestCleanupOldLogs:
         mock_datetime.now.return_value = mock_now
 
         self.query_mock.count.return_value = 25
-        self.query_mock.delete.return_value = 25
+        self.purge_mock.return_value = _purge_report(25)
 
         # Act
         cleanup_old_logs(
@@ -567,6 +639,11 @@ class TestAuditLogsIntegration:
 
     def setup_method(self):
         """Setup para cada teste."""
+        self.purge_patcher = patch(
+            "app.api.v1.audit_logs.AuditRetentionService.purge",
+            return_value=_purge_report(0),
+        )
+        self.purge_mock = self.purge_patcher.start()
         self.db_mock = Mock(spec=Session)
         self.admin_user = User(
             id=1, username="admin", email="admin@test.com", role="ADMIN", is_active=True
@@ -579,6 +656,10 @@ class TestAuditLogsIntegration:
             is_active=True,
         )
 
+    def teardown_method(self):
+        """Limpeza após cada teste."""
+        self.purge_patcher.stop()
+
     def test_admin_endpoints_access_control(self):
         """Testa controle de acesso para endpoints de ADMIN."""
         # Este teste seria implementado no nível de integração com FastAPI
@@ -680,7 +761,7 @@ class TestAuditLogsIntegration:
             self.db_mock.query.return_value = query_mock
             query_mock.filter.return_value = query_mock
             query_mock.count.return_value = 100
-            query_mock.delete.return_value = 100
+            self.purge_mock.return_value = _purge_report(100)
 
             # Act
             cleanup_old_logs(
@@ -705,6 +786,11 @@ class TestAuditLogsAdvanced:
 
     def setup_method(self):
         """Setup para cada teste."""
+        self.purge_patcher = patch(
+            "app.api.v1.audit_logs.AuditRetentionService.purge",
+            return_value=_purge_report(0),
+        )
+        self.purge_mock = self.purge_patcher.start()
         self.db_mock = Mock(spec=Session)
         self.admin_user = User(
             id=1, username="admin", email="admin@test.com", role="ADMIN", is_active=True
@@ -727,6 +813,10 @@ class TestAuditLogsAdvanced:
         self.query_mock.distinct.return_value = self.query_mock
         self.query_mock.group_by.return_value = self.query_mock
 
+    def teardown_method(self):
+        """Limpeza após cada teste."""
+        self.purge_patcher.stop()
+
     def test_pagination_validation_negative_skip(self):
         """Testa validação de paginação com skip negativo."""
         # Arrange
@@ -891,7 +981,7 @@ class TestAuditLogsAdvanced:
         mock_datetime.now.return_value = mock_now
 
         self.query_mock.count.return_value = 0
-        self.query_mock.delete.return_value = 0
+        self.purge_mock.return_value = _purge_report(0)
 
         # Act
         result = cleanup_old_logs(
@@ -909,7 +999,7 @@ class TestAuditLogsAdvanced:
         mock_datetime.now.return_value = mock_now
 
         self.query_mock.count.return_value = 0
-        self.query_mock.delete.return_value = 0
+        self.purge_mock.return_value = _purge_report(0)
 
         # Act
         result = cleanup_old_logs(
@@ -1025,7 +1115,7 @@ class TestAuditLogsAdvanced:
             mock_datetime.now.return_value = mock_now
 
             self.query_mock.count.return_value = 50
-            self.query_mock.delete.return_value = 50
+            self.purge_mock.return_value = _purge_report(50)
 
             # Act
             result = cleanup_old_logs(
@@ -1106,7 +1196,7 @@ class TestAuditLogsAdvanced:
             mock_datetime.now.return_value = mock_now
 
             self.query_mock.count.return_value = 100
-            self.query_mock.delete.return_value = 100
+            self.purge_mock.return_value = _purge_report(100)
 
             # Simular erro após delete mas antes do commit
             self.db_mock.commit.side_effect = Exception("Commit failed")
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import BackgroundTasks
+from pydantic import ValidationError
+
+from app.api.v1.cep import router, resolve_ceps_batch, backfill_user_addresses
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.cep_schema import CEPBatchRequest
+from app.services.cep_backfill_service import CEPBackfillService
+
+
+class TestCEPBatchAPI:
+    """Testes para os endpoints de CEP em lote."""
+
+    def setup_method(self):
+        """Setup para cada teste."""
+        self.admin_user = User(
+            id=1, username="admin", email="admin@test.com", role="ADMIN", is_active=True
+        )
+
+    def test_router_configuration(self):
+        """Testa se as rotas de lote estão registradas."""
+        routes = [route.path for route in router.routes]
+        assert "/batch" in routes
+        assert "/backfill-users" in routes
+
+    def test_batch_size_is_limited(self):
+        """Testa validação do tamanho do lote."""
+        with pytest.raises(ValidationError):
+            CEPBatchRequest(ceps=[])
+        with pytest.raises(ValidationError):
+            CEPBatchRequest(ceps=["01310100"] * (settings.CEP_BATCH_MAX_SIZE + 1))
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_items_and_summary(self):
+        """Testa resposta com status por item e resumo."""
+        results = [
+            {"cep": "01310100", "status": "found", "data": {"city": "São Paulo"}},
+            {"cep": "01310-100", "status": "found", "data": {"city": "São Paulo"}},
+            {"cep": "123", "status": "invalid", "data": None},
+        ]
+        with patch(
+            "app.api.v1.cep.CEPService.resolve_many", AsyncMock(return_value=results)
+        ) as resolve:
+            response = await resolve_ceps_batch(
+                CEPBatchRequest(ceps=["01310100", "01310-100", "123"]),
+                current_user=self.admin_user,
+            )
+
+        resolve.assert_awaited_once_with(["01310100", "01310-100", "123"])
+        assert response["data"] == results
+        assert response["summary"] == {"found": 2, "invalid": 1}
+        assert response["message"] == "2 de 3 CEPs encontrados"
+
+    @pytest.mark.asyncio
+    async def test_backfill_is_scheduled_in_background(self):
+        """Testa agendamento do backfill de endereços."""
+        background_tasks = Mock(spec=BackgroundTasks)
+
+        response = await backfill_user_addresses(
+            background_tasks, current_user=self.admin_user
+        )
+
+        background_tasks.add_task.assert_called_once_with(
+            CEPBackfillService.backfill_user_addresses
+        )
+        assert response["success"] is True
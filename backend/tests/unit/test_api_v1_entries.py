@@ -0,0 +1,101 @@
+"""Testes para as rotas de entries.py (validação de subcategoria)"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import entries
+from app.core.database import get_db
+from app.dependencies import get_current_user
+from app.models.category import Category
+from app.models.entry import Entry
+from app.models.user import User
+
+PAYLOAD = {
+    "amount": 120.0,
+    "description": "Posto",
+    "date": "2026-10-19T08:30:00",
+    "type": "EXPENSE",
+    "category": "Combustível",
+    "subcategory": "Gasolina",
+}
+
+
+@pytest.fixture
+def session_factory(session_factory, db):
+    """Fábrica do banco com o usuário u1 e as categorias do módulo."""
+    db.add_all([
+        Category(
+            name="Combustível", type="EXPENSE", is_default=True,
+            subcategories=["Gasolina", "Etanol"],
+        ),
+        Category(name="Lavagem", type="EXPENSE", is_default=True),
+    ])
+    db.commit()
+    return session_factory
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(entries.router)
+
+    def get_session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with session_factory() as db:
+        user = db.get(User, "u1")
+        db.expunge(user)
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+@pytest.fixture
+def entry_id(client):
+    response = client.post("/entries/", json=PAYLOAD)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _subcategory(session_factory, entry_id):
+    with session_factory() as db:
+        return db.get(Entry, entry_id).subcategory
+
+
+class TestSubcategoryValidation:
+    """Subcategoria fora da lista da categoria responde 400 sem gravar nada."""
+
+    def test_create(self, client, session_factory):
+        response = client.post("/entries/", json={**PAYLOAD, "subcategory": "Diesel"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Subcategoria inválida para a categoria informada"
+        with session_factory() as db:
+            assert db.query(Entry).count() == 0
+        # Categorias sem lista aceitam qualquer subcategoria
+        response = client.post(
+            "/entries/", json={**PAYLOAD, "category": "Lavagem", "subcategory": "Completa"}
+        )
+        assert response.status_code == 201
+
+    def test_update_is_rolled_back(self, client, session_factory, entry_id):
+        for method in (client.put, client.patch):
+            response = method(f"/entries/{entry_id}", json={"subcategory": "Diesel"})
+            assert response.status_code == 400
+            assert _subcategory(session_factory, entry_id) == "Gasolina"
+
+        response = client.patch(f"/entries/{entry_id}", json={"subcategory": "Etanol"})
+        assert response.status_code == 200
+        assert _subcategory(session_factory, entry_id) == "Etanol"
+
+    def test_bulk_update(self, client, session_factory, entry_id):
+        changes = {"category": "Combustível", "subcategory": "Diesel"}
+        response = client.post("/entries/bulk-update", json={"ids": [entry_id], "changes": changes})
+
+        assert response.status_code == 400
+        assert _subcategory(session_factory, entry_id) == "Gasolina"
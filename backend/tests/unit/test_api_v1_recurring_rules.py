@@ -0,0 +1,104 @@
+"""Testes para as rotas de recurring_rules.py"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import recurring_rules
+from app.core.database import get_db
+from app.dependencies import get_current_user
+from app.models.category import Category
+from app.models.recurring_rule import RecurringRule
+from app.models.user import User
+
+PAYLOAD = {
+    "description": "Seguro do carro",
+    "amount": 180.0,
+    "type": "EXPENSE",
+    "category": "Seguro",
+    "frequency": "MONTHLY",
+    "start_date": "2025-01-10",
+}
+
+
+@pytest.fixture
+def session_factory(session_factory, db):
+    """Fábrica do banco com o usuário u1 e as categorias do módulo."""
+    db.add(Category(
+        name="Seguro", type="EXPENSE", subcategories=["Carro", "Vida"], is_default=True
+    ))
+    db.commit()
+    return session_factory
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(recurring_rules.router)
+
+    def get_session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with session_factory() as db:
+        user = db.get(User, "u1")
+        db.expunge(user)
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+@pytest.fixture
+def rule_id(client):
+    response = client.post("/recurring-rules/", json=PAYLOAD)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+class TestRecurringRuleValidation:
+    """Campos obrigatórios, plataforma e subcategoria."""
+
+    @pytest.mark.parametrize(
+        "field", ["amount", "frequency", "interval", "start_date", "is_active", "category"]
+    )
+    def test_required_fields_cannot_be_cleared(self, client, rule_id, field):
+        response = client.put(f"/recurring-rules/{rule_id}", json={field: None})
+        assert response.status_code == 422
+
+    def test_platform_must_be_known(self, client, rule_id):
+        assert client.post("/recurring-rules/", json={**PAYLOAD, "platform": "TAXI"}).status_code == 422
+        response = client.put(f"/recurring-rules/{rule_id}", json={"platform": "UBER"})
+        assert response.json()["platform"] == "UBER"
+        assert client.put(f"/recurring-rules/{rule_id}", json={"platform": "TAXI"}).status_code == 422
+
+    def test_subcategory_must_belong_to_category(self, client, session_factory, rule_id):
+        response = client.post("/recurring-rules/", json={**PAYLOAD, "subcategory": "Moto"})
+        assert response.status_code == 400
+
+        assert client.put(f"/recurring-rules/{rule_id}", json={"subcategory": "Moto"}).status_code == 400
+        with session_factory() as db:
+            assert db.get(RecurringRule, rule_id).subcategory is None
+        response = client.put(f"/recurring-rules/{rule_id}", json={"subcategory": "Carro"})
+        assert response.json()["subcategory"] == "Carro"
+
+
+class TestRecurringRuleSchedule:
+    """Recálculo da próxima execução."""
+
+    def test_reactivation_skips_paused_period(self, client, session_factory, rule_id):
+        client.put(f"/recurring-rules/{rule_id}", json={"is_active": False})
+
+        response = client.put(f"/recurring-rules/{rule_id}", json={"is_active": True})
+
+        next_run = date.fromisoformat(response.json()["next_run_date"])
+        assert date.today() <= next_run < date.today() + timedelta(days=32)
+        assert next_run.day == 10
+
+    def test_other_edits_keep_the_watermark(self, client, rule_id):
+        response = client.put(f"/recurring-rules/{rule_id}", json={"is_active": True, "amount": 200.0})
+        assert response.json()["next_run_date"] == PAYLOAD["start_date"]
@@ -0,0 +1,164 @@
+"""Testes para o módulo metrics.py"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram, MetricsMiddleware, registry
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+metrics.instrument_engine(engine)
+TestingSession = sessionmaker(bind=engine)
+
+
+def get_session():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _build_app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, db: Session = Depends(get_session)):
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    @app.get("/in-progress")
+    async def in_progress():
+        return {str(k): v for k, v in metrics.HTTP_IN_PROGRESS.values().items()}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("falha")
+
+    return app
+
+
+@pytest.fixture
+def client():
+    registry.clear()
+    yield TestClient(_build_app(), raise_server_exceptions=False)
+    registry.clear()
+
+
+class TestExposition:
+    """Testes do formato texto do Prometheus."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency", "Latência", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, ("/a",))
+
+        lines = histogram.render()
+        assert 'latency_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_bucket{route="/a",le="1"} 3' in lines
+        assert 'latency_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_count{route="/a"} 4' in lines
+        assert 'latency_sum{route="/a"} 3.65' in lines
+        assert lines[:2] == ["# HELP latency Latência", "# TYPE latency histogram"]
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("hits", "Acertos", ("path",))
+        counter.inc(('a"b\\c\nd',))
+        assert counter.render()[-1] == 'hits{path="a\\"b\\\\c\\nd"} 1'
+
+
+class TestMetricsMiddleware:
+    """Testes da coleta por rota."""
+
+    def test_requests_are_labeled_by_route_template(self, client):
+        for item_id in (1, 2, 3):
+            assert client.get(f"/items/{item_id}").status_code == 200
+        client.get("/items/abc")
+        client.get("/nao-existe")
+
+        assert metrics.HTTP_REQUESTS.value(("GET", "/items/{item_id}", "200")) == 3
+        assert metrics.HTTP_REQUESTS.value(("GET", "/items/{item_id}", "422")) == 1
+        assert metrics.HTTP_REQUESTS.value(("GET", "unmatched", "404")) == 1
+        _, _, count = metrics.HTTP_LATENCY.snapshot(("GET", "/items/{item_id}"))
+        assert count == 4
+
+    def test_unhandled_errors_count_as_500(self, client):
+        assert client.get("/boom").status_code == 500
+        assert metrics.HTTP_REQUESTS.value(("GET", "/boom", "500")) == 1
+
+    def test_queries_are_attributed_to_route(self, client):
+        client.get("/items/1")
+        client.get("/items/2")
+
+        assert metrics.DB_QUERIES.value(("/items/{item_id}",)) == 6
+        _, _, count = metrics.DB_QUERY_LATENCY.snapshot(("/items/{item_id}",))
+        assert count == 6
+        cumulative, total, requests = metrics.DB_QUERIES_PER_REQUEST.snapshot(
+            ("/items/{item_id}",)
+        )
+        assert (total, requests) == (6, 2)
+
+        with TestingSession() as db:
+            db.execute(text("SELECT 1"))
+        assert metrics.DB_QUERIES.value(("background",)) == 1
+
+    def test_pool_checkout_wait_is_observed(self, client):
+        client.get("/items/1")
+        assert metrics.DB_POOL_WAIT.snapshot()[2] >= 1
+
+    def test_in_progress_gauge_includes_current_request(self, client):
+        body = client.get("/in-progress").json()
+        assert body == {str(("GET", "/in-progress")): 1}
+        assert metrics.HTTP_IN_PROGRESS.values() == {}
+
+    def test_cache_hit_ratio(self, client):
+        for hit in (True, True, True, False):
+            metrics.record_cache("categorias", hit)
+
+        assert metrics.CACHE_HIT_RATIO.values() == {("categorias",): 0.75}
+        assert 'cache_hit_ratio{cache="categorias"} 0.75' in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Testes de GET /metrics na aplicação."""
+
+    @pytest.fixture
+    def app_client(self):
+        from app.main import app
+
+        return TestClient(app)
+
+    def test_renders_prometheus_text(self, app_client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "segredo")
+        app_client.get("/")
+        response = app_client.get("/metrics", headers={"Authorization": "Bearer segredo"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_requests_total{method="GET",route="/",status="200"}' in response.text
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+    def test_not_served_without_token(self, app_client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+        assert app_client.get("/metrics").status_code == 404
+
+    def test_token_is_required(self, app_client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "segredo")
+
+        assert app_client.get("/metrics").status_code == 401
+        assert app_client.get("/metrics", headers={"Authorization": "Bearer outro"}).status_code == 401
+        response = app_client.get(
+            "/metrics", headers={"Authorization": "Bearer segredo"}
+        )
+        assert response.status_code == 200
@@ -0,0 +1,115 @@
+"""Testes para o módulo audit_facet_service.py"""
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.models.audit_log import AuditLog
+from app.models.audit_log_facet import AuditLogFacet
+from app.services.audit_facet_service import AuditFacetService
+
+
+def _log(action, resource_type="user"):
+    return AuditLog(
+        action=action,
+        resource_type=resource_type,
+        performed_by="admin@test.com",
+        performed_by_role="ADMIN",
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_facets():
+    AuditFacetService.reset()
+
+
+class TestFacetMaintenance:
+    """Testes para a manutenção do dicionário na gravação dos logs."""
+
+    def test_new_values_are_recorded_on_insert(self, db):
+        db.add_all([_log("LOGIN", "auth"), _log("CREATE_USER"), _log("LOGIN", "auth")])
+        db.commit()
+
+        assert AuditFacetService.list_values(db, "action") == ["CREATE_USER", "LOGIN"]
+        assert AuditFacetService.list_values(db, "resource_type") == ["auth", "user"]
+
+    def test_known_values_skip_the_facet_table(self, db, engine):
+        db.add(_log("LOGIN", "auth"))
+        db.commit()
+
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        db.add(_log("LOGIN", "auth"))
+        db.commit()
+
+        assert not any("audit_log_facets" in s for s in statements)
+
+    def test_rollback_does_not_mark_values_as_known(self, db):
+        db.add(_log("DELETE_USER"))
+        db.flush()
+        db.rollback()
+
+        assert AuditFacetService.list_values(db, "action") == []
+
+        db.add(_log("DELETE_USER"))
+        db.commit()
+
+        assert AuditFacetService.list_values(db, "action") == ["DELETE_USER"]
+
+    def test_value_inserted_by_another_process_is_ignored(self, db):
+        db.add(AuditLogFacet(kind="action", value="LOGOUT"))
+        db.commit()
+
+        db.add(_log("LOGOUT"))
+        db.commit()
+
+        assert AuditFacetService.list_values(db, "action") == ["LOGOUT"]
+
+
+class TestBackfill:
+    """Testes para o backfill a partir dos logs existentes."""
+
+    def _insert_raw_logs(self, db):
+        # Inserção em massa não passa pelos eventos do mapper
+        db.execute(
+            insert(AuditLog),
+            [
+                {
+                    "id": str(i),
+                    "action": action,
+                    "resource_type": "entry",
+                    "performed_by": "x",
+                    "performed_by_role": "USER",
+                }
+                for i, action in enumerate(["CREATE_ENTRY", "UPDATE_ENTRY", "CREATE_ENTRY"])
+            ],
+        )
+        db.commit()
+
+    def test_ensure_seeded_populates_empty_dictionary(self, db):
+        self._insert_raw_logs(db)
+
+        assert AuditFacetService.ensure_seeded(db) == 3
+        assert AuditFacetService.list_values(db, "action") == [
+            "CREATE_ENTRY",
+            "UPDATE_ENTRY",
+        ]
+        assert AuditFacetService.list_values(db, "resource_type") == ["entry"]
+
+    def test_ensure_seeded_is_noop_when_populated(self, db):
+        db.add(_log("LOGIN", "auth"))
+        db.commit()
+        self._insert_raw_logs(db)
+
+        assert AuditFacetService.ensure_seeded(db) == 0
+
+    def test_backfill_only_adds_missing_values(self, db):
+        db.add(_log("CREATE_ENTRY", "entry"))
+        db.commit()
+        self._insert_raw_logs(db)
+
+        assert AuditFacetService.backfill(db) == 1
+        assert "UPDATE_ENTRY" in AuditFacetService.list_values(db, "action")
@@ -0,0 +1,161 @@
+"""Testes para o módulo audit_retention_service.py"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.audit_log import AuditLog
+from app.services.audit_retention_service import (
+    AuditRetentionService,
+    run_scheduled_retention,
+)
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+@pytest.fixture
+def db(db):
+    # 25 logs antigos (em 5 dias distintos) e 5 recentes
+    for i in range(25):
+        db.add(
+            AuditLog(
+                id=f"old-{i:03d}",
+                action="LOGIN",
+                resource_type="auth",
+                performed_by="user@test.com",
+                performed_by_role="USER",
+                details={"n": i},
+                created_at=NOW - timedelta(days=200 + i % 5),
+            )
+        )
+    for i in range(5):
+        db.add(
+            AuditLog(
+                id=f"new-{i:03d}",
+                action="LOGIN",
+                resource_type="auth",
+                performed_by="user@test.com",
+                performed_by_role="USER",
+                created_at=NOW - timedelta(days=1),
+            )
+        )
+    db.commit()
+    return db
+
+
+class TestAuditRetentionPurge:
+    """Testes para AuditRetentionService.purge."""
+
+    def test_deletes_only_expired_rows(self, db):
+        report = AuditRetentionService.purge(
+            db, NOW - timedelta(days=90), chunk_size=10, pause_seconds=0
+        )
+
+        assert report["deleted_count"] == 25
+        assert report["archived_count"] == 0
+        remaining = {row.id for row in db.query(AuditLog).all()}
+        assert remaining == {f"new-{i:03d}" for i in range(5)}
+
+    def test_deletes_in_bounded_chunks(self, db, engine):
+        deletes = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("DELETE"):
+                deletes.append(len(parameters))
+
+        report = AuditRetentionService.purge(
+            db, NOW - timedelta(days=90), chunk_size=10, pause_seconds=0
+        )
+
+        assert report["chunks"] == 3
+        assert deletes == [10, 10, 5]
+
+    def test_reports_progress_after_each_chunk(self, db):
+        progress = []
+
+        AuditRetentionService.purge(
+            db,
+            NOW - timedelta(days=90),
+            chunk_size=10,
+            pause_seconds=0,
+            progress_callback=progress.append,
+        )
+
+        assert [p["deleted_count"] for p in progress] == [10, 20, 25]
+        assert all("rows_per_second" in p for p in progress)
+
+    def test_pauses_between_full_chunks(self, db):
+        with patch("app.services.audit_retention_service.time.sleep") as sleep:
+            AuditRetentionService.purge(
+                db, NOW - timedelta(days=90), chunk_size=10, pause_seconds=0.5
+            )
+
+        assert sleep.call_count == 2
+        sleep.assert_called_with(0.5)
+
+    def test_nothing_to_delete(self, db):
+        report = AuditRetentionService.purge(db, NOW - timedelta(days=365))
+
+        assert report["deleted_count"] == 0
+        assert report["chunks"] == 0
+
+    def test_invalid_chunk_size(self, db):
+        with pytest.raises(ValueError):
+            AuditRetentionService.purge(db, NOW, chunk_size=0)
+
+    def test_archives_rows_partitioned_by_day(self, db, tmp_path):
+        report = AuditRetentionService.purge(
+            db,
+            NOW - timedelta(days=90),
+            chunk_size=7,
+            pause_seconds=0,
+            archive_dir=str(tmp_path),
+        )
+
+        assert report["archived_count"] == 25
+        segments = sorted(tmp_path.rglob("*.ndjson.gz"))
+        assert len(segments) == 5
+
+        archived = []
+        for segment in segments:
+            with gzip.open(segment, "rt", encoding="utf-8") as fh:
+                archived.extend(json.loads(line) for line in fh if line.strip())
+        assert sorted(r["id"] for r in archived) == [f"old-{i:03d}" for i in range(25)]
+        assert archived[0]["details"] is not None
+
+        day = (NOW - timedelta(days=200)).date()
+        expected = AuditRetentionService.segment_path(tmp_path, day.isoformat())
+        assert expected.exists()
+        assert expected.parent == tmp_path / f"{day:%Y}" / f"{day:%m}"
+
+
+class TestScheduledRetention:
+    """Testes para run_scheduled_retention."""
+
+    def test_uses_log_retention_days_config(self, engine, db):
+        TestingSession = sessionmaker(bind=engine)
+        with patch(
+            "app.services.audit_retention_service.SessionLocal", TestingSession
+        ), patch(
+            "app.services.system_config_service.SystemConfigService.get_config",
+            return_value=90,
+        ):
+            report = run_scheduled_retention()
+
+        assert report["deleted_count"] == 25
+
+    def test_disabled_when_retention_is_zero(self, engine, db):
+        TestingSession = sessionmaker(bind=engine)
+        with patch(
+            "app.services.audit_retention_service.SessionLocal", TestingSession
+        ), patch(
+            "app.services.system_config_service.SystemConfigService.get_config",
+            return_value=0,
+        ):
+            assert run_scheduled_retention() is None
@@ -0,0 +1,212 @@
+"""Testes para o módulo cache_invalidation_service.py"""
+
+import asyncio
+import multiprocessing
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.cache_invalidation import CacheInvalidation
+from app.services.cache_invalidation_service import (
+    CacheInvalidationService,
+    InvalidationPoller,
+    cache_invalidation_loop,
+)
+from app.services.category_cache_service import CATEGORIES_TOPIC, CategoryCacheService
+
+
+@pytest.fixture
+def received():
+    calls = []
+    CacheInvalidationService.subscribe("test", calls.append)
+    yield calls
+    CacheInvalidationService._handlers["test"].remove(calls.append)
+
+
+def _remote(db, topic="test", key=None, **extra):
+    db.add(CacheInvalidation(topic=topic, key=key, origin="outro-worker", **extra))
+    db.commit()
+
+
+class TestPublish:
+    """Publicação na transação da escrita."""
+
+    def test_dispatches_locally_on_commit(self, session_factory, received):
+        with session_factory() as db:
+            CacheInvalidationService.publish(db, "test", "u1")
+            CacheInvalidationService.publish(db, "test", "u1")
+            assert received == []
+            db.commit()
+            assert db.query(CacheInvalidation).count() == 2
+        # Invalidações repetidas na mesma transação são aplicadas uma vez
+        assert received == ["u1"]
+
+    def test_rollback_discards(self, session_factory, received):
+        with session_factory() as db:
+            CacheInvalidationService.publish(db, "test", "u1")
+            db.rollback()
+            db.commit()
+            assert db.query(CacheInvalidation).count() == 0
+        assert received == []
+
+    def test_category_cache_subscribed(self):
+        generation = CategoryCacheService._generation
+        CacheInvalidationService.dispatch(CATEGORIES_TOPIC)
+        assert CategoryCacheService._generation == generation + 1
+
+
+class TestPoller:
+    """Leitura das invalidações dos outros workers."""
+
+    def test_applies_only_new_remote_rows(self, session_factory, received):
+        with session_factory() as db:
+            _remote(db, key="antes")
+            poller = InvalidationPoller(session_factory)
+            assert poller.poll() == 0  # Primeira leitura só posiciona o cursor
+
+            _remote(db, key="u1")
+            CacheInvalidationService.publish(db, "test", "local")
+            db.commit()
+            received.clear()
+
+            assert poller.poll() == 1
+            assert received == ["u1"]
+            assert poller.poll() == 0
+
+    def test_waits_for_skipped_ids(self, session_factory, received):
+        poller = InvalidationPoller(session_factory)
+        poller.poll()
+        with session_factory() as db:
+            _remote(db, key="a", id=1)
+            _remote(db, key="c", id=3)
+            assert poller.poll() == 2
+            # id 2 ainda não visível (commit fora de ordem): o cursor fica antes dele
+            _remote(db, key="b", id=2)
+            assert poller.poll() == 1
+        assert received == ["a", "c", "b"]
+
+    def test_expired_gap_is_skipped(self, session_factory, received, monkeypatch):
+        monkeypatch.setattr(InvalidationPoller, "GAP_GRACE_SECONDS", 0)
+        poller = InvalidationPoller(session_factory)
+        poller.poll()
+        with session_factory() as db:
+            _remote(db, key="c", id=3)
+            poller.poll()
+            assert poller._cursor == 3
+
+    def test_purge(self, session_factory):
+        with session_factory() as db:
+            _remote(db, created_at=datetime.utcnow() - timedelta(hours=1))
+            _remote(db)
+            assert CacheInvalidationService.purge(db, datetime.utcnow() - timedelta(minutes=10)) == 1
+
+    def test_ids_are_not_reused_after_purge(self, tmp_path, received):
+        engine = create_engine(f"sqlite:///{tmp_path / 'bus.db'}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        poller = InvalidationPoller(factory)
+        poller.poll()
+        try:
+            with factory() as db:
+                for key in ("a", "b", "c"):
+                    _remote(db, key=key)
+                assert poller.poll() == 3
+                # Período ocioso: a limpeza esvazia a tabela
+                everything = datetime.utcnow() + timedelta(minutes=1)
+                assert CacheInvalidationService.purge(db, everything) == 3
+                for key in ("d", "e", "f"):
+                    _remote(db, key=key)
+                assert [row.id for row in db.query(CacheInvalidation)] == [4, 5, 6]
+
+            assert poller.poll() == 3
+            assert received == ["a", "b", "c", "d", "e", "f"]
+        finally:
+            engine.dispose()
+
+    def test_cursor_resets_when_ids_restart(self, session_factory, received):
+        # Tabela criada sem AUTOINCREMENT: ids recomeçam abaixo do cursor
+        poller = InvalidationPoller(session_factory)
+        poller.poll()
+        poller._cursor = 50
+        with session_factory() as db:
+            _remote(db, key="a", id=1)
+            _remote(db, key="b", id=2)
+
+        assert poller.poll() == 2
+        assert received == ["a", "b"]
+        assert poller._cursor == 2
+
+
+def _worker(db_url, socket_dir, poll_seconds, ready, events):
+    """Processo que simula um worker do uvicorn com o laço de invalidação."""
+    engine = create_engine(db_url)
+    CacheInvalidationService.subscribe("test", lambda key: events.put((key, time.time())))
+
+    async def main():
+        task = asyncio.create_task(
+            cache_invalidation_loop(poll_seconds, sessionmaker(bind=engine), socket_dir)
+        )
+        await asyncio.sleep(1.0)
+        ready.set()
+        await asyncio.sleep(30)
+        task.cancel()
+
+    asyncio.run(main())
+
+
+class TestMultiProcess:
+    """Defasagem máxima entre workers em processos separados."""
+
+    WORKERS = 3
+
+    def _run(self, tmp_path, monkeypatch, poll_seconds, socket_dir=None):
+        db_url = f"sqlite:///{tmp_path / 'bus.db'}"
+        engine = create_engine(db_url)
+        Base.metadata.create_all(engine)
+        monkeypatch.setattr(settings, "CACHE_INVALIDATION_SOCKET_DIR", socket_dir)
+
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        workers = []
+        for _ in range(self.WORKERS):
+            ready = context.Event()
+            process = context.Process(
+                target=_worker, args=(db_url, socket_dir, poll_seconds, ready, events), daemon=True
+            )
+            process.start()
+            workers.append((process, ready))
+        try:
+            for _, ready in workers:
+                assert ready.wait(60)
+            with sessionmaker(bind=engine)() as db:
+                CacheInvalidationService.publish(db, "test", "u1")
+                db.commit()
+                committed_at = time.time()
+            delays = []
+            for _ in range(self.WORKERS):
+                key, received_at = events.get(timeout=poll_seconds + 10)
+                assert key == "u1"
+                delays.append(received_at - committed_at)
+            return delays
+        finally:
+            for process, _ in workers:
+                process.terminate()
+                process.join(5)
+            engine.dispose()
+
+    def test_polling_bounds_staleness(self, tmp_path, monkeypatch):
+        poll_seconds = 0.5
+        delays = self._run(tmp_path, monkeypatch, poll_seconds)
+        # Uma rodada de polling, com folga para o agendamento dos processos
+        assert max(delays) < poll_seconds + 0.5
+
+    def test_socket_fast_path(self, tmp_path, monkeypatch):
+        poll_seconds = 30
+        delays = self._run(tmp_path, monkeypatch, poll_seconds, str(tmp_path / "sockets"))
+        # O aviso pelo socket antecipa a leitura: bem abaixo do intervalo de polling
+        assert max(delays) < 1.0
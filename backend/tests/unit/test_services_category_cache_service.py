@@ -0,0 +1,104 @@
+"""Testes para o módulo category_cache_service.py"""
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.category import Category
+from app.services.category_cache_service import CategoryCacheService
+
+
+@pytest.fixture
+def db(db):
+    db.add_all(
+        [
+            Category(
+                id="d1",
+                name="Combustível",
+                type="EXPENSE",
+                is_default=True,
+                subcategories=["Gasolina", "Etanol"],
+            ),
+            Category(id="d2", name="Corrida", type="INCOME", is_default=True),
+            Category(id="c1", name="Lanche", type="EXPENSE", user_id="u1"),
+        ]
+    )
+    db.commit()
+    CategoryCacheService.invalidate()
+    return db
+    CategoryCacheService.invalidate()
+
+
+def _count_selects(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+class TestCategoryCacheService:
+    """Testes para a classe CategoryCacheService."""
+
+    def test_returns_only_default_categories(self, db):
+        result = CategoryCacheService.get_default_categories(db)
+
+        assert {c.id for c in result} == {"d1", "d2"}
+        fuel = next(c for c in result if c.id == "d1")
+        assert fuel.subcategories == ["Gasolina", "Etanol"]
+
+    def test_filters_by_type(self, db):
+        result = CategoryCacheService.get_default_categories(db, "INCOME")
+
+        assert [c.id for c in result] == ["d2"]
+
+    def test_second_read_does_not_hit_database(self, db, engine):
+        CategoryCacheService.get_default_categories(db)
+        statements = _count_selects(engine)
+
+        CategoryCacheService.get_default_categories(db)
+        CategoryCacheService.get_default_category(db, "d1")
+
+        assert statements == []
+
+    def test_invalidate_reloads_from_database(self, db):
+        CategoryCacheService.get_default_categories(db)
+        db.add(Category(id="d3", name="Pedágio", type="EXPENSE", is_default=True))
+        db.commit()
+
+        assert "d3" not in {c.id for c in CategoryCacheService.get_default_categories(db)}
+
+        CategoryCacheService.invalidate()
+
+        assert "d3" in {c.id for c in CategoryCacheService.get_default_categories(db)}
+
+    def test_get_default_category_ignores_user_categories(self, db):
+        assert CategoryCacheService.get_default_category(db, "d2").name == "Corrida"
+        assert CategoryCacheService.get_default_category(db, "c1") is None
+
+    def test_cached_categories_are_immutable(self, db):
+        category = CategoryCacheService.get_default_category(db, "d1")
+
+        with pytest.raises(ValidationError):
+            category.name = "Outro"
+
+    def test_snapshots_are_isolated_per_engine(self, db):
+        CategoryCacheService.get_default_categories(db)
+
+        other_engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(other_engine)
+        other_db = sessionmaker(bind=other_engine)()
+        try:
+            assert CategoryCacheService.get_default_categories(other_db) == ()
+        finally:
+            other_db.close()
@@ -0,0 +1,118 @@
+"""Testes para o módulo cep_backfill_service.py"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models.user import User
+from app.services.cep_backfill_service import CEPBackfillService
+
+PAULISTA = {
+    "cep": "01310-100",
+    "street": "Avenida Paulista",
+    "neighborhood": "Bela Vista",
+    "city": "São Paulo",
+    "state": "SP",
+}
+
+
+def _user(n, **fields):
+    return User(
+        id=f"u{n:02d}", email=f"u{n}@test.com", username=f"u{n}", name="U", **fields
+    )
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all(
+            [
+                _user(1, cep="01310-100"),
+                _user(2, cep="01310100", street="Rua Informada", city="Outra"),
+                _user(3, cep="99999-999"),
+                _user(4),
+                _user(
+                    5,
+                    cep="01310-100",
+                    street="Avenida Paulista",
+                    neighborhood="Bela Vista",
+                    city="São Paulo",
+                    state="SP",
+                ),
+                _user(6, cep="12"),
+            ]
+        )
+        db.commit()
+    return session_factory
+
+
+async def _fake_resolve_many(ceps, concurrency=None):
+    results = []
+    for cep in ceps:
+        digits = "".join(ch for ch in cep if ch.isdigit())
+        if len(digits) != 8:
+            results.append({"cep": cep, "status": "invalid", "data": None})
+        elif digits == "01310100":
+            results.append({"cep": cep, "status": "found", "data": dict(PAULISTA)})
+        else:
+            results.append({"cep": cep, "status": "not_found", "data": None})
+    return results
+
+
+class TestBackfillUserAddresses:
+    """Testes para CEPBackfillService.backfill_user_addresses."""
+
+    @pytest.mark.asyncio
+    async def test_fills_only_empty_fields(self, session_factory):
+        with patch(
+            "app.services.cep_backfill_service.CEPService.resolve_many",
+            side_effect=_fake_resolve_many,
+        ):
+            report = await CEPBackfillService.backfill_user_addresses(
+                session_factory, batch_size=2
+            )
+
+        assert report == {
+            "scanned": 4,
+            "updated": 2,
+            "not_found": 1,
+            "invalid": 1,
+            "errors": 0,
+        }
+        with session_factory() as db:
+            u1 = db.get(User, "u01")
+            assert (u1.street, u1.neighborhood, u1.city, u1.state) == (
+                "Avenida Paulista",
+                "Bela Vista",
+                "São Paulo",
+                "SP",
+            )
+            u2 = db.get(User, "u02")
+            assert u2.street == "Rua Informada"
+            assert u2.city == "Outra"
+            assert u2.neighborhood == "Bela Vista"
+            assert db.get(User, "u03").street is None
+
+    @pytest.mark.asyncio
+    async def test_complete_and_cepless_users_are_not_scanned(self, session_factory):
+        resolve = AsyncMock(side_effect=_fake_resolve_many)
+        with patch(
+            "app.services.cep_backfill_service.CEPService.resolve_many", resolve
+        ):
+            await CEPBackfillService.backfill_user_addresses(session_factory)
+
+        (ceps,), _ = resolve.call_args
+        assert sorted(ceps) == ["01310-100", "01310100", "12", "99999-999"]
+
+    def test_updated_count_only_includes_written_rows(self, session_factory):
+        with session_factory() as db:
+            # Perfil completado pelo próprio usuário durante a consulta ao ViaCEP
+            db.get(User, "u03").street = "Rua Preenchida"
+            db.commit()
+
+        updates = [
+            ("u01", {"street": "Avenida Paulista"}),
+            ("u03", {"street": "Avenida Paulista"}),
+            ("removido", {"street": "Avenida Paulista"}),
+        ]
+        assert CEPBackfillService._apply_updates(session_factory, updates) == 1
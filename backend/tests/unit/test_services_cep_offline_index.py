@@ -0,0 +1,141 @@
+"""Testes para o módulo cep_offline_index.py"""
+
+import httpx
+import pytest
+
+from app.services.cep_offline_index import CEPOfflineIndex, build_cep_index
+from app.services.cep_service import CEPService
+
+CSV_ROWS = [
+    "cep;logradouro;complemento;bairro;localidade;uf;ibge;ddd",
+    "20040-020;Rua da Assembleia;;Centro;Rio de Janeiro;RJ;3304557;21",
+    "01310-100;Avenida Paulista;de 612 a 1510 - lado par;Bela Vista;São Paulo;SP;3550308;11",
+    "01001000;Praça da Sé;lado ímpar;Sé;São Paulo;sp;3550308;11",
+    "99999;Inválido;;;Nenhum;XX;;",
+    "30112000;Rua Espírito Santo;;Centro;Belo Horizonte;MG;3106200;31",
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    csv_path = tmp_path / "ceps.csv"
+    csv_path.write_text("\n".join(CSV_ROWS) + "\n", encoding="utf-8")
+    path = tmp_path / "ceps.idx"
+    assert build_cep_index(csv_path, path) == 4
+    return path
+
+
+@pytest.fixture
+def index(index_path):
+    index = CEPOfflineIndex(index_path)
+    yield index
+    index.close()
+
+
+class TestCEPOfflineIndex:
+    """Testes da geração e da busca na base offline."""
+
+    def test_lookup_returns_cep_service_format(self, index):
+        assert index.lookup("01310100") == {
+            "cep": "01310-100",
+            "street": "Avenida Paulista",
+            "complement": "de 612 a 1510 - lado par",
+            "neighborhood": "Bela Vista",
+            "city": "São Paulo",
+            "state": "SP",
+            "ibge_code": "3550308",
+            "ddd": "11",
+        }
+
+    def test_first_and_last_entries(self, index):
+        assert index.lookup("01001000")["street"] == "Praça da Sé"
+        assert index.lookup("30112000")["city"] == "Belo Horizonte"
+
+    def test_state_is_normalized(self, index):
+        assert index.lookup("01001000")["state"] == "SP"
+
+    def test_missing_ceps(self, index):
+        for cep in ("00000000", "01310101", "20040019", "99999999"):
+            assert index.lookup(cep) is None
+
+    def test_invalid_rows_are_skipped(self, index):
+        assert len(index) == 4
+
+    def test_comma_delimited_csv_with_english_headers(self, tmp_path):
+        csv_path = tmp_path / "ceps.csv"
+        csv_path.write_text(
+            "cep,street,neighborhood,city,state\n"
+            "01310100,Avenida Paulista,Bela Vista,São Paulo,SP\n",
+            encoding="utf-8",
+        )
+        build_cep_index(csv_path, tmp_path / "ceps.idx")
+
+        index = CEPOfflineIndex(tmp_path / "ceps.idx")
+        try:
+            address = index.lookup("01310100")
+        finally:
+            index.close()
+        assert address["neighborhood"] == "Bela Vista"
+        assert address["complement"] == ""
+
+    def test_missing_required_columns(self, tmp_path):
+        csv_path = tmp_path / "ceps.csv"
+        csv_path.write_text("cep,logradouro\n01310100,Avenida Paulista\n")
+
+        with pytest.raises(ValueError, match="Colunas obrigatórias"):
+            build_cep_index(csv_path, tmp_path / "ceps.idx")
+
+    def test_rejects_unknown_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not an index file at all, just some bytes")
+
+        with pytest.raises(ValueError, match="inválido"):
+            CEPOfflineIndex(path)
+
+
+class TestCEPServiceOffline:
+    """Integração da base offline com o CEPService."""
+
+    @pytest.fixture(autouse=True)
+    def offline_service(self, index_path, monkeypatch):
+        self.calls = []
+
+        def viacep(request):
+            self.calls.append(request.url.path)
+            return httpx.Response(200, json={"erro": True})
+
+        monkeypatch.setattr(
+            CEPService, "_load_persistent", classmethod(lambda cls, cep: (False, None))
+        )
+        monkeypatch.setattr(
+            CEPService,
+            "_store_persistent",
+            classmethod(lambda cls, cep, address, ttl: None),
+        )
+        CEPService.clear_cache()
+        CEPService.load_offline_dataset(str(index_path))
+        self.transport = httpx.MockTransport(viacep)
+        yield
+        CEPService.close_offline_dataset()
+
+    @pytest.mark.asyncio
+    async def test_hit_does_not_touch_network(self):
+        await CEPService.startup(transport=self.transport)
+        try:
+            address = await CEPService.get_address_by_cep("20040-020")
+        finally:
+            await CEPService._close_client()
+
+        assert address["street"] == "Rua da Assembleia"
+        assert self.calls == []
+
+    @pytest.mark.asyncio
+    async def test_miss_falls_back_to_remote(self):
+        await CEPService.startup(transport=self.transport)
+        try:
+            address = await CEPService.get_address_by_cep("04538-133")
+        finally:
+            await CEPService._close_client()
+
+        assert address is None
+        assert self.calls == ["/ws/04538133/json/"]
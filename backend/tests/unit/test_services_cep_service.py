@@ -0,0 +1,269 @@
+"""Testes para o cache e o cliente compartilhado de cep_service.py"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.models.cep_cache import CepCache
+from app.services.cep_service import CEPService
+
+ADDRESSES = {
+    "01310100": {
+        "cep": "01310-100",
+        "logradouro": "Avenida Paulista",
+        "complemento": "de 612 a 1510 - lado par",
+        "bairro": "Bela Vista",
+        "localidade": "São Paulo",
+        "uf": "SP",
+        "ibge": "3550308",
+        "gia": "1004",
+        "ddd": "11",
+        "siafi": "7107",
+    }
+}
+
+
+class FakeViaCEP:
+    """Substituto local do ViaCEP, servido pelo ASGITransport do httpx."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.status_code = 200
+        self.active = 0
+        self.max_active = 0
+        self.app = FastAPI()
+
+        @self.app.get("/ws/{cep}/json/")
+        async def lookup(cep: str):
+            self.calls.append(cep)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.active -= 1
+            if self.status_code != 200:
+                return JSONResponse({}, status_code=self.status_code)
+            return ADDRESSES.get(cep, {"erro": True})
+
+
+@pytest.fixture
+def viacep(monkeypatch, session_factory):
+    fake = FakeViaCEP(delay=0.05)
+    monkeypatch.setattr(CEPService, "BASE_URL", "http://viacep.local/ws")
+    monkeypatch.setattr(CEPService, "session_factory", session_factory)
+    CEPService.clear_cache()
+    return fake
+
+
+async def _start(fake):
+    await CEPService.startup(transport=httpx.ASGITransport(app=fake.app))
+
+
+class TestCEPCache:
+    """Testes do cache em dois níveis."""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_served_from_memory(self, viacep):
+        await _start(viacep)
+        try:
+            first = await CEPService.get_address_by_cep("01310-100")
+            second = await CEPService.get_address_by_cep("01310100")
+        finally:
+            await CEPService.shutdown()
+
+        assert first == second
+        assert first["street"] == "Avenida Paulista"
+        assert viacep.calls == ["01310100"]
+
+    @pytest.mark.asyncio
+    async def test_persistent_cache_survives_memory_eviction(
+        self, viacep, session_factory
+    ):
+        await _start(viacep)
+        try:
+            await CEPService.get_address_by_cep("01310100")
+            CEPService.clear_cache()
+            result = await CEPService.get_address_by_cep("01310100")
+        finally:
+            await CEPService.shutdown()
+
+        assert result["city"] == "São Paulo"
+        assert viacep.calls == ["01310100"]
+        with session_factory() as db:
+            row = db.get(CepCache, "01310100")
+            assert row.data["state"] == "SP"
+            assert row.expires_at > datetime.utcnow() + timedelta(days=29)
+
+    @pytest.mark.asyncio
+    async def test_not_found_is_negatively_cached(self, viacep, session_factory):
+        await _start(viacep)
+        try:
+            assert await CEPService.get_address_by_cep("99999999") is None
+            CEPService.clear_cache()
+            assert await CEPService.get_address_by_cep("99999999") is None
+        finally:
+            await CEPService.shutdown()
+
+        assert viacep.calls == ["99999999"]
+        with session_factory() as db:
+            row = db.get(CepCache, "99999999")
+            assert row.data is None
+            assert row.expires_at < datetime.utcnow() + timedelta(days=2)
+            # Cache negativo é NULL do SQL, não o JSON 'null'
+            assert db.execute(
+                text("SELECT data IS NULL FROM cep_cache WHERE cep = '99999999'")
+            ).scalar() == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refreshed(self, viacep, session_factory):
+        with session_factory() as db:
+            db.add(
+                CepCache(
+                    cep="01310100",
+                    data={"street": "antigo"},
+                    fetched_at=datetime.utcnow() - timedelta(days=60),
+                    expires_at=datetime.utcnow() - timedelta(days=30),
+                )
+            )
+            db.commit()
+
+        await _start(viacep)
+        try:
+            result = await CEPService.get_address_by_cep("01310100")
+        finally:
+            await CEPService.shutdown()
+
+        assert result["street"] == "Avenida Paulista"
+        assert viacep.calls == ["01310100"]
+
+    @pytest.mark.asyncio
+    async def test_upstream_errors_are_not_cached(self, viacep):
+        viacep.status_code = 503
+        await _start(viacep)
+        try:
+            with pytest.raises(Exception, match="Serviço indisponível"):
+                await CEPService.get_address_by_cep("01310100")
+            viacep.status_code = 200
+            result = await CEPService.get_address_by_cep("01310100")
+        finally:
+            await CEPService.shutdown()
+
+        assert result["street"] == "Avenida Paulista"
+        assert len(viacep.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_cep_does_not_call_upstream(self, viacep):
+        await _start(viacep)
+        try:
+            assert await CEPService.get_address_by_cep("123") is None
+        finally:
+            await CEPService.shutdown()
+
+        assert viacep.calls == []
+
+
+class TestSingleFlight:
+    """Testes da deduplicação de consultas simultâneas."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_upstream_call(self, viacep):
+        await _start(viacep)
+        try:
+            results = await asyncio.gather(
+                *(CEPService.get_address_by_cep("01310-100") for _ in range(20))
+            )
+        finally:
+            await CEPService.shutdown()
+
+        assert viacep.calls == ["01310100"]
+        assert all(r == results[0] for r in results)
+        # Cada chamador recebe sua própria cópia
+        results[0]["street"] = "alterado"
+        assert results[1]["street"] == "Avenida Paulista"
+
+    @pytest.mark.asyncio
+    async def test_distinct_ceps_are_not_merged(self, viacep):
+        await _start(viacep)
+        try:
+            await asyncio.gather(
+                CEPService.get_address_by_cep("01310100"),
+                CEPService.get_address_by_cep("99999999"),
+            )
+        finally:
+            await CEPService.shutdown()
+
+        assert sorted(viacep.calls) == ["01310100", "99999999"]
+
+
+class TestResolveMany:
+    """Testes da consulta em lote."""
+
+    @pytest.mark.asyncio
+    async def test_per_item_status_in_input_order(self, viacep):
+        await _start(viacep)
+        try:
+            results = await CEPService.resolve_many(
+                ["01310-100", "123", "99999999", "01310100"]
+            )
+        finally:
+            await CEPService.shutdown()
+
+        assert [r["cep"] for r in results] == [
+            "01310-100",
+            "123",
+            "99999999",
+            "01310100",
+        ]
+        assert [r["status"] for r in results] == [
+            "found",
+            "invalid",
+            "not_found",
+            "found",
+        ]
+        assert results[0]["data"]["street"] == "Avenida Paulista"
+        # Duplicados (com e sem formatação) geram uma única consulta
+        assert sorted(viacep.calls) == ["01310100", "99999999"]
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_upstream(self, viacep):
+        await _start(viacep)
+        try:
+            await CEPService.get_address_by_cep("01310100")
+            results = await CEPService.resolve_many(["01310100"])
+        finally:
+            await CEPService.shutdown()
+
+        assert results[0]["status"] == "found"
+        assert viacep.calls == ["01310100"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, viacep):
+        ceps = [f"{n:08d}" for n in range(10_000_000, 10_000_030)]
+        await _start(viacep)
+        try:
+            results = await CEPService.resolve_many(ceps, concurrency=4)
+        finally:
+            await CEPService.shutdown()
+
+        assert len(viacep.calls) == 30
+        assert 1 < viacep.max_active <= 4
+        assert {r["status"] for r in results} == {"not_found"}
+
+    @pytest.mark.asyncio
+    async def test_upstream_error_is_reported_per_item(self, viacep):
+        viacep.status_code = 503
+        await _start(viacep)
+        try:
+            results = await CEPService.resolve_many(["01310100", "123"])
+        finally:
+            await CEPService.shutdown()
+
+        assert results[0]["status"] == "error"
+        assert "indisponível" in results[0]["detail"]
+        assert results[1]["status"] == "invalid"
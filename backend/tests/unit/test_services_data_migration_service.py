@@ -0,0 +1,137 @@
+"""Testes para o módulo data_migration_service.py"""
+
+import pytest
+from sqlalchemy import MetaData, create_engine, event, insert
+from sqlalchemy.pool import StaticPool
+
+import app.main as main_mod
+from app.core.config import settings
+from app.core.database import Base
+from app.models.data_migration import DataMigration
+from app.models.user import User
+from app.services.data_migration_service import DataMigrationService
+
+VERSION = "20261019_01_backfill_user_roles"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(
+        engine, tables=[t for t in Base.metadata.sorted_tables if t.name != "users"]
+    )
+    # role é NOT NULL no modelo; a cópia permite simular registros legados
+    users = User.__table__.to_metadata(MetaData())
+    users.c.role.nullable = True
+    users.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def _add_users(session_factory, count, role):
+    prefix = role.lower() if role else "legado"
+    with session_factory() as db:
+        db.execute(
+            insert(User.__table__),
+            [
+                {
+                    "id": f"{prefix}-{i}",
+                    "email": f"{prefix}{i}@example.com",
+                    "username": f"{prefix}{i}",
+                    "name": f"User {i}",
+                    "role": role,
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        )
+        db.commit()
+
+
+def _record_statements(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+class TestDataMigrationService:
+    """Testes do registro e da execução das migrações de dados."""
+
+    def test_backfill_runs_once_with_single_update(self, engine, session_factory):
+        _add_users(session_factory, 3, None)
+        _add_users(session_factory, 2, "ADMIN")
+
+        statements = _record_statements(engine)
+        with session_factory() as db:
+            result = DataMigrationService.run_pending(db)
+
+        assert result[VERSION] == 3
+        updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+        assert len(updates) == 1
+        with session_factory() as db:
+            assert db.query(User).filter(User.role.is_(None)).count() == 0
+            assert db.get(DataMigration, VERSION) is not None
+
+    def test_second_run_only_reads_applied_versions(self, engine, session_factory):
+        with session_factory() as db:
+            DataMigrationService.run_pending(db)
+        _add_users(session_factory, 2, None)
+
+        statements = _record_statements(engine)
+        with session_factory() as db:
+            assert DataMigrationService.run_pending(db) == {}
+
+        assert len(statements) == 1
+        assert "data_migrations" in statements[0]
+
+    def test_version_registered_by_another_process_is_skipped(
+        self, session_factory, monkeypatch
+    ):
+        calls = []
+
+        def migration(db):
+            calls.append(1)
+            return 0
+
+        monkeypatch.setattr(
+            DataMigrationService, "MIGRATIONS", [("20990101_01_teste", migration)]
+        )
+        monkeypatch.setattr(DataMigrationService, "applied_versions", lambda db: set())
+        with session_factory() as db:
+            db.add(DataMigration(version="20990101_01_teste"))
+            db.commit()
+
+        with session_factory() as db:
+            assert DataMigrationService.run_pending(db) == {}
+        assert calls == []
+
+    def test_failed_migration_is_not_registered(self, session_factory, monkeypatch):
+        def migration(db):
+            raise RuntimeError("falha")
+
+        monkeypatch.setattr(
+            DataMigrationService, "MIGRATIONS", [("20990101_01_teste", migration)]
+        )
+        with session_factory() as db:
+            with pytest.raises(RuntimeError):
+                DataMigrationService.run_pending(db)
+        with session_factory() as db:
+            assert db.get(DataMigration, "20990101_01_teste") is None
+
+    def test_startup_hook(self, session_factory, monkeypatch):
+        _add_users(session_factory, 2, None)
+        monkeypatch.setattr(main_mod, "SessionLocal", session_factory)
+        monkeypatch.setattr(settings, "MASTER_EMAIL", None)
+
+        main_mod.run_data_migrations()
+
+        with session_factory() as db:
+            assert db.query(User).filter(User.role.is_(None)).count() == 0
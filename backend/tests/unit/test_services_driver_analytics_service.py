@@ -0,0 +1,129 @@
+"""Testes para o módulo driver_analytics_service.py"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models.entry import Entry, EntryType
+from app.services.driver_analytics_service import DriverAnalyticsService
+
+
+@pytest.fixture
+def db(db):
+    DriverAnalyticsService.invalidate()
+    yield db
+    DriverAnalyticsService.invalidate()
+
+
+def _ride(db, when, net, km=10.0, minutes=30, platform="UBER", shift="MANHA", **extra):
+    values = dict(
+        amount=net,
+        description="Corrida",
+        date=when,
+        type=EntryType.INCOME,
+        category="Corrida",
+        user_id="u1",
+        gross_amount=net * 1.25,
+        platform_fee=net * 0.25,
+        net_amount=net,
+        distance_km=km,
+        duration_min=minutes,
+        platform=platform,
+        shift_tag=shift,
+        city="São Paulo",
+    )
+    values.update(extra)
+    db.add(Entry(**values))
+    db.commit()
+
+
+class TestHeatmap:
+    """Testes do heatmap dia da semana × hora."""
+
+    def test_rides_land_in_weekday_hour_cells(self, db):
+        # 2026-10-19 é uma segunda-feira
+        _ride(db, datetime(2026, 10, 19, 8, 15), 30.0, km=10, minutes=60)
+        _ride(db, datetime(2026, 10, 19, 8, 45), 10.0, km=5, minutes=30)
+        _ride(db, datetime(2026, 10, 25, 23, 5), 50.0, km=20, minutes=60)
+
+        result = DriverAnalyticsService.heatmap(db, "u1")
+
+        assert result["total_rides"] == 3
+        assert result["rides"][0][8] == 2
+        assert result["net"][0][8] == 40.0
+        assert result["earn_per_hour"][0][8] == pytest.approx(26.67)
+        assert result["earn_per_km"][0][8] == pytest.approx(2.67)
+        assert result["rides"][6][23] == 1
+        assert result["weekdays"][6] == "Dom"
+        assert result["earn_per_hour"][3][12] == 0
+
+    def test_filters_and_excluded_entries(self, db):
+        _ride(db, datetime(2026, 10, 19, 8), 30.0, platform="UBER")
+        _ride(db, datetime(2026, 10, 20, 9), 20.0, platform="99")
+        _ride(db, datetime(2026, 9, 1, 9), 20.0, platform="99")
+        _ride(db, datetime(2026, 10, 20, 9), 99.0, is_deleted=True)
+        _ride(db, datetime(2026, 10, 20, 9), 99.0, type=EntryType.EXPENSE)
+
+        assert DriverAnalyticsService.heatmap(db, "u1")["total_rides"] == 3
+        assert DriverAnalyticsService.heatmap(db, "u1", platform="99")["total_rides"] == 2
+        assert DriverAnalyticsService.heatmap(db, "u1", platform="X")["total_rides"] == 0
+        result = DriverAnalyticsService.heatmap(
+            db, "u1", start_date=date(2026, 10, 1), end_date=date(2026, 10, 19)
+        )
+        assert result["total_rides"] == 1
+
+    def test_user_without_rides(self, db):
+        result = DriverAnalyticsService.heatmap(db, "u1")
+
+        assert result["total_rides"] == 0
+        assert len(result["net"]) == 7 and len(result["net"][0]) == 24
+        assert DriverAnalyticsService.platforms(db, "u1")["platforms"] == []
+
+
+class TestPlatforms:
+    """Testes da comparação por plataforma e turno."""
+
+    def test_breakdowns_sorted_by_net(self, db):
+        _ride(db, datetime(2026, 10, 19, 8), 30.0, km=10, minutes=60, platform="UBER")
+        _ride(db, datetime(2026, 10, 19, 20), 60.0, km=20, minutes=60, platform="99", shift="NOITE")
+        _ride(db, datetime(2026, 10, 19, 21), 10.0, km=5, minutes=30, platform=None, shift=None)
+
+        result = DriverAnalyticsService.platforms(db, "u1")
+
+        assert [p["platform"] for p in result["platforms"]] == ["99", "UBER", None]
+        top = result["platforms"][0]
+        assert top["rides"] == 1
+        assert top["earn_per_hour"] == 60.0
+        assert top["earn_per_km"] == 3.0
+        assert top["fee_pct"] == 20.0
+        assert [s["shift_tag"] for s in result["shifts"]] == ["NOITE", "MANHA", None]
+        assert result["cities"][0]["rides"] == 3
+
+
+class TestColumnCache:
+    """Testes do cache de colunas por usuário."""
+
+    def test_columns_loaded_once_until_invalidated(self, db, engine):
+        _ride(db, datetime(2026, 10, 19, 8), 30.0)
+        statements = []
+        event.listen(
+            engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+
+        DriverAnalyticsService.heatmap(db, "u1")
+        DriverAnalyticsService.platforms(db, "u1")
+        assert len(statements) == 1
+
+        _ride(db, datetime(2026, 10, 19, 9), 30.0)
+        assert DriverAnalyticsService.heatmap(db, "u1")["total_rides"] == 1
+        DriverAnalyticsService.invalidate("u1")
+        assert DriverAnalyticsService.heatmap(db, "u1")["total_rides"] == 2
+
+    def test_least_recently_used_users_are_evicted(self, db, monkeypatch):
+        monkeypatch.setattr(DriverAnalyticsService, "MAX_CACHED_USERS", 2)
+        for user_id in ("a", "b", "u1"):
+            DriverAnalyticsService.get_columns(db, user_id)
+
+        cached = DriverAnalyticsService._columns[db.get_bind()]
+        assert list(cached) == ["b", "u1"]
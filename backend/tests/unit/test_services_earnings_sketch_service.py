@@ -0,0 +1,148 @@
+"""Testes para o módulo earnings_sketch_service.py"""
+
+import math
+import random
+from datetime import datetime
+
+import pytest
+
+from app.models.earnings_sketch import EarningsSketch
+from app.models.entry import Entry, EntryType
+from app.services.earnings_sketch_service import EarningsSketchService
+
+
+def _ride(when, net, km=10.0, minutes=30, **extra):
+    values = dict(
+        amount=net,
+        description="Corrida",
+        date=when,
+        type=EntryType.INCOME,
+        category="Corrida",
+        user_id="u1",
+        net_amount=net,
+        distance_km=km,
+        duration_min=minutes,
+    )
+    values.update(extra)
+    return Entry(**values)
+
+
+def _sketch_rows(db):
+    return {
+        row.month: (row.rides, row.sketches)
+        for row in db.query(EarningsSketch).filter(EarningsSketch.user_id == "u1")
+    }
+
+
+class TestIncrementalMaintenance:
+    """Sketches atualizados na mesma transação das escritas de lançamento."""
+
+    def test_insert_updates_month_sketch(self, db):
+        db.add_all([_ride(datetime(2026, 9, 3, 8), 20.0), _ride(datetime(2026, 10, 1, 9), 30.0)])
+        db.add(_ride(datetime(2026, 10, 2, 9), 99.0, type=EntryType.EXPENSE))
+        db.commit()
+
+        rows = _sketch_rows(db)
+        assert {month: rides for month, (rides, _) in rows.items()} == {"2026-09": 1, "2026-10": 1}
+
+    def test_update_replaces_previous_contribution(self, db):
+        entry = _ride(datetime(2026, 10, 1, 9), 30.0)
+        db.add(entry)
+        db.commit()
+
+        entry.net_amount = 45.0
+        entry.date = datetime(2026, 11, 5, 9)
+        db.commit()
+
+        rows = _sketch_rows(db)
+        assert list(rows) == ["2026-11"]
+        result = EarningsSketchService.percentiles(db, "u1", quantiles=[0.5])
+        assert result["metrics"]["per_ride"]["p50"] == pytest.approx(45.0, rel=0.01)
+
+    def test_soft_and_hard_delete_remove_contribution(self, db):
+        kept = _ride(datetime(2026, 10, 1, 9), 30.0)
+        soft = _ride(datetime(2026, 10, 2, 9), 40.0)
+        hard = _ride(datetime(2026, 10, 3, 9), 50.0)
+        db.add_all([kept, soft, hard])
+        db.commit()
+
+        soft.is_deleted = True
+        db.delete(hard)
+        db.commit()
+        assert _sketch_rows(db)["2026-10"][0] == 1
+
+        kept.is_deleted = True
+        db.commit()
+        assert _sketch_rows(db) == {}
+
+    def test_rollback_discards_sketch_changes(self, db):
+        db.add(_ride(datetime(2026, 10, 1, 9), 30.0))
+        db.flush()
+        db.rollback()
+
+        assert _sketch_rows(db) == {}
+
+    def test_rebuild_matches_incremental_state(self, db):
+        rng = random.Random(5)
+        entries = [
+            _ride(
+                datetime(2026, rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23)),
+                round(rng.uniform(-5, 80), 2),
+                km=rng.choice([0, rng.uniform(1, 30)]),
+                minutes=rng.choice([None, rng.randint(5, 90)]),
+            )
+            for _ in range(300)
+        ]
+        db.add_all(entries)
+        db.commit()
+        for entry in entries[:40]:
+            entry.net_amount = entry.net_amount + 3
+        for entry in entries[40:60]:
+            entry.is_deleted = True
+        db.commit()
+        incremental = _sketch_rows(db)
+
+        assert EarningsSketchService.rebuild(db) == len(incremental)
+        db.commit()
+
+        assert _sketch_rows(db) == incremental
+
+
+class TestPercentiles:
+    """Consulta de percentis sobre intervalos de meses."""
+
+    def test_percentiles_within_documented_bound(self, db):
+        rng = random.Random(9)
+        rides = [
+            (datetime(2026, month, rng.randint(1, 28), 12), rng.lognormvariate(3, 0.6), rng.uniform(2, 25), rng.randint(5, 80))
+            for month in range(1, 13)
+            for _ in range(150)
+        ]
+        db.add_all([_ride(when, net, km, minutes) for when, net, km, minutes in rides])
+        db.commit()
+
+        result = EarningsSketchService.percentiles(
+            db, "u1", "2026-03", "2026-08", quantiles=[0.5, 0.9, 0.99]
+        )
+
+        selected = [r for r in rides if 3 <= r[0].month <= 8]
+        exact = {
+            "per_ride": sorted(net for _, net, _, _ in selected),
+            "per_km": sorted(net / km for _, net, km, _ in selected),
+            "per_hour": sorted(net / (minutes / 60) for _, net, _, minutes in selected),
+        }
+        assert result["months"] == 6
+        for metric, values in exact.items():
+            assert result["metrics"][metric]["count"] == len(values)
+            for q, label in ((0.5, "p50"), (0.9, "p90"), (0.99, "p99")):
+                expected = values[math.floor(q * (len(values) - 1))]
+                # Tolerância: erro do sketch + arredondamento para centavos
+                assert result["metrics"][metric][label] == pytest.approx(
+                    expected, rel=result["relative_accuracy"], abs=0.01
+                )
+
+    def test_no_rides(self, db):
+        result = EarningsSketchService.percentiles(db, "u1")
+
+        assert result["months"] == 0
+        assert result["metrics"]["per_hour"] == {"count": 0, "p50": None, "p90": None}
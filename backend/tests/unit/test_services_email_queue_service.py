@@ -0,0 +1,306 @@
+"""Testes para o módulo email_queue_service.py"""
+
+import asyncio
+import smtplib
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.outbound_email import OutboundEmail
+from app.services.email_queue_service import (
+    EmailQueueService,
+    SMTPConnectionPool,
+    email_sender_loop,
+)
+from app.services.email_service import email_service
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+
+
+class FakeSMTPServer:
+    """Servidor SMTP local (aiosmtpd) que registra conexões, logins e mensagens."""
+
+    def __init__(self):
+        self.messages = []
+        self.logins = 0
+        self.connections = 0
+        self.reject_rcpt = set()
+        self.fail_data = set()
+
+    def authenticator(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        return AuthResult(success=auth_data.login == b"user")
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.reject_rcpt:
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if set(envelope.rcpt_tos) & self.fail_data:
+            return "451 Try again later"
+        self.messages.append((envelope.rcpt_tos[0], envelope.content))
+        return "250 Message accepted"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    fake = FakeSMTPServer()
+    fake.port = _free_port()
+    controller = aiosmtpd_controller.Controller(
+        fake,
+        hostname="127.0.0.1",
+        port=fake.port,
+        authenticator=fake.authenticator,
+        auth_require_tls=False,
+    )
+    controller.start()
+    yield fake
+    controller.stop()
+
+
+@pytest.fixture
+def pool(smtp_server):
+    pool = SMTPConnectionPool(
+        "127.0.0.1",
+        smtp_server.port,
+        username="user",
+        password="secret",
+        starttls=False,
+        size=2,
+    )
+    yield pool
+    pool.close()
+
+
+def _enqueue(session_factory, *recipients):
+    with session_factory() as db:
+        for to_email in recipients:
+            EmailQueueService.enqueue(db, to_email, "Assunto", f"Olá {to_email}")
+        db.commit()
+
+
+def _messages(session_factory):
+    with session_factory() as db:
+        return {m.to_email: m for m in db.query(OutboundEmail).all()}
+
+
+class TestSMTPConnectionPool:
+    """Testes do reaproveitamento de conexões autenticadas."""
+
+    def test_connection_is_reused_across_messages(self, pool, smtp_server):
+        for i in range(5):
+            pool.send(email_service.build_message(f"u{i}@test.com", "Oi", "corpo"))
+
+        assert len(smtp_server.messages) == 5
+        assert pool.connections_opened == 1
+        assert smtp_server.logins == 1
+
+    def test_rejected_recipient_keeps_connection(self, pool, smtp_server):
+        smtp_server.reject_rcpt.add("bad@test.com")
+
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            pool.send(email_service.build_message("bad@test.com", "Oi", "corpo"))
+        pool.send(email_service.build_message("ok@test.com", "Oi", "corpo"))
+
+        assert pool.connections_opened == 1
+        assert [to for to, _ in smtp_server.messages] == ["ok@test.com"]
+
+    def test_dropped_idle_connection_is_replaced(self, pool, smtp_server):
+        pool.send(email_service.build_message("a@test.com", "Oi", "corpo"))
+        # Servidor encerra a conexão ociosa sem avisar
+        pool._idle[0][0].sock.shutdown(socket.SHUT_RDWR)
+
+        pool.send(email_service.build_message("b@test.com", "Oi", "corpo"))
+
+        assert pool.connections_opened == 2
+        assert len(smtp_server.messages) == 2
+
+
+class TestEmailQueue:
+    """Testes da fila persistente."""
+
+    def test_enqueue_is_part_of_callers_transaction(self, session_factory):
+        with session_factory() as db:
+            EmailQueueService.enqueue(db, "a@test.com", "Assunto", "corpo")
+            db.rollback()
+
+        assert _messages(session_factory) == {}
+
+    def test_batch_is_sent_and_body_discarded(self, session_factory, pool, smtp_server):
+        _enqueue(session_factory, "a@test.com", "b@test.com", "c@test.com")
+
+        report = EmailQueueService.process_batch(pool, session_factory, batch_size=10)
+
+        assert report == {"claimed": 3, "sent": 3, "retried": 0, "dead": 0, "expired": 0}
+        assert sorted(to for to, _ in smtp_server.messages) == [
+            "a@test.com",
+            "b@test.com",
+            "c@test.com",
+        ]
+        assert smtp_server.logins <= pool.size
+        for message in _messages(session_factory).values():
+            assert message.status == EmailQueueService.SENT
+            assert message.body is None
+            assert message.sent_at is not None
+            assert message.locked_by is None
+
+    def test_transient_failure_is_retried_with_backoff(
+        self, session_factory, pool, smtp_server
+    ):
+        smtp_server.fail_data.add("slow@test.com")
+        _enqueue(session_factory, "slow@test.com")
+
+        report = EmailQueueService.process_batch(pool, session_factory)
+
+        assert report["retried"] == 1
+        message = _messages(session_factory)["slow@test.com"]
+        assert message.status == EmailQueueService.PENDING
+        assert message.attempts == 1
+        assert "451" in message.last_error
+        assert message.next_attempt_at > datetime.utcnow()
+        # Ainda não venceu: o próximo lote não a reserva
+        assert EmailQueueService.process_batch(pool, session_factory)["claimed"] == 0
+
+    def test_permanent_failure_goes_to_dead_letter(
+        self, session_factory, pool, smtp_server
+    ):
+        smtp_server.reject_rcpt.add("gone@test.com")
+        _enqueue(session_factory, "gone@test.com", "ok@test.com")
+
+        report = EmailQueueService.process_batch(pool, session_factory)
+
+        assert report == {"claimed": 2, "sent": 1, "retried": 0, "dead": 1, "expired": 0}
+        message = _messages(session_factory)["gone@test.com"]
+        assert message.status == EmailQueueService.DEAD
+        assert message.body is None
+        assert "550" in message.last_error
+
+    def test_exhausted_attempts_go_to_dead_letter(
+        self, session_factory, pool, smtp_server
+    ):
+        smtp_server.fail_data.add("slow@test.com")
+        _enqueue(session_factory, "slow@test.com")
+        with session_factory() as db:
+            db.query(OutboundEmail).update({"attempts": 2})
+            db.commit()
+
+        report = EmailQueueService.process_batch(pool, session_factory, max_attempts=3)
+
+        assert report["dead"] == 1
+        assert _messages(session_factory)["slow@test.com"].attempts == 3
+
+    def test_stale_reservation_is_reclaimed(self, session_factory, pool, smtp_server):
+        _enqueue(session_factory, "a@test.com", "b@test.com")
+        with session_factory() as db:
+            db.query(OutboundEmail).filter(OutboundEmail.to_email == "a@test.com").update(
+                {
+                    "status": EmailQueueService.SENDING,
+                    "locked_by": "worker-morto",
+                    "locked_at": datetime.utcnow() - timedelta(hours=1),
+                }
+            )
+            db.query(OutboundEmail).filter(OutboundEmail.to_email == "b@test.com").update(
+                {
+                    "status": EmailQueueService.SENDING,
+                    "locked_by": "outro-worker",
+                    "locked_at": datetime.utcnow(),
+                }
+            )
+            db.commit()
+
+        report = EmailQueueService.process_batch(pool, session_factory)
+
+        assert report["sent"] == 1
+        messages = _messages(session_factory)
+        assert messages["a@test.com"].status == EmailQueueService.SENT
+        assert messages["b@test.com"].status == EmailQueueService.SENDING
+
+    def test_overdue_messages_expire_without_sending(
+        self, session_factory, pool, smtp_server
+    ):
+        _enqueue(session_factory, "old@test.com", "stale@test.com", "busy@test.com", "new@test.com")
+        overdue = datetime.utcnow() - timedelta(minutes=1)
+        with session_factory() as db:
+            db.query(OutboundEmail).filter(OutboundEmail.to_email != "new@test.com").update(
+                {"expires_at": overdue}
+            )
+            db.query(OutboundEmail).filter(OutboundEmail.to_email == "stale@test.com").update(
+                {
+                    "status": EmailQueueService.SENDING,
+                    "locked_by": "worker-morto",
+                    "locked_at": datetime.utcnow() - timedelta(hours=1),
+                }
+            )
+            db.query(OutboundEmail).filter(OutboundEmail.to_email == "busy@test.com").update(
+                {
+                    "status": EmailQueueService.SENDING,
+                    "locked_by": "outro-worker",
+                    "locked_at": datetime.utcnow(),
+                }
+            )
+            db.commit()
+
+        report = EmailQueueService.process_batch(pool, session_factory)
+
+        assert report == {"claimed": 1, "sent": 1, "retried": 0, "dead": 0, "expired": 2}
+        assert [to for to, _ in smtp_server.messages] == ["new@test.com"]
+        messages = _messages(session_factory)
+        for to_email in ("old@test.com", "stale@test.com"):
+            assert messages[to_email].status == EmailQueueService.DEAD
+            assert messages[to_email].body is None
+            assert messages[to_email].last_error == EmailQueueService.EXPIRED_ERROR
+            assert messages[to_email].locked_by is None
+        # Reserva em andamento: o worker que a detém decide o resultado
+        assert messages["busy@test.com"].status == EmailQueueService.SENDING
+
+    def test_queue_helpers_build_the_expected_messages(self, session_factory):
+        with session_factory() as db:
+            email_service.queue_temporary_password_email(
+                db, to_email="a@test.com", user_name="Ana", temp_password="Xy12!"
+            )
+            db.commit()
+
+        message = _messages(session_factory)["a@test.com"]
+        assert "Senha Temporária" in message.subject
+        assert "Xy12!" in message.body
+        assert message.expires_at > datetime.utcnow() + timedelta(hours=23)
+
+
+class TestEmailSenderLoop:
+    """Testes do laço de envio em segundo plano."""
+
+    @pytest.mark.asyncio
+    async def test_commit_wakes_the_loop(self, session_factory, pool, smtp_server):
+        task = asyncio.create_task(
+            email_sender_loop(60, pool=pool, session_factory=session_factory)
+        )
+        try:
+            await asyncio.sleep(0.1)
+            _enqueue(session_factory, "a@test.com")
+            for _ in range(50):
+                if smtp_server.messages:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        # Entregue muito antes do intervalo de polling de 60s
+        assert [to for to, _ in smtp_server.messages] == ["a@test.com"]
+        assert EmailQueueService._wakeup is None
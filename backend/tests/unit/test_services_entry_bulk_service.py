@@ -0,0 +1,143 @@
+"""Testes para o módulo entry_bulk_service.py"""
+
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event
+
+from app.models.earnings_sketch import EarningsSketch
+from app.models.entry import Entry, EntryType
+from app.models.user import User
+from app.schemas.entry_schema import EntryBulkDelete, EntryBulkUpdate
+from app.services.earnings_sketch_service import EarningsSketchService
+from app.services.entry_bulk_service import EntryBulkService
+
+
+@pytest.fixture
+def db(db):
+    db.add(User(id="u2", email="u2@test.com", username="u2", name="U2", role="USER"))
+    # 7 corridas e 3 despesas do u1, uma corrida já excluída e uma do u2
+    for i in range(7):
+        db.add(_entry(f"ride-{i}", EntryType.INCOME, "Corrida", 10.0 + i, month=9 + i % 2))
+    for i in range(3):
+        db.add(_entry(f"fuel-{i}", EntryType.EXPENSE, "Combustível", 80.0))
+    db.add(_entry("ride-deleted", EntryType.INCOME, "Corrida", 50.0, is_deleted=True))
+    db.add(_entry("ride-other", EntryType.INCOME, "Corrida", 50.0, user_id="u2"))
+    db.commit()
+    return db
+
+
+def _entry(entry_id, entry_type, category, amount, month=10, user_id="u1", **extra):
+    return Entry(
+        id=entry_id, amount=amount, net_amount=amount, description=category,
+        date=datetime(2026, month, 5, 9), type=entry_type, category=category,
+        user_id=user_id, distance_km=8.0, duration_min=20, **extra,
+    )
+
+
+def _active_ids(db, user_id="u1"):
+    return {
+        entry.id
+        for entry in db.query(Entry).filter(Entry.user_id == user_id, Entry.is_deleted.is_(False))
+    }
+
+
+def _sketch_rows(db):
+    return {
+        (row.user_id, row.month): (row.rides, row.sketches) for row in db.query(EarningsSketch)
+    }
+
+
+class TestBulkSoftDelete:
+    """Exclusão em massa por ids ou filtros."""
+
+    def test_by_ids_in_batches(self, db):
+        ids = ["ride-0", "ride-1", "ride-1", "fuel-0", "ride-deleted", "ride-other", "missing"]
+        report = EntryBulkService.soft_delete(db, "u1", ids=ids, batch_size=2)
+        db.commit()
+
+        assert report == {"affected_count": 3, "batches": 2}
+        assert _active_ids(db) == {f"ride-{i}" for i in range(2, 7)} | {"fuel-1", "fuel-2"}
+        assert _active_ids(db, "u2") == {"ride-other"}
+        # updated_at marca a exclusão (base da carência da limpeza definitiva)
+        assert db.get(Entry, "ride-0").updated_at is not None
+
+    def test_by_criteria_keeps_sketches_in_sync(self, db):
+        report = EntryBulkService.soft_delete(
+            db, "u1", criteria=[Entry.type == EntryType.INCOME], batch_size=3
+        )
+        db.commit()
+
+        assert report == {"affected_count": 7, "batches": 3}
+        assert _active_ids(db) == {"fuel-0", "fuel-1", "fuel-2"}
+        incremental = _sketch_rows(db)
+        assert all(rides == 0 for user, (rides, _) in incremental.items() if user[0] == "u1")
+
+        EarningsSketchService.rebuild(db)
+        db.commit()
+        assert {key: value for key, value in _sketch_rows(db).items() if value[0]} == {
+            key: value for key, value in incremental.items() if value[0]
+        }
+
+    def test_emulated_without_returning(self, db, monkeypatch):
+        monkeypatch.setattr(db.get_bind().dialect, "update_returning", False)
+
+        report = EntryBulkService.soft_delete(db, "u1", criteria=[Entry.category == "Combustível"])
+
+        assert report == {"affected_count": 3, "batches": 1}
+        assert "fuel-0" not in _active_ids(db)
+
+
+class TestBulkUpdate:
+    """Edição em massa dos campos de classificação."""
+
+    def test_one_statement_per_batch(self, db, engine):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        report = EntryBulkService.update(
+            db, "u1", {"shift_tag": "NOITE"}, criteria=[Entry.category == "Corrida"], batch_size=3
+        )
+        db.commit()
+
+        # As linhas editadas continuam casando com o filtro: o keyset não as repete
+        assert report == {"affected_count": 7, "batches": 3}
+        assert len([sql for sql in statements if sql.startswith("UPDATE entries")]) == 3
+        assert {e.shift_tag for e in db.query(Entry).filter(Entry.category == "Corrida")} == {
+            "NOITE", None
+        }
+        assert db.get(Entry, "ride-deleted").shift_tag is None
+
+    def test_by_ids(self, db):
+        report = EntryBulkService.update(db, "u1", {"city": "Recife"}, ids=["fuel-0", "ride-other"])
+        assert report == {"affected_count": 1, "batches": 1}
+
+    def test_rejects_tracked_fields(self, db):
+        with pytest.raises(ValueError):
+            EntryBulkService.update(db, "u1", {"amount": 1.0}, ids=["fuel-0"])
+        with pytest.raises(ValueError):
+            EntryBulkService.update(db, "u1", {"city": "Recife"})
+
+
+class TestBulkSchemas:
+    """Validação das requisições em massa."""
+
+    def test_ids_or_filters(self):
+        assert EntryBulkDelete(ids=["a"]).ids == ["a"]
+        assert EntryBulkDelete(filters={"category": "Corrida"}).filters.category == "Corrida"
+        for payload in ({}, {"ids": ["a"], "filters": {"city": "Recife"}}, {"filters": {}}, {"ids": []}):
+            with pytest.raises(ValidationError):
+                EntryBulkDelete(**payload)
+
+    def test_changes(self):
+        with pytest.raises(ValidationError):
+            EntryBulkUpdate(ids=["a"], changes={})
+        with pytest.raises(ValidationError):
+            EntryBulkUpdate(ids=["a"], changes={"category": "Alimentação"})
+        with pytest.raises(ValidationError):
+            EntryBulkUpdate(ids=["a"], changes={"shift_tag": "SEMPRE"})
+        update = EntryBulkUpdate(ids=["a"], changes={"category": "Alimentação", "subcategory": None})
+        assert update.changes.model_dump(exclude_unset=True) == {
+            "category": "Alimentação", "subcategory": None
+        }
@@ -0,0 +1,104 @@
+"""Testes para o módulo entry_retention_service.py"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.models.entry import Entry, EntryType
+from app.services.entry_retention_service import EntryRetentionService
+
+NOW = datetime.utcnow().replace(microsecond=0)
+CUTOFF = NOW - timedelta(days=30)
+
+
+@pytest.fixture
+def db(db):
+    # 12 excluídos há 60 dias, 3 excluídos ontem e 5 ativos antigos
+    for i in range(12):
+        db.add(_entry(f"old-{i:03d}", True, NOW - timedelta(days=60)))
+    for i in range(3):
+        db.add(_entry(f"recent-{i:03d}", True, NOW - timedelta(days=1)))
+    for i in range(5):
+        db.add(_entry(f"active-{i:03d}", False, NOW - timedelta(days=90)))
+    db.commit()
+    return db
+
+
+def _entry(entry_id, deleted, updated_at, **extra):
+    return Entry(
+        id=entry_id, amount=10.0, type=EntryType.INCOME, category="Corrida", user_id="u1",
+        date=updated_at - timedelta(days=1), is_deleted=deleted, updated_at=updated_at, **extra,
+    )
+
+
+def _ids(db):
+    return {row[0] for row in db.execute(text("SELECT id FROM entries"))}
+
+
+class TestEntryPurge:
+    """Remoção definitiva dos lançamentos excluídos."""
+
+    def test_purges_only_expired_deleted_rows_in_chunks(self, db):
+        progress = []
+        report = EntryRetentionService.purge(
+            db, CUTOFF, chunk_size=5, pause_seconds=0, progress_callback=progress.append
+        )
+
+        assert report["deleted_count"] == 12
+        assert report["chunks"] == 3
+        assert [p["deleted_count"] for p in progress] == [5, 10, 12]
+        remaining = _ids(db)
+        assert not any(i.startswith("old-") for i in remaining)
+        assert len(remaining) == 8
+
+    def test_unlinks_expenses_of_purged_rides(self, db):
+        db.add(Entry(
+            id="toll", amount=5.0, type=EntryType.EXPENSE, category="Pedágio", user_id="u1",
+            linked_entry_id="old-000", is_deleted=False,
+        ))
+        db.commit()
+
+        report = EntryRetentionService.purge(db, CUTOFF, pause_seconds=0)
+
+        assert report["unlinked_count"] == 1
+        assert db.get(Entry, "toll").linked_entry_id is None
+
+    def test_archives_before_delete(self, db, tmp_path):
+        report = EntryRetentionService.purge(db, CUTOFF, pause_seconds=0, archive_dir=str(tmp_path))
+
+        assert report["archived_count"] == 12
+        day = (NOW - timedelta(days=61)).date().isoformat()
+        segment = EntryRetentionService.segment_path(tmp_path, day)
+        with gzip.open(segment, "rt", encoding="utf-8") as handle:
+            rows = [json.loads(line) for line in handle]
+        assert {row["id"] for row in rows} == {f"old-{i:03d}" for i in range(12)}
+        assert rows[0]["is_deleted"] is True
+
+    def test_reports_index_sizes(self, db):
+        report = EntryRetentionService.purge(db, CUTOFF, pause_seconds=0)
+
+        for name in ("ix_entries_active_user_date", "ix_entries_active_user_type_date", "ix_entries_deleted_id"):
+            assert name in report["index_bytes_before"]
+            assert name in report["index_bytes_after"]
+
+    def test_invalid_chunk_size(self, db):
+        with pytest.raises(ValueError):
+            EntryRetentionService.purge(db, CUTOFF, chunk_size=0)
+
+
+class TestPartialIndexes:
+    """O planejador usa os índices parciais com o predicado das consultas."""
+
+    def test_hot_paths_use_partial_indexes(self, db):
+        query = (
+            db.query(Entry.id)
+            .filter(Entry.user_id == "u1", Entry.is_deleted.is_(False), Entry.type == EntryType.INCOME)
+            .filter(Entry.date >= NOW - timedelta(days=365))
+        )
+        sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[-1] for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+        assert "ix_entries_active_user_type_date" in plan
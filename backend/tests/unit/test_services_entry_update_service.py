@@ -0,0 +1,119 @@
+"""Testes para o módulo entry_update_service.py"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.models.earnings_sketch import EarningsSketch
+from app.models.entry import Entry, EntryType
+from app.services.earnings_sketch_service import EarningsSketchService
+from app.services.entry_update_service import EntryUpdateService
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        _ride("ride", gross=25.0, fee=5.0, amount=25.0),
+        _ride("custom", gross=25.0, fee=5.0, amount=18.0),
+        _ride("deleted", is_deleted=True),
+        Entry(
+            id="fuel", amount=100.0, description="Posto", date=datetime(2026, 10, 2),
+            type=EntryType.EXPENSE, category="Combustível", user_id="u1",
+        ),
+    ])
+    db.commit()
+    return db
+
+
+def _ride(entry_id, gross=None, fee=None, amount=20.0, **extra):
+    return Entry(
+        id=entry_id, amount=amount, description="Corrida", date=datetime(2026, 10, 1, 9),
+        type=EntryType.INCOME, category="Corrida", user_id="u1", gross_amount=gross,
+        platform_fee=fee, net_amount=(gross - fee) if gross is not None else None,
+        distance_km=10.0, duration_min=30, **extra,
+    )
+
+
+def _sketch_rows(db):
+    return {row.month: (row.rides, row.sketches) for row in db.query(EarningsSketch)}
+
+
+class TestEntryUpdate:
+    """UPDATE ... RETURNING com o recálculo de net_amount/amount."""
+
+    def test_recomputes_net_and_amount(self, db):
+        entry = EntryUpdateService.update(db, "u1", "ride", {"tips_amount": 3.0, "platform_fee": 6.0})
+        assert entry["net_amount"] == 22.0
+        # amount era o bruto: passa a acompanhar o líquido
+        assert entry["amount"] == 22.0
+        assert entry["updated_at"] is not None
+
+        custom = EntryUpdateService.update(db, "u1", "custom", {"gross_amount": 30.0})
+        assert custom["net_amount"] == 25.0
+        assert custom["amount"] == 18.0
+
+        expense = EntryUpdateService.update(db, "u1", "fuel", {"gross_amount": 30.0})
+        assert expense["net_amount"] is None
+        db.commit()
+
+        stored = db.get(Entry, "ride")
+        assert (stored.net_amount, stored.amount, stored.tips_amount) == (22.0, 22.0, 3.0)
+
+    def test_only_active_entries_of_the_user(self, db):
+        assert EntryUpdateService.update(db, "u2", "ride", {"amount": 1.0}) is None
+        assert EntryUpdateService.update(db, "u1", "deleted", {"amount": 1.0}) is None
+        assert EntryUpdateService.update(db, "u1", "missing", {}) is None
+        assert EntryUpdateService.update(db, "u1", "fuel", {})["amount"] == 100.0
+
+    def test_single_statement_for_untracked_fields(self, db, engine):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        entry = EntryUpdateService.update(db, "u1", "fuel", {"description": "Posto Shell"})
+
+        assert entry["description"] == "Posto Shell"
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE entries") and "RETURNING" in statements[0]
+
+    def test_emulated_without_returning(self, db, monkeypatch):
+        monkeypatch.setattr(db.get_bind().dialect, "update_returning", False)
+
+        entry = EntryUpdateService.update(db, "u1", "ride", {"gross_amount": 40.0})
+
+        assert entry["net_amount"] == 35.0
+        assert EntryUpdateService.update(db, "u2", "ride", {"amount": 1.0}) is None
+
+
+class TestSketches:
+    """Os sketches de ganhos acompanham a edição feita pelo Core."""
+
+    def test_matches_rebuild(self, db):
+        EntryUpdateService.update(db, "u1", "ride", {"tips_amount": 4.0})
+        EntryUpdateService.update(db, "u1", "custom", {"date": datetime(2026, 11, 3)})
+        EntryUpdateService.update(db, "u1", "fuel", {"type": EntryType.INCOME, "net_amount": 50.0})
+        db.commit()
+        incremental = _sketch_rows(db)
+        assert incremental["2026-11"][0] == 1
+
+        EarningsSketchService.rebuild(db)
+        db.commit()
+        assert _sketch_rows(db) == incremental
+
+    def test_postgresql_returns_previous_row(self):
+        # No PostgreSQL a linha anterior vem do FROM travado, no mesmo UPDATE
+        statements = []
+        db = SimpleNamespace(
+            get_bind=lambda: SimpleNamespace(dialect=postgresql.dialect()),
+            execute=lambda stmt: statements.append(stmt) or SimpleNamespace(first=lambda: None),
+        )
+
+        assert EntryUpdateService.update(db, "u1", "ride", {"amount": 1.0}) is None
+
+        assert len(statements) == 1
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE entries SET")
+        assert "FOR UPDATE) AS previous" in sql
+        assert "previous.amount AS previous_amount" in sql
@@ -0,0 +1,181 @@
+"""Testes para o cache de certificados do Google (google_certs_cache.py)"""
+
+import asyncio
+import datetime as dt
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+from app.core.config import settings
+from app.services.google_auth import verify_google_token
+from app.services.google_certs_cache import GoogleCertsCache, google_certs_refresh_loop
+
+CLIENT_ID = "client-id.apps.googleusercontent.com"
+
+
+def _key_pair():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+KEYS = {kid: _key_pair() for kid in ("kid-1", "kid-2")}
+
+
+class FakeKeyServer:
+    """Substituto local do endpoint de certificados do Google."""
+
+    def __init__(self):
+        self.requests = 0
+        self.kids = ["kid-1"]
+        self.max_age = 3600
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                body = json.dumps({kid: KEYS[kid][1] for kid in server.kids}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={server.max_age}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/oauth2/v1/certs"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _token(kid="kid-1", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "ana@example.com",
+        "name": "Ana",
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    signer = crypt.RSASigner.from_string(KEYS[kid][0], key_id=kid)
+    return google_jwt.encode(signer, payload).decode()
+
+
+@pytest.fixture
+def key_server(monkeypatch):
+    server = FakeKeyServer()
+    monkeypatch.setattr(settings, "GOOGLE_CERTS_URL", server.url)
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    GoogleCertsCache.clear()
+    yield server
+    GoogleCertsCache.clear()
+    server.stop()
+
+
+class TestGoogleCertsCache:
+    """Testes da verificação local com certificados em cache."""
+
+    def test_steady_state_logins_make_no_http_calls(self, key_server):
+        for _ in range(5):
+            user = verify_google_token(_token())
+            assert user["email"] == "ana@example.com"
+            assert user["google_id"] == "1234567890"
+
+        assert key_server.requests == 1
+
+    def test_invalid_tokens_are_rejected_locally(self, key_server):
+        assert verify_google_token(_token(aud="outro-cliente")) is None
+        assert verify_google_token(_token(iss="https://evil.example")) is None
+        tampered = _token()[:-4] + "AAAA"
+        assert verify_google_token(tampered) is None
+        assert key_server.requests == 1
+
+    def test_expired_cache_is_refetched(self, key_server):
+        verify_google_token(_token())
+        GoogleCertsCache._expires_at = time.monotonic() - 1
+
+        assert verify_google_token(_token()) is not None
+        assert key_server.requests == 2
+
+    def test_max_age_minus_age_sets_ttl(self):
+        assert GoogleCertsCache._ttl_from_headers(
+            {"cache-control": "public, max-age=20000, must-revalidate", "age": "500"}
+        ) == 19500
+        assert (
+            GoogleCertsCache._ttl_from_headers({})
+            == GoogleCertsCache.DEFAULT_TTL_SECONDS
+        )
+
+    def test_unknown_kid_forces_one_refresh(self, key_server):
+        verify_google_token(_token())
+        key_server.kids = ["kid-1", "kid-2"]
+
+        assert verify_google_token(_token(kid="kid-2")) is not None
+        assert key_server.requests == 2
+
+        # Outros kids desconhecidos não geram novas buscas dentro do intervalo
+        key_server.kids = ["kid-2"]
+        GoogleCertsCache._key_ids = frozenset(["kid-2"])
+        assert verify_google_token(_token(kid="kid-1")) is not None
+        assert key_server.requests == 2
+
+    def test_stale_certs_are_served_when_refresh_fails(self, key_server):
+        verify_google_token(_token())
+        GoogleCertsCache._expires_at = time.monotonic() - 1
+        key_server.stop()
+
+        assert verify_google_token(_token()) is not None
+
+    @pytest.mark.asyncio
+    async def test_background_loop_refreshes_before_expiry(self, key_server):
+        key_server.max_age = 2
+        task = asyncio.create_task(google_certs_refresh_loop())
+        try:
+            await asyncio.sleep(0.2)
+            assert key_server.requests == 1
+            # Renovação com 10% de margem: antes dos 2s do max-age
+            await asyncio.sleep(2.0)
+            assert key_server.requests == 2
+            assert GoogleCertsCache._expires_at > time.monotonic()
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert verify_google_token(_token()) is not None
+        assert key_server.requests == 2
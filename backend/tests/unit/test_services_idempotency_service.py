@@ -0,0 +1,145 @@
+"""Testes para o módulo idempotency_service.py"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.v1 import entries
+from app.core.database import get_db
+from app.dependencies import get_current_user
+from app.models.entry import Entry
+from app.models.idempotency_key import IdempotencyKey
+from app.models.user import User
+from app.services.idempotency_service import IdempotencyKeyMismatch, IdempotencyService
+
+NOW = datetime(2026, 10, 19, 12)
+PAYLOAD = {
+    "amount": 25.0,
+    "description": "Corrida aeroporto",
+    "date": "2026-10-19T08:30:00",
+    "type": "INCOME",
+    "category": "Corrida",
+}
+
+
+@pytest.fixture
+def session_factory(session_factory, db):
+    """Fábrica do banco com o usuário u1 já gravado."""
+    return session_factory
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(entries.router)
+
+    def get_session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with session_factory() as db:
+        user = db.get(User, "u1")
+        db.expunge(user)
+    app.dependency_overrides[get_db] = get_session
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+def _entry_count(session_factory):
+    with session_factory() as db:
+        return db.query(Entry).count()
+
+
+class TestIdempotencyService:
+    """Consulta, gravação e limpeza das chaves."""
+
+    def test_store_and_lookup(self, session_factory):
+        with session_factory() as db:
+            assert IdempotencyService.lookup(db, "u1", "k1", "h1", now=NOW) is None
+            IdempotencyService.store(db, "u1", "k1", "h1", 201, {"id": "e1"}, now=NOW)
+            db.commit()
+
+            assert IdempotencyService.lookup(db, "u1", "k1", "h1", now=NOW) == (201, {"id": "e1"})
+            # A chave é por usuário
+            assert IdempotencyService.lookup(db, "u2", "k1", "h1", now=NOW) is None
+            with pytest.raises(IdempotencyKeyMismatch):
+                IdempotencyService.lookup(db, "u1", "k1", "outro", now=NOW)
+
+    def test_expired_key_is_released(self, session_factory):
+        with session_factory() as db:
+            IdempotencyService.store(db, "u1", "k1", "h1", 201, {}, now=NOW - timedelta(days=2))
+            db.commit()
+
+            assert IdempotencyService.lookup(db, "u1", "k1", "h2", now=NOW) is None
+            IdempotencyService.store(db, "u1", "k1", "h2", 201, {"id": "novo"}, now=NOW)
+            db.commit()
+            assert IdempotencyService.lookup(db, "u1", "k1", "h2", now=NOW) == (201, {"id": "novo"})
+
+    def test_purge_expired_in_chunks(self, session_factory):
+        with session_factory() as db:
+            for i in range(7):
+                IdempotencyService.store(db, "u1", f"old-{i}", "h", 201, {}, now=NOW - timedelta(days=2))
+            IdempotencyService.store(db, "u1", "fresh", "h", 201, {}, now=NOW)
+            db.commit()
+
+            assert IdempotencyService.purge_expired(db, now=NOW, chunk_size=3) == 7
+            assert [row.key for row in db.query(IdempotencyKey)] == ["fresh"]
+
+
+class TestCreateEntryIdempotency:
+    """POST /entries/ com o cabeçalho Idempotency-Key."""
+
+    def test_replay_returns_stored_response_without_insert(self, client, session_factory, engine):
+        headers = {"Idempotency-Key": "ride-123"}
+        first = client.post("/entries/", json=PAYLOAD, headers=headers)
+        assert first.status_code == 201
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        replay = client.post("/entries/", json=PAYLOAD, headers=headers)
+
+        assert replay.status_code == 201
+        assert replay.json() == first.json()
+        assert replay.headers["Idempotent-Replayed"] == "true"
+        # A repetição custa uma consulta pela chave primária e nada mais
+        assert len(statements) == 1 and "FROM idempotency_keys" in statements[0]
+        assert _entry_count(session_factory) == 1
+
+    def test_same_key_with_other_body_is_rejected(self, client, session_factory):
+        headers = {"Idempotency-Key": "ride-123"}
+        client.post("/entries/", json=PAYLOAD, headers=headers)
+
+        response = client.post("/entries/", json={**PAYLOAD, "amount": 30.0}, headers=headers)
+
+        assert response.status_code == 422
+        assert _entry_count(session_factory) == 1
+
+    def test_without_key_every_request_creates(self, client, session_factory):
+        client.post("/entries/", json=PAYLOAD)
+        client.post("/entries/", json=PAYLOAD)
+        assert _entry_count(session_factory) == 2
+
+    def test_concurrent_retry_loses_on_unique_index(self, client, session_factory, monkeypatch):
+        headers = {"Idempotency-Key": "ride-123"}
+        first = client.post("/entries/", json=PAYLOAD, headers=headers)
+
+        # Simula a segunda tentativa consultando a chave antes do commit da primeira
+        original = IdempotencyService.lookup
+        calls = []
+
+        def racing_lookup(*args, **kwargs):
+            calls.append(args)
+            return None if len(calls) == 1 else original(*args, **kwargs)
+
+        monkeypatch.setattr(IdempotencyService, "lookup", staticmethod(racing_lookup))
+        retry = client.post("/entries/", json=PAYLOAD, headers=headers)
+
+        assert retry.status_code == 201
+        assert retry.json() == first.json()
+        assert _entry_count(session_factory) == 1
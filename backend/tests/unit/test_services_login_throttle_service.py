@@ -0,0 +1,178 @@
+"""Testes para o módulo login_throttle_service.py"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.auth import login_for_access_token
+from app.core.config import settings
+from app.models.system_config import SystemConfig
+from app.models.user import User
+from app.services.login_throttle_service import (
+    DatabaseThrottleBackend,
+    LoginThrottleService,
+    MemoryThrottleBackend,
+)
+
+
+@pytest.fixture(params=["memory", "database"])
+def backend(request, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_THROTTLE_ENABLED", True)
+    monkeypatch.setattr(settings, "LOGIN_THROTTLE_IP_FACTOR", 4)
+    if request.param == "memory":
+        backend = MemoryThrottleBackend()
+    else:
+        backend = DatabaseThrottleBackend(session_factory)
+    LoginThrottleService.set_backend(backend)
+    LoginThrottleService.reset()
+    yield backend
+    LoginThrottleService.set_backend(None)
+    LoginThrottleService._policy = None
+
+
+def _fail(db, times, username="ana@example.com", ip="10.0.0.1"):
+    for _ in range(times):
+        LoginThrottleService.record_failure(db, username, ip)
+
+
+class TestSlidingWindow:
+    """Testes da política de bloqueio com os dois backends."""
+
+    def test_blocks_after_max_attempts(self, db, backend):
+        _fail(db, 4)
+        assert LoginThrottleService.retry_after(db, "ana@example.com", "10.0.0.1") is None
+
+        _fail(db, 1)
+        retry_after = LoginThrottleService.retry_after(db, "ana@example.com", "10.0.0.1")
+        assert 29 * 60 < retry_after <= 30 * 60
+
+    def test_username_key_is_normalized(self, db, backend):
+        _fail(db, 5, username="Ana@Example.com ")
+        assert LoginThrottleService.retry_after(db, "ana@example.com", "10.0.0.9")
+
+    def test_ip_limit_catches_credential_stuffing(self, db, backend):
+        for i in range(19):
+            _fail(db, 1, username=f"user{i}@example.com")
+        assert LoginThrottleService.retry_after(db, "novo@example.com", "10.0.0.1") is None
+
+        _fail(db, 1, username="user19@example.com")
+        assert LoginThrottleService.retry_after(db, "novo@example.com", "10.0.0.1")
+        # Outro IP continua liberado
+        assert LoginThrottleService.retry_after(db, "novo@example.com", "10.0.0.2") is None
+
+    def test_failures_outside_window_do_not_count(self, db, backend):
+        old = datetime.utcnow() - timedelta(minutes=31)
+        backend.record_failure(["user:ana@example.com"] * 4, old, old)
+        _fail(db, 4)
+
+        assert LoginThrottleService.retry_after(db, "ana@example.com", "10.0.0.1") is None
+
+    def test_retry_after_follows_oldest_failure_in_window(self, db, backend):
+        now = datetime.utcnow()
+        backend.record_failure(
+            ["user:ana@example.com"], now - timedelta(minutes=25), now
+        )
+        _fail(db, 4, ip=None)
+
+        retry_after = LoginThrottleService.retry_after(db, "ana@example.com", None)
+        assert 4 * 60 < retry_after <= 5 * 60
+
+    def test_success_resets_username_only(self, db, backend):
+        _fail(db, 5)
+        LoginThrottleService.record_success("ana@example.com")
+
+        assert LoginThrottleService.retry_after(db, "ana@example.com", "10.0.0.1") is None
+        assert backend.recent_failures(
+            "ip:10.0.0.1", datetime.utcnow() - timedelta(hours=1), 100
+        )
+
+    def test_policy_comes_from_system_config(self, db, backend):
+        db.add_all(
+            [
+                SystemConfig(
+                    key="max_login_attempts",
+                    value="2",
+                    value_type="integer",
+                    created_by="test",
+                ),
+                SystemConfig(
+                    key="lockout_duration_minutes",
+                    value="5",
+                    value_type="integer",
+                    created_by="test",
+                ),
+            ]
+        )
+        db.commit()
+
+        _fail(db, 2)
+        assert LoginThrottleService.retry_after(db, "ana@example.com", None) <= 5 * 60
+
+    def test_disabled(self, db, backend, monkeypatch):
+        monkeypatch.setattr(settings, "LOGIN_THROTTLE_ENABLED", False)
+        _fail(db, 10)
+        assert LoginThrottleService.retry_after(db, "ana@example.com", "10.0.0.1") is None
+
+
+class TestLoginEndpointThrottling:
+    """Testes da integração com POST /auth/token."""
+
+    @pytest.fixture
+    def user(self, db):
+        user = User(
+            email="ana@example.com",
+            username="ana",
+            name="Ana",
+            hashed_password="hash",
+            role="USER",
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    def _request(self, ip="10.0.0.1"):
+        return SimpleNamespace(client=SimpleNamespace(host=ip), headers={})
+
+    async def _login(self, db, password, ip="10.0.0.1"):
+        form = SimpleNamespace(username="ana@example.com", password=password)
+        return await login_for_access_token(form_data=form, request=self._request(ip), db=db)
+
+    @pytest.mark.asyncio
+    async def test_blocked_attempts_skip_bcrypt_and_audit(self, db, backend, user):
+        with patch(
+            "app.api.v1.auth.verify_password", return_value=False
+        ) as verify, patch("app.api.v1.auth.AuditService.log_auth_action") as audit:
+            for _ in range(5):
+                with pytest.raises(HTTPException) as exc:
+                    await self._login(db, "errada")
+                assert exc.value.status_code == 401
+
+            for _ in range(20):
+                with pytest.raises(HTTPException) as exc:
+                    await self._login(db, "errada")
+                assert exc.value.status_code == 429
+                assert int(exc.value.headers["Retry-After"]) > 0
+
+        assert verify.call_count == 5
+        assert audit.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_successful_login_clears_failures(self, db, backend, user):
+        with patch(
+            "app.api.v1.auth.verify_password",
+            side_effect=lambda plain, hashed: plain == "senha-correta",
+        ), patch("app.api.v1.auth.AuditService.log_auth_action"):
+            for _ in range(4):
+                with pytest.raises(HTTPException):
+                    await self._login(db, "errada")
+            token = await self._login(db, "senha-correta")
+            assert token["token_type"] == "bearer"
+
+            # Contagem recomeça após o sucesso
+            for _ in range(4):
+                with pytest.raises(HTTPException) as exc:
+                    await self._login(db, "errada")
+                assert exc.value.status_code == 401
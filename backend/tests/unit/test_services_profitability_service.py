@@ -0,0 +1,112 @@
+"""Testes para o módulo profitability_service.py"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models.entry import Entry, EntryType
+from app.models.user import User
+from app.services.profitability_service import ProfitabilityService
+
+
+@pytest.fixture
+def db(db):
+    db.add(User(id="u2", email="u2@test.com", username="u2", name="U2", role="USER"))
+    db.commit()
+    return db
+
+
+def _ride(db, ride_id, when, net, km, user_id="u1", **extra):
+    db.add(Entry(
+        id=ride_id, amount=net, net_amount=net, distance_km=km, date=when,
+        type=EntryType.INCOME, category="Corrida", user_id=user_id, **extra,
+    ))
+
+
+def _expense(db, amount, when, linked=None, user_id="u1", **extra):
+    db.add(Entry(
+        amount=amount, date=when, type=EntryType.EXPENSE, category="Despesa",
+        user_id=user_id, linked_entry_id=linked, **extra,
+    ))
+
+
+@pytest.fixture
+def trips(db):
+    _ride(db, "r1", datetime(2026, 9, 10, 8), 50.0, 20.0)
+    _ride(db, "r2", datetime(2026, 9, 12, 8), 30.0, 10.0)
+    _ride(db, "r3", datetime(2026, 10, 2, 8), 40.0, 8.0)
+    # Pedágios vinculados à r1 (dois) e à r3
+    _expense(db, 6.0, datetime(2026, 9, 10, 9), linked="r1")
+    _expense(db, 4.0, datetime(2026, 9, 10, 9), linked="r1")
+    _expense(db, 5.0, datetime(2026, 10, 2, 9), linked="r3")
+    # Combustível não vinculado: 30 em setembro (30 km), 16 em outubro (8 km)
+    _expense(db, 30.0, datetime(2026, 9, 15), is_trip_expense=True)
+    _expense(db, 16.0, datetime(2026, 10, 5))
+    # Não contam: despesa excluída, vínculo de outro usuário, despesa de mês sem corridas
+    _expense(db, 99.0, datetime(2026, 9, 15), linked="r1", is_deleted=True)
+    _expense(db, 99.0, datetime(2026, 9, 15), linked="r1", user_id="u2")
+    _expense(db, 12.0, datetime(2026, 11, 1))
+    db.commit()
+
+
+class TestProfitabilityReport:
+    """Lucro por período e por corrida."""
+
+    def test_periods_and_totals(self, db, trips):
+        result = ProfitabilityService.report(db, "u1")
+
+        september, october = result["periods"]
+        assert september["period"] == "2026-09"
+        assert september["rides"] == 2
+        assert september["linked_costs"] == 10.0
+        assert september["apportioned_costs"] == 30.0
+        assert september["cost_per_km"] == 1.0
+        assert september["profit"] == 40.0
+        assert october["profit"] == 40.0 - 5.0 - 16.0
+        assert result["totals"]["profit"] == 59.0
+        assert result["totals"]["unapportioned_costs"] == 12.0
+
+    def test_trips_with_linked_and_apportioned_costs(self, db, trips):
+        trips_by_id = {t["id"]: t for t in ProfitabilityService.report(db, "u1")["trips"]}
+
+        assert trips_by_id["r1"]["linked_costs"] == 10.0
+        assert trips_by_id["r1"]["apportioned_costs"] == 20.0
+        assert trips_by_id["r1"]["profit"] == 20.0
+        assert trips_by_id["r2"]["profit"] == 20.0
+        assert trips_by_id["r3"]["profit"] == 40.0 - 5.0 - 16.0
+
+    def test_trip_expense_filter_and_date_range(self, db, trips):
+        result = ProfitabilityService.report(db, "u1", only_trip_expenses=True)
+        assert result["periods"][1]["apportioned_costs"] == 0
+
+        result = ProfitabilityService.report(
+            db, "u1", start_date=date(2026, 10, 1), end_date=date(2026, 10, 31)
+        )
+        assert [p["period"] for p in result["periods"]] == ["2026-10"]
+        assert [t["id"] for t in result["trips"]] == ["r3"]
+
+    def test_daily_granularity_and_pagination(self, db, trips):
+        result = ProfitabilityService.report(db, "u1", granularity="day", limit=1, offset=1)
+
+        assert [p["period"] for p in result["periods"]] == ["2026-09-10", "2026-09-12", "2026-10-02"]
+        # Combustível de 15/09 e 05/10 cai em dias sem corrida: não é rateado
+        assert result["totals"]["apportioned_costs"] == 0
+        assert [t["id"] for t in result["trips"]] == ["r2"]
+
+    def test_constant_number_of_queries(self, db, engine, trips):
+        for i in range(50):
+            _ride(db, f"x{i}", datetime(2026, 9, 20, 8), 10.0, 5.0)
+            _expense(db, 1.0, datetime(2026, 9, 20, 9), linked=f"x{i}")
+        db.commit()
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        result = ProfitabilityService.report(db, "u1", limit=100)
+
+        assert len(result["trips"]) == 53
+        assert len(statements) == 3
+
+    def test_invalid_granularity(self, db):
+        with pytest.raises(ValueError):
+            ProfitabilityService.report(db, "u1", granularity="week")
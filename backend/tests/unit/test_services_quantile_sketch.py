@@ -0,0 +1,111 @@
+"""Testes para o módulo quantile_sketch.py"""
+
+import math
+import random
+
+import pytest
+
+from app.services.quantile_sketch import QuantileSketch
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1]
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+def _assert_within_bound(sketch, values):
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        estimate = sketch.quantile(q)
+        assert abs(estimate - exact) <= sketch.relative_accuracy * abs(exact) + 1e-9, q
+
+
+class TestErrorBound:
+    """O erro relativo de qualquer quantil fica dentro de α."""
+
+    @pytest.mark.parametrize(
+        "generator",
+        [
+            lambda r: r.lognormvariate(3, 1),
+            lambda r: r.uniform(5, 80),
+            lambda r: r.expovariate(0.05),
+            lambda r: r.uniform(-20, 60),
+        ],
+        ids=["lognormal", "uniforme", "exponencial", "com-negativos"],
+    )
+    @pytest.mark.parametrize("accuracy", [0.01, 0.05])
+    def test_quantiles_against_exact(self, generator, accuracy):
+        rng = random.Random(7)
+        values = [generator(rng) for _ in range(20_000)]
+
+        sketch = QuantileSketch(accuracy).update(values)
+
+        assert sketch.count == len(values)
+        _assert_within_bound(sketch, values)
+
+    def test_quantiles_in_one_pass_match_single_calls(self):
+        rng = random.Random(3)
+        sketch = QuantileSketch().update(rng.uniform(1, 100) for _ in range(1000))
+
+        assert sketch.quantiles([0.9, 0.5, 0.1]) == [
+            sketch.quantile(0.9),
+            sketch.quantile(0.5),
+            sketch.quantile(0.1),
+        ]
+
+    def test_zero_and_empty(self):
+        assert QuantileSketch().quantile(0.5) is None
+        assert QuantileSketch().update([0, 0, 10]).quantile(0.5) == 0.0
+
+    def test_invalid_quantile(self):
+        with pytest.raises(ValueError):
+            QuantileSketch().update([1]).quantile(1.5)
+
+
+class TestMergeAndRemove:
+    """Mescla e remoção preservam o estado exato dos buckets."""
+
+    def test_merge_equals_sketch_of_union(self):
+        rng = random.Random(11)
+        months = [[rng.lognormvariate(3, 0.8) for _ in range(500)] for _ in range(12)]
+
+        merged = QuantileSketch()
+        for values in months:
+            merged.merge(QuantileSketch().update(values))
+        union = [v for values in months for v in values]
+
+        assert merged.to_dict() == QuantileSketch().update(union).to_dict()
+        _assert_within_bound(merged, union)
+
+    def test_remove_reverts_add(self):
+        sketch = QuantileSketch().update([10, 20, 30])
+        before = sketch.to_dict()
+
+        sketch.add(-4.5)
+        sketch.add(55)
+        sketch.remove(-4.5)
+        sketch.remove(55)
+
+        assert sketch.to_dict() == before
+        assert sketch.count == 3
+
+    def test_removing_unknown_value_is_ignored(self):
+        sketch = QuantileSketch().update([10])
+        sketch.remove(999)
+
+        assert sketch.count == 1
+
+    def test_merge_requires_same_accuracy(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+    def test_serialization_round_trip(self):
+        sketch = QuantileSketch(0.02).update([-3, 0, 1.5, 40, 40])
+
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+
+        assert restored.to_dict() == sketch.to_dict()
+        assert restored.count == 5
+        assert restored.quantiles([0, 0.5, 1]) == sketch.quantiles([0, 0.5, 1])
@@ -0,0 +1,189 @@
+"""Testes para o módulo query_profiler_service.py"""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import app.services.query_profiler_service as profiler_module
+from app.models.system_config import SystemConfig
+from app.models.user import User
+from app.services.cache_invalidation_service import CacheInvalidationService
+from app.services.login_throttle_service import CONFIG_TOPIC
+from app.services.query_profiler_service import (
+    QueryProfile,
+    QueryProfilerMiddleware,
+    QueryProfilerService,
+)
+
+
+@pytest.fixture
+def session_factory(session_factory, monkeypatch):
+    monkeypatch.setattr(profiler_module, "SessionLocal", session_factory)
+    QueryProfilerService.reset()
+    yield session_factory
+    QueryProfilerService.reset()
+
+
+def _set_config(session_factory, **values):
+    with session_factory() as db:
+        for key, value in values.items():
+            db.add(
+                SystemConfig(
+                    key=key,
+                    value=str(value).lower() if isinstance(value, bool) else str(value),
+                    value_type="boolean" if isinstance(value, bool) else "integer",
+                    created_by="test",
+                )
+            )
+        db.commit()
+    QueryProfilerService.reset()
+
+
+def _build_client(engine, session_factory, role="MASTER"):
+    app = FastAPI()
+    app.add_middleware(QueryProfilerMiddleware, engine=engine)
+
+    def get_session():
+        with session_factory() as db:
+            yield db
+
+    def current_user():
+        user = SimpleNamespace(role=role)
+        QueryProfilerService.note_user(user)
+        return user
+
+    @app.get("/owners")
+    def list_owners(db: Session = Depends(get_session), user=Depends(current_user)):
+        ids = [row[0] for row in db.execute(text("SELECT id FROM users"))]
+        # N+1: uma consulta por usuário
+        return [db.get(User, user_id).email for user_id in ids]
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def users(session_factory):
+    with session_factory() as db:
+        db.add_all(
+            [
+                User(email=f"u{i}@example.com", username=f"u{i}", name=f"U{i}", role="USER")
+                for i in range(6)
+            ]
+        )
+        db.commit()
+
+
+class TestQueryProfile:
+    """Testes da contagem de comandos por requisição."""
+
+    def test_repeated_statements_sorted_by_count(self):
+        profile = QueryProfile("GET /x", 200)
+        for _ in range(3):
+            profile.record("SELECT a", 0.001)
+        for _ in range(5):
+            profile.record("SELECT b", 0.001)
+        profile.record("SELECT c", 0.001)
+
+        assert profile.repeated(3) == [("SELECT b", 5), ("SELECT a", 3)]
+        assert profile.total_queries == 9
+
+    def test_statement_list_is_capped(self, monkeypatch):
+        monkeypatch.setattr(QueryProfile, "MAX_STATEMENTS", 2)
+        profile = QueryProfile("GET /x", 200)
+        for _ in range(4):
+            profile.record("SELECT 1", 0.5)
+
+        assert len(profile.statements) == 2
+        assert profile.total_queries == 4
+        assert profile.total_seconds == 2.0
+
+
+class TestQueryProfilerMiddleware:
+    """Testes do profiler ligado pelo SystemConfig."""
+
+    def test_disabled_by_default(self, engine, session_factory, users):
+        response = _build_client(engine, session_factory).get("/owners")
+
+        assert response.status_code == 200
+        assert "x-db-queries" not in response.headers
+        assert engine not in QueryProfilerService._instrumented
+
+    def test_master_gets_summary_headers(self, engine, session_factory, users):
+        _set_config(session_factory, query_profiler_enabled=True)
+
+        response = _build_client(engine, session_factory).get("/owners")
+
+        assert response.status_code == 200
+        assert response.headers["x-db-queries"] == "7"
+        assert float(response.headers["x-db-time"]) >= 0
+
+    def test_other_roles_do_not_get_headers(self, engine, session_factory, users):
+        _set_config(session_factory, query_profiler_enabled=True)
+
+        response = _build_client(engine, session_factory, role="ADMIN").get("/owners")
+
+        assert "x-db-queries" not in response.headers
+
+    def test_n_plus_one_is_logged(self, engine, session_factory, users, caplog):
+        _set_config(
+            session_factory,
+            query_profiler_enabled=True,
+            query_profiler_repeat_threshold=5,
+        )
+
+        with caplog.at_level(logging.WARNING, logger=profiler_module.__name__):
+            _build_client(engine, session_factory).get("/owners")
+
+        messages = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+        assert len(messages) == 1
+        assert "GET /owners" in messages[0]
+        assert "6x" in messages[0]
+        assert "FROM users" in messages[0]
+
+    def test_slow_queries_are_logged_with_plan(
+        self, engine, session_factory, users, caplog, monkeypatch
+    ):
+        monkeypatch.setattr(QueryProfilerService, "config", lambda: (True, 0, 100))
+
+        with caplog.at_level(logging.WARNING, logger=profiler_module.__name__):
+            _build_client(engine, session_factory).get("/owners")
+
+        slow = [r.getMessage() for r in caplog.records if "Consulta lenta" in r.getMessage()]
+        assert len(slow) == 7
+        assert "SCAN" in slow[0] or "SEARCH" in slow[0]
+
+    def test_runtime_toggle_follows_system_config(self, engine, session_factory, users):
+        client = _build_client(engine, session_factory)
+        _set_config(session_factory, query_profiler_enabled=True)
+        assert "x-db-queries" in client.get("/owners").headers
+
+        with session_factory() as db:
+            db.query(SystemConfig).filter(
+                SystemConfig.key == "query_profiler_enabled"
+            ).update({"value": "false"})
+            db.commit()
+        # Até o fim do TTL a configuração em cache continua valendo
+        assert "x-db-queries" in client.get("/owners").headers
+        QueryProfilerService.reset()
+        assert "x-db-queries" not in client.get("/owners").headers
+
+    def test_config_change_invalidates_cache(self, engine, session_factory, users):
+        client = _build_client(engine, session_factory)
+        assert "x-db-queries" not in client.get("/owners").headers
+
+        _set_config(session_factory, query_profiler_enabled=True)
+        client.get("/owners")
+        with session_factory() as db:
+            db.query(SystemConfig).filter(
+                SystemConfig.key == "query_profiler_enabled"
+            ).update({"value": "false"})
+            # Mesmo aviso publicado pelas rotas de /system-config
+            CacheInvalidationService.publish(db, CONFIG_TOPIC)
+            db.commit()
+
+        assert "x-db-queries" not in client.get("/owners").headers
@@ -0,0 +1,119 @@
+"""Testes para o módulo recurring_entry_service.py"""
+
+from datetime import date
+
+from sqlalchemy import event
+
+from app.models.earnings_sketch import EarningsSketch
+from app.models.entry import Entry
+from app.models.recurring_rule import RecurringRule
+from app.services.recurring_entry_service import (
+    RecurringEntryService,
+    due_dates,
+    first_occurrence_on_or_after,
+    occurrence,
+)
+
+
+def _rule(db, frequency, start, end=None, interval=1, **extra):
+    values = dict(description="Regra", amount=100.0, type="EXPENSE", category="Seguro")
+    values.update(extra)
+    rule = RecurringRule(
+        user_id="u1", frequency=frequency, interval=interval,
+        start_date=start, end_date=end, next_run_date=start, **values,
+    )
+    db.add(rule)
+    db.commit()
+    return rule
+
+
+def _dates(db, rule):
+    return [
+        e.date.date()
+        for e in db.query(Entry).filter(Entry.recurring_rule_id == rule.id).order_by(Entry.date)
+    ]
+
+
+class TestSchedule:
+    """Cálculo das ocorrências."""
+
+    def test_monthly_anchored_on_start_day(self):
+        start = date(2026, 1, 31)
+        assert [occurrence(start, "MONTHLY", 1, i) for i in range(4)] == [
+            date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30),
+        ]
+        assert first_occurrence_on_or_after(start, "MONTHLY", 1, date(2026, 3, 1)) == date(2026, 3, 31)
+
+    def test_weekly_interval_and_end(self):
+        start = date(2026, 10, 5)
+        assert first_occurrence_on_or_after(start, "WEEKLY", 2, date(2026, 10, 6)) == date(2026, 10, 19)
+        assert first_occurrence_on_or_after(start, "WEEKLY", 2, date(2026, 10, 6), date(2026, 10, 18)) is None
+
+    def test_due_dates_caps_catch_up(self):
+        rule = RecurringRule(
+            start_date=date(2026, 1, 1), end_date=None, frequency="DAILY",
+            interval=1, next_run_date=date(2026, 1, 1),
+        )
+        dates, next_run = due_dates(rule, date(2026, 12, 31), limit=10)
+        assert len(dates) == 10
+        assert next_run == date(2026, 1, 11)
+
+
+class TestMaterializeDue:
+    """Geração em lote das ocorrências vencidas."""
+
+    def test_materializes_and_advances_watermark(self, db):
+        insurance = _rule(db, "MONTHLY", date(2026, 8, 15))
+        rental = _rule(db, "WEEKLY", date(2026, 10, 1), end=date(2026, 10, 10))
+
+        report = RecurringEntryService.materialize_due(db, today=date(2026, 10, 19))
+
+        assert report == {"rules": 2, "entries": 5, "batches": 1}
+        assert _dates(db, insurance) == [date(2026, 8, 15), date(2026, 9, 15), date(2026, 10, 15)]
+        assert _dates(db, rental) == [date(2026, 10, 1), date(2026, 10, 8)]
+        db.refresh(insurance)
+        db.refresh(rental)
+        assert insurance.next_run_date == date(2026, 11, 15)
+        assert rental.next_run_date is None
+        assert db.query(Entry).filter(Entry.is_recurring.is_(True)).count() == 5
+
+    def test_rerun_is_idempotent(self, db):
+        rule = _rule(db, "DAILY", date(2026, 10, 15))
+        RecurringEntryService.materialize_due(db, today=date(2026, 10, 19))
+
+        # Simula uma rodada interrompida depois do INSERT e antes de avançar a marca d'água
+        rule.next_run_date = date(2026, 10, 15)
+        db.commit()
+        report = RecurringEntryService.materialize_due(db, today=date(2026, 10, 20))
+
+        assert report["entries"] == 1
+        assert len(_dates(db, rule)) == 6
+
+    def test_inactive_and_future_rules_are_skipped(self, db):
+        _rule(db, "DAILY", date(2026, 10, 1), is_active=False)
+        _rule(db, "DAILY", date(2026, 11, 1))
+
+        report = RecurringEntryService.materialize_due(db, today=date(2026, 10, 19))
+
+        assert report == {"rules": 0, "entries": 0, "batches": 0}
+
+    def test_batches_use_constant_statements(self, db, engine):
+        for i in range(25):
+            _rule(db, "WEEKLY", date(2026, 9, 1), description=f"Regra {i}")
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        report = RecurringEntryService.materialize_due(db, today=date(2026, 9, 30), batch_size=10)
+
+        assert report == {"rules": 25, "entries": 125, "batches": 3}
+        # Por lote: SELECT das regras, INSERT e UPDATE; mais o SELECT final vazio
+        assert not any("FROM entries" in s for s in statements)
+        assert len([s for s in statements if s.startswith("INSERT INTO entries")]) == 3
+
+    def test_income_updates_earnings_sketches(self, db):
+        _rule(db, "MONTHLY", date(2026, 9, 5), type="INCOME", category="Aluguel", amount=500.0)
+
+        RecurringEntryService.materialize_due(db, today=date(2026, 10, 19))
+
+        months = {s.month: s.rides for s in db.query(EarningsSketch).all()}
+        assert months == {"2026-09": 1, "2026-10": 1}
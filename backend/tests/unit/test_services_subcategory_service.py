@@ -0,0 +1,130 @@
+"""Testes para o módulo subcategory_service.py"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.custom_types import list_elements
+from app.models.category import Category
+from app.models.user import User
+from app.services.subcategory_service import SubcategoryService
+
+
+@pytest.fixture
+def db(db):
+    db.add_all(
+        [
+            User(id="u2", email="u2@test.com", username="u2", name="U2"),
+            Category(
+                id="fuel",
+                name="Combustível",
+                type="EXPENSE",
+                is_default=True,
+                subcategories=["Gasolina", "Etanol", "GNV"],
+            ),
+            Category(id="ride", name="Corrida", type="INCOME", is_default=True),
+            Category(
+                id="mine",
+                name="Manutenção",
+                type="EXPENSE",
+                user_id="u1",
+                subcategories=["Pneu", "Óleo"],
+            ),
+            Category(
+                id="empty", name="Lavagem", type="EXPENSE", user_id="u1", subcategories=[]
+            ),
+        ]
+    )
+    db.commit()
+    return db
+
+
+class TestListSubcategories:
+    """Testes para list_subcategories."""
+
+    def test_preserves_original_order(self, db):
+        result = SubcategoryService.list_subcategories(db, "fuel", "u1")
+
+        assert result == ["Gasolina", "Etanol", "GNV"]
+
+    def test_user_category(self, db):
+        assert SubcategoryService.list_subcategories(db, "mine", "u1") == ["Pneu", "Óleo"]
+
+    def test_category_without_items_returns_empty_list(self, db):
+        assert SubcategoryService.list_subcategories(db, "empty", "u1") == []
+        assert SubcategoryService.list_subcategories(db, "ride", "u1") == []
+
+    def test_other_users_category_is_not_visible(self, db):
+        assert SubcategoryService.list_subcategories(db, "mine", "u2") is None
+
+    def test_unknown_category_returns_none(self, db):
+        assert SubcategoryService.list_subcategories(db, "missing", "u1") is None
+
+    def test_invalid_legacy_json_is_ignored(self, db):
+        db.execute(
+            text("UPDATE categories SET subcategories = 'not json' WHERE id = 'mine'")
+        )
+        db.commit()
+
+        assert SubcategoryService.list_subcategories(db, "mine", "u1") == []
+
+
+class TestIsValidSubcategory:
+    """Testes para is_valid_subcategory."""
+
+    def test_member_is_valid(self, db):
+        assert SubcategoryService.is_valid_subcategory(db, "u1", "Combustível", "Etanol")
+
+    def test_non_member_is_invalid(self, db):
+        assert not SubcategoryService.is_valid_subcategory(
+            db, "u1", "Combustível", "Diesel"
+        )
+
+    def test_category_without_list_accepts_anything(self, db):
+        assert SubcategoryService.is_valid_subcategory(db, "u1", "Corrida", "Qualquer")
+        assert SubcategoryService.is_valid_subcategory(db, "u1", "Lavagem", "Qualquer")
+
+    def test_unknown_category_accepts_anything(self, db):
+        assert SubcategoryService.is_valid_subcategory(db, "u1", "Inexistente", "X")
+
+    def test_respects_visibility(self, db):
+        assert not SubcategoryService.is_valid_subcategory(db, "u1", "Manutenção", "X")
+        assert SubcategoryService.is_valid_subcategory(db, "u2", "Manutenção", "X")
+
+    def test_filters_by_entry_type(self, db):
+        assert SubcategoryService.is_valid_subcategory(
+            db, "u1", "Combustível", "Diesel", "INCOME"
+        )
+
+
+class TestListElementsCompilation:
+    """Garante o SQL específico de cada dialeto."""
+
+    def test_postgresql_uses_jsonb_functions(self):
+        elements = list_elements(Category.subcategories, "postgresql")
+        sql = str(elements.select().compile(dialect=postgresql.dialect()))
+
+        assert "jsonb_array_elements_text" in sql
+        assert "WITH ORDINALITY" in sql
+
+    def test_sqlite_uses_json_each(self):
+        elements = list_elements(Category.subcategories, "sqlite")
+
+        assert "json_each" in str(elements.select())
+
+    def test_postgresql_membership_uses_gin_operator(self):
+        statements = []
+        db = SimpleNamespace(
+            get_bind=lambda: SimpleNamespace(dialect=postgresql.dialect()),
+            execute=lambda stmt: statements.append(stmt)
+            or SimpleNamespace(one=lambda: (True, True)),
+        )
+
+        assert SubcategoryService.is_valid_subcategory(db, "u1", "Combustível", "Etanol")
+
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        # Só a verificação de lista restrita expande os itens; o pertencimento usa @>
+        assert sql.count("jsonb_array_elements_text") == 1
+        assert "categories.subcategories @> " in sql
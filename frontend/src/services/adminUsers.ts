@@ -92,7 +92,7 @@ export async function changeStatus(
 
 export interface ResetPasswordResponse {
   message: string;
-  email_sent: boolean;
+  email_queued: boolean;
   expires_at: string;
 }
 